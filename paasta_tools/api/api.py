@@ -31,9 +31,12 @@ import paasta_tools.api
 from paasta_tools import kubernetes_tools
 from paasta_tools import yaml_tools as yaml
 from paasta_tools.api import settings
+from paasta_tools.api.status_poller import StatusPoller
 from paasta_tools.api.tweens import auth
 from paasta_tools.api.tweens import profiling
 from paasta_tools.api.tweens import request_logger
+from paasta_tools.kubernetes.async_client import AsyncKubeClient
+from paasta_tools.kubernetes.bounce_tracker import BounceTracker
 from paasta_tools.utils import load_system_paasta_config
 
 try:
@@ -152,6 +155,7 @@ def make_app(global_config=None):
         "service.instance.bounce_status",
         "/v1/services/{service}/{instance}/bounce_status",
     )
+    config.add_route("bounces.list", "/v1/bounces")
     config.add_route(
         "service.instance.set_state",
         "/v1/services/{service}/{instance}/state/{desired_state}",
@@ -274,11 +278,34 @@ def setup_paasta_api():
         log.exception("Error while initializing KubeClient")
         settings.kubernetes_client = None
 
+    kube_async_pool_size = settings.system_paasta_config.get_api_kube_async_pool_size()
+    if settings.kubernetes_client is not None and kube_async_pool_size > 0:
+        kubernetes_tools.set_async_kube_client(
+            settings.kubernetes_client,
+            AsyncKubeClient(
+                settings.kubernetes_client,
+                pool_size=kube_async_pool_size,
+                timeout=settings.system_paasta_config.get_api_kube_async_timeout(),
+            ),
+        )
+
     # Set up transparent cache for http API calls. With expire_after, responses
     # are removed only when the same request is made. Expired storage is not a
     # concern here. Thus remove_expired_responses is not needed.
     requests_cache.install_cache("paasta-api", backend="memory", expire_after=5)
 
+    status_poll_interval = settings.system_paasta_config.get_api_status_poll_interval()
+    if status_poll_interval > 0:
+        settings.status_poller = StatusPoller(interval=status_poll_interval)
+        settings.status_poller.start()
+
+    if (
+        settings.kubernetes_client is not None
+        and settings.system_paasta_config.get_api_bounce_tracker_enabled()
+    ):
+        settings.bounce_tracker = BounceTracker(settings.kubernetes_client)
+        settings.bounce_tracker.start()
+
 
 def setup_clog(config_file="/nail/srv/configs/clog.yaml"):
     if clog:
@@ -18,6 +18,9 @@ import os
 from typing import Optional
 
 from paasta_tools import utils
+from paasta_tools.api.status_poller import StatusPoller
+from paasta_tools.kubernetes.autoscaling_overrides import AutoscalingOverridesStore
+from paasta_tools.kubernetes.bounce_tracker import BounceTracker
 from paasta_tools.kubernetes_tools import KubeClient
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import SystemPaastaConfig
@@ -31,3 +34,6 @@ cluster: str = None  # type: ignore
 hostname: str = utils.get_hostname()
 kubernetes_client: Optional[KubeClient] = None
 system_paasta_config: Optional[SystemPaastaConfig]
+status_poller: Optional[StatusPoller] = None
+autoscaling_overrides_store: Optional[AutoscalingOverridesStore] = None
+bounce_tracker: Optional[BounceTracker] = None
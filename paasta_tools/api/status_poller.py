@@ -0,0 +1,161 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Background refresh of slow status lookups (Flink jobmanager endpoints and
+Flink/Cassandra CR status) for the paasta-api server.
+
+The first request for a given status is answered synchronously, and registers
+it with the poller. From then on, a background thread refreshes it every
+`interval` seconds (with some jitter, so that statuses requested together are
+not all refreshed together) for as long as somebody keeps asking for it, and
+requests are answered from memory along with how old the answer is.
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+log = logging.getLogger(__name__)
+
+JITTER = 0.2
+
+
+class PolledStatus(NamedTuple):
+    value: Any
+    fetched_at: float
+
+
+class StatusPoller:
+    def __init__(
+        self,
+        interval: float,
+        max_workers: int = 8,
+        idle_timeout: float = 300,
+    ) -> None:
+        """
+        :param interval: how often to refresh each status, in seconds
+        :param max_workers: how many statuses to refresh concurrently
+        :param idle_timeout: stop refreshing a status nobody asked for in this long
+        """
+        self.interval = interval
+        # past this, a status is too stale to serve, e.g. because refreshing it
+        # keeps failing: fetch it again synchronously (and surface any error)
+        self.max_age = 2 * interval
+        self.idle_timeout = idle_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="status-poller"
+        )
+        self._lock = threading.Lock()
+        self._statuses: Dict[Hashable, PolledStatus] = {}
+        self._fetchers: Dict[Hashable, Callable[[], Any]] = {}
+        self._last_requested: Dict[Hashable, float] = {}
+        self._next_refresh: Dict[Hashable, float] = {}
+        self._in_flight: Set[Hashable] = set()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, key: Hashable, fetch: Callable[[], Any]) -> Tuple[Any, float]:
+        """Return the status for key, and its age in seconds.
+
+        :param key: identifies the status, e.g. ("flink", service, instance, "overview")
+        :param fetch: looks the status up; called here on a miss, and in the
+            background to refresh it afterwards
+        """
+        now = time.time()
+        with self._lock:
+            self._fetchers[key] = fetch
+            self._last_requested[key] = now
+            polled = self._statuses.get(key)
+        if polled is not None and now - polled.fetched_at <= self.max_age:
+            return polled.value, now - polled.fetched_at
+
+        value = fetch()
+        self._store(key, value, now)
+        return value, 0.0
+
+    def _store(self, key: Hashable, value: Any, fetched_at: float) -> None:
+        with self._lock:
+            self._statuses[key] = PolledStatus(value, fetched_at)
+            self._next_refresh[key] = fetched_at + self.interval * random.uniform(
+                1 - JITTER, 1 + JITTER
+            )
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Any]) -> None:
+        try:
+            fetched_at = time.time()
+            self._store(key, fetch(), fetched_at)
+        except Exception:
+            # keep the previous status: it will go stale, and the next request
+            # will then fetch it synchronously and get the error
+            log.warning(f"Unable to refresh status for {key}", exc_info=True)
+            with self._lock:
+                self._next_refresh[key] = time.time() + self.interval
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+    def refresh_due(self) -> int:
+        """Schedule a refresh of the statuses that are due one, and forget the
+        ones nobody asked for in a while.
+
+        :returns: how many refreshes were scheduled
+        """
+        now = time.time()
+        to_refresh = []
+        with self._lock:
+            for key, last_requested in list(self._last_requested.items()):
+                if now - last_requested > self.idle_timeout:
+                    for mapping in (
+                        self._statuses,
+                        self._fetchers,
+                        self._last_requested,
+                        self._next_refresh,
+                    ):
+                        mapping.pop(key, None)
+                elif self._next_refresh.get(key, 0) <= now and (
+                    key not in self._in_flight
+                ):
+                    self._in_flight.add(key)
+                    to_refresh.append((key, self._fetchers[key]))
+        for key, fetch in to_refresh:
+            self._executor.submit(self._refresh, key, fetch)
+        return len(to_refresh)
+
+    def _run(self) -> None:
+        tick = min(1.0, self.interval / 4)
+        while not self._stopped.wait(tick):
+            try:
+                self.refresh_due()
+            except Exception:
+                log.exception("Error while scheduling status refreshes")
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="status-poller", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._executor.shutdown(wait=False)
@@ -15,24 +15,18 @@
 """
 PaaSTA service list (instances) etc.
 """
-import json
 import logging
 from datetime import datetime
 from datetime import timezone
-from typing import Tuple
 
-from kubernetes.client import V1ConfigMap
 from pyramid.response import Response
 from pyramid.view import view_config
 
 from paasta_tools.api import settings
 from paasta_tools.api.views.exception import ApiFailure
 from paasta_tools.cli.utils import get_instance_config
-from paasta_tools.kubernetes_tools import AUTOSCALING_OVERRIDES_CONFIGMAP_NAME
-from paasta_tools.kubernetes_tools import AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE
+from paasta_tools.kubernetes.autoscaling_overrides import AutoscalingOverridesStore
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
-from paasta_tools.kubernetes_tools import get_or_create_namespaced_configmap
-from paasta_tools.kubernetes_tools import patch_namespaced_configmap
 
 log = logging.getLogger(__name__)
 
@@ -113,12 +107,12 @@ def update_autoscaler_count(request):
     return Response(json_body=response_body, status_code=202)
 
 
-def get_or_create_autoscaling_overrides_configmap() -> Tuple[V1ConfigMap, bool]:
-    return get_or_create_namespaced_configmap(
-        AUTOSCALING_OVERRIDES_CONFIGMAP_NAME,
-        namespace=AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE,
-        kube_client=settings.kubernetes_client,
-    )
+def get_autoscaling_overrides_store() -> AutoscalingOverridesStore:
+    if settings.autoscaling_overrides_store is None:
+        settings.autoscaling_overrides_store = AutoscalingOverridesStore(
+            settings.kubernetes_client
+        )
+    return settings.autoscaling_overrides_store
 
 
 @view_config(
@@ -178,70 +172,53 @@ def set_autoscaling_override(request):
     if instance_config.is_autoscaling_enabled() is None:
         raise ApiFailure(f"Autoscaling is not enabled for {service}.{instance}", 400)
 
-    configmap, created = get_or_create_autoscaling_overrides_configmap()
-    if created:
-        log.info("Created new autoscaling overrides ConfigMap")
-    # i dunno why this is necessary, but a newly created configmap doesn't have a data field
-    # even when we set it in the create call
-    if not configmap.data:
-        configmap.data = {}
-
     service_instance = f"{service}.{instance}"
-    existing_overrides = (
-        json.loads(configmap.data[service_instance])
-        if service_instance in configmap.data
-        else {}
-    )
 
-    # this is slightly funky as there's a hierarchy of what value to pick:
-    # 1. the override value provided in the request - as this should override any existing value
-    # 2. the existing override value in the configmap - this is used if we previously only set an override for min or
-    #    max instances and now want to set a value for the other
-    # 3. the value from the instance config - this is used as a final fallback since this means no override is present
-    min_instances = (
-        min_instances_override
-        or existing_overrides.get("min_instances")
-        or instance_config.get_min_instances()
-    )
-    max_instances = (
-        max_instances_override
-        or existing_overrides.get("max_instances")
-        or instance_config.get_max_instances()
-    )
-
-    # NOTE: the max_instances check is unnecessary here, but type-checkers can't see that the is_autoscaling_enabled()
-    # check above ensures that max_instances is not None
-    if max_instances is None or max_instances < min_instances:
-        raise ApiFailure(
-            f"min_instances ({min_instances_override}) cannot be greater than max_instances ({max_instances})",
-            400,
+    def merge_overrides(existing_overrides):
+        existing_overrides = existing_overrides or {}
+
+        # this is slightly funky as there's a hierarchy of what value to pick:
+        # 1. the override value provided in the request - as this should override any existing value
+        # 2. the existing override value in the configmap - this is used if we previously only set an override for min
+        #    or max instances and now want to set a value for the other
+        # 3. the value from the instance config - this is used as a final fallback since this means no override is
+        #    present
+        min_instances = (
+            min_instances_override
+            or existing_overrides.get("min_instances")
+            or instance_config.get_min_instances()
+        )
+        max_instances = (
+            max_instances_override
+            or existing_overrides.get("max_instances")
+            or instance_config.get_max_instances()
         )
 
-    override_data = {
-        "min_instances": min_instances_override,
-        "max_instances": max_instances_override,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "expire_after": expire_after,
-    }
+        # NOTE: the max_instances check is unnecessary here, but type-checkers can't see that the
+        # is_autoscaling_enabled() check above ensures that max_instances is not None
+        if max_instances is None or max_instances < min_instances:
+            raise ApiFailure(
+                f"min_instances ({min_instances_override}) cannot be greater than max_instances ({max_instances})",
+                400,
+            )
 
-    # NOTE: we need to strip out null values from the incoming overrides since otherwise we'd remove existing overrides
-    # (since if only --set-min or --set-max is provided, the other will be sent as None)
-    merged_overrides = {
-        **existing_overrides,
-        **{k: v for k, v in override_data.items() if v is not None},
-    }
-    serialized_overrides = json.dumps(merged_overrides)
-
-    # note: we can only append with patching - if we ever want to remove overrides outside of the cleanup cronjob,
-    # we would need to change this to use replace_namespaced_configmap
-    patch_namespaced_configmap(
-        name=AUTOSCALING_OVERRIDES_CONFIGMAP_NAME,
-        namespace=AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE,
-        # this should only update the single entry for the $service.$instance key
-        # ain't k8s grand?
-        body={"data": {service_instance: serialized_overrides}},
-        kube_client=settings.kubernetes_client,
-    )
+        override_data = {
+            "min_instances": min_instances_override,
+            "max_instances": max_instances_override,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "expire_after": expire_after,
+        }
+
+        # NOTE: we need to strip out null values from the incoming overrides since otherwise we'd remove existing
+        # overrides (since if only --set-min or --set-max is provided, the other will be sent as None)
+        return {
+            **existing_overrides,
+            **{k: v for k, v in override_data.items() if v is not None},
+        }
+
+    # this only patches the entry for the $service.$instance key (along with those of any other overrides being set
+    # at the same time), and recomputes it if the entry changed since we last read it
+    get_autoscaling_overrides_store().update(service_instance, merge_overrides)
 
     response_body = {
         "service": service,
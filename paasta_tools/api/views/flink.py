@@ -15,13 +15,33 @@
 """
 PaaSTA flink service list jobs, overview and config.
 """
+from functools import partial
+from typing import Any
+from typing import Mapping
+
 from pyramid.view import view_config
 
+from paasta_tools.api import settings
 from paasta_tools.api.views.exception import ApiFailure
 from paasta_tools.flink_tools import cr_id
 from paasta_tools.flink_tools import curl_flink_endpoint
 
 
+def get_flink_endpoint(
+    request: Any, service: str, instance: str, endpoint: str
+) -> Mapping[str, Any]:
+    """curl_flink_endpoint, served from the status poller if it is enabled, in
+    which case the Age header says how old the response is."""
+    fetch = partial(curl_flink_endpoint, cr_id(service, instance), endpoint)
+    if settings.status_poller is None:
+        return fetch()
+    response, age = settings.status_poller.get(
+        ("flink", service, instance, endpoint), fetch
+    )
+    request.response.headers["Age"] = str(int(age))
+    return response
+
+
 @view_config(
     route_name="flink.service.instance.jobs", request_method="GET", renderer="json"
 )
@@ -29,7 +49,7 @@ def list_flink_cluster_jobs(request):
     service = request.swagger_data.get("service")
     instance = request.swagger_data.get("instance")
     try:
-        return curl_flink_endpoint(cr_id(service, instance), "jobs")
+        return get_flink_endpoint(request, service, instance, "jobs")
     except ValueError as e:
         raise ApiFailure(e, 500)
 
@@ -44,7 +64,7 @@ def get_flink_cluster_job_details(request):
     instance = request.swagger_data.get("instance")
     job_id = request.swagger_data.get("job_id")
     try:
-        return curl_flink_endpoint(cr_id(service, instance), f"jobs/{job_id}")
+        return get_flink_endpoint(request, service, instance, f"jobs/{job_id}")
     except ValueError as e:
         raise ApiFailure(e, 500)
 
@@ -59,8 +79,8 @@ def get_flink_cluster_job_checkpoints(request):
     instance = request.swagger_data.get("instance")
     job_id = request.swagger_data.get("job_id")
     try:
-        return curl_flink_endpoint(
-            cr_id(service, instance), f"jobs/{job_id}/checkpoints"
+        return get_flink_endpoint(
+            request, service, instance, f"jobs/{job_id}/checkpoints"
         )
     except ValueError as e:
         raise ApiFailure(e, 500)
@@ -73,7 +93,7 @@ def get_flink_cluster_overview(request):
     service = request.swagger_data.get("service")
     instance = request.swagger_data.get("instance")
     try:
-        return curl_flink_endpoint(cr_id(service, instance), "overview")
+        return get_flink_endpoint(request, service, instance, "overview")
     except ValueError as e:
         raise ApiFailure(e, 500)
 
@@ -85,6 +105,6 @@ def get_flink_cluster_config(request):
     service = request.swagger_data.get("service")
     instance = request.swagger_data.get("instance")
     try:
-        return curl_flink_endpoint(cr_id(service, instance), "config")
+        return get_flink_endpoint(request, service, instance, "config")
     except ValueError as e:
         raise ApiFailure(e, 500)
@@ -36,6 +36,7 @@ from paasta_tools.api.views.exception import ApiFailure
 from paasta_tools.async_utils import run_sync
 from paasta_tools.cli.cmds.status import get_actual_deployments
 from paasta_tools.instance import kubernetes as pik
+from paasta_tools.kubernetes_tools import KubernetesDeployStatus
 from paasta_tools.mesos_tools import get_all_frameworks as get_all_mesos_frameworks
 from paasta_tools.utils import PAASTA_K8S_INSTANCE_TYPES
 from paasta_tools.utils import DeploymentVersion
@@ -308,7 +309,11 @@ def bounce_status(request):
 
     try:
         return pik.bounce_status(
-            service, instance, settings, is_eks=(instance_type == "eks")
+            service,
+            instance,
+            settings,
+            is_eks=(instance_type == "eks"),
+            bounce_tracker=settings.bounce_tracker,
         )
     except NoConfigurationForServiceError:
         # Handle race condition where instance has been removed since the above validation
@@ -332,6 +337,41 @@ def bounce_status(request):
         raise ApiFailure(error_message, 500)
 
 
+@view_config(route_name="bounces.list", request_method="GET", renderer="json")
+def list_bounces(request):
+    bounce_tracker = settings.bounce_tracker
+    if bounce_tracker is None:
+        raise ApiFailure("Bounce tracking is not enabled on this paasta-api", 501)
+    if not bounce_tracker.synced:
+        raise ApiFailure(
+            "Bounce tracking is not in sync with the cluster yet. Please try again.",
+            503,
+        )
+    return {
+        "bounces": [
+            {
+                "namespace": progress.namespace,
+                "service": progress.service,
+                "instance": progress.instance,
+                "desired_replicas": progress.desired_replicas,
+                "ready_replicas": progress.ready_replicas,
+                "updated_replicas": progress.updated_replicas,
+                "new_version_replicas": progress.new_version_replicas,
+                "old_version_replicas": progress.old_version_replicas,
+                "deploy_status": KubernetesDeployStatus.tostring(
+                    progress.deploy_status
+                ),
+                "app_count": len(progress.active_versions),
+                "active_versions": sorted(
+                    (version.sha, version.image_version, config_sha)
+                    for version, config_sha in progress.active_versions
+                ),
+            }
+            for progress in bounce_tracker.in_flight()
+        ]
+    }
+
+
 def add_executor_info(task):
     task._Task__items["executor"] = run_sync(task.executor).copy()
     task._Task__items["executor"].pop("tasks", None)
@@ -63,6 +63,7 @@ def view_remote_run_poll(request):
     job_name = request.swagger_data["job_name"]
     user = request.swagger_data["user"]
     is_toolbox = request.swagger_data.get("toolbox", False)
+    wait = request.swagger_data.get("wait") or 0
     try:
         return remote_run_ready(
             service=service,
@@ -71,6 +72,7 @@ def view_remote_run_poll(request):
             job_name=job_name,
             user=user,
             is_toolbox=is_toolbox,
+            wait=wait,
         )
     except Exception:
         error_message = traceback.format_exc()
@@ -1,3 +1,6 @@
+import math
+from array import array
+
 from paasta_tools.autoscaling.utils import get_autoscaling_component
 from paasta_tools.autoscaling.utils import register_autoscaling_component
 from paasta_tools.long_running_service_tools import (
@@ -24,8 +27,110 @@ def current_value_forecast_policy(historical_load, **kwargs):
     return historical_load[-1][1]
 
 
+class HistoricalLoad:
+    """A bounded history of (timestamp, value)s, for callers that keep forecasting from the same, growing history.
+
+    The datapoints are kept in a ring buffer of two float arrays, oldest first, so appending is O(1) and finding the
+    datapoints of a time window is a binary search rather than a scan of the whole history. Timestamps must be
+    appended in non-decreasing order.
+
+    It can be passed wherever forecast policies take a list of (timestamp, value)s.
+    """
+
+    def __init__(self, capacity, datapoints=()):
+        """
+        :param capacity: how many datapoints to keep; appending more forgets the oldest ones.
+        :param datapoints: (timestamp, value)s to start with.
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, not {capacity}")
+        self.capacity = capacity
+        self._timestamps = array("d", [0.0]) * capacity
+        self._values = array("d", [0.0]) * capacity
+        self._start = 0
+        self._length = 0
+        for timestamp, value in datapoints:
+            self.append(timestamp, value)
+
+    def __len__(self):
+        return self._length
+
+    def _position(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("HistoricalLoad index out of range")
+        return (self._start + index) % self.capacity
+
+    def __getitem__(self, index):
+        position = self._position(index)
+        return self._timestamps[position], self._values[position]
+
+    def __iter__(self):
+        for index in range(self._length):
+            position = (self._start + index) % self.capacity
+            yield self._timestamps[position], self._values[position]
+
+    def append(self, timestamp, value):
+        if self._length and timestamp < self[-1][0]:
+            raise ValueError(
+                f"Timestamps must not decrease: {timestamp} is older than {self[-1][0]}"
+            )
+        if self._length < self.capacity:
+            position = (self._start + self._length) % self.capacity
+            self._length += 1
+        else:
+            position = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._timestamps[position] = timestamp
+        self._values[position] = value
+
+    def _bisect_left(self, timestamp):
+        """Index of the first datapoint at or after timestamp."""
+        low, high = 0, self._length
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamps[(self._start + middle) % self.capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _bisect_right(self, timestamp):
+        """Index of the first datapoint after timestamp."""
+        low, high = 0, self._length
+        while low < high:
+            middle = (low + high) // 2
+            if timestamp < self._timestamps[(self._start + middle) % self.capacity]:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def window(self, window_begin, window_end):
+        """The timestamps and values of the datapoints between window_begin and window_end, inclusive, as two arrays."""
+        first = self._bisect_left(window_begin)
+        last = self._bisect_right(window_end)
+        if first >= last:
+            return array("d"), array("d")
+        begin = (self._start + first) % self.capacity
+        count = last - first
+        if begin + count <= self.capacity:
+            return (
+                self._timestamps[begin : begin + count],
+                self._values[begin : begin + count],
+            )
+        wrapped = begin + count - self.capacity
+        return (
+            self._timestamps[begin:] + self._timestamps[:wrapped],
+            self._values[begin:] + self._values[:wrapped],
+        )
+
+
 def window_historical_load(historical_load, window_begin, window_end):
     """Filter historical_load down to just the datapoints lying between times window_begin and window_end, inclusive."""
+    if isinstance(historical_load, HistoricalLoad):
+        return list(zip(*historical_load.window(window_begin, window_end)))
     filtered = []
     for timestamp, value in historical_load:
         if timestamp >= window_begin and timestamp <= window_end:
@@ -39,6 +144,21 @@ def trailing_window_historical_load(historical_load, window_size):
     return window_historical_load(historical_load, window_begin, window_end)
 
 
+def trailing_window_series(historical_load, window_size):
+    """Like trailing_window_historical_load, but return the timestamps and the values of the window separately."""
+    window_end, _ = historical_load[-1]
+    window_begin = window_end - window_size
+    if isinstance(historical_load, HistoricalLoad):
+        return historical_load.window(window_begin, window_end)
+    times = []
+    loads = []
+    for timestamp, value in historical_load:
+        if timestamp >= window_begin and timestamp <= window_end:
+            times.append(timestamp)
+            loads.append(value)
+    return times, loads
+
+
 @register_autoscaling_component("moving_average", FORECAST_POLICY_KEY)
 def moving_average_forecast_policy(
     historical_load,
@@ -48,11 +168,10 @@ def moving_average_forecast_policy(
     """Does a simple average of all historical load data points within the moving average window. Weights all data
     points within the window equally."""
 
-    windowed_data = trailing_window_historical_load(
+    _, windowed_values = trailing_window_series(
         historical_load, moving_average_window_seconds
     )
-    windowed_values = [value for timestamp, value in windowed_data]
-    return sum(windowed_values) / len(windowed_values)
+    return math.fsum(windowed_values) / len(windowed_values)
 
 
 @register_autoscaling_component("linreg", FORECAST_POLICY_KEY)
@@ -77,18 +196,15 @@ def linreg_forecast_policy(
 
     """
 
-    window = trailing_window_historical_load(historical_load, linreg_window_seconds)
+    times, loads = trailing_window_series(historical_load, linreg_window_seconds)
 
-    loads = [load for timestamp, load in window]
-    times = [timestamp for timestamp, load in window]
+    mean_time = math.fsum(times) / len(times)
+    mean_load = math.fsum(loads) / len(loads)
 
-    mean_time = sum(times) / len(times)
-    mean_load = sum(loads) / len(loads)
-
-    if len(window) > 1:
-        slope = sum((t - mean_time) * (l - mean_load) for t, l in window) / sum(
-            (t - mean_time) ** 2 for t in times
-        )
+    if len(times) > 1:
+        slope = math.fsum(
+            (t - mean_time) * (l - mean_load) for t, l in zip(times, loads)
+        ) / math.fsum((t - mean_time) ** 2 for t in times)
     else:
         slope = linreg_default_slope
 
@@ -103,3 +219,119 @@ def linreg_forecast_policy(
     now, _ = historical_load[-1]
     forecasted_values = [predict(now + delta) for delta in linreg_extrapolation_seconds]
     return max(forecasted_values)
+
+
+# datapoints older than this many half-lives weigh less than 0.1% in an EWMA
+EWMA_HORIZON_HALF_LIVES = 10
+
+
+@register_autoscaling_component("ewma", FORECAST_POLICY_KEY)
+def ewma_forecast_policy(
+    historical_load,
+    ewma_half_life_seconds=DEFAULT_UWSGI_AUTOSCALING_MOVING_AVERAGE_WINDOW,
+    **kwargs,
+):
+    """An exponentially weighted moving average of the historical load: a datapoint's weight halves every
+    ewma_half_life_seconds. Unlike moving_average, this reacts to recent changes in load faster than to old ones, and
+    doesn't jump when a datapoint leaves the window.
+
+    :param ewma_half_life_seconds: How long it takes for a datapoint's weight to halve.
+    """
+    if ewma_half_life_seconds <= 0:
+        return current_value_forecast_policy(historical_load)
+
+    times, loads = trailing_window_series(
+        historical_load, EWMA_HORIZON_HALF_LIVES * ewma_half_life_seconds
+    )
+    average = loads[0]
+    previous_time = times[0]
+    for timestamp, load in zip(times, loads):
+        # timestamps need not be evenly spaced, so the decay depends on how long it has been since the last datapoint
+        decay = 0.5 ** ((timestamp - previous_time) / ewma_half_life_seconds)
+        average = decay * average + (1 - decay) * load
+        previous_time = timestamp
+    return average
+
+
+@register_autoscaling_component("holt_winters", FORECAST_POLICY_KEY)
+def holt_winters_forecast_policy(
+    historical_load,
+    holt_winters_window_seconds,
+    holt_winters_extrapolation_seconds,
+    holt_winters_alpha=0.5,
+    holt_winters_beta=0.1,
+    holt_winters_gamma=0.1,
+    holt_winters_season_length=0,
+    **kwargs,
+):
+    """Additive Holt-Winters (triple exponential smoothing) over the load data within the last
+    holt_winters_window_seconds: tracks the level of the load, its trend and, optionally, its seasonality, and
+    extrapolates them like linreg does, returning the maximum of the predicted values.
+
+    The datapoints are assumed to be roughly evenly spaced, as seasons are measured in datapoints.
+
+    :param holt_winters_window_seconds: Consider all data from this many seconds ago until now.
+    :param holt_winters_extrapolation_seconds: A number, or list of numbers, of seconds in the future at which to
+                                               predict the load. The highest prediction will be returned.
+    :param holt_winters_alpha: Smoothing factor of the level, between 0 and 1.
+    :param holt_winters_beta: Smoothing factor of the trend, between 0 and 1.
+    :param holt_winters_gamma: Smoothing factor of the seasonality, between 0 and 1.
+    :param holt_winters_season_length: Number of datapoints in a season. Seasonality is ignored if this is 0, or if the
+                                       window doesn't hold at least two seasons (Holt's linear trend method).
+    """
+    times, loads = trailing_window_series(historical_load, holt_winters_window_seconds)
+    if isinstance(holt_winters_extrapolation_seconds, (int, float)):
+        holt_winters_extrapolation_seconds = [holt_winters_extrapolation_seconds]
+    if len(loads) == 1:
+        return loads[0]
+
+    season_length = holt_winters_season_length
+    if season_length > 0 and len(loads) >= 2 * season_length:
+        first_season = math.fsum(loads[:season_length]) / season_length
+        second_season = (
+            math.fsum(loads[season_length : 2 * season_length]) / season_length
+        )
+        level = first_season
+        trend = (second_season - first_season) / season_length
+        seasonals = [load - first_season for load in loads[:season_length]]
+    else:
+        season_length = 0
+        level = loads[0]
+        trend = loads[1] - loads[0]
+        seasonals = []
+
+    for index, load in enumerate(loads):
+        if season_length:
+            seasonal = seasonals[index % season_length]
+            previous_level = level
+            level = holt_winters_alpha * (load - seasonal) + (
+                1 - holt_winters_alpha
+            ) * (level + trend)
+            trend = (
+                holt_winters_beta * (level - previous_level)
+                + (1 - holt_winters_beta) * trend
+            )
+            seasonals[index % season_length] = (
+                holt_winters_gamma * (load - level)
+                + (1 - holt_winters_gamma) * seasonal
+            )
+        elif index > 0:
+            previous_level = level
+            level = holt_winters_alpha * load + (1 - holt_winters_alpha) * (
+                level + trend
+            )
+            trend = (
+                holt_winters_beta * (level - previous_level)
+                + (1 - holt_winters_beta) * trend
+            )
+
+    step = (times[-1] - times[0]) / (len(times) - 1)
+
+    def predict(delta):
+        steps = delta / step if step > 0 else 0
+        prediction = level + steps * trend
+        if season_length:
+            prediction += seasonals[(len(loads) + round(steps) - 1) % season_length]
+        return prediction
+
+    return max(predict(delta) for delta in holt_winters_extrapolation_seconds)
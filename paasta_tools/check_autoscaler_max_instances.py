@@ -2,25 +2,41 @@
 import argparse
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Sequence
+from typing import Tuple
 from typing import Type
 
 import pysensu_yelp
+from kubernetes.client import V2HorizontalPodAutoscaler
 
 from paasta_tools.eks_tools import EksDeploymentConfig
 from paasta_tools.instance import kubernetes as pik
+from paasta_tools.instance.kubernetes import KubernetesAutoscalingStatusDict
 from paasta_tools.kubernetes_tools import KubeClient
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
+from paasta_tools.kubernetes_tools import get_all_hpas
 from paasta_tools.kubernetes_tools import get_kubernetes_app_name
 from paasta_tools.metrics.metastatus_lib import suffixed_number_value
 from paasta_tools.monitoring_tools import send_event
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
 from paasta_tools.utils import DEFAULT_SOA_DIR
+from paasta_tools.utils import MonitoringDict
 from paasta_tools.utils import SystemPaastaConfig
 from paasta_tools.utils import list_services
 from paasta_tools.utils import load_system_paasta_config
 
 log = logging.getLogger(__name__)
 
+# How many services to load and check at once.
+MAX_CONCURRENT_SERVICES = 16
+# How many Sensu events to send at once.
+SENSU_EVENT_BATCH_SIZE = 50
+
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -46,150 +62,254 @@ def parse_args():
     return parser.parse_args()
 
 
-async def check_max_instances(
-    soa_dir: str,
-    cluster: str,
-    instance_type_class: Type[KubernetesDeploymentConfig],
-    system_paasta_config: SystemPaastaConfig,
-    dry_run: bool = False,
-):
-    kube_client = KubeClient()
-    for service in list_services(soa_dir=soa_dir):
-        service_config = PaastaServiceConfigLoader(service=service, soa_dir=soa_dir)
-        for job_config in service_config.instance_configs(
-            cluster=cluster, instance_type_class=instance_type_class
+class MaxInstancesEvent(NamedTuple):
+    service: str
+    instance: str
+    overrides: MonitoringDict
+    status: int
+    output: str
+
+
+def get_hpas_by_namespace_and_name(
+    kube_client: KubeClient,
+) -> Dict[Tuple[str, str], V2HorizontalPodAutoscaler]:
+    return {
+        (hpa.metadata.namespace, hpa.metadata.name): hpa
+        for hpa in get_all_hpas(kube_client)
+    }
+
+
+def check_instance(
+    job_config: KubernetesDeploymentConfig,
+    autoscaling_status: KubernetesAutoscalingStatusDict,
+) -> Tuple[int, str]:
+    service = job_config.get_service()
+    instance = job_config.get_instance()
+    if (
+        autoscaling_status["min_instances"] == autoscaling_status["max_instances"]
+    ) and "canary" in instance:
+        status = pysensu_yelp.Status.OK
+        output = (
+            f"Not checking {service}.{instance} as the instance name contains"
+            ' "canary" and min_instances == max_instances.'
+        )
+    elif autoscaling_status["desired_replicas"] >= autoscaling_status["max_instances"]:
+
+        metrics_provider_configs = job_config.get_autoscaling_params()[
+            "metrics_providers"
+        ]
+
+        status = pysensu_yelp.Status.UNKNOWN
+        output = "how are there no metrics for this thing?"
+
+        # This makes an assumption that the metrics currently used by the HPA are exactly the same order (and
+        # length) as the list of metrics_providers dictionaries. This should generally be true, but between
+        # yelpsoa-configs being pushed and the HPA actually being updated it may not be true. This might cause
+        # spurious alerts, but hopefully the frequency is low. We can add some safeguards if it's a problem.
+        # (E.g. smarter matching between the status dicts and the config dicts, or bailing/not alerting if the
+        # lists aren't the same lengths.)
+        for metric, metrics_provider_config in zip(
+            autoscaling_status["metrics"], metrics_provider_configs
         ):
-            instance = job_config.get_instance()
-            if not job_config.get_autoscaling_metric_spec(
-                name=get_kubernetes_app_name(service, instance),
-                cluster=cluster,
-                kube_client=kube_client,
-                namespace=job_config.get_namespace(),
-            ):
-                # Not an instance that uses HPA, don't check.
-                # TODO: should we send status=0 here, in case someone disables autoscaling for their service / changes
-                # to bespoke autoscaler?
-                continue
-
-            if not job_config.get_docker_image():
-                # skip services that haven't been marked for deployment yet.
-                continue
-
-            autoscaling_status = await pik.autoscaling_status(
-                kube_client=kube_client,
-                job_config=job_config,
-                namespace=job_config.get_namespace(),
+
+            setpoint = metrics_provider_config["setpoint"]
+            threshold = metrics_provider_config.get(
+                "max_instances_alert_threshold",
+                setpoint,
             )
-            if autoscaling_status["min_instances"] == -1:
-                log.warning(
-                    f"HPA {job_config.get_sanitised_deployment_name()} not found."
-                )
-                continue
-
-            if (
-                autoscaling_status["min_instances"]
-                == autoscaling_status["max_instances"]
-            ) and "canary" in instance:
-                status = pysensu_yelp.Status.OK
-                output = (
-                    f"Not checking {service}.{instance} as the instance name contains"
-                    ' "canary" and min_instances == max_instances.'
-                )
-            elif (
-                autoscaling_status["desired_replicas"]
-                >= autoscaling_status["max_instances"]
-            ):
 
-                metrics_provider_configs = job_config.get_autoscaling_params()[
-                    "metrics_providers"
-                ]
+            try:
+                current_value = suffixed_number_value(metric["current_value"])
+                target_value = suffixed_number_value(metric["target_value"])
+            except KeyError:
+                # we likely couldn't find values for the current metric from autoscaling status
+                # if this is the only metric, we will return UNKNOWN+this error
+                # suggest fixing their autoscaling config
+                output = f'{service}.{instance}: Service is at max_instances, and there is an error fetching your {metrics_provider_config["type"]} metric. Check your autoscaling configs or reach out to #paasta.'
+            else:
+                # target_value can be 100*setpoint (for cpu), 1 (for uwsgi, piscina, gunicorn,
+                # active_requests), or setpoint (for promql).
+                # Here we divide current_value by target_value to find the ratio of utilization to setpoint,
+                # and then multiply by setpoint to find the actual utilization in the same units as setpoint.
+                utilization = setpoint * current_value / target_value
 
-                status = pysensu_yelp.Status.UNKNOWN
-                output = "how are there no metrics for this thing?"
-
-                # This makes an assumption that the metrics currently used by the HPA are exactly the same order (and
-                # length) as the list of metrics_providers dictionaries. This should generally be true, but between
-                # yelpsoa-configs being pushed and the HPA actually being updated it may not be true. This might cause
-                # spurious alerts, but hopefully the frequency is low. We can add some safeguards if it's a problem.
-                # (E.g. smarter matching between the status dicts and the config dicts, or bailing/not alerting if the
-                # lists aren't the same lengths.)
-                for metric, metrics_provider_config in zip(
-                    autoscaling_status["metrics"], metrics_provider_configs
-                ):
-
-                    setpoint = metrics_provider_config["setpoint"]
-                    threshold = metrics_provider_config.get(
-                        "max_instances_alert_threshold",
-                        setpoint,
+                if threshold == setpoint:
+                    threshold_description = f"setpoint ({threshold})"
+                else:
+                    threshold_description = (
+                        f"max_instances_alert_threshold ({threshold})"
                     )
 
-                    try:
-                        current_value = suffixed_number_value(metric["current_value"])
-                        target_value = suffixed_number_value(metric["target_value"])
-                    except KeyError:
-                        # we likely couldn't find values for the current metric from autoscaling status
-                        # if this is the only metric, we will return UNKNOWN+this error
-                        # suggest fixing their autoscaling config
-                        output = f'{service}.{instance}: Service is at max_instances, and there is an error fetching your {metrics_provider_config["type"]} metric. Check your autoscaling configs or reach out to #paasta.'
-                    else:
-                        # target_value can be 100*setpoint (for cpu), 1 (for uwsgi, piscina, gunicorn,
-                        # active_requests), or setpoint (for promql).
-                        # Here we divide current_value by target_value to find the ratio of utilization to setpoint,
-                        # and then multiply by setpoint to find the actual utilization in the same units as setpoint.
-                        utilization = setpoint * current_value / target_value
-
-                        if threshold == setpoint:
-                            threshold_description = f"setpoint ({threshold})"
-                        else:
-                            threshold_description = (
-                                f"max_instances_alert_threshold ({threshold})"
-                            )
-
-                        if utilization > threshold:
-                            status = pysensu_yelp.Status.CRITICAL
-                            output = (
-                                f"{service}.{instance}: Service is at max_instances, and"
-                                f" utilization ({utilization}) is greater than"
-                                f" {threshold_description}."
-                            )
-                        else:
-                            status = pysensu_yelp.Status.OK
-                            output = (
-                                f"{service}.{instance}: Service is at max_instances, but"
-                                f" utilization ({utilization}) is less than"
-                                f" {threshold_description}."
-                            )
-            else:
-                status = pysensu_yelp.Status.OK
-                output = f"{service}.{instance} is below max_instances."
-
-            monitoring_overrides = job_config.get_monitoring()
-            monitoring_overrides.update(
-                {
-                    "page": False,  # TODO: remove this line once this alert has been deployed for a little while.
-                    "runbook": "y/check-autoscaler-max-instances",
-                    "realert_every": 60,  # The check runs once a minute, so this would realert every hour.
-                    "tip": (
-                        "The autoscaler wants to scale up to handle additional load"
-                        " because your service is overloaded, but cannot scale any"
-                        " higher because of max_instances. You may want to bump"
-                        " max_instances. To make this alert quieter, adjust"
-                        " autoscaling.metrics_providers[n].max_instances_alert_threshold in yelpsoa-configs."
-                    ),
-                }
+                if utilization > threshold:
+                    status = pysensu_yelp.Status.CRITICAL
+                    output = (
+                        f"{service}.{instance}: Service is at max_instances, and"
+                        f" utilization ({utilization}) is greater than"
+                        f" {threshold_description}."
+                    )
+                else:
+                    status = pysensu_yelp.Status.OK
+                    output = (
+                        f"{service}.{instance}: Service is at max_instances, but"
+                        f" utilization ({utilization}) is less than"
+                        f" {threshold_description}."
+                    )
+    else:
+        status = pysensu_yelp.Status.OK
+        output = f"{service}.{instance} is below max_instances."
+
+    return status, output
+
+
+def check_service(
+    service: str,
+    soa_dir: str,
+    cluster: str,
+    instance_type_class: Type[KubernetesDeploymentConfig],
+    kube_client: KubeClient,
+    hpas: Mapping[Tuple[str, str], V2HorizontalPodAutoscaler],
+) -> List[MaxInstancesEvent]:
+    events = []
+    service_config = PaastaServiceConfigLoader(service=service, soa_dir=soa_dir)
+    for job_config in service_config.instance_configs(
+        cluster=cluster, instance_type_class=instance_type_class
+    ):
+        instance = job_config.get_instance()
+        if not job_config.get_autoscaling_metric_spec(
+            name=get_kubernetes_app_name(service, instance),
+            cluster=cluster,
+            kube_client=kube_client,
+            namespace=job_config.get_namespace(),
+        ):
+            # Not an instance that uses HPA, don't check.
+            # TODO: should we send status=0 here, in case someone disables autoscaling for their service / changes
+            # to bespoke autoscaler?
+            continue
+
+        if not job_config.get_docker_image():
+            # skip services that haven't been marked for deployment yet.
+            continue
+
+        autoscaling_status = pik.autoscaling_status_from_hpa(
+            hpas.get(
+                (job_config.get_namespace(), job_config.get_sanitised_deployment_name())
             )
-            send_event(
-                service,
-                check_name=f"check_autoscaler_max_instances.{service}.{instance}",
+        )
+        if autoscaling_status["min_instances"] == -1:
+            log.warning(f"HPA {job_config.get_sanitised_deployment_name()} not found.")
+            continue
+
+        status, output = check_instance(job_config, autoscaling_status)
+
+        monitoring_overrides = job_config.get_monitoring()
+        monitoring_overrides.update(
+            {
+                "page": False,  # TODO: remove this line once this alert has been deployed for a little while.
+                "runbook": "y/check-autoscaler-max-instances",
+                "realert_every": 60,  # The check runs once a minute, so this would realert every hour.
+                "tip": (
+                    "The autoscaler wants to scale up to handle additional load"
+                    " because your service is overloaded, but cannot scale any"
+                    " higher because of max_instances. You may want to bump"
+                    " max_instances. To make this alert quieter, adjust"
+                    " autoscaling.metrics_providers[n].max_instances_alert_threshold in yelpsoa-configs."
+                ),
+            }
+        )
+        events.append(
+            MaxInstancesEvent(
+                service=service,
+                instance=instance,
                 overrides=monitoring_overrides,
                 status=status,
                 output=output,
-                soa_dir=soa_dir,
-                ttl=None,
-                cluster=cluster,
-                system_paasta_config=system_paasta_config,
-                dry_run=dry_run,
             )
+        )
+    return events
+
+
+def send_events(
+    events: Sequence[MaxInstancesEvent],
+    soa_dir: str,
+    cluster: str,
+    system_paasta_config: SystemPaastaConfig,
+    dry_run: bool = False,
+) -> None:
+    def send(event: MaxInstancesEvent) -> None:
+        send_event(
+            event.service,
+            check_name=f"check_autoscaler_max_instances.{event.service}.{event.instance}",
+            overrides=event.overrides,
+            status=event.status,
+            output=event.output,
+            soa_dir=soa_dir,
+            ttl=None,
+            cluster=cluster,
+            system_paasta_config=system_paasta_config,
+            dry_run=dry_run,
+        )
+
+    # each event is its own request to the local sensu client: send a batch of
+    # them at a time, concurrently (but keep dry-run output readable)
+    with ThreadPoolExecutor(
+        max_workers=1 if dry_run else SENSU_EVENT_BATCH_SIZE
+    ) as executor:
+        for start in range(0, len(events), SENSU_EVENT_BATCH_SIZE):
+            list(executor.map(send, events[start : start + SENSU_EVENT_BATCH_SIZE]))
+
+
+async def check_max_instances(
+    soa_dir: str,
+    cluster: str,
+    instance_type_class: Type[KubernetesDeploymentConfig],
+    system_paasta_config: SystemPaastaConfig,
+    dry_run: bool = False,
+):
+    kube_client = KubeClient()
+    # one LIST for the whole cluster, rather than a GET per autoscaled instance
+    hpas = await asyncio.to_thread(get_hpas_by_namespace_and_name, kube_client)
+
+    loop = asyncio.get_running_loop()
+    pending: List[MaxInstancesEvent] = []
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SERVICES) as executor:
+        try:
+            for service_events in asyncio.as_completed(
+                [
+                    loop.run_in_executor(
+                        executor,
+                        check_service,
+                        service,
+                        soa_dir,
+                        cluster,
+                        instance_type_class,
+                        kube_client,
+                        hpas,
+                    )
+                    for service in list_services(soa_dir=soa_dir)
+                ]
+            ):
+                pending.extend(await service_events)
+                if len(pending) >= SENSU_EVENT_BATCH_SIZE:
+                    batch, pending = pending, []
+                    await asyncio.to_thread(
+                        send_events,
+                        batch,
+                        soa_dir,
+                        cluster,
+                        system_paasta_config,
+                        dry_run,
+                    )
+        finally:
+            # still send what we've already checked if a later service blows up
+            if pending:
+                await asyncio.to_thread(
+                    send_events,
+                    pending,
+                    soa_dir,
+                    cluster,
+                    system_paasta_config,
+                    dry_run,
+                )
 
 
 def main():
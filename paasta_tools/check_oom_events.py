@@ -14,8 +14,17 @@
 # limitations under the License.
 import argparse
 import json
+import os
 import sys
+import threading
 import time
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Set
+from typing import Tuple
 
 from pysensu_yelp import Status
 
@@ -89,11 +98,31 @@ def parse_args(args):
         action="store_true",
         help="Print Sensu alert events instead of sending them",
     )
+    parser.add_argument(
+        "--checkpoint",
+        dest="checkpoint",
+        default=None,
+        help=(
+            "Path of a file in which to keep the OOM events seen so far between runs. "
+            "Events are then counted even once they have scrolled out of the "
+            "lines read from the stream."
+        ),
+    )
+    parser.add_argument(
+        "--daemon",
+        dest="daemon",
+        action="store_true",
+        help=(
+            "Keep following the stream and send Sensu events every "
+            "--check-interval minutes instead of exiting after one check."
+        ),
+    )
     return parser.parse_args(args)
 
 
 def read_oom_events_from_scribe(cluster, superregion, num_lines=1000):
-    """Read the latest 'num_lines' lines from OOM_EVENTS_STREAM and iterate over them."""
+    """Read the latest 'num_lines' lines from OOM_EVENTS_STREAM and iterate over them.
+    If 'num_lines' is None, keep following the stream for new lines instead."""
     # paasta configs incls a map for cluster -> env that is expected by scribe
     log_reader_config = load_system_paasta_config().get_log_reader()
     cluster_map = log_reader_config["options"]["cluster_map"]
@@ -104,12 +133,13 @@ def read_oom_events_from_scribe(cluster, superregion, num_lines=1000):
     host, port = scribereader.get_tail_host_and_port(
         **scribe_env_to_locations(scribe_env),
     )
+    tailer_kwargs = {} if num_lines is None else {"lines": num_lines}
     stream = scribereader.get_stream_tailer(
         stream_name=OOM_EVENTS_STREAM,
         tailing_host=host,
         tailing_port=port,
-        lines=num_lines,
         superregion=superregion,
+        **tailer_kwargs,
     )
     try:
         for line in stream:
@@ -140,6 +170,127 @@ def latest_oom_events(cluster, superregion, interval=60):
     return res
 
 
+class OOMEventsWindow:
+    """The containers of each (service, instance) that got OOM-killed recently,
+    and when each of them was last killed.
+
+    Adding the same event twice is harmless, so overlapping reads of the stream
+    never double count a container.
+    """
+
+    def __init__(
+        self,
+        last_timestamp: int = 0,
+        containers: Optional[Dict[Tuple[str, str], Dict[str, int]]] = None,
+    ) -> None:
+        self.last_timestamp = last_timestamp
+        self.containers = containers if containers is not None else {}
+
+    def add(self, event: Mapping[str, Any]) -> None:
+        timestamp = event["timestamp"]
+        key = (event["service"], event["instance"])
+        instance_containers = self.containers.setdefault(key, {})
+        container_id = event.get("container_id", "")
+        instance_containers[container_id] = max(
+            instance_containers.get(container_id, timestamp), timestamp
+        )
+        self.last_timestamp = max(self.last_timestamp, timestamp)
+
+    def is_new(self, event: Mapping[str, Any]) -> bool:
+        """Whether the window doesn't know of event yet: anything newer than the
+        newest event seen is new, and older events only are if they arrived late
+        for a kill the window hasn't recorded."""
+        timestamp = event["timestamp"]
+        if timestamp > self.last_timestamp:
+            return True
+        known = self.containers.get((event["service"], event["instance"]), {}).get(
+            event.get("container_id", "")
+        )
+        return known is None or known < timestamp
+
+    def expire(self, start_timestamp: int) -> None:
+        """Forget about any container not killed after start_timestamp."""
+        for key in list(self.containers):
+            instance_containers = {
+                container_id: timestamp
+                for container_id, timestamp in self.containers[key].items()
+                if timestamp > start_timestamp
+            }
+            if instance_containers:
+                self.containers[key] = instance_containers
+            else:
+                del self.containers[key]
+
+    def victims(self, start_timestamp: int) -> Dict[Tuple[str, str], Set[str]]:
+        """
+        :returns: {(service, instance): {container_id, ...} }
+                  for the containers killed after start_timestamp
+        """
+        res = {}
+        for key, instance_containers in self.containers.items():
+            container_ids = {
+                container_id
+                for container_id, timestamp in instance_containers.items()
+                if timestamp > start_timestamp
+            }
+            if container_ids:
+                res[key] = container_ids
+        return res
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "last_timestamp": self.last_timestamp,
+            "containers": [
+                {"service": service, "instance": instance, "containers": containers}
+                for (service, instance), containers in self.containers.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> "OOMEventsWindow":
+        return cls(
+            last_timestamp=d["last_timestamp"],
+            containers={
+                (c["service"], c["instance"]): c["containers"] for c in d["containers"]
+            },
+        )
+
+
+def load_oom_events_window(path: str) -> OOMEventsWindow:
+    try:
+        with open(path) as f:
+            return OOMEventsWindow.from_dict(json.load(f))
+    except FileNotFoundError:
+        return OOMEventsWindow()
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Ignoring unreadable checkpoint {path}: {e}", file=sys.stderr)
+        return OOMEventsWindow()
+
+
+def save_oom_events_window(path: str, window: OOMEventsWindow) -> None:
+    # write to a temporary file first so that a crash never leaves a
+    # half-written checkpoint behind
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(window.to_dict(), f)
+    os.replace(tmp_path, path)
+
+
+def read_new_oom_events(
+    window: OOMEventsWindow,
+    events: Iterator[Mapping[str, Any]],
+    start_timestamp: int = 0,
+) -> int:
+    """Add to window the events it doesn't know of yet, skipping those from
+    before start_timestamp, and return how many were added."""
+    added = 0
+    for e in events:
+        if e["timestamp"] > start_timestamp and window.is_new(e):
+            window.add(e)
+            added += 1
+    return added
+
+
 def compose_sensu_status(
     instance, oom_events, is_check_enabled, alert_threshold, check_interval
 ):
@@ -218,13 +369,10 @@ def send_sensu_event(instance, oom_events, args):
     )
 
 
-def main(sys_argv):
-    args = parse_args(sys_argv[1:])
-    cluster = load_system_paasta_config().get_cluster()
-    victims = latest_oom_events(
-        cluster, args.superregion, interval=(60 * args.check_interval)
-    )
-
+def send_sensu_events(cluster, victims, args):
+    """
+    :param victims: {(service, instance): [OOMEvent, OOMEvent,...] }
+    """
     for (service, instance) in get_services_for_cluster(cluster, soa_dir=args.soa_dir):
         try:
             instance_config = get_instance_config(
@@ -240,5 +388,65 @@ def main(sys_argv):
             pass
 
 
+def run_daemon(cluster, args):
+    """Follow the stream on a background thread, and send Sensu events for the
+    last --check-interval minutes every --check-interval minutes."""
+    interval = 60 * args.check_interval
+    window = (
+        load_oom_events_window(args.checkpoint)
+        if args.checkpoint
+        else OOMEventsWindow()
+    )
+    lock = threading.Lock()
+
+    def follow_stream():
+        for e in read_oom_events_from_scribe(cluster, args.superregion, num_lines=None):
+            with lock:
+                window.add(e)
+
+    reader = threading.Thread(
+        target=follow_stream, name="oom-events-reader", daemon=True
+    )
+    reader.start()
+    while reader.is_alive():
+        time.sleep(interval)
+        start_timestamp = int(time.time()) - interval
+        with lock:
+            window.expire(start_timestamp)
+            victims = window.victims(start_timestamp)
+            if args.checkpoint:
+                save_oom_events_window(args.checkpoint, window)
+        send_sensu_events(cluster, victims, args)
+    print("Stopped following the OOM events stream, exiting.", file=sys.stderr)
+    sys.exit(1)
+
+
+def main(sys_argv):
+    args = parse_args(sys_argv[1:])
+    cluster = load_system_paasta_config().get_cluster()
+    if args.daemon:
+        run_daemon(cluster, args)
+        return
+
+    interval = 60 * args.check_interval
+    if args.checkpoint:
+        window = load_oom_events_window(args.checkpoint)
+        start_timestamp = int(time.time()) - interval
+        # the stream can't be read from an offset, so this re-reads its latest
+        # lines and only keeps the events that the checkpoint doesn't have yet
+        read_new_oom_events(
+            window,
+            read_oom_events_from_scribe(cluster, args.superregion),
+            start_timestamp,
+        )
+        window.expire(start_timestamp)
+        save_oom_events_window(args.checkpoint, window)
+        victims = window.victims(start_timestamp)
+    else:
+        victims = latest_oom_events(cluster, args.superregion, interval=interval)
+
+    send_sensu_events(cluster, victims, args)
+
+
 if __name__ == "__main__":
     main(sys.argv)
@@ -14,11 +14,13 @@
 import argparse
 import logging
 import sys
+import time
 from multiprocessing import Pool
 from os import cpu_count
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
 from typing import Sequence
@@ -140,7 +142,19 @@ def check_services_replication(
     service_instances_set = set(service_instances)
     replication_statuses: List[bool] = []
 
-    for service in list_services(soa_dir=soa_dir):
+    services: Iterable[str]
+    if service_instances_set:
+        # no need to load the configs of services we were not asked about
+        services = sorted(
+            {
+                service_instance.split(SPACER)[0]
+                for service_instance in service_instances_set
+            }
+        )
+    else:
+        services = list_services(soa_dir=soa_dir)
+
+    for service in services:
         service_config = PaastaServiceConfigLoader(service=service, soa_dir=soa_dir)
         for instance_config in service_config.instance_configs(
             cluster=cluster, instance_type_class=instance_type_class
@@ -207,6 +221,7 @@ def main(
 
     timer.start()
 
+    phase_start = time.time()
     if namespace:
         pods, nodes = get_kubernetes_pods_and_nodes(namespace=namespace)
         replication_checker = KubeSmartstackEnvoyReplicationChecker(
@@ -219,9 +234,15 @@ def main(
             nodes=nodes,
             system_paasta_config=system_paasta_config,
         )
+    log.info(
+        f"Fetched {len(pods)} pods and {len(nodes)} nodes in {time.time() - phase_start:.2f}s"
+    )
 
+    phase_start = time.time()
     pods_by_service_instance = group_pods_by_service_instance(pods)
+    log.info(f"Grouped pods by service instance in {time.time() - phase_start:.2f}s")
 
+    phase_start = time.time()
     count_under_replicated, total = check_services_replication(
         soa_dir=args.soa_dir,
         cluster=cluster,
@@ -232,6 +253,9 @@ def main(
         pods_by_service_instance=pods_by_service_instance,
         dry_run=args.dry_run,
     )
+    log.info(
+        f"Checked replication of {total} service instances in {time.time() - phase_start:.2f}s"
+    )
     pct_under_replicated = 0 if total == 0 else 100 * count_under_replicated / total
     if yelp_meteorite is not None:
         emit_cluster_replication_metrics(
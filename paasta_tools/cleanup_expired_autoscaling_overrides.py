@@ -1,5 +1,4 @@
 import argparse
-import json
 import logging
 import sys
 import time
@@ -8,11 +7,10 @@ from datetime import timezone
 
 from kubernetes.client.rest import ApiException
 
+from paasta_tools.kubernetes.autoscaling_overrides import AutoscalingOverridesStore
+from paasta_tools.kubernetes.autoscaling_overrides import get_expire_after
 from paasta_tools.kubernetes_tools import AUTOSCALING_OVERRIDES_CONFIGMAP_NAME
-from paasta_tools.kubernetes_tools import AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE
 from paasta_tools.kubernetes_tools import KubeClient
-from paasta_tools.kubernetes_tools import get_namespaced_configmap
-from paasta_tools.kubernetes_tools import replace_namespaced_configmap
 
 log = logging.getLogger(__name__)
 
@@ -45,85 +43,33 @@ def main():
     args = parse_args()
     setup_logging(args.verbose)
 
-    kube_client = KubeClient()
+    store = AutoscalingOverridesStore(KubeClient())
+    # we'll fix the comparison time to the start of the script execution
+    current_timestamp = time.time()
+    log.debug(f"Current timestamp: {current_timestamp}")
 
     try:
-        configmap = get_namespaced_configmap(
-            name=AUTOSCALING_OVERRIDES_CONFIGMAP_NAME,
-            namespace=AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE,
-            kube_client=kube_client,
-        )
+        # overrides are indexed by expiry time, so this doesn't look at unexpired ones
+        expired_entries = store.expired(current_timestamp, max_age=0)
     except ApiException as e:
-        if e.status == 404:
-            log.debug(
-                f"ConfigMap {AUTOSCALING_OVERRIDES_CONFIGMAP_NAME} not found, nothing to clean up"
-            )
-            sys.exit(0)
-        else:
-            log.error(f"Error retrieving ConfigMap: {e}")
-            sys.exit(1)
-
-    if configmap is None:
-        log.debug(
-            f"ConfigMap {AUTOSCALING_OVERRIDES_CONFIGMAP_NAME} not found, nothing to clean up"
-        )
-        sys.exit(0)
+        log.error(f"Error retrieving ConfigMap: {e}")
+        sys.exit(1)
 
-    if not configmap.data:
-        log.debug("ConfigMap has no data, nothing to clean up")
+    if not expired_entries:
+        log.info("No expired entries found")
         sys.exit(0)
 
-    current_timestamp = (
-        time.time()
-    )  # we'll fix the comparison time to the start of the script execution
-    expired_entries = []  # used just for logging
-    unexpired_data = {}  # used to replace the existing configmap data
-
-    log.debug(f"Current timestamp: {current_timestamp}")
-    for service_instance, override_json in configmap.data.items():
-        log.debug(f"Processing entry for {service_instance}")
-
-        try:
-            override_data = json.loads(override_json)
-        except json.JSONDecodeError:
-            log.exception(
-                f"Failed to parse JSON for {service_instance}, removing entry"
-            )
-            expired_entries.append(service_instance)
-            continue
-
-        if "expire_after" not in override_data:
+    for service_instance in expired_entries:
+        expire_after = get_expire_after(store.read()[service_instance])
+        if expire_after == float("-inf"):
             log.warning(
-                f"Entry for {service_instance} missing expire_after field, removing entry"
+                f"Entry for {service_instance} is not valid or has no expire_after field, removing entry"
             )
-            expired_entries.append(service_instance)
-            continue
-
-        try:
-            expire_after = float(override_data["expire_after"])
-        except (ValueError, TypeError):
-            log.exception(
-                f"Failed to parse expire_after for {service_instance}, removing entry"
-            )
-            expired_entries.append(service_instance)
-            continue
-
-        if current_timestamp > expire_after:
-            expire_datetime = datetime.fromtimestamp(expire_after, tz=timezone.utc)
-            log.debug(
-                f"Entry for {service_instance} expired at {expire_after} ({expire_datetime})"
-            )
-            expired_entries.append(service_instance)
         else:
             expire_datetime = datetime.fromtimestamp(expire_after, tz=timezone.utc)
             log.debug(
-                f"Entry for {service_instance} expires at {expire_after} ({expire_datetime}), keeping"
+                f"Entry for {service_instance} expired at {expire_after} ({expire_datetime})"
             )
-            unexpired_data[service_instance] = override_json
-
-    if not expired_entries:
-        log.info("No expired entries found")
-        sys.exit(0)
 
     if args.dry_run:
         log.info(
@@ -133,20 +79,14 @@ def main():
         sys.exit(0)
 
     try:
-        configmap.data = (
-            unexpired_data  # naughtily re-use the existing configmap object
-        )
-        replace_namespaced_configmap(  # NOTE: this is not a patch since you cannot currently remove entries in a patch
-            name=AUTOSCALING_OVERRIDES_CONFIGMAP_NAME,
-            namespace=AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE,
-            body=configmap,
-            kube_client=kube_client,
-        )
+        # this patches away just the expired entries, and checks that they're still
+        # expired against the version of the ConfigMap it patches
+        removed_entries = store.remove_expired(current_timestamp)
         log.info(
-            f"Successfully removed {len(expired_entries)} expired entries:\n "
-            + "\n ".join(expired_entries)
+            f"Successfully removed {len(removed_entries)} expired entries:\n "
+            + "\n ".join(removed_entries)
         )
-    except ApiException as e:
+    except (ApiException, ValueError) as e:
         log.error(f"Failed to update ConfigMap: {e}")
         sys.exit(1)
 
@@ -15,6 +15,9 @@
 # PYTHON_ARGCOMPLETE_OK
 """A command line tool for viewing information from the PaaSTA stack."""
 import argparse
+import functools
+import glob
+import json
 import logging
 import os
 import pkgutil
@@ -22,7 +25,9 @@ import subprocess
 import sys
 import warnings
 from typing import Any
+from typing import Dict
 from typing import List
+from typing import Set
 from typing import Tuple
 
 import argcomplete
@@ -65,7 +70,8 @@ class PrintsHelpOnErrorArgumentParser(argparse.ArgumentParser):
         sys.exit(1)
 
 
-def list_external_commands():
+@functools.lru_cache(maxsize=1)
+def list_external_commands() -> Set[str]:
     p = subprocess.check_output(["/bin/bash", "-p", "-c", "compgen -A command paasta-"])
     lines = p.decode("utf-8").strip().split("\n")
     return {line.replace("paasta-", "", 1) for line in lines}
@@ -213,6 +219,126 @@ def get_argparser(commands: list[str] | None = None) -> argparse.ArgumentParser:
     return parser
 
 
+COMPLETION_SPEC_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "paasta"
+)
+
+
+def get_completion_spec_path() -> str:
+    return os.path.join(
+        COMPLETION_SPEC_DIR, f"completion-spec-{paasta_tools.__version__}.json"
+    )
+
+
+def load_completion_spec() -> Dict[str, List[Dict[str, Any]]]:
+    """Load the cached completion spec for this version of paasta-tools.
+
+    The spec maps each subcommand to the arguments its parser accepts. It lets us
+    complete option names without importing the subcommand module (and with it
+    kubernetes, paastaapi, ...) on every <TAB>.
+    """
+    try:
+        with open(get_completion_spec_path()) as f:
+            spec = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if spec.get("version") != paasta_tools.__version__:
+        return {}
+    return spec.get("commands", {})
+
+
+def save_completion_spec(commands: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Atomically write the completion spec, dropping specs of other versions.
+
+    Failures are ignored: the cache is an optimization and completion still works
+    (slowly) without it.
+    """
+    path = get_completion_spec_path()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(COMPLETION_SPEC_DIR, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump({"version": paasta_tools.__version__, "commands": commands}, f)
+        os.replace(tmp_path, path)
+        for stale_path in glob.glob(
+            os.path.join(COMPLETION_SPEC_DIR, "completion-spec-*.json")
+        ):
+            if stale_path != path:
+                os.remove(stale_path)
+    except OSError:
+        pass
+
+
+def describe_subcommand_arguments(
+    parser: argparse.ArgumentParser, command: str
+) -> List[Dict[str, Any]]:
+    """Return a JSON-serializable description of the arguments of `command`."""
+    subparsers_action = next(
+        action
+        for action in parser._actions
+        if isinstance(action, argparse._SubParsersAction)
+    )
+    subparser = subparsers_action.choices[command]
+    return [
+        {
+            "option_strings": action.option_strings,
+            "dest": action.dest,
+            "nargs": action.nargs,
+            "help": action.help,
+        }
+        for action in subparser._actions
+    ]
+
+
+def get_argparser_from_spec(
+    command: str, arguments: List[Dict[str, Any]]
+) -> argparse.ArgumentParser:
+    """Build a parser for `command` that has the same arguments as the real one,
+    but without types, defaults or completers. Good enough to complete option names.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    subparsers = parser.add_subparsers(dest="command", metavar="")
+    subparser = subparsers.add_parser(command, add_help=False)
+    for argument in arguments:
+        kwargs: Dict[str, Any] = {"help": argument["help"]}
+        if argument["nargs"] == 0:
+            kwargs["action"] = "store_true"
+        else:
+            kwargs["nargs"] = argument["nargs"]
+        if argument["option_strings"]:
+            subparser.add_argument(
+                *argument["option_strings"], dest=argument["dest"], **kwargs
+            )
+        else:
+            subparser.add_argument(argument["dest"], **kwargs)
+    return parser
+
+
+def is_completing_option_name(comp_line: str, comp_point: int) -> bool:
+    current_word = comp_line[:comp_point].split(" ")[-1]
+    return current_word.startswith("-") and "=" not in current_word
+
+
+def get_completion_argparser(
+    command: str, comp_line: str, comp_point: int
+) -> argparse.ArgumentParser:
+    """Return the parser to hand to argcomplete when completing `command`.
+
+    Option names come from the on-disk spec; anything else (e.g. service or
+    cluster names) needs the real completers, so we build the full parser.
+    """
+    if not is_completing_option_name(comp_line, comp_point):
+        return get_argparser(commands=[command])
+
+    commands = load_completion_spec()
+    if command not in commands:
+        parser = get_argparser(commands=[command])
+        commands[command] = describe_subcommand_arguments(parser, command)
+        save_completion_spec(commands)
+        return parser
+    return get_argparser_from_spec(command, commands[command])
+
+
 def parse_args(argv):
     """Initialize autocompletion and configure the argument parser.
 
@@ -230,7 +356,11 @@ def parse_args(argv):
         # ...but we want to grab the subcommand since the
         # shell can handle tab-completing `paasta` :p
         if len(comp_words) >= 2 and comp_words[1] in PAASTA_SUBCOMMANDS:
-            parser = get_argparser(commands=[comp_words[1]])
+            parser = get_completion_argparser(
+                comp_words[1],
+                comp_line,
+                int(os.environ.get("COMP_POINT", len(comp_line))),
+            )
         else:
             parser = get_argparser(commands=[])
         argcomplete.autocomplete(parser)
@@ -25,10 +25,10 @@ import time
 import uuid
 from os import execlpe
 from random import randint
+from typing import TYPE_CHECKING
 from typing import Optional
 from urllib.parse import urlparse
 
-import boto3
 import requests
 from docker import errors
 from docker.api.client import APIClient
@@ -49,6 +49,7 @@ from paasta_tools.kubernetes_tools import KUBE_CONFIG_USER_PATH
 from paasta_tools.kubernetes_tools import KubeClient
 from paasta_tools.kubernetes_tools import get_kubernetes_secret_env_variables
 from paasta_tools.kubernetes_tools import get_kubernetes_secret_volumes
+from paasta_tools.lazy_imports import lazy_import
 from paasta_tools.long_running_service_tools import get_healthcheck_for_instance
 from paasta_tools.paasta_execute_docker_command import execute_in_container
 from paasta_tools.secret_tools import decrypt_secret_environment_variables
@@ -74,6 +75,14 @@ from paasta_tools.utils import list_services
 from paasta_tools.utils import load_system_paasta_config
 from paasta_tools.utils import validate_service_instance
 
+# boto3 is only needed when assuming an AWS role for the container
+if TYPE_CHECKING:
+    import boto3
+else:
+    boto3 = lazy_import("boto3")
+
+DEFAULT_VAULT_MAX_WORKERS = 8
+
 
 class AWSSessionCreds(TypedDict):
     AWS_ACCESS_KEY_ID: str
@@ -1298,10 +1307,16 @@ def configure_and_run_docker_container(
         else:
             command = instance_config.get_args()
 
+    local_run_config = system_paasta_config.get_local_run_config()
     secret_provider_kwargs = {
         "vault_cluster_config": system_paasta_config.get_vault_cluster_config(),
         "vault_auth_method": args.vault_auth_method,
         "vault_token_file": args.vault_token_file,
+        # services with dozens of secrets shouldn't wait on them one at a time
+        "vault_max_workers": local_run_config.get(
+            "vault_max_workers", DEFAULT_VAULT_MAX_WORKERS
+        ),
+        "vault_cache_ttl": local_run_config.get("vault_cache_ttl", 0),
     }
 
     return run_docker_container(
@@ -15,26 +15,35 @@
 """PaaSTA log reader for humans"""
 import argparse
 import asyncio
+import concurrent.futures
 import datetime
+import heapq
+import itertools
 import json
 import logging
 import re
 import sys
+from collections import deque
 from collections import namedtuple
 from contextlib import contextmanager
+from functools import lru_cache
 from multiprocessing import Process
 from multiprocessing import Queue
 from queue import Empty
 from time import sleep
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 from typing import ContextManager
+from typing import Deque
 from typing import Dict
+from typing import FrozenSet
 from typing import Iterable
 from typing import Iterator
 from typing import List
 from typing import Mapping
 from typing import MutableSequence
+from typing import NamedTuple
 from typing import Optional
 from typing import Sequence
 from typing import Set
@@ -43,7 +52,6 @@ from typing import Type
 from typing import Union
 
 import isodate
-import nats
 import pytz
 from dateutil import tz
 
@@ -80,6 +88,21 @@ except ImportError:
                 "logreader (internal Yelp package) is not available - unable to display logs."
             )
 
+        def get_log_object_keys(
+            self,
+            log_name: str,
+            start_datetime: datetime.datetime,
+            end_datetime: datetime.datetime,
+        ) -> List[str]:
+            raise NotImplementedError(
+                "logreader (internal Yelp package) is not available - unable to display logs."
+            )
+
+        def get_log_object_reader(self, key: str) -> Iterator[str]:
+            raise NotImplementedError(
+                "logreader (internal Yelp package) is not available - unable to display logs."
+            )
+
 
 from pytimeparse.timeparse import timeparse
 
@@ -87,6 +110,7 @@ from paasta_tools.cli.utils import figure_out_service_name
 from paasta_tools.cli.utils import guess_service_name
 from paasta_tools.cli.utils import lazy_choices_completer
 from paasta_tools.cli.utils import verify_instances
+from paasta_tools.lazy_imports import lazy_import
 from paasta_tools.utils import ANY_CLUSTER
 from paasta_tools.utils import DEFAULT_LOGLEVEL
 from paasta_tools.utils import DEFAULT_SOA_DIR
@@ -99,6 +123,12 @@ from paasta_tools.utils import list_clusters
 from paasta_tools.utils import list_services
 from paasta_tools.utils import load_system_paasta_config
 
+# nats (and aiohttp with it) is only needed to tail logs from vector
+if TYPE_CHECKING:
+    import nats
+else:
+    nats = lazy_import("nats")
+
 DEFAULT_COMPONENTS = ["stdout", "stderr"]
 
 log = logging.getLogger(__name__)
@@ -297,6 +327,272 @@ def check_timestamp_in_range(
         return True
 
 
+# Log lines are stamped either by paasta itself (a naive isoformat, see
+# utils._now) or by the logging pipeline (e.g. "2016-06-08T06:31:52.706609135Z").
+# Both start with a fixed "YYYY-MM-DDTHH:MM:SS" prefix that is shared by every
+# line emitted in the same second, so that is the part we parse and cache.
+_TIMESTAMP_PREFIX_LENGTH = 19
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp_prefix(prefix: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(prefix)
+
+
+def parse_log_timestamp(timestamp: str) -> datetime.datetime:
+    """Parses an ISO 8601 log timestamp, giving the same result as
+    isodate.parse_datetime. Timestamps in the fixed formats used by our log
+    lines take a cached fast path, anything else is handed to isodate.
+
+    :param timestamp: The timestamp string from a log line
+    :return: The parsed datetime, timezone-aware only if the timestamp had a zone
+    """
+    rest = timestamp[_TIMESTAMP_PREFIX_LENGTH:]
+    tzinfo = None
+    if rest.endswith("Z"):
+        rest = rest[:-1]
+        tzinfo = datetime.timezone.utc
+    elif rest.endswith("+00:00"):
+        rest = rest[:-6]
+        tzinfo = datetime.timezone.utc
+
+    fraction = rest[1:]
+    if rest and (rest[0] != "." or not (fraction.isascii() and fraction.isdigit())):
+        return isodate.parse_datetime(timestamp)
+    prefix = timestamp[:_TIMESTAMP_PREFIX_LENGTH]
+    if len(prefix) != _TIMESTAMP_PREFIX_LENGTH or prefix[10] != "T":
+        return isodate.parse_datetime(timestamp)
+    try:
+        dt = _parse_timestamp_prefix(prefix)
+    except ValueError:
+        return isodate.parse_datetime(timestamp)
+    # isodate truncates anything beyond microsecond precision (e.g. nanoseconds)
+    microsecond = int(fraction[:6].ljust(6, "0")) if fraction else 0
+    return dt.replace(microsecond=microsecond, tzinfo=tzinfo)
+
+
+def _get_record_timestamp(record: Mapping[str, Any]) -> Optional[datetime.datetime]:
+    try:
+        return parse_log_timestamp(record["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class ParsedLogLine(NamedTuple):
+    raw_line: Union[str, bytes]
+    record: Dict[str, Any]
+    timestamp: Optional[datetime.datetime]
+
+    @property
+    def line(self) -> str:
+        if isinstance(self.raw_line, bytes):
+            return self.raw_line.decode("utf-8")
+        return self.raw_line
+
+    @property
+    def sort_key(self) -> datetime.datetime:
+        if self.timestamp is None:
+            return pytz.utc.localize(datetime.datetime.min)
+        if self.timestamp.tzinfo is None:
+            return pytz.utc.localize(self.timestamp)
+        return self.timestamp
+
+
+def _compile_prefilter(
+    values: Optional[FrozenSet[str]],
+) -> Optional[Tuple[Tuple[str, ...], Tuple[bytes, ...]]]:
+    """Returns the JSON-encoded forms of values, which any line carrying one of
+    those values must contain verbatim. Returns None if some value would not be
+    encoded verbatim (e.g. it needs escaping), in which case we can't prefilter.
+    """
+    if values is None:
+        return None
+    tokens = []
+    for value in values:
+        if not isinstance(value, str):
+            return None
+        token = json.dumps(value)
+        if "\\" in token:
+            return None
+        tokens.append(token)
+    return tuple(tokens), tuple(token.encode("utf-8") for token in tokens)
+
+
+class LogLineFilter:
+    """A log line filter compiled once for a given set of filtering options, so
+    that the per-line work on busy streams is as small as possible:
+
+    * lines that cannot contain any of the requested clusters, instances or pods
+      are rejected by a substring check on the raw line, before JSON decoding
+    * membership checks are done against frozensets
+    * timestamps are parsed with parse_log_timestamp
+
+    Lines that pass are returned as a ParsedLogLine so that callers (and
+    print_log) can reuse the decoded record instead of decoding the line again.
+
+    :param app_output: Whether this filters app_output (stdout/stderr) lines,
+                       with the semantics of paasta_app_output_passes_filter,
+                       rather than those of paasta_log_line_passes_filter
+    """
+
+    def __init__(
+        self,
+        levels: Iterable[str],
+        components: Iterable[str],
+        clusters: Iterable[str],
+        instances: Optional[Iterable[str]],
+        pods: Iterable[str] = None,
+        start_time: datetime.datetime = None,
+        end_time: datetime.datetime = None,
+        app_output: bool = False,
+    ) -> None:
+        self.app_output = app_output
+        self.levels = frozenset(levels)
+        self.components = frozenset(components)
+        self.clusters = frozenset(clusters)
+        if not app_output:
+            self.clusters |= {ANY_CLUSTER}
+        self.instances = None if instances is None else frozenset(instances)
+        # Pods are only filtered on for app_output, as paasta's own log lines
+        # don't carry a pod name
+        self.pods = None if pods is None or not app_output else frozenset(pods)
+        self.start_time = start_time
+        self.end_time = end_time
+
+        self._prefilters = [
+            prefilter
+            for prefilter in (
+                _compile_prefilter(self.clusters),
+                _compile_prefilter(self.instances),
+                _compile_prefilter(self.pods),
+            )
+            if prefilter is not None
+        ]
+
+    def parse(self, line: Union[str, bytes]) -> Optional[ParsedLogLine]:
+        """Returns the parsed line if it should be displayed, None otherwise."""
+        for str_tokens, bytes_tokens in self._prefilters:
+            if isinstance(line, bytes):
+                if not any(token in line for token in bytes_tokens):
+                    return None
+            elif not any(token in line for token in str_tokens):
+                return None
+
+        try:
+            record = json.loads(line)
+        except ValueError:
+            log.debug("Trouble parsing line as json. Skipping. Line: %r" % line)
+            return None
+        if not isinstance(record, dict):
+            return None
+
+        if self.instances is not None and record.get("instance") not in self.instances:
+            return None
+        if record.get("component") not in self.components:
+            return None
+        if record.get("cluster") not in self.clusters:
+            return None
+        if self.app_output:
+            if self.pods is not None and record.get("pod_name") not in self.pods:
+                return None
+        else:
+            level = record.get("level")
+            if level is not None and level not in self.levels:
+                return None
+
+        timestamp = _get_record_timestamp(record)
+        if timestamp is None:
+            # Timestamp might be missing from app_output. We had an issue where OTel was splitting
+            # overly long log lines and not including timestamps in the resulting log records
+            # (OBSPLAT-2216). Although this was then fixed in OTel, we should not rely on timestamps
+            # being present, as the format cannot be guaranteed.
+            if self.app_output:
+                return None
+        elif not check_timestamp_in_range(timestamp, self.start_time, self.end_time):
+            return None
+        return ParsedLogLine(line, record, timestamp)
+
+    def __call__(self, line: Union[str, bytes]) -> bool:
+        return self.parse(line) is not None
+
+
+class LogObject(NamedTuple):
+    """The lines of one S3 log object which passed a LogLineFilter, in the order
+    they were logged, and the time of the object's first line (filtered or not),
+    if it could be read."""
+
+    start: Optional[datetime.datetime]
+    lines: List[ParsedLogLine]
+
+
+def prefetch(
+    fn: Callable[[Any], Any], items: Iterable[Any], max_ahead: int
+) -> Iterator[Any]:
+    """Yields fn(item) for each of items, in order, computing the results for up
+    to max_ahead of the next items concurrently while the current one is used."""
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_ahead)
+    try:
+        pending: Deque[concurrent.futures.Future] = deque()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) > max_ahead:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def merge_log_objects(log_objects: Iterable[LogObject]) -> Iterator[ParsedLogLine]:
+    """Merges the lines of log objects, which must come in the order they
+    started in, into a single time-ordered stream.
+
+    This is a k-way merge over a heap, like heapq.merge, except that objects only
+    join it once the merge reaches the time they start at: heapq.merge would
+    start (and so fetch) every one of them up front. A line is yielded as soon
+    as no object still to come can hold an earlier one, so only the objects
+    overlapping the current time are held in memory.
+    """
+    # (sort key of the object's next line, tie breaker, that line, the rest of them)
+    heap: List[Tuple[datetime.datetime, int, ParsedLogLine, Iterator[ParsedLogLine]]]
+    heap = []
+    objects = iter(log_objects)
+    upcoming = next(objects, None)
+    for index in itertools.count():
+        if upcoming is not None and (
+            not heap or upcoming.start is None or upcoming.start < heap[0][0]
+        ):
+            lines = iter(upcoming.lines)
+            first = next(lines, None)
+            if first is not None:
+                heapq.heappush(heap, (first.sort_key, index, first, lines))
+            upcoming = next(objects, None)
+            continue
+        if not heap:
+            return
+        _, _, parsed, lines = heap[0]
+        yield parsed
+        following = next(lines, None)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (following.sort_key, index, following, lines))
+
+
+def dedupe_log_lines(lines: Iterable[ParsedLogLine]) -> Iterator[ParsedLogLine]:
+    """Drops repeated lines from a time-ordered stream. Copies of a line share
+    its timestamp, so only the lines of the current timestamp are remembered."""
+    current_key = None
+    seen: Set[str] = set()
+    for parsed in lines:
+        if parsed.sort_key != current_key:
+            current_key = parsed.sort_key
+            seen.clear()
+        if parsed.line not in seen:
+            seen.add(parsed.line)
+            yield parsed
+
+
 def paasta_log_line_passes_filter(
     line: str,
     levels: Sequence[str],
@@ -313,26 +609,11 @@ def paasta_log_line_passes_filter(
     otherwise.
 
     NOTE: Pods are optional as services that use Mesos do not operate with pods.
+    NOTE: Use a LogLineFilter instead when filtering more than a handful of lines.
     """
-    try:
-        parsed_line = json.loads(line)
-    except ValueError:
-        log.debug("Trouble parsing line as json. Skipping. Line: %r" % line)
-        return False
-
-    if (
-        (instances is None or parsed_line.get("instance") in instances)
-        and (parsed_line.get("level") is None or parsed_line.get("level") in levels)
-        and parsed_line.get("component") in components
-        and (
-            parsed_line.get("cluster") in clusters
-            or parsed_line.get("cluster") == ANY_CLUSTER
-        )
-    ):
-        timestamp = isodate.parse_datetime(parsed_line.get("timestamp"))
-        if check_timestamp_in_range(timestamp, start_time, end_time):
-            return True
-    return False
+    return LogLineFilter(
+        levels, components, clusters, instances, pods, start_time, end_time
+    )(line)
 
 
 def paasta_app_output_passes_filter(
@@ -346,29 +627,16 @@ def paasta_app_output_passes_filter(
     start_time: datetime.datetime = None,
     end_time: datetime.datetime = None,
 ) -> bool:
-    try:
-        parsed_line = json.loads(line)
-    except ValueError:
-        log.debug("Trouble parsing line as json. Skipping. Line: %r" % line)
-        return False
-
-    if (
-        (instances is None or parsed_line.get("instance") in instances)
-        and parsed_line.get("cluster") in clusters
-        and parsed_line.get("component") in components
-        and (pods is None or parsed_line.get("pod_name") in pods)
-    ):
-        try:
-            timestamp = isodate.parse_datetime(parsed_line.get("timestamp"))
-        except AttributeError:
-            # Timestamp might be missing. We had an issue where OTel was splitting overly long log lines
-            # and not including timestamps in the resulting log records (OBSPLAT-2216).
-            # Although this was then fixed in OTel, we should not rely on timestamps being present,
-            # as the format cannot be guaranteed.
-            return False
-        if check_timestamp_in_range(timestamp, start_time, end_time):
-            return True
-    return False
+    return LogLineFilter(
+        levels,
+        components,
+        clusters,
+        instances,
+        pods,
+        start_time,
+        end_time,
+        app_output=True,
+    )(line)
 
 
 def extract_utc_timestamp_from_log_line(line: str) -> datetime.datetime:
@@ -399,27 +667,37 @@ def print_log(
     requested_levels: Sequence[str],
     raw_mode: bool = False,
     strip_headers: bool = False,
+    parsed_line: Dict[str, Any] = None,
 ) -> None:
     """Mostly a stub to ease testing. Eventually this may do some formatting or
     something.
+
+    If the caller has already decoded line (e.g. while filtering it), it can
+    pass the result as parsed_line so that we don't decode it again.
     """
     if raw_mode:
         # suppress trailing newline since scribereader already attached one
         print(line, end=" ", flush=True)
     else:
         print(
-            prettify_log_line(line, requested_levels, strip_headers),
+            prettify_log_line(line, requested_levels, strip_headers, parsed_line),
             flush=True,
         )
 
 
-def prettify_timestamp(timestamp: datetime.datetime) -> str:
+@lru_cache(maxsize=4096)
+def _format_local_timestamp(utc_datetime: datetime.datetime) -> str:
+    return datetime_from_utc_to_local(utc_datetime).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def prettify_timestamp(timestamp: str) -> str:
     """Returns more human-friendly form of 'timestamp' without microseconds and
     in local time.
     """
-    dt = isodate.parse_datetime(timestamp)
-    pretty_timestamp = datetime_from_utc_to_local(dt)
-    return pretty_timestamp.strftime("%Y-%m-%d %H:%M:%S")
+    dt = parse_log_timestamp(timestamp)
+    # Dropping microseconds (and the zone, which is treated as UTC regardless)
+    # first means lines logged in the same second share a cache entry
+    return _format_local_timestamp(dt.replace(microsecond=0, tzinfo=None))
 
 
 def prettify_component(component: str) -> str:
@@ -448,16 +726,20 @@ def prettify_level(level: str, requested_levels: Sequence[str]) -> str:
 
 
 def prettify_log_line(
-    line: str, requested_levels: Sequence[str], strip_headers: bool
+    line: str,
+    requested_levels: Sequence[str],
+    strip_headers: bool,
+    parsed_line: Dict[str, Any] = None,
 ) -> str:
     """Given a line from the log, which is expected to be JSON and have all the
     things we expect, return a pretty formatted string containing relevant values.
     """
-    try:
-        parsed_line = json.loads(line)
-    except ValueError:
-        log.debug("Trouble parsing line as json. Skipping. Line: %r" % line)
-        return "Invalid JSON: %s" % line
+    if parsed_line is None:
+        try:
+            parsed_line = json.loads(line)
+        except ValueError:
+            log.debug("Trouble parsing line as json. Skipping. Line: %r" % line)
+            return "Invalid JSON: %s" % line
 
     try:
         if strip_headers:
@@ -608,8 +890,10 @@ class LogReader:
         raise NotImplementedError("print_logs_by_offset is not implemented")
 
 
+# app_output: whether the stream's lines are filtered as app_output (stdout/stderr)
+# lines rather than as paasta's own log lines, see LogLineFilter
 ScribeComponentStreamInfo = namedtuple(
-    "ScribeComponentStreamInfo", "per_cluster, stream_name_fn, filter_fn, parse_fn"
+    "ScribeComponentStreamInfo", "per_cluster, stream_name_fn, app_output, parse_fn"
 )
 
 
@@ -623,7 +907,7 @@ class ScribeLogReader(LogReader):
         "default": ScribeComponentStreamInfo(
             per_cluster=False,
             stream_name_fn=get_log_name_for_service,
-            filter_fn=paasta_log_line_passes_filter,
+            app_output=False,
             parse_fn=None,
         ),
         "stdout": ScribeComponentStreamInfo(
@@ -631,7 +915,7 @@ class ScribeLogReader(LogReader):
             stream_name_fn=lambda service: get_log_name_for_service(
                 service, prefix="app_output"
             ),
-            filter_fn=paasta_app_output_passes_filter,
+            app_output=True,
             parse_fn=None,
         ),
         "stderr": ScribeComponentStreamInfo(
@@ -639,7 +923,7 @@ class ScribeLogReader(LogReader):
             stream_name_fn=lambda service: get_log_name_for_service(
                 service, prefix="app_output"
             ),
-            filter_fn=paasta_app_output_passes_filter,
+            app_output=True,
             parse_fn=None,
         ),
     }
@@ -761,7 +1045,7 @@ class ScribeLogReader(LogReader):
                 "instances": instances,
                 "pods": pods,
                 "queue": queue,
-                "filter_fn": stream_info.filter_fn,
+                "app_output": stream_info.app_output,
             }
 
             if stream_info.per_cluster:
@@ -892,7 +1176,7 @@ class ScribeLogReader(LogReader):
                 instances=instances,
                 aggregated_logs=aggregated_logs,
                 pods=pods,
-                filter_fn=stream_info.filter_fn,
+                app_output=stream_info.app_output,
                 parser_fn=stream_info.parse_fn,
                 start_time=start_time,
                 end_time=end_time,
@@ -908,7 +1192,13 @@ class ScribeLogReader(LogReader):
         aggregated_logs.sort(key=lambda log_line: log_line["sort_key"])
 
         for line in aggregated_logs:
-            print_log(line["raw_line"], levels, raw_mode, strip_headers)
+            print_log(
+                line["raw_line"],
+                levels,
+                raw_mode,
+                strip_headers,
+                parsed_line=line["parsed_line"],
+            )
 
     def print_last_n_logs(
         self,
@@ -948,7 +1238,7 @@ class ScribeLogReader(LogReader):
                 instances=instances,
                 aggregated_logs=aggregated_logs,
                 pods=pods,
-                filter_fn=stream_info.filter_fn,
+                app_output=stream_info.app_output,
                 parser_fn=stream_info.parse_fn,
             )
 
@@ -961,7 +1251,13 @@ class ScribeLogReader(LogReader):
         aggregated_logs.sort(key=lambda log_line: log_line["sort_key"])
 
         for line in aggregated_logs:
-            print_log(line["raw_line"], levels, raw_mode, strip_headers)
+            print_log(
+                line["raw_line"],
+                levels,
+                raw_mode,
+                strip_headers,
+                parsed_line=line["parsed_line"],
+            )
 
     def filter_and_aggregate_scribe_logs(
         self,
@@ -976,10 +1272,20 @@ class ScribeLogReader(LogReader):
         aggregated_logs: MutableSequence[Dict[str, Any]],
         pods: Iterable[str] = None,
         parser_fn: Callable = None,
-        filter_fn: Callable = None,
+        app_output: bool = False,
         start_time: datetime.datetime = None,
         end_time: datetime.datetime = None,
     ) -> None:
+        line_filter = LogLineFilter(
+            levels,
+            components,
+            clusters,
+            instances,
+            pods,
+            start_time=start_time,
+            end_time=end_time,
+            app_output=app_output,
+        )
         with scribe_reader_ctx as scribe_reader:
             try:
                 for line in scribe_reader:
@@ -988,30 +1294,15 @@ class ScribeLogReader(LogReader):
                         line = line.decode("utf-8")
                     if parser_fn:
                         line = parser_fn(line, clusters, service)
-                    if filter_fn:
-                        if filter_fn(
-                            line,
-                            levels,
-                            service,
-                            components,
-                            clusters,
-                            instances,
-                            pods,
-                            start_time=start_time,
-                            end_time=end_time,
-                        ):
-                            try:
-                                parsed_line = json.loads(line)
-                                timestamp = isodate.parse_datetime(
-                                    parsed_line.get("timestamp")
-                                )
-                                if not timestamp.tzinfo:
-                                    timestamp = pytz.utc.localize(timestamp)
-                            except ValueError:
-                                timestamp = pytz.utc.localize(datetime.datetime.min)
-
-                            line = {"raw_line": line, "sort_key": timestamp}
-                            aggregated_logs.append(line)
+                    parsed = line_filter.parse(line)
+                    if parsed is not None:
+                        aggregated_logs.append(
+                            {
+                                "raw_line": parsed.line,
+                                "parsed_line": parsed.record,
+                                "sort_key": parsed.sort_key,
+                            }
+                        )
             except StreamTailerSetupError as e:
                 if "No data in stream" in str(e):
                     log.warning(f"Scribe stream {stream_name} is empty on {scribe_env}")
@@ -1110,7 +1401,7 @@ class ScribeLogReader(LogReader):
         instances: List[str],
         pods: Iterable[str],
         queue: Queue,
-        filter_fn: Callable,
+        app_output: bool,
         parse_fn: Callable = None,
     ) -> None:
         """Creates a scribetailer for a particular environment.
@@ -1126,12 +1417,13 @@ class ScribeLogReader(LogReader):
                 **scribe_env_to_locations(scribe_env),
             )
             tailer = scribereader.get_stream_tailer(stream_name, host, port)
+            line_filter = LogLineFilter(
+                levels, components, clusters, instances, pods, app_output=app_output
+            )
             for line in tailer:
                 if parse_fn:
                     line = parse_fn(line, clusters, service)
-                if filter_fn(
-                    line, levels, service, components, clusters, instances, pods
-                ):
+                if line_filter(line):
                     queue.put(line)
         except KeyboardInterrupt:
             # Die peacefully rather than printing N threads worth of stack
@@ -1194,6 +1486,10 @@ class VectorLogsReader(LogReader):
     SUPPORTS_TAILING = True
     SUPPORTS_TIME = True
 
+    # print_logs_by_time fetches up to this many of the S3 objects of its time
+    # range ahead of the one it is printing lines from
+    PREFETCH_OBJECTS = 4
+
     def __init__(
         self, cluster_map: Mapping[str, Any], nats_endpoint_map: Mapping[str, Any]
     ) -> None:
@@ -1226,41 +1522,55 @@ class VectorLogsReader(LogReader):
     ) -> None:
         stream_name = get_log_name_for_service(service, prefix="app_output")
         superregion = self.get_superregion_for_cluster(clusters[0])
-        reader = S3LogsReader(superregion)
-        aggregated_logs: List[Dict[str, Any]] = []
+        line_filter = LogLineFilter(
+            levels,
+            components,
+            clusters,
+            instances,
+            pods,
+            start_time=start_time,
+            end_time=end_time,
+            app_output=True,
+        )
 
-        for line in reader.get_log_reader(
+        # The S3 objects backing the range are each read once, a few of them
+        # ahead of the lines being printed, and merged into a single stream in
+        # which a line is printed as soon as no earlier line can still turn up
+        reader = S3LogsReader(superregion)
+        keys = reader.get_log_object_keys(
             log_name=stream_name, start_datetime=start_time, end_datetime=end_time
-        ):
-            if paasta_app_output_passes_filter(
-                line,
+        )
+        log_objects = prefetch(
+            lambda key: self.read_log_object(reader, key, line_filter),
+            keys,
+            self.PREFETCH_OBJECTS,
+        )
+        for parsed in dedupe_log_lines(merge_log_objects(log_objects)):
+            print_log(
+                parsed.line,
                 levels,
-                service,
-                components,
-                clusters,
-                instances,
-                pods,
-                start_time=start_time,
-                end_time=end_time,
-            ):
+                raw_mode,
+                strip_headers,
+                parsed_line=parsed.record,
+            )
+
+    def read_log_object(
+        self, reader: S3LogsReader, key: str, line_filter: LogLineFilter
+    ) -> LogObject:
+        start = None
+        lines = []
+        for index, line in enumerate(reader.get_log_object_reader(key)):
+            if index == 0:
                 try:
-                    parsed_line = json.loads(line)
-                    timestamp = isodate.parse_datetime(parsed_line.get("timestamp"))
-                    if not timestamp.tzinfo:
-                        timestamp = pytz.utc.localize(timestamp)
+                    start = _get_record_timestamp(json.loads(line))
                 except ValueError:
-                    timestamp = pytz.utc.localize(datetime.datetime.min)
-
-                formatted_line = {"raw_line": line, "sort_key": timestamp}
-                aggregated_logs.append(formatted_line)
-
-        aggregated_logs = list(
-            {line["raw_line"]: line for line in aggregated_logs}.values()
-        )
-        aggregated_logs.sort(key=lambda log_line: log_line["sort_key"])
-
-        for formatted_line in aggregated_logs:
-            print_log(formatted_line["raw_line"], levels, raw_mode, strip_headers)
+                    pass
+                if start is not None and start.tzinfo is None:
+                    start = pytz.utc.localize(start)
+            parsed = line_filter.parse(line)
+            if parsed is not None:
+                lines.append(parsed)
+        return LogObject(start, lines)
 
     def tail_logs(
         self,
@@ -1280,6 +1590,10 @@ class VectorLogsReader(LogReader):
                 "Tailing logs is not supported in this cluster yet, sorry"
             )
 
+        line_filter = LogLineFilter(
+            levels, components, clusters, instances, pods, app_output=True
+        )
+
         async def tail_logs_from_nats() -> None:
             nc = await nats.connect(f"nats://{endpoint}")
             sub = await nc.subscribe(stream_name)
@@ -1287,19 +1601,15 @@ class VectorLogsReader(LogReader):
             while True:
                 # Wait indefinitely for a new message (no timeout)
                 msg = await sub.next_msg(timeout=None)
-                decoded_data = msg.data.decode("utf-8")
-
-                if paasta_app_output_passes_filter(
-                    decoded_data,
-                    levels,
-                    service,
-                    components,
-                    clusters,
-                    instances,
-                    pods,
-                ):
+                parsed = line_filter.parse(msg.data)
+                if parsed is not None:
                     await asyncio.to_thread(
-                        print_log, decoded_data, levels, raw_mode, strip_headers
+                        print_log,
+                        parsed.line,
+                        levels,
+                        raw_mode,
+                        strip_headers,
+                        parsed.record,
                     )
 
         run_sync(tail_logs_from_nats)
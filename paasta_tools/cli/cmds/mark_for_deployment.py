@@ -1853,10 +1853,10 @@ def get_instance_configs_for_service_in_deploy_group_all_clusters(
         service=service, soa_dir=soa_dir, load_deployments=False
     )
 
-    instance_configs_per_cluster = {}
-
-    api_endpoints = load_system_paasta_config().get_api_endpoints()
-    for cluster in service_configs.clusters:
+    system_paasta_config = load_system_paasta_config()
+    api_endpoints = system_paasta_config.get_api_endpoints()
+    clusters = list(service_configs.clusters)
+    for cluster in clusters:
         if cluster not in api_endpoints:
             print(
                 PaastaColors.red(
@@ -1865,13 +1865,20 @@ def get_instance_configs_for_service_in_deploy_group_all_clusters(
             )
             raise NoSuchCluster
 
-        instance_configs_per_cluster[cluster] = list(
+    def load_cluster(cluster: str) -> List[LongRunningServiceConfig]:
+        return list(
             get_instance_configs_for_service_in_cluster_and_deploy_group(
                 service_configs, cluster, deploy_group
             )
         )
 
-    return instance_configs_per_cluster
+    # the files of each cluster are independent: for services in many clusters,
+    # reading them one after the other is most of the time it takes to start
+    # waiting for the deployment
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=system_paasta_config.get_mark_for_deployment_max_polling_threads()
+    ) as executor:
+        return dict(zip(clusters, executor.map(load_cluster, clusters)))
 
 
 def _record_instance_duration(
@@ -1925,7 +1932,7 @@ async def wait_for_deployment(
     metrics_interface: Optional[metrics_lib.BaseMetrics] = None,
     rollback_type: Optional[RollbackTypes] = None,
 ) -> Optional[int]:
-    if not instance_configs_per_cluster:
+    if instance_configs_per_cluster is None:
         instance_configs_per_cluster = (
             get_instance_configs_for_service_in_deploy_group_all_clusters(
                 service, deploy_group, soa_dir
@@ -26,6 +26,7 @@ from paasta_tools.cli.utils import get_paasta_oapi_client_with_auth
 from paasta_tools.cli.utils import lazy_choices_completer
 from paasta_tools.cli.utils import parse_error
 from paasta_tools.cli.utils import run_interactive_cli
+from paasta_tools.kubernetes.remote_run import MAX_READY_WAIT
 from paasta_tools.kubernetes.remote_run import TOOLBOX_MOCK_SERVICE
 from paasta_tools.kubernetes.remote_run import format_remote_run_job_name
 from paasta_tools.kubernetes.remote_run import load_eks_or_adhoc_deployment_config
@@ -39,6 +40,10 @@ from paasta_tools.utils import list_clusters
 from paasta_tools.utils import list_services
 from paasta_tools.utils import load_system_paasta_config
 
+# the API holds each poll request open until the pod is ready, or for this long
+POLL_WAIT_SECONDS = 30
+POLL_INTERVAL_SECONDS = 10
+
 KUBECTL_EXEC_CMD_TEMPLATE = (
     "{kubectl_wrapper} --token {token} exec -it -n {namespace} {pod} -- /bin/bash"
 )
@@ -197,12 +202,18 @@ def paasta_remote_run_start(
     )
     start_time = time.time()
     while time.time() - start_time < args.timeout:
+        wait = max(
+            1, min(POLL_WAIT_SECONDS, int(args.timeout - (time.time() - start_time)))
+        )
+        poll_start_time = time.time()
         poll_response = client.remote_run.remote_run_poll(
             service=args.service,
             instance=args.instance,
             job_name=start_response.job_name,
             user=user,
             toolbox=args.toolbox,
+            wait=wait,
+            _request_timeout=MAX_READY_WAIT + 30,
         )
         if poll_response.status == 200:
             print("")
@@ -216,7 +227,9 @@ def paasta_remote_run_start(
             else:
                 print("\nSomething went wrong. Pod still not found.")
                 return 1
-        time.sleep(10)
+        if time.time() - poll_start_time < 1:
+            # older API servers answer straight away instead of waiting
+            time.sleep(POLL_INTERVAL_SECONDS)
     else:
         print(f"{status_prefix}Timed out while waiting for job to start")
         return 1
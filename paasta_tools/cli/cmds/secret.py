@@ -35,17 +35,19 @@ from paasta_tools.kubernetes_tools import get_kubernetes_secret_env_variables
 from paasta_tools.kubernetes_tools import get_paasta_secret_name
 from paasta_tools.kubernetes_tools import get_secret
 from paasta_tools.secret_providers import SecretProvider
+from paasta_tools.secret_providers import SecretWriteError
 from paasta_tools.secret_tools import SHARED_SECRET_SERVICE
 from paasta_tools.secret_tools import decrypt_secret_environment_variables
 from paasta_tools.secret_tools import get_secret_provider
+from paasta_tools.secret_tools import write_secret_file
 from paasta_tools.utils import _log_audit
-from paasta_tools.utils import atomic_file_write
 from paasta_tools.utils import is_secrets_for_teams_enabled
 from paasta_tools.utils import list_clusters
 from paasta_tools.utils import list_services
 from paasta_tools.utils import load_system_paasta_config
 
 SECRET_NAME_REGEX = r"([A-Za-z0-9_-]*)"
+DEFAULT_SECRET_WRITE_PARALLELISM = 4
 
 
 def check_secret_name(secret_name_arg: str):
@@ -219,6 +221,13 @@ def _add_and_update_args(parser: argparse.ArgumentParser):
         ),
         metavar="NAMESPACES",
     )
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=DEFAULT_SECRET_WRITE_PARALLELISM,
+        help="How many ecosystems to encrypt the secret for at once, "
+        "defaults to %(default)s",
+    )
 
 
 def _add_vault_auth_args(parser: argparse.ArgumentParser):
@@ -457,9 +466,7 @@ def _update_extra_namespaces(secret_path: str, namespaces: List[str]) -> None:
         data["extra_namespaces"] = namespaces
     else:
         data.pop("extra_namespaces", None)
-    with atomic_file_write(secret_path) as f:
-        json.dump(data, f, indent=4, sort_keys=True)
-        f.write("\n")
+    write_secret_file(secret_path, data)
 
 
 def paasta_secret_set_namespaces(args: argparse.Namespace) -> None:
@@ -571,17 +578,26 @@ def paasta_secret(args):
                 # best solution so far is to change the below string to "token",
                 # so that token file is picked up from argparse
                 "vault_auth_method": "okta",  # must use Okta to get 2FA push
+                "vault_max_workers": args.parallelism,
             },
         )
-        secret_provider.write_secret(
-            action=args.action,
-            secret_name=args.secret_name,
-            plaintext=plaintext,
-            cross_environment_motivation=args.cross_env_motivation,
-        )
         secret_path = os.path.join(
             secret_provider.secret_dir, f"{args.secret_name}.json"
         )
+        try:
+            secret_provider.write_secret(
+                action=args.action,
+                secret_name=args.secret_name,
+                plaintext=plaintext,
+                cross_environment_motivation=args.cross_env_motivation,
+            )
+        except SecretWriteError as e:
+            print(
+                f"{e}\n"
+                f"The secret was written for the other ecosystems, see {secret_path}. "
+                f"Re-run with --clusters for the ecosystems that failed."
+            )
+            sys.exit(1)
         if args.extra_namespaces is not None:
             _update_extra_namespaces(secret_path, args.extra_namespaces)
         _log_audit(
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3.10
+"""Microbenchmark for generating HPA specs and Prometheus adapter rules.
+
+Loads every kubernetes/eks instance of a cluster from soa-configs, then times
+building their HPA specs (as setup_kubernetes_job does) and their Prometheus
+adapter rules (as setup_prometheus_adapter_config does): once from cold caches,
+and again with the caches populated by the first run, which is what every run
+after the first one of a long-lived process sees.
+
+    python -m paasta_tools.contrib.benchmark_autoscaling_specs -c norcal-prod
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable
+from typing import List
+
+from paasta_tools import kubernetes_tools
+from paasta_tools import setup_prometheus_adapter_config
+from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
+from paasta_tools.setup_prometheus_adapter_config import get_rules_for_service_instance
+from paasta_tools.setup_prometheus_adapter_config import (
+    load_service_instance_configs_for_adapter,
+)
+from paasta_tools.utils import DEFAULT_SOA_DIR
+from paasta_tools.utils import list_services
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-c", "--cluster", required=True)
+    parser.add_argument("-d", "--soa-dir", default=DEFAULT_SOA_DIR)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def clear_caches() -> None:
+    kubernetes_tools._hpa_spec_cache.clear()
+    for name in dir(setup_prometheus_adapter_config):
+        cache_clear = getattr(
+            getattr(setup_prometheus_adapter_config, name), "cache_clear", None
+        )
+        if cache_clear is not None:
+            cache_clear()
+
+
+def build_hpa_specs(
+    cluster: str, instance_configs: List[KubernetesDeploymentConfig]
+) -> int:
+    built = 0
+    for instance_config in instance_configs:
+        if instance_config.get_autoscaling_metric_spec(
+            name=instance_config.get_sanitised_deployment_name(),
+            cluster=cluster,
+            kube_client=None,
+            namespace=instance_config.get_namespace(),
+        ):
+            built += 1
+    return built
+
+
+def build_adapter_rules(
+    cluster: str, instance_configs: List[KubernetesDeploymentConfig]
+) -> int:
+    return sum(
+        len(
+            get_rules_for_service_instance(
+                instance_config.service, instance_config, cluster
+            )
+        )
+        for instance_config in instance_configs
+    )
+
+
+def time_it(fn: Callable[[str, List[KubernetesDeploymentConfig]], int], *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    args = parse_args()
+    instance_configs = [
+        instance_config
+        for service in list_services(soa_dir=args.soa_dir)
+        for instance_config in load_service_instance_configs_for_adapter(
+            service, args.cluster, Path(args.soa_dir)
+        )
+    ]
+    print(f"{len(instance_configs)} instances")
+
+    for name, fn in (
+        ("HPA specs", build_hpa_specs),
+        ("adapter rules", build_adapter_rules),
+    ):
+        cold, warm = [], []
+        for _ in range(args.repeat):
+            clear_caches()
+            cold.append(time_it(fn, args.cluster, instance_configs))
+            warm.append(time_it(fn, args.cluster, instance_configs))
+        built = fn(args.cluster, instance_configs)
+        print(
+            f"{name:>14}: {built} built, "
+            f"cold {min(cold) * 1000:.1f}ms, warm {min(warm) * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3.10
+"""Microbenchmark for the autoscaling forecast policies.
+
+Forecasts from a synthetic load history kept the way bespoke autoscalers
+usually keep it, as a list of (timestamp, value)s, and as a HistoricalLoad
+ring buffer, which finds the forecast window with a binary search rather than
+by scanning the whole history.
+
+    python -m paasta_tools.contrib.benchmark_forecasting --datapoints 100000
+"""
+import argparse
+import math
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+from paasta_tools.autoscaling.forecasting import HistoricalLoad
+from paasta_tools.autoscaling.forecasting import get_forecast_policy
+
+POLICIES: Dict[str, Dict[str, Any]] = {
+    "moving_average": {"moving_average_window_seconds": 1800},
+    "linreg": {"linreg_window_seconds": 1800, "linreg_extrapolation_seconds": 300},
+    "ewma": {"ewma_half_life_seconds": 300},
+    "holt_winters": {
+        "holt_winters_window_seconds": 1800,
+        "holt_winters_extrapolation_seconds": 300,
+    },
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--datapoints", type=int, default=100000)
+    parser.add_argument("--interval", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def best_of(repeat: int, fn: Callable[[], float]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    args = parse_args()
+    datapoints = [
+        (i * args.interval, 100 + 20 * math.sin(i / 360) + i / 1000)
+        for i in range(args.datapoints)
+    ]
+    historical_load = HistoricalLoad(capacity=args.datapoints, datapoints=datapoints)
+
+    print(f"{args.datapoints} datapoints, one every {args.interval}s")
+    for name, kwargs in POLICIES.items():
+        policy = get_forecast_policy(name)
+        forecast = policy(historical_load, **kwargs)
+        if not math.isclose(forecast, policy(datapoints, **kwargs)):
+            raise SystemExit(f"{name}: list and HistoricalLoad forecasts disagree!")
+        from_list = best_of(args.repeat, lambda: policy(datapoints, **kwargs))
+        from_buffer = best_of(args.repeat, lambda: policy(historical_load, **kwargs))
+        print(
+            f"{name:>14}: list {from_list * 1000:.2f}ms, "
+            f"HistoricalLoad {from_buffer * 1000:.2f}ms "
+            f"({from_list / from_buffer:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
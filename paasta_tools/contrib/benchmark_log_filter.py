@@ -0,0 +1,108 @@
+#!/usr/bin/env python3.10
+"""Microbenchmark for the `paasta logs` line filter.
+
+Replays a recorded log stream (one JSON log line per line, e.g. the output of
+`paasta logs --raw-mode ...` redirected to a file) through the filtering and
+rendering path used by `paasta logs`, and compares it with decoding every line
+twice and parsing timestamps with isodate, which is what we used to do.
+
+    python -m paasta_tools.contrib.benchmark_log_filter recorded.log \\
+        -c norcal-prod -i main --components stdout stderr
+"""
+import argparse
+import json
+import time
+from typing import Callable
+from typing import List
+
+import isodate
+
+from paasta_tools.cli.cmds.logs import LogLineFilter
+from paasta_tools.cli.cmds.logs import check_timestamp_in_range
+from paasta_tools.cli.cmds.logs import prettify_log_line
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("recording", help="File containing one log line per line")
+    parser.add_argument("-c", "--clusters", nargs="+", required=True)
+    parser.add_argument("-i", "--instances", nargs="+", default=None)
+    parser.add_argument("-p", "--pods", nargs="+", default=None)
+    parser.add_argument("--components", nargs="+", default=["stdout", "stderr"])
+    parser.add_argument("--levels", nargs="+", default=["event", "debug"])
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def legacy_render(args: argparse.Namespace, lines: List[bytes]) -> int:
+    shown = 0
+    for raw_line in lines:
+        try:
+            parsed_line = json.loads(raw_line)
+        except ValueError:
+            continue
+        if (
+            (args.instances is None or parsed_line.get("instance") in args.instances)
+            and parsed_line.get("cluster") in args.clusters
+            and parsed_line.get("component") in args.components
+            and (args.pods is None or parsed_line.get("pod_name") in args.pods)
+        ):
+            try:
+                timestamp = isodate.parse_datetime(parsed_line.get("timestamp"))
+            except AttributeError:
+                continue
+            if check_timestamp_in_range(timestamp, None, None):
+                line = raw_line.decode("utf-8")
+                prettify_log_line(line, args.levels, strip_headers=False)
+                shown += 1
+    return shown
+
+
+def compiled_render(args: argparse.Namespace, lines: List[bytes]) -> int:
+    line_filter = LogLineFilter(
+        args.levels,
+        args.components,
+        args.clusters,
+        args.instances,
+        args.pods,
+        app_output=True,
+    )
+    shown = 0
+    for raw_line in lines:
+        parsed = line_filter.parse(raw_line)
+        if parsed is not None:
+            prettify_log_line(
+                parsed.line, args.levels, strip_headers=False, parsed_line=parsed.record
+            )
+            shown += 1
+    return shown
+
+
+def best_of(
+    repeat: int, fn: Callable[[argparse.Namespace, List[bytes]], int], *args
+) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    args = parse_args()
+    with open(args.recording, "rb") as f:
+        lines = f.read().splitlines()
+
+    shown = compiled_render(args, lines)
+    if shown != legacy_render(args, lines):
+        raise SystemExit("Compiled and legacy filters disagree on this recording!")
+
+    print(f"{len(lines)} lines, {shown} shown")
+    for name, fn in (("legacy", legacy_render), ("compiled", compiled_render)):
+        elapsed = best_of(args.repeat, fn, args, lines)
+        print(f"{name:>8}: {elapsed:.3f}s ({len(lines) / elapsed:,.0f} lines/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3.10
+"""Benchmark PaaSTA's hot paths end to end, offline, against synthetic soa-configs.
+
+Generates a soa-configs tree of the given scale (see synthetic_soa_configs) and
+serves a fake Kubernetes API (see fake_kube_api), then times each entry point
+in a process of its own: its first run sees cold caches, like the cron jobs and
+CLI commands calling it do, and the other runs warm ones. ZooKeeper and
+tronfig, which setup_kube_deployments and paasta validate reach out to, are
+replaced by stand-ins that do nothing. Some of the checks of paasta validate
+need data that only exists on PaaSTA hosts (e.g. Sensu teams), so its verdict
+isn't looked at: only its timing is.
+
+Results are written as JSON. Given the results of a previous run at the same
+scale (e.g. of the target branch, on the same machine), exits with an error if
+any entry point got slower than in those by more than the threshold.
+
+    python -m paasta_tools.contrib.benchmark_suite --output benchmarks.json
+    python -m paasta_tools.contrib.benchmark_suite --baseline base.json --threshold 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from kazoo.exceptions import NoNodeError
+
+from paasta_tools import __version__
+from paasta_tools.cli.cmds.status import apply_args_filters
+from paasta_tools.cli.cmds.validate import paasta_validate
+from paasta_tools.contrib.fake_kube_api import FakeKubernetesAPI
+from paasta_tools.contrib.synthetic_soa_configs import add_scale_arguments
+from paasta_tools.contrib.synthetic_soa_configs import generate
+from paasta_tools.contrib.synthetic_soa_configs import scale_from_args
+from paasta_tools.kubernetes_tools import KubeClient
+from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
+from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
+from paasta_tools.setup_kubernetes_job import get_kubernetes_deployment_config
+from paasta_tools.setup_kubernetes_job import setup_kube_deployments
+from paasta_tools.setup_prometheus_adapter_config import (
+    create_prometheus_adapter_config,
+)
+from paasta_tools.tron_tools import create_complete_config
+from paasta_tools.tron_tools import get_tron_namespaces
+from paasta_tools.utils import ZookeeperPool
+from paasta_tools.utils import get_services_for_cluster
+
+DEFAULT_THRESHOLD = 0.25
+# slowdowns smaller than this are noise, whatever the threshold
+MIN_REGRESSION_S = 0.005
+
+
+class BenchmarkContext(NamedTuple):
+    soa_dir: str
+    # the one the benchmarks run for
+    cluster: str
+    clusters: List[str]
+    services: List[str]
+
+
+# given the context, does the setup a benchmark needs, and returns the function
+# to time, which returns how many things (e.g. instances) it went through
+Benchmark = Callable[[BenchmarkContext], Callable[[], int]]
+
+
+class _FakeZooKeeper:
+    """Stands in for the KazooClient of ZookeeperPool: it has no nodes."""
+
+    def get(self, path: str) -> Any:
+        raise NoNodeError(path)
+
+    def get_children(self, path: str) -> Any:
+        raise NoNodeError(path)
+
+    def exists(self, path: str) -> None:
+        return None
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def use_fake_zookeeper() -> None:
+    # as long as the pool is entered, it keeps (and shares) its client
+    ZookeeperPool.zk = _FakeZooKeeper()
+    ZookeeperPool.counter = 1
+
+
+def load_kubernetes_configs(
+    context: BenchmarkContext,
+) -> List[KubernetesDeploymentConfig]:
+    return [
+        instance_config
+        for service in context.services
+        for instance_config in PaastaServiceConfigLoader(
+            service, soa_dir=context.soa_dir
+        ).instance_configs(
+            cluster=context.cluster, instance_type_class=KubernetesDeploymentConfig
+        )
+    ]
+
+
+def bench_get_services_for_cluster(context: BenchmarkContext) -> Callable[[], int]:
+    return lambda: len(
+        get_services_for_cluster(
+            cluster=context.cluster, instance_type="kubernetes", soa_dir=context.soa_dir
+        )
+    )
+
+
+def bench_instance_configs(context: BenchmarkContext) -> Callable[[], int]:
+    return lambda: len(load_kubernetes_configs(context))
+
+
+def bench_format_kubernetes_app(context: BenchmarkContext) -> Callable[[], int]:
+    instance_configs = load_kubernetes_configs(context)
+
+    def run() -> int:
+        for instance_config in instance_configs:
+            instance_config.format_kubernetes_app()
+        return len(instance_configs)
+
+    return run
+
+
+def bench_setup_kube_deployments(context: BenchmarkContext) -> Callable[[], int]:
+    kube_client = KubeClient()
+    service_instance_configs_list = get_kubernetes_deployment_config(
+        service_instances_with_valid_names=[
+            (service, instance, None, None)
+            for service, instance in get_services_for_cluster(
+                cluster=context.cluster,
+                instance_type="kubernetes",
+                soa_dir=context.soa_dir,
+            )
+        ],
+        cluster=context.cluster,
+        soa_dir=context.soa_dir,
+    )
+
+    def run() -> int:
+        # the first run creates everything, the next ones find it all up to date
+        setup_kube_deployments(
+            kube_client=kube_client,
+            cluster=context.cluster,
+            service_instance_configs_list=service_instance_configs_list,
+            soa_dir=context.soa_dir,
+        )
+        return len(service_instance_configs_list)
+
+    return run
+
+
+def bench_create_prometheus_adapter_config(
+    context: BenchmarkContext,
+) -> Callable[[], int]:
+    return lambda: len(
+        create_prometheus_adapter_config(
+            paasta_cluster=context.cluster, soa_dir=Path(context.soa_dir)
+        )["rules"]
+    )
+
+
+def bench_create_complete_config(context: BenchmarkContext) -> Callable[[], int]:
+    namespaces = get_tron_namespaces(cluster=context.cluster, soa_dir=context.soa_dir)
+
+    def run() -> int:
+        for namespace in namespaces:
+            create_complete_config(
+                service=namespace,
+                cluster=context.cluster,
+                soa_dir=context.soa_dir,
+                k8s_enabled=True,
+            )
+        return len(namespaces)
+
+    return run
+
+
+def bench_paasta_validate(context: BenchmarkContext) -> Callable[[], int]:
+    def run() -> int:
+        for service in context.services:
+            paasta_validate(
+                argparse.Namespace(
+                    service=service,
+                    yelpsoa_config_root=context.soa_dir,
+                    verbose=False,
+                )
+            )
+        return len(context.services)
+
+    return run
+
+
+def bench_apply_args_filters(context: BenchmarkContext) -> Callable[[], int]:
+    def run() -> int:
+        # e.g. paasta status --owner team1, in every cluster
+        clusters_services_instances = apply_args_filters(
+            argparse.Namespace(
+                service_instance=None,
+                service=None,
+                instances=None,
+                clusters=",".join(context.clusters),
+                deploy_group=None,
+                registration=None,
+                owner="team1",
+                soa_dir=context.soa_dir,
+            )
+        )
+        return sum(
+            len(instances)
+            for services_instances in clusters_services_instances.values()
+            for instances in services_instances.values()
+        )
+
+    return run
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "get_services_for_cluster": bench_get_services_for_cluster,
+    "PaastaServiceConfigLoader.instance_configs": bench_instance_configs,
+    "format_kubernetes_app": bench_format_kubernetes_app,
+    "setup_kube_deployments": bench_setup_kube_deployments,
+    "create_prometheus_adapter_config": bench_create_prometheus_adapter_config,
+    "tron_tools.create_complete_config": bench_create_complete_config,
+    "paasta validate": bench_paasta_validate,
+    "apply_args_filters": bench_apply_args_filters,
+}
+
+
+def run_benchmark(name: str, context: BenchmarkContext, repeat: int) -> Dict[str, Any]:
+    """Time the benchmark called name repeat times, in this process. What the
+    entry points print is discarded."""
+    use_fake_zookeeper()
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn = BENCHMARKS[name](context)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            items = fn()
+            times.append(time.perf_counter() - start)
+    return {
+        "items": items,
+        "first": times[0],
+        "best": min(times),
+        "median": statistics.median(times),
+    }
+
+
+def run_benchmarks(
+    args: argparse.Namespace, names: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="paasta-benchmarks-") as root:
+        synthetic = generate(root, scale_from_args(args))
+        context = BenchmarkContext(
+            soa_dir=synthetic.soa_dir,
+            cluster=synthetic.clusters[0],
+            clusters=synthetic.clusters,
+            services=synthetic.services,
+        )
+
+        bin_dir = os.path.join(root, "bin")
+        os.mkdir(bin_dir)
+        with open(os.path.join(bin_dir, "tronfig"), "w") as f:
+            f.write("#!/bin/sh\ncat > /dev/null\n")
+        os.chmod(os.path.join(bin_dir, "tronfig"), 0o755)
+
+        api = FakeKubernetesAPI()
+        api.start()
+        kubeconfig = os.path.join(root, "kubeconfig")
+        api.write_kubeconfig(kubeconfig)
+        env = {
+            **os.environ,
+            "PAASTA_SYSTEM_CONFIG_DIR": synthetic.system_paasta_config_dir,
+            "KUBECONFIG": kubeconfig,
+            "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+        }
+        try:
+            for name in names:
+                api.requests.clear()
+                proc = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "paasta_tools.contrib.benchmark_suite",
+                        "--run",
+                        name,
+                        "--context",
+                        json.dumps(context._asdict()),
+                        "--repeat",
+                        str(args.repeat),
+                    ],
+                    env=env,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    encoding="utf-8",
+                )
+                if proc.returncode != 0:
+                    results[name] = {"error": proc.stderr.strip().rsplit("\n", 1)[-1]}
+                    print(f"{name}: failed\n{proc.stderr}", file=sys.stderr)
+                    continue
+                results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+                # over the setup and all the runs
+                results[name]["api_requests"] = sum(api.requests.values())
+                print(format_result(name, results[name]))
+        finally:
+            api.stop()
+    return results
+
+
+def format_result(
+    name: str, result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None
+) -> str:
+    line = (
+        f"{name:>42}: {result['items']:>5} items, first {result['first'] * 1000:8.1f}ms, "
+        f"best {result['best'] * 1000:8.1f}ms, median {result['median'] * 1000:8.1f}ms"
+    )
+    if baseline and "best" in baseline:
+        line += f" ({result['best'] / baseline['best'] - 1:+.0%} vs baseline)"
+    return line
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[str]:
+    """The benchmarks whose best time is more than threshold (as a fraction)
+    slower than in baseline. Benchmarks missing from either are skipped."""
+    return [
+        name
+        for name, result in results.items()
+        if "best" in result
+        and "best" in baseline.get(name, {})
+        and result["best"] > baseline[name]["best"] * (1 + threshold)
+        and result["best"] - baseline[name]["best"] > MIN_REGRESSION_S
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_scale_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=list(BENCHMARKS),
+        help="only run this benchmark (can be repeated)",
+    )
+    parser.add_argument("-o", "--output", help="write the results to this file")
+    parser.add_argument(
+        "--baseline", help="results of a previous run to compare the results with"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="how much slower than the baseline (as a fraction of it) is a regression",
+    )
+    # what the suite runs each benchmark with
+    parser.add_argument("--run", choices=list(BENCHMARKS), help=argparse.SUPPRESS)
+    parser.add_argument("--context", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.run:
+        context = BenchmarkContext(**json.loads(args.context))
+        print(json.dumps(run_benchmark(args.run, context, args.repeat)))
+        return
+
+    scale = scale_from_args(args)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["scale"] != scale._asdict():
+            sys.exit(
+                f"The baseline was taken at a different scale ({baseline['scale']}), "
+                "its results can't be compared"
+            )
+
+    results = run_benchmarks(args, args.only or list(BENCHMARKS))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "scale": scale._asdict(),
+                    "repeat": args.repeat,
+                    "python": platform.python_version(),
+                    "paasta_tools": __version__,
+                    "benchmarks": results,
+                },
+                f,
+                indent=2,
+            )
+
+    failed = [name for name, result in results.items() if "error" in result]
+    if baseline is not None:
+        print(f"\nCompared with {args.baseline}:")
+        for name, result in results.items():
+            if "error" not in result:
+                print(format_result(name, result, baseline["benchmarks"].get(name)))
+        regressions = find_regressions(results, baseline["benchmarks"], args.threshold)
+        if regressions:
+            print(
+                f"\nMore than {args.threshold:.0%} slower than the baseline: "
+                f"{', '.join(regressions)}"
+            )
+            failed.extend(regressions)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3.10
+"""Fail if importing the modules on the `paasta` startup path gets slow again.
+
+Runs `python -X importtime -c "import <module>"` a few times for each module,
+takes the fastest cumulative time, and compares it with a budget. It also checks
+that dependencies we deliberately load lazily (see paasta_tools.lazy_imports)
+are not imported eagerly by accident, since that is how startup usually regresses.
+
+    python paasta_tools/contrib/check_import_time.py [--repeat 5] [--slack 1.5]
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Set
+
+# Cumulative import time budgets, in milliseconds, measured on a developer laptop.
+IMPORT_BUDGETS_MS = {
+    "paasta_tools.cli.cli": 100,
+    "paasta_tools.utils": 350,
+    "paasta_tools.kubernetes_tools": 900,
+}
+
+# Modules that must not be imported as a side effect of importing the key.
+LAZY_DEPENDENCIES = {
+    "paasta_tools.cli.cli": ["paasta_tools.utils", "kubernetes"],
+    "paasta_tools.utils": ["docker", "ldap3", "networkx", "requests_cache"],
+    "paasta_tools.kubernetes_tools": ["humanfriendly", "networkx"],
+}
+
+
+class ImportTiming(NamedTuple):
+    cumulative_ms: float
+    imported: Set[str]
+
+
+def parse_importtime(output: str) -> Dict[str, float]:
+    """Parse `-X importtime` output into {module: cumulative time in ms}."""
+    timings = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, module = line[len("import time:") :].split("|")
+        timings[module.strip()] = int(cumulative_us) / 1000
+    return timings
+
+
+def time_import(module: str) -> ImportTiming:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = parse_importtime(proc.stderr)
+    return ImportTiming(cumulative_ms=timings[module], imported=set(timings))
+
+
+def check_module(module: str, repeat: int, slack: float) -> List[str]:
+    timings = [time_import(module) for _ in range(repeat)]
+    best_ms = min(timing.cumulative_ms for timing in timings)
+    budget_ms = IMPORT_BUDGETS_MS[module] * slack
+    print(f"{module:>32}: {best_ms:7.1f}ms (budget {budget_ms:.0f}ms)")
+
+    problems = []
+    if best_ms > budget_ms:
+        problems.append(
+            f"{module} took {best_ms:.1f}ms to import (> {budget_ms:.0f}ms)"
+        )
+    for dependency in LAZY_DEPENDENCIES.get(module, []):
+        if dependency in timings[0].imported:
+            problems.append(f"importing {module} eagerly imports {dependency}")
+    return problems
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--slack",
+        type=float,
+        default=1.5,
+        help="Multiply budgets by this factor, to account for slower machines",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    problems = []
+    for module in IMPORT_BUDGETS_MS:
+        problems.extend(check_module(module, args.repeat, args.slack))
+    if problems:
+        raise SystemExit("Startup import time regressed:\n" + "\n".join(problems))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3.10
+"""In-memory stand-in for the Kubernetes API server, for offline benchmarks.
+
+It speaks enough of the REST API for the Kubernetes client (and so KubeClient)
+to create, read, list, patch, replace and delete any kind of object: objects
+are kept as the JSON they were sent as, by resource and namespace, and lists
+can be filtered with label selectors. There is no validation, no defaulting,
+no controllers (nothing ever creates pods) and no watches. Clients find it
+through the kubeconfig written by write_kubeconfig().
+
+    python -m paasta_tools.contrib.fake_kube_api --kubeconfig /tmp/kubeconfig
+"""
+import argparse
+import copy
+import datetime
+import itertools
+import json
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+import yaml
+
+# (api prefix, e.g. "apis/apps/v1", resource, e.g. "deployments")
+Resource = Tuple[str, str]
+# (namespace, None for cluster-scoped objects, name)
+ObjectKey = Tuple[Optional[str], str]
+Response = Tuple[int, Dict[str, Any]]
+
+# "key", "!key", "key=value", "key==value", "key!=value", "key in (a,b)" or
+# "key notin (a,b)"
+_SELECTOR_TERM = re.compile(r"[^,(]+(?:\([^)]*\))?")
+
+
+def parse_path(
+    path: str,
+) -> Tuple[Resource, Optional[str], Optional[str]]:
+    """Split an API path into its resource, namespace and object name (the last
+    two being None when absent). Subresources (e.g. /status) are ignored: they
+    read and write the object itself here."""
+    parts = [part for part in path.split("/") if part]
+    if parts[:1] == ["api"] and len(parts) >= 3:
+        prefix, rest = "/".join(parts[:2]), parts[2:]
+    elif parts[:1] == ["apis"] and len(parts) >= 4:
+        prefix, rest = "/".join(parts[:3]), parts[3:]
+    else:
+        raise ValueError(f"Not a resource path: {path}")
+    namespace = None
+    if len(rest) >= 3 and rest[0] == "namespaces":
+        namespace, rest = rest[1], rest[2:]
+    name = rest[1] if len(rest) > 1 else None
+    return (prefix, rest[0]), namespace, name
+
+
+def match_label_selector(selector: str, labels: Mapping[str, str]) -> bool:
+    for term in _SELECTOR_TERM.findall(selector):
+        term = term.strip()
+        if not term:
+            continue
+        set_based = re.fullmatch(r"(\S+)\s+(in|notin)\s+\((.*)\)", term)
+        if set_based:
+            key, operator, values = set_based.groups()
+            in_values = labels.get(key) in {v.strip() for v in values.split(",")}
+            if in_values != (operator == "in"):
+                return False
+        elif "!=" in term:
+            key, value = term.split("!=", 1)
+            if labels.get(key.strip()) == value.strip():
+                return False
+        elif "=" in term:
+            key, value = re.split("==?", term, maxsplit=1)
+            if labels.get(key.strip()) != value.strip():
+                return False
+        elif term.startswith("!"):
+            if term[1:] in labels:
+                return False
+        elif term not in labels:
+            return False
+    return True
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """Apply a JSON merge patch (RFC 7386), which is also how strategic merge
+    patches are applied here: lists are replaced rather than merged."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def status(code: int, reason: str, message: str) -> Response:
+    return code, {
+        "kind": "Status",
+        "apiVersion": "v1",
+        "metadata": {},
+        "status": "Success" if code < 400 else "Failure",
+        "reason": reason,
+        "message": message,
+        "code": code,
+    }
+
+
+class FakeKubernetesAPI:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._objects: Dict[Resource, Dict[ObjectKey, Dict[str, Any]]] = {}
+        self._resource_versions = itertools.count(1)
+        self._server: Optional[ThreadingHTTPServer] = None
+        # number of requests served, by verb ("list" for GETs of collections)
+        self.requests: Counter[str] = Counter()
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None, "the server isn't started"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def objects(self, resource: Resource) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._objects.get(resource, {}).values())
+
+    def handle(
+        self,
+        verb: str,
+        path: str,
+        query: Mapping[str, List[str]],
+        body: Any = None,
+    ) -> Response:
+        try:
+            resource, namespace, name = parse_path(path)
+        except ValueError as e:
+            return status(404, "NotFound", str(e))
+
+        with self._lock:
+            objects = self._objects.setdefault(resource, {})
+            if verb == "GET" and name is None:
+                self.requests["list"] += 1
+                return self._list(objects, namespace, query)
+            self.requests[verb.lower()] += 1
+
+            if verb == "POST":
+                name = body.get("metadata", {}).get("name")
+                if not name:
+                    return status(422, "Invalid", "metadata.name is required")
+                if (namespace, name) in objects:
+                    return status(409, "AlreadyExists", f"{name} already exists")
+                obj = self._store(objects, namespace, name, body)
+                obj["metadata"][
+                    "uid"
+                ] = f"{resource[1]}-{obj['metadata']['resourceVersion']}"
+                obj["metadata"]["creationTimestamp"] = datetime.datetime.now(
+                    datetime.timezone.utc
+                ).strftime("%Y-%m-%dT%H:%M:%SZ")
+                return 201, obj
+
+            if name is None:
+                return status(405, "MethodNotAllowed", f"{verb} needs an object name")
+            current = objects.get((namespace, name))
+            if current is None:
+                return status(404, "NotFound", f"{name} not found")
+            if verb == "GET":
+                return 200, current
+            if verb == "DELETE":
+                del objects[(namespace, name)]
+                return 200, current
+            if verb == "PUT":
+                new = copy.deepcopy(body)
+            elif isinstance(body, dict):
+                new = merge_patch(current, body)
+            else:
+                # JSON patches (lists of operations) aren't supported: they're
+                # only acknowledged
+                new = copy.deepcopy(current)
+            new.setdefault("metadata", {})
+            for field in ("uid", "creationTimestamp"):
+                if field in current.get("metadata", {}):
+                    new["metadata"][field] = current["metadata"][field]
+            return 200, self._store(objects, namespace, name, new)
+
+    def _store(
+        self,
+        objects: Dict[ObjectKey, Dict[str, Any]],
+        namespace: Optional[str],
+        name: str,
+        obj: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        obj = copy.deepcopy(obj)
+        metadata = obj.setdefault("metadata", {})
+        metadata["name"] = name
+        if namespace is not None:
+            metadata["namespace"] = namespace
+        metadata["resourceVersion"] = str(next(self._resource_versions))
+        objects[(namespace, name)] = obj
+        return obj
+
+    def _list(
+        self,
+        objects: Dict[ObjectKey, Dict[str, Any]],
+        namespace: Optional[str],
+        query: Mapping[str, List[str]],
+    ) -> Response:
+        selector = query.get("labelSelector", [""])[0]
+        items = [
+            obj
+            for (obj_namespace, _), obj in objects.items()
+            if namespace in (None, obj_namespace)
+            and match_label_selector(
+                selector, obj.get("metadata", {}).get("labels") or {}
+            )
+        ]
+        return 200, {
+            "kind": "List",
+            "apiVersion": "v1",
+            "metadata": {"resourceVersion": str(next(self._resource_versions))},
+            "items": items,
+        }
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve the API (on a random port by default) from a background thread,
+        and return its URL."""
+        if self._server is None:
+            self._server = ThreadingHTTPServer((host, port), _Handler)
+            self._server.daemon_threads = True
+            self._server.api = self  # type: ignore
+            threading.Thread(
+                target=self._server.serve_forever, name="fake-kube-api", daemon=True
+            ).start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def write_kubeconfig(self, path: str) -> None:
+        with open(path, "w") as f:
+            yaml.safe_dump(
+                {
+                    "apiVersion": "v1",
+                    "kind": "Config",
+                    "clusters": [{"name": "fake", "cluster": {"server": self.url}}],
+                    "users": [{"name": "fake", "user": {"token": "fake"}}],
+                    "contexts": [
+                        {"name": "fake", "context": {"cluster": "fake", "user": "fake"}}
+                    ],
+                    "current-context": "fake",
+                },
+                f,
+            )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # keeps connections alive, as the Kubernetes client's connection pool expects
+    protocol_version = "HTTP/1.1"
+    # headers and bodies are written separately: don't wait for the ACK of one
+    # to send the other
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _handle(self, verb: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        url = urlsplit(self.path)
+        code, response = self.server.api.handle(  # type: ignore
+            verb, url.path, parse_qs(url.query), body
+        )
+        data = json.dumps(response).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--kubeconfig", required=True)
+    parser.add_argument("--port", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    api = FakeKubernetesAPI()
+    print(f"Serving on {api.start(port=args.port)}, kubeconfig in {args.kubeconfig}")
+    api.write_kubeconfig(args.kubeconfig)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
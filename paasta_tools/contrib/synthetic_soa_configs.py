@@ -0,0 +1,331 @@
+#!/usr/bin/env python3.10
+"""Generate a synthetic soa-configs tree, and a system paasta config to go with it.
+
+Every service gets kubernetes instances (with autotuned defaults) and tron jobs
+in every cluster, secrets, a deploy pipeline, deployments.json and a monitoring
+config, with a mix of the features that make instances expensive to load and
+format (autoscaling with each metrics provider, secret environment variables,
+mesh registrations, persistent volumes). The tree is
+the same for the same scale, so that timings taken against it compare.
+
+    python -m paasta_tools.contrib.synthetic_soa_configs /tmp/synthetic --services 500
+"""
+import argparse
+import json
+import os
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+
+import yaml
+
+DEPLOY_GROUPS = ["canary", "prod.everything"]
+VAULT_ENV = "devc"
+# cycled through by the kubernetes instances of a service, after main and canary
+METRICS_PROVIDERS: List[Dict[str, Any]] = [
+    {"type": "cpu", "setpoint": 0.7},
+    {"type": "uwsgi", "setpoint": 0.8},
+    {"type": "active-requests", "desired_active_requests_per_replica": 5},
+    {"type": "gunicorn", "setpoint": 0.6},
+]
+# one service in this many has an instance with persistent volumes (a StatefulSet)
+STATEFUL_SERVICE_EVERY = 10
+SHARED_SECRET = "shared-credentials"
+
+
+class Scale(NamedTuple):
+    services: int = 50
+    # kubernetes instances of each service, in each cluster
+    instances: int = 4
+    clusters: int = 3
+    # tron jobs of each service, in each cluster
+    tron_jobs: int = 2
+    # secrets of each service
+    secrets: int = 2
+    autotune: bool = True
+
+
+class SyntheticSoaConfigs(NamedTuple):
+    soa_dir: str
+    system_paasta_config_dir: str
+    clusters: List[str]
+    services: List[str]
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = Scale()
+    parser.add_argument("--services", type=int, default=defaults.services)
+    parser.add_argument(
+        "--instances",
+        type=int,
+        default=defaults.instances,
+        help="kubernetes instances per service and cluster",
+    )
+    parser.add_argument("--clusters", type=int, default=defaults.clusters)
+    parser.add_argument(
+        "--tron-jobs",
+        type=int,
+        default=defaults.tron_jobs,
+        help="tron jobs per service and cluster",
+    )
+    parser.add_argument(
+        "--secrets", type=int, default=defaults.secrets, help="secrets per service"
+    )
+    parser.add_argument(
+        "--no-autotune",
+        dest="autotune",
+        action="store_false",
+        help="don't generate autotuned defaults",
+    )
+
+
+def scale_from_args(args: argparse.Namespace) -> Scale:
+    return Scale(**{field: getattr(args, field) for field in Scale._fields})
+
+
+def _write(path: str, data: Any) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        if path.endswith(".json"):
+            json.dump(data, f, indent=2)
+        else:
+            yaml.safe_dump(data, f, default_flow_style=False)
+
+
+def get_instance_names(scale: Scale) -> List[str]:
+    names = ["main", "canary"][: scale.instances]
+    return names + [f"worker{i}" for i in range(scale.instances - len(names))]
+
+
+def get_secret_env(service_index: int, scale: Scale) -> Dict[str, str]:
+    env = {"LOG_LEVEL": "info", "SERVICE_INDEX": str(service_index)}
+    for i in range(scale.secrets):
+        env[f"SECRET_{i}"] = f"SECRET(secret-{i})"
+    if scale.secrets:
+        env["SHARED_SECRET"] = f"SHARED_SECRET({SHARED_SECRET})"
+    return env
+
+
+def get_kubernetes_instance(
+    service: str, service_index: int, instance: str, index: int, scale: Scale
+) -> Dict[str, Any]:
+    config: Dict[str, Any] = {
+        "cpus": 0.1 * (1 + index % 4),
+        "mem": 512 * (1 + index % 3),
+        "deploy_group": "canary" if instance == "canary" else "prod.everything",
+        "env": get_secret_env(service_index, scale),
+    }
+    if instance == "canary":
+        config["instances"] = 1
+        config["registrations"] = [f"{service}.main"]
+        return config
+
+    config["min_instances"] = 2
+    config["max_instances"] = 10 + index
+    if instance == "main":
+        config["registrations"] = [f"{service}.main"]
+        config["healthcheck_mode"] = "http"
+        config["healthcheck_uri"] = "/status"
+        config["autoscaling"] = {"metrics_providers": [METRICS_PROVIDERS[1]]}
+    else:
+        config["cmd"] = f"python -m {service}.{instance}"
+        config["autoscaling"] = {
+            "metrics_providers": [METRICS_PROVIDERS[index % len(METRICS_PROVIDERS)]]
+        }
+    if (
+        service_index % STATEFUL_SERVICE_EVERY == 0
+        and index == scale.instances - 1
+        and instance != "main"
+    ):
+        config["persistent_volumes"] = [
+            {"container_path": "/data", "size": 10, "mode": "RW"}
+        ]
+    return config
+
+
+def get_tron_jobs(service_index: int, scale: Scale) -> Dict[str, Any]:
+    return {
+        f"job{i}": {
+            "node": "paasta",
+            "schedule": f"cron {(service_index + i) % 60} * * * *",
+            "deploy_group": "prod.everything",
+            "actions": {
+                "run": {
+                    "command": f"python -m batch.job{i}",
+                    "cpus": 0.5,
+                    "mem": 1024,
+                    "env": get_secret_env(service_index, scale),
+                },
+                "report": {
+                    "command": f"python -m batch.report{i}",
+                    "requires": ["run"],
+                },
+            },
+        }
+        for i in range(scale.tron_jobs)
+    }
+
+
+def generate_service(
+    soa_dir: str, service: str, service_index: int, clusters: List[str], scale: Scale
+) -> None:
+    service_dir = os.path.join(soa_dir, service)
+    instances = get_instance_names(scale)
+    git_sha = f"{service_index:040x}"
+
+    _write(
+        os.path.join(service_dir, "service.yaml"),
+        {"description": f"Synthetic {service}", "external_link": "example.com"},
+    )
+    _write(
+        os.path.join(service_dir, "monitoring.yaml"),
+        {"team": f"team{service_index % 10}"},
+    )
+    _write(
+        os.path.join(service_dir, "deploy.yaml"),
+        {"pipeline": [{"step": deploy_group} for deploy_group in DEPLOY_GROUPS]},
+    )
+
+    controls = {}
+    for cluster in clusters:
+        _write(
+            os.path.join(service_dir, f"kubernetes-{cluster}.yaml"),
+            {
+                instance: get_kubernetes_instance(
+                    service, service_index, instance, index, scale
+                )
+                for index, instance in enumerate(instances)
+            },
+        )
+        if scale.autotune:
+            _write(
+                os.path.join(
+                    service_dir, "autotuned_defaults", f"kubernetes-{cluster}.yaml"
+                ),
+                {
+                    instance: {"cpus": 0.25 + 0.05 * index, "mem": 640 + 64 * index}
+                    for index, instance in enumerate(instances)
+                },
+            )
+        if scale.tron_jobs:
+            _write(
+                os.path.join(service_dir, f"tron-{cluster}.yaml"),
+                get_tron_jobs(service_index, scale),
+            )
+        for instance in instances:
+            controls[f"{service}:{cluster}.{instance}"] = {
+                "desired_state": "start",
+                "force_bounce": None,
+            }
+
+    _write(
+        os.path.join(service_dir, "deployments.json"),
+        {
+            "v2": {
+                "deployments": {
+                    deploy_group: {
+                        "docker_image": f"services-{service}:paasta-{git_sha}",
+                        "git_sha": git_sha,
+                        "image_version": None,
+                    }
+                    for deploy_group in DEPLOY_GROUPS
+                },
+                "controls": controls,
+            }
+        },
+    )
+
+    for i in range(scale.secrets):
+        _write(
+            os.path.join(service_dir, "secrets", f"secret-{i}.json"),
+            {
+                "environments": {
+                    VAULT_ENV: {"ciphertext": f"{service}-{i}", "signature": "sig"}
+                }
+            },
+        )
+
+
+def generate_system_paasta_config(
+    config_dir: str, clusters: List[str], scale: Scale
+) -> None:
+    configs: Dict[str, Dict[str, Any]] = {
+        "clusters": {"cluster": clusters[0], "clusters": clusters},
+        "api_endpoints": {
+            "api_endpoints": {
+                cluster: f"http://paasta-{cluster}.example.com" for cluster in clusters
+            }
+        },
+        "docker_registry": {"docker_registry": "docker-registry.example.com:443"},
+        "logs": {"log_writer": {"driver": "null"}},
+        "vault": {
+            "vault_environment": VAULT_ENV,
+            "vault_cluster_map": {cluster: VAULT_ENV for cluster in clusters},
+            "secret_provider": "paasta_tools.secret_providers.vault",
+        },
+        "volumes": {
+            "volumes": [
+                {"hostPath": "/nail/srv", "containerPath": "/nail/srv", "mode": "RO"}
+            ],
+            "hacheck_sidecar_volumes": [],
+        },
+        "autotune": {
+            "auto_config_instance_types_enabled": {"kubernetes": scale.autotune}
+        },
+        "tron": {
+            "tron_use_k8s": True,
+            "tron": {"cluster_name": clusters[0], "url": "http://tron.example.com"},
+        },
+    }
+    for name, config in configs.items():
+        _write(os.path.join(config_dir, f"{name}.json"), config)
+
+
+def generate(root: str, scale: Scale) -> SyntheticSoaConfigs:
+    """Write a soa-configs tree of the given scale in root/soa_configs, and a
+    system paasta config for it in root/etc_paasta."""
+    soa_dir = os.path.join(root, "soa_configs")
+    system_paasta_config_dir = os.path.join(root, "etc_paasta")
+    clusters = [f"cluster{i}" for i in range(scale.clusters)]
+    services = [f"service{i:04d}" for i in range(scale.services)]
+
+    generate_system_paasta_config(system_paasta_config_dir, clusters, scale)
+    for cluster in clusters:
+        _write(
+            os.path.join(soa_dir, "tron", cluster, "MASTER.yaml"),
+            {"ssh_options": {"agent": False}, "jobs": {}},
+        )
+    if scale.secrets:
+        _write(
+            os.path.join(soa_dir, "_shared", "secrets", f"{SHARED_SECRET}.json"),
+            {"environments": {VAULT_ENV: {"ciphertext": "shared", "signature": "sig"}}},
+        )
+    for index, service in enumerate(services):
+        generate_service(soa_dir, service, index, clusters, scale)
+    return SyntheticSoaConfigs(
+        soa_dir=soa_dir,
+        system_paasta_config_dir=system_paasta_config_dir,
+        clusters=clusters,
+        services=services,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("output_dir")
+    add_scale_arguments(parser)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    synthetic = generate(args.output_dir, scale_from_args(args))
+    print(
+        f"Wrote {len(synthetic.services)} services in {synthetic.soa_dir}; "
+        f"export PAASTA_SYSTEM_CONFIG_DIR={synthetic.system_paasta_config_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import collections
+import functools
 import os
 import socket
 from typing import AbstractSet
@@ -29,6 +30,7 @@ from typing import Sequence
 from typing import Set
 from typing import Tuple
 
+import cachetools.func
 import requests
 from kubernetes.client import V1Pod
 from mypy_extensions import TypedDict
@@ -105,6 +107,22 @@ def are_namespaces_up_in_eds(
     return True
 
 
+# How long (seconds) one check cycle reuses a single /clusters fetch.
+ENVOY_CLUSTERS_SNAPSHOT_TTL = 5
+
+
+@functools.lru_cache(maxsize=1)
+def _get_envoy_admin_session() -> requests.Session:
+    """Returns a requests.Session shared by every Envoy admin query in this
+    process, so that connections to each Envoy host are pooled and reused."""
+    # retry 3 times
+    envoy_admin_request = requests.Session()
+    envoy_admin_request.headers.update({"User-Agent": get_user_agent()})
+    envoy_admin_request.mount("http://", requests.adapters.HTTPAdapter(max_retries=3))
+    envoy_admin_request.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
+    return envoy_admin_request
+
+
 def retrieve_envoy_clusters(
     envoy_host: str, envoy_admin_port: int, envoy_admin_endpoint_format: str
 ) -> Dict[str, Any]:
@@ -112,12 +130,8 @@ def retrieve_envoy_clusters(
         host=envoy_host, port=envoy_admin_port, endpoint="clusters?format=json"
     )
 
-    # timeout after 3 seconds and retry 3 times
-    envoy_admin_request = requests.Session()
-    envoy_admin_request.headers.update({"User-Agent": get_user_agent()})
-    envoy_admin_request.mount("http://", requests.adapters.HTTPAdapter(max_retries=3))
-    envoy_admin_request.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
-    envoy_admin_response = envoy_admin_request.get(envoy_uri, timeout=3)
+    # timeout after 3 seconds
+    envoy_admin_response = _get_envoy_admin_session().get(envoy_uri, timeout=3)
     return envoy_admin_response.json()
 
 
@@ -199,6 +213,112 @@ def get_backends(
     )
 
 
+class EnvoyClustersSnapshot:
+    """The egress clusters listed in a single fetch of Envoy's /clusters
+    endpoint, indexed by service so that any number of per-service lookups can
+    be answered without going back to Envoy."""
+
+    def __init__(self, clusters_info: Mapping[str, Any]) -> None:
+        self.casper_endpoints = get_casper_endpoints(clusters_info)
+        self._clusters_by_service: Dict[str, List[Mapping[str, Any]]] = {}
+        for cluster_status in clusters_info["cluster_statuses"]:
+            if "host_statuses" in cluster_status:
+                if cluster_status["name"].endswith(".egress_cluster"):
+                    service_name = cluster_status["name"][: -len(".egress_cluster")]
+                    self._clusters_by_service.setdefault(service_name, []).append(
+                        cluster_status
+                    )
+
+    def get_backends(
+        self,
+        services: Optional[Collection[str]],
+        resolve_hostnames: bool = True,
+    ) -> Dict[str, List[Tuple[EnvoyBackend, bool]]]:
+        """Returns the backends of the given services. A new EnvoyBackend is
+        built on every call, so callers are free to modify what is returned.
+
+        :param services: If None, return backends for all services, otherwise only return backends for these particular
+                         services.
+        :param resolve_hostnames: whether to look up the hostname of each backend
+        """
+        if services is None:
+            service_names: Iterable[str] = self._clusters_by_service.keys()
+        else:
+            service_names = [
+                service_name
+                for service_name in dict.fromkeys(services)
+                if service_name in self._clusters_by_service
+            ]
+
+        backends: DefaultDict[
+            str, List[Tuple[EnvoyBackend, bool]]
+        ] = collections.defaultdict(list)
+        for service_name in service_names:
+            for cluster_status in self._clusters_by_service[service_name]:
+                backends[service_name] += self._get_cluster_backends(
+                    service_name, cluster_status, resolve_hostnames
+                )
+        return backends
+
+    def _get_cluster_backends(
+        self,
+        service_name: str,
+        cluster_status: Mapping[str, Any],
+        resolve_hostnames: bool,
+    ) -> List[Tuple[EnvoyBackend, bool]]:
+        cluster_backends = []
+        casper_endpoint_found = False
+        for host_status in cluster_status["host_statuses"]:
+            address = host_status["address"]["socket_address"]["address"]
+            port_value = host_status["address"]["socket_address"]["port_value"]
+
+            # Check if this endpoint is actually a casper backend
+            # If so, omit from the service's list of backends
+            if not service_name.startswith("spectre."):
+                if (address, port_value) in self.casper_endpoints:
+                    casper_endpoint_found = True
+                    continue
+
+            hostname = address
+            if resolve_hostnames:
+                try:
+                    hostname = socket.gethostbyaddr(address)[0].split(".")[0]
+                except socket.herror:
+                    # Default to the raw IP address if we can't lookup the hostname
+                    pass
+
+            cluster_backends.append(
+                (
+                    EnvoyBackend(
+                        address=address,
+                        port_value=port_value,
+                        hostname=hostname,
+                        eds_health_status=host_status["health_status"][
+                            "eds_health_status"
+                        ],
+                        weight=host_status["weight"],
+                    ),
+                    casper_endpoint_found,
+                )
+            )
+        return cluster_backends
+
+
+@cachetools.func.ttl_cache(maxsize=256, ttl=ENVOY_CLUSTERS_SNAPSHOT_TTL)
+def get_envoy_clusters_snapshot(
+    envoy_host: str, envoy_admin_port: int, envoy_admin_endpoint_format: str
+) -> EnvoyClustersSnapshot:
+    """Fetches and indexes Envoy's clusters, reusing the result of any identical
+    fetch made in the last ENVOY_CLUSTERS_SNAPSHOT_TTL seconds."""
+    return EnvoyClustersSnapshot(
+        retrieve_envoy_clusters(
+            envoy_host=envoy_host,
+            envoy_admin_port=envoy_admin_port,
+            envoy_admin_endpoint_format=envoy_admin_endpoint_format,
+        )
+    )
+
+
 def get_multiple_backends(
     services: Optional[Sequence[str]],
     envoy_host: str,
@@ -216,64 +336,12 @@ def get_multiple_backends(
     :returns backends: A list of dicts representing the backends of all
                        services or the requested service
     """
-    clusters_info = retrieve_envoy_clusters(
+    snapshot = get_envoy_clusters_snapshot(
         envoy_host=envoy_host,
         envoy_admin_port=envoy_admin_port,
         envoy_admin_endpoint_format=envoy_admin_endpoint_format,
     )
-
-    casper_endpoints = get_casper_endpoints(clusters_info)
-
-    backends: DefaultDict[
-        str, List[Tuple[EnvoyBackend, bool]]
-    ] = collections.defaultdict(list)
-    for cluster_status in clusters_info["cluster_statuses"]:
-        if "host_statuses" in cluster_status:
-            if cluster_status["name"].endswith(".egress_cluster"):
-                service_name = cluster_status["name"][: -len(".egress_cluster")]
-
-                if services is None or service_name in services:
-                    cluster_backends = []
-                    casper_endpoint_found = False
-                    for host_status in cluster_status["host_statuses"]:
-                        address = host_status["address"]["socket_address"]["address"]
-                        port_value = host_status["address"]["socket_address"][
-                            "port_value"
-                        ]
-
-                        # Check if this endpoint is actually a casper backend
-                        # If so, omit from the service's list of backends
-                        if not service_name.startswith("spectre."):
-                            if (address, port_value) in casper_endpoints:
-                                casper_endpoint_found = True
-                                continue
-
-                        hostname = address
-                        if resolve_hostnames:
-                            try:
-                                hostname = socket.gethostbyaddr(address)[0].split(".")[
-                                    0
-                                ]
-                            except socket.herror:
-                                # Default to the raw IP address if we can't lookup the hostname
-                                pass
-
-                        cluster_backends.append(
-                            (
-                                EnvoyBackend(
-                                    address=address,
-                                    port_value=port_value,
-                                    hostname=hostname,
-                                    eds_health_status=host_status["health_status"][
-                                        "eds_health_status"
-                                    ],
-                                    weight=host_status["weight"],
-                                ),
-                                casper_endpoint_found,
-                            )
-                        )
-                    backends[service_name] += cluster_backends
-    return backends
+    return snapshot.get_backends(services, resolve_hostnames=resolve_hostnames)
 
 
 def match_backends_and_pods(
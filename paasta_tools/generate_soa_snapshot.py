@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Generate (or refresh) the snapshot of a soa-configs directory that paasta uses
+to list clusters and instances without globbing and parsing every yaml file.
+
+Run this wherever soa-configs are synced to a host; once the snapshot exists,
+paasta keeps it up to date on its own as service directories change.
+"""
+import argparse
+import logging
+import os
+
+from paasta_tools.utils import DEFAULT_SOA_DIR
+from paasta_tools.utils import SoaSnapshot
+from paasta_tools.utils import get_soa_snapshot_path
+
+log = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "-d",
+        "--soa-dir",
+        dest="soa_dir",
+        default=DEFAULT_SOA_DIR,
+        help="define a different soa config directory",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore any existing snapshot and re-read every file",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", dest="verbose")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    soa_dir = os.path.abspath(args.soa_dir)
+    path = get_soa_snapshot_path(soa_dir)
+
+    snapshot = None
+    if not args.rebuild and os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                snapshot = SoaSnapshot.loads(soa_dir, f.read())
+        except (OSError, ValueError, TypeError, EOFError) as e:
+            log.warning(f"Rebuilding unusable snapshot {path}: {e}")
+
+    if snapshot is None:
+        snapshot = SoaSnapshot.build(soa_dir)
+    else:
+        snapshot.refresh()
+
+    snapshot.save(path)
+    log.info(f"Wrote snapshot of {len(snapshot.services)} services to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 import asyncio
+import inspect
 import logging
+import time
 from asyncio.tasks import Task
 from collections import defaultdict
 from enum import Enum
+from functools import partial
 from typing import Any
+from typing import Awaitable
 from typing import DefaultDict
 from typing import Dict
 from typing import Iterable
@@ -14,15 +18,18 @@ from typing import Optional
 from typing import Sequence
 from typing import Set
 from typing import Tuple
+from typing import TypeVar
 from typing import Union
 
 import pytz
 import requests.exceptions
 from kubernetes.client import V1Container
+from kubernetes.client import V1ContainerStatus
 from kubernetes.client import V1ControllerRevision
 from kubernetes.client import V1Pod
 from kubernetes.client import V1Probe
 from kubernetes.client import V1ReplicaSet
+from kubernetes.client import V2HorizontalPodAutoscaler
 from kubernetes.client.rest import ApiException
 from mypy_extensions import TypedDict
 
@@ -40,6 +47,7 @@ from paasta_tools.async_utils import to_blocking
 from paasta_tools.cli.utils import LONG_RUNNING_INSTANCE_TYPE_HANDLERS
 from paasta_tools.instance.hpa_metrics_parser import HPAMetricsDict
 from paasta_tools.instance.hpa_metrics_parser import HPAMetricsParser
+from paasta_tools.kubernetes.bounce_tracker import BounceTracker
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
 from paasta_tools.kubernetes_tools import get_pod_event_messages
 from paasta_tools.kubernetes_tools import get_tail_lines_for_kubernetes_container
@@ -51,6 +59,7 @@ from paasta_tools.long_running_service_tools import (
 )
 from paasta_tools.smartstack_tools import KubeSmartstackEnvoyReplicationChecker
 from paasta_tools.smartstack_tools import match_backends_and_pods
+from paasta_tools.utils import DeploymentVersion
 from paasta_tools.utils import calculate_tail_lines
 
 INSTANCE_TYPES_CR = {
@@ -81,6 +90,18 @@ INSTANCE_TYPE_CR_ID = dict(
 
 logger = logging.getLogger(__name__)
 
+# Bounds on the container log and pod event reads of a verbose status request,
+# see PodDetailsFetcher.
+POD_DETAILS_CONCURRENCY = 32
+POD_DETAILS_BUDGET_S = 15.0
+LOG_TAIL_CACHE_TTL_S = 10.0
+LOG_TAIL_CACHE_MAX_SIZE = 10000
+
+# (pod uid, container, restart count, previous, tail lines) -> (fetched at, tail lines)
+_log_tail_cache: Dict[Tuple, Tuple[float, MutableMapping[str, Any]]] = {}
+
+T = TypeVar("T")
+
 
 class ServiceMesh(Enum):
     SMARTSTACK = "smartstack"
@@ -214,6 +235,12 @@ async def autoscaling_status(
         name=job_config.get_sanitised_deployment_name(),
         namespace=namespace,
     )
+    return autoscaling_status_from_hpa(hpa)
+
+
+def autoscaling_status_from_hpa(
+    hpa: Optional[V2HorizontalPodAutoscaler],
+) -> KubernetesAutoscalingStatusDict:
     if hpa is None:
         return KubernetesAutoscalingStatusDict(
             min_instances=-1,
@@ -260,27 +287,125 @@ async def autoscaling_status(
     )
 
 
+class PodDetailsFetcher:
+    """Fetches container log tails and pod events for the pods of one status
+    request.
+
+    With enough verbosity, a status request reads the logs of every container of
+    every pod (and their previous logs, if they restarted recently) and the
+    events of every pod: for a large service that is hundreds of apiserver
+    reads. This runs them concurrently, but with at most `concurrency` in
+    flight, and gives up on the ones that haven't completed `budget` seconds
+    after the request started, so that a slow apiserver makes the answer
+    partial rather than late.
+
+    Log tails are also cached for a few seconds, so that repeatedly checking on
+    a service (e.g. with `watch paasta status -vv`) doesn't read them every time.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        num_tail_lines: int,
+        concurrency: int = POD_DETAILS_CONCURRENCY,
+        budget: float = POD_DETAILS_BUDGET_S,
+    ) -> None:
+        self.client = client
+        self.num_tail_lines = num_tail_lines
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._deadline = time.monotonic() + budget
+
+    async def _within_budget(self, coro: Awaitable[T]) -> T:
+        async def bounded() -> T:
+            async with self._semaphore:
+                return await coro
+
+        remaining = self._deadline - time.monotonic()
+        if remaining <= 0:
+            if inspect.iscoroutine(coro):
+                coro.close()
+            raise asyncio.TimeoutError()
+        return await asyncio.wait_for(bounded(), timeout=remaining)
+
+    async def tail_lines(
+        self, pod: V1Pod, container: V1ContainerStatus, previous: bool = False
+    ) -> MutableMapping[str, Any]:
+        key = (
+            pod.metadata.uid,
+            container.name,
+            container.restart_count,
+            previous,
+            self.num_tail_lines,
+        )
+        now = time.monotonic()
+        cached = _log_tail_cache.get(key)
+        if cached is not None and now - cached[0] < LOG_TAIL_CACHE_TTL_S:
+            return cached[1]
+
+        try:
+            tail_lines = await self._within_budget(
+                get_tail_lines_for_kubernetes_container(
+                    self.client,
+                    pod,
+                    container,
+                    self.num_tail_lines,
+                    previous=previous,
+                )
+            )
+        except asyncio.TimeoutError:
+            logs = "previous logs" if previous else "logs"
+            return {
+                "error_message": f"Could not fetch {logs} for {container.name}",
+                "partial": True,
+            }
+
+        if pod.metadata.uid is not None:
+            _cache_log_tail(key, tail_lines, now)
+        return tail_lines
+
+    async def event_messages(
+        self, pod: V1Pod, max_age_in_seconds: Optional[int] = None
+    ) -> List[Dict]:
+        """:raises asyncio.TimeoutError: if the events didn't arrive in time"""
+        return await self._within_budget(
+            get_pod_event_messages(
+                self.client, pod, max_age_in_seconds=max_age_in_seconds
+            )
+        )
+
+
+def _cache_log_tail(
+    key: Tuple, tail_lines: MutableMapping[str, Any], fetched_at: float
+) -> None:
+    if len(_log_tail_cache) >= LOG_TAIL_CACHE_MAX_SIZE:
+        for cached_key, (cached_at, _) in list(_log_tail_cache.items()):
+            if fetched_at - cached_at >= LOG_TAIL_CACHE_TTL_S:
+                _log_tail_cache.pop(cached_key, None)
+        if len(_log_tail_cache) >= LOG_TAIL_CACHE_MAX_SIZE:
+            return
+    _log_tail_cache[key] = (fetched_at, tail_lines)
+
+
 async def pod_info(
     pod: V1Pod,
     client: kubernetes_tools.KubeClient,
     num_tail_lines: int,
+    fetcher: Optional[PodDetailsFetcher] = None,
 ) -> Dict[str, Any]:
+    if fetcher is None:
+        fetcher = PodDetailsFetcher(client, num_tail_lines)
     container_statuses = pod.status.container_statuses or []
+    events_task = asyncio.ensure_future(fetcher.event_messages(pod))
+    tail_lines = await asyncio.gather(
+        *[fetcher.tail_lines(pod, container) for container in container_statuses]
+    )
     try:
-        pod_event_messages = await get_pod_event_messages(client, pod)
+        pod_event_messages = await events_task
     except asyncio.TimeoutError:
         pod_event_messages = [{"error": "Could not fetch events for pod"}]
     containers = [
-        dict(
-            name=container.name,
-            tail_lines=await get_tail_lines_for_kubernetes_container(
-                client,
-                pod,
-                container,
-                num_tail_lines,
-            ),
-        )
-        for container in container_statuses
+        dict(name=container.name, tail_lines=container_tail_lines)
+        for container, container_tail_lines in zip(container_statuses, tail_lines)
     ]
     return {
         "name": pod.metadata.name,
@@ -320,8 +445,9 @@ async def job_status(
 
     if verbose > 0:
         num_tail_lines = calculate_tail_lines(verbose)
+        fetcher = PodDetailsFetcher(client, num_tail_lines)
         kstatus["pods"] = await asyncio.gather(
-            *[pod_info(pod, client, num_tail_lines) for pod in pod_list]
+            *[pod_info(pod, client, num_tail_lines, fetcher) for pod in pod_list]
         )
 
     for replicaset in replicaset_list:
@@ -588,8 +714,16 @@ def filter_actually_running_replicasets(
 
 
 def bounce_status(
-    service: str, instance: str, settings: Any, is_eks: bool = False
+    service: str,
+    instance: str,
+    settings: Any,
+    is_eks: bool = False,
+    bounce_tracker: Optional[BounceTracker] = None,
 ) -> Dict[str, Any]:
+    """
+    :param bounce_tracker: if given, and in sync with the cluster, the app and
+        its versions are looked up there rather than fetched from Kubernetes
+    """
     status: Dict[str, Any] = {}
     # this should be the only place where it matters that we use eks_tools.
     # apart from loading config files, we should be using kubernetes_tools
@@ -616,6 +750,32 @@ def bounce_status(
     desired_state = job_config.get_desired_state()
     status["desired_state"] = desired_state
 
+    if bounce_tracker is not None and bounce_tracker.synced:
+        progress = bounce_tracker.get(
+            namespace=job_config.get_kubernetes_namespace(),
+            service=job_config.service,
+            instance=job_config.instance,
+        )
+        if progress is None:
+            # like reading the app would, so that the API relays it
+            raise ApiException(
+                status=404,
+                reason=f"No Deployment or StatefulSet for {service}.{instance}",
+            )
+        status["running_instance_count"] = progress.ready_replicas
+        deploy_status = kubernetes_tools.get_deploy_status_from_replicas(
+            ready_replicas=progress.ready_replicas,
+            updated_replicas=progress.updated_replicas,
+            replicas=progress.replicas,
+            desired_instances=(
+                expected_instance_count if desired_state != "stop" else 0
+            ),
+        )
+        status["deploy_status"] = kubernetes_tools.KubernetesDeployStatus.tostring(
+            deploy_status
+        )
+        return _add_active_versions(status, progress.active_versions)
+
     kube_client = settings.kubernetes_client
     if kube_client is None:
         raise RuntimeError("Could not load Kubernetes client!")
@@ -658,6 +818,14 @@ def bounce_status(
     active_versions = kubernetes_tools.get_active_versions_for_service(
         [app, *version_objects],
     )
+    return _add_active_versions(status, active_versions)
+
+
+def _add_active_versions(
+    status: Dict[str, Any],
+    active_versions: Iterable[Tuple[DeploymentVersion, str]],
+) -> Dict[str, Any]:
+    active_versions = list(active_versions)
     status["active_shas"] = [
         (deployment_version.sha, config_sha)
         for deployment_version, config_sha in active_versions
@@ -882,6 +1050,7 @@ async def get_pod_status_tasks_by_replicaset(
     verbose: int,
 ) -> Dict[str, List["asyncio.Future[Dict[str, Any]]"]]:
     num_tail_lines = calculate_tail_lines(verbose)
+    fetcher = PodDetailsFetcher(client, num_tail_lines)
     pods = await pods_task
     tasks_by_replicaset: DefaultDict[
         str, List["asyncio.Future[Dict[str, Any]]"]
@@ -890,7 +1059,7 @@ async def get_pod_status_tasks_by_replicaset(
         for owner_reference in pod.metadata.owner_references:
             if owner_reference.kind == "ReplicaSet":
                 pod_status_task = asyncio.create_task(
-                    get_pod_status(pod, backends_task, client, num_tail_lines)
+                    get_pod_status(pod, backends_task, client, num_tail_lines, fetcher)
                 )
                 tasks_by_replicaset[owner_reference.name].append(pod_status_task)
 
@@ -968,12 +1137,15 @@ async def get_pod_status(
     backends_task: "asyncio.Future[Dict[str, Any]]",
     client: Any,
     num_tail_lines: int,
+    fetcher: Optional[PodDetailsFetcher] = None,
 ) -> Dict[str, Any]:
+    if fetcher is None:
+        fetcher = PodDetailsFetcher(client, num_tail_lines)
     events_task = asyncio.create_task(
-        get_pod_event_messages(client, pod, max_age_in_seconds=900)
+        fetcher.event_messages(pod, max_age_in_seconds=900)
     )
     containers_task = asyncio.create_task(
-        get_pod_containers(pod, client, num_tail_lines)
+        get_pod_containers(pod, client, num_tail_lines, fetcher)
     )
 
     await asyncio.gather(events_task, containers_task, return_exceptions=True)
@@ -1036,9 +1208,19 @@ def get_container_healthcheck(pod_ip: str, probe: V1Probe) -> Dict[str, Any]:
 
 
 async def get_pod_containers(
-    pod: V1Pod, client: Any, num_tail_lines: int
+    pod: V1Pod,
+    client: Any,
+    num_tail_lines: int,
+    fetcher: Optional[PodDetailsFetcher] = None,
 ) -> List[Dict[str, Any]]:
+    if fetcher is None:
+        fetcher = PodDetailsFetcher(client, num_tail_lines)
     containers = []
+    # (container, key, fetch) of the log tails of all the containers, which are
+    # fetched concurrently once we've looked at every container
+    log_fetches: List[
+        Tuple[Dict[str, Any], str, Awaitable[MutableMapping[str, Any]]]
+    ] = []
     statuses = pod.status.container_statuses or []
     container_specs = pod.spec.containers
     for cs in statuses:
@@ -1093,42 +1275,6 @@ async def get_pod_containers(
 
                     last_timestamp = this_state["started_at"].timestamp()
 
-        async def get_tail_lines() -> MutableMapping[str, Any]:
-            try:
-                return await get_tail_lines_for_kubernetes_container(
-                    client,
-                    pod,
-                    cs,
-                    num_tail_lines,
-                    previous=False,
-                )
-            except asyncio.TimeoutError:
-                return {"error_message": f"Could not fetch logs for {cs.name}"}
-
-        # get previous log lines as well if this container restarted recently
-        async def get_previous_tail_lines() -> MutableMapping[str, Any]:
-            if state == "running" and kubernetes_tools.recent_container_restart(
-                cs.restart_count, last_state, last_timestamp
-            ):
-                try:
-                    return await get_tail_lines_for_kubernetes_container(
-                        client,
-                        pod,
-                        cs,
-                        num_tail_lines,
-                        previous=True,
-                    )
-                except asyncio.TimeoutError:
-                    return {
-                        "error_message": f"Could not fetch previous logs for {cs.name}"
-                    }
-            return None
-
-        tail_lines, previous_tail_lines = await asyncio.gather(
-            asyncio.ensure_future(get_tail_lines()),
-            asyncio.ensure_future(get_previous_tail_lines()),
-        )
-
         containers.append(
             {
                 "name": cs.name,
@@ -1141,13 +1287,29 @@ async def get_pod_containers(
                 "last_message": last_message,
                 "last_duration": last_duration,
                 "last_timestamp": last_timestamp,
-                "previous_tail_lines": previous_tail_lines,
+                "previous_tail_lines": None,
                 "timestamp": start_timestamp,
                 "healthcheck_grace_period": healthcheck_grace_period,
                 "healthcheck_cmd": healthcheck,
-                "tail_lines": tail_lines,
+                "tail_lines": None,
             }
         )
+        log_fetches.append((containers[-1], "tail_lines", fetcher.tail_lines(pod, cs)))
+        # get previous log lines as well if this container restarted recently
+        if state == "running" and kubernetes_tools.recent_container_restart(
+            cs.restart_count, last_state, last_timestamp
+        ):
+            log_fetches.append(
+                (
+                    containers[-1],
+                    "previous_tail_lines",
+                    fetcher.tail_lines(pod, cs, previous=True),
+                )
+            )
+
+    fetched = await asyncio.gather(*[fetch for _, _, fetch in log_fetches])
+    for (container, key, _), tail_lines in zip(log_fetches, fetched):
+        container[key] = tail_lines
     return containers
 
 
@@ -1160,6 +1322,7 @@ async def get_pod_status_tasks_by_sha_and_readiness(
     Tuple[str, str], DefaultDict[bool, List["asyncio.Future[Dict[str, Any]]"]]
 ]:
     num_tail_lines = calculate_tail_lines(verbose)
+    fetcher = PodDetailsFetcher(client, num_tail_lines)
     tasks_by_sha_and_readiness: DefaultDict[
         Tuple[str, str], DefaultDict[bool, List["asyncio.Future[Dict[str, Any]]"]]
     ] = defaultdict(lambda: defaultdict(list))
@@ -1168,7 +1331,7 @@ async def get_pod_status_tasks_by_sha_and_readiness(
         config_sha = pod.metadata.labels["paasta.yelp.com/config_sha"]
         is_ready = kubernetes_tools.is_pod_ready(pod)
         pod_status_task = asyncio.create_task(
-            get_pod_status(pod, backends_task, client, num_tail_lines)
+            get_pod_status(pod, backends_task, client, num_tail_lines, fetcher)
         )
         tasks_by_sha_and_readiness[(git_sha, config_sha)][is_ready].append(
             pod_status_task
@@ -1381,13 +1544,21 @@ def instance_status(
         )
 
     if instance_type in INSTANCE_TYPES_CR:
-        status[instance_type] = cr_status(
+        get_cr_status = partial(
+            cr_status,
             service=service,
             instance=instance,
             instance_type=instance_type,
             verbose=verbose,
             kube_client=settings.kubernetes_client,
         )
+        if settings.status_poller is None:
+            status[instance_type] = get_cr_status()
+        else:
+            polled_status, age = settings.status_poller.get(
+                ("cr", instance_type, service, instance), get_cr_status
+            )
+            status[instance_type] = {**polled_status, "age": int(age)}
 
     if instance_type in INSTANCE_TYPES_K8S:
         if use_new:
@@ -0,0 +1,186 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A read-only Kubernetes API client built on aiohttp, for the async status paths
+of paasta-api.
+
+The official client is synchronous, so the async helpers in kubernetes_tools
+used to run it with asyncio.to_thread: each in-flight request then holds a
+thread from the default executor (and a urllib3 connection), which caps how
+many requests a worker can have in flight. This client issues the requests on
+the event loop itself, over a connection pool shared by all of them.
+
+It reuses the configuration (host, TLS and credentials) of a KubeClient, and
+only implements what the status paths need: GETs returning either plain JSON
+dicts or, for callers that expect them, the usual kubernetes.client models.
+"""
+import asyncio
+import json
+import ssl
+import weakref
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Mapping
+from typing import Optional
+from typing import Union
+
+import aiohttp
+from kubernetes.client.rest import ApiException
+
+if TYPE_CHECKING:
+    from paasta_tools.kubernetes_tools import KubeClient
+
+DEFAULT_POOL_SIZE = 100
+DEFAULT_TIMEOUT_S = 10.0
+
+Params = Mapping[str, Union[str, int]]
+
+
+class _RawResponse:
+    """The bits of a urllib3 response that ApiClient.deserialize looks at."""
+
+    def __init__(self, data: str) -> None:
+        self.data = data
+
+
+class AsyncKubeClient:
+    def __init__(
+        self,
+        kube_client: "KubeClient",
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT_S,
+    ) -> None:
+        """
+        :param kube_client: the (synchronous) client whose configuration to use
+        :param pool_size: how many connections to the API server to keep open,
+            shared by all the requests made from a given event loop
+        :param timeout: default timeout of a request, in seconds
+        """
+        self.api_client = kube_client.api_client
+        self.configuration = self.api_client.configuration
+        self.host = self.configuration.host.rstrip("/")
+        self.user_agent = self.api_client.user_agent
+        self.pool_size = pool_size
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._ssl_context = self._build_ssl_context()
+        # aiohttp sessions are bound to the loop they were created on, and
+        # paasta-api runs one loop per worker thread (see async_utils.run_sync)
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _build_ssl_context(self) -> Union[ssl.SSLContext, bool]:
+        if not self.host.startswith("https"):
+            return False
+        if not self.configuration.verify_ssl:
+            return False
+        context = ssl.create_default_context(cafile=self.configuration.ssl_ca_cert)
+        if self.configuration.cert_file:
+            context.load_cert_chain(
+                self.configuration.cert_file, self.configuration.key_file
+            )
+        if not self.configuration.assert_hostname:
+            context.check_hostname = False
+        return context
+
+    def _session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size, ssl=self._ssl_context
+                ),
+                timeout=self.timeout,
+                headers={"User-Agent": self.user_agent},
+            )
+            self._sessions[loop] = session
+        return session
+
+    def _headers(self, accept: str) -> Dict[str, str]:
+        headers = {"Accept": accept}
+        # this goes through refresh_api_key_hook, so expiring tokens are renewed
+        for auth in self.configuration.auth_settings().values():
+            if auth["in"] == "header" and auth["value"]:
+                headers[auth["key"]] = auth["value"]
+        return headers
+
+    async def _get(
+        self,
+        path: str,
+        params: Optional[Params],
+        accept: str,
+        timeout: Optional[float],
+    ) -> str:
+        kwargs: Dict[str, Any] = {}
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        async with self._session().get(
+            f"{self.host}{path}",
+            params=params,
+            headers=self._headers(accept),
+            proxy=self.configuration.proxy,
+            **kwargs,
+        ) as response:
+            body = await response.text()
+            if response.status >= 400:
+                # the same exception the synchronous client raises, so that
+                # callers can handle errors from either client the same way
+                error = ApiException(status=response.status, reason=response.reason)
+                error.body = body
+                error.headers = response.headers
+                raise error
+            return body
+
+    async def get_json(
+        self,
+        path: str,
+        params: Optional[Params] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """GET path from the API server, and return the decoded JSON response.
+
+        :param path: e.g. /api/v1/namespaces/paasta/pods
+        :param params: query parameters, e.g. {"labelSelector": "app=foo"}
+        :param timeout: overrides the default timeout for this request
+        """
+        return json.loads(await self._get(path, params, "application/json", timeout))
+
+    async def get_object(
+        self,
+        path: str,
+        response_type: str,
+        params: Optional[Params] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Like get_json, but return the same model the synchronous client would,
+        e.g. a V1PodList for response_type="V1PodList"."""
+        body = await self._get(path, params, "application/json", timeout)
+        return self.api_client.deserialize(_RawResponse(body), response_type)
+
+    async def get_text(
+        self,
+        path: str,
+        params: Optional[Params] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """GET a plain text resource, e.g. a container's logs."""
+        return await self._get(path, params, "*/*", timeout)
+
+    async def close(self) -> None:
+        """Close the session of the running loop."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
@@ -0,0 +1,292 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Access to the autoscaling overrides ConfigMap, which maps "$service.$instance"
+keys to JSON-encoded overrides of min/max_instances that expire at some point
+(see setup_kubernetes_job.get_hpa_overrides for the format).
+
+Overrides tend to be set all at once (e.g. for most of a cluster during a load
+event), and used to each read and patch the whole ConfigMap. The store here:
+
+* keeps the last version of the ConfigMap it saw, and only fetches it again
+  once it's older than a TTL, with a single request for all the threads that
+  want a fresh one at the same time. Entries that did not change since the
+  previous version are not parsed again.
+* coalesces the updates requested while another one is in flight into a
+  single patch, which is conditional on the resourceVersion the updates were
+  computed from: if somebody else changed the ConfigMap in the meantime, the
+  updates are computed again from a fresh version.
+* indexes the entries by expiry time, so that cleaning up only looks at (and
+  patches away) the expired ones.
+"""
+import bisect
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from kubernetes.client import V1ConfigMap
+from kubernetes.client.rest import ApiException
+
+from paasta_tools.kubernetes_tools import AUTOSCALING_OVERRIDES_CONFIGMAP_NAME
+from paasta_tools.kubernetes_tools import AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE
+from paasta_tools.kubernetes_tools import KubeClient
+from paasta_tools.kubernetes_tools import get_namespaced_configmap
+from paasta_tools.kubernetes_tools import get_or_create_namespaced_configmap
+from paasta_tools.kubernetes_tools import patch_namespaced_configmap
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TTL_S = 5.0
+MAX_WRITE_ATTEMPTS = 5
+
+Override = Dict[str, Any]
+# given the current override of a key (None if there is none), returns the new
+# one (None to remove it)
+OverrideUpdate = Callable[[Optional[Override]], Optional[Override]]
+
+
+class _Snapshot(NamedTuple):
+    resource_version: Optional[str]
+    fetched_at: float
+    raw: Mapping[str, str]
+    # None for entries that can't be parsed
+    overrides: Mapping[str, Optional[Override]]
+    # (expire_after, key), sorted; entries without a valid expire_after sort first
+    expiry_index: List[Tuple[float, str]]
+
+
+class _PendingUpdate(NamedTuple):
+    key: str
+    update: OverrideUpdate
+    result: "Future[Optional[Override]]"
+
+
+def parse_override(override_json: str) -> Optional[Override]:
+    try:
+        override = json.loads(override_json)
+    except json.JSONDecodeError:
+        return None
+    return override if isinstance(override, dict) else None
+
+
+def get_expire_after(override: Optional[Override]) -> float:
+    """When override expires, as a unix timestamp; -inf if it's not valid."""
+    if override is None:
+        return float("-inf")
+    try:
+        return float(override["expire_after"])
+    except (KeyError, TypeError, ValueError):
+        return float("-inf")
+
+
+class AutoscalingOverridesStore:
+    def __init__(
+        self,
+        kube_client: KubeClient,
+        ttl: float = DEFAULT_TTL_S,
+        name: str = AUTOSCALING_OVERRIDES_CONFIGMAP_NAME,
+        namespace: str = AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE,
+    ) -> None:
+        """
+        :param ttl: how long, in seconds, reads can be answered from the last
+            version of the ConfigMap seen
+        """
+        self.kube_client = kube_client
+        self.ttl = ttl
+        self.name = name
+        self.namespace = namespace
+        self._snapshot: Optional[_Snapshot] = None
+        self._read_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: List[_PendingUpdate] = []
+
+    def _store(self, configmap: Optional[V1ConfigMap]) -> _Snapshot:
+        previous = self._snapshot
+        raw: Mapping[str, str] = (configmap.data or {}) if configmap else {}
+        overrides: Dict[str, Optional[Override]] = {}
+        for key, override_json in raw.items():
+            if previous is not None and previous.raw.get(key) == override_json:
+                overrides[key] = previous.overrides[key]
+            else:
+                overrides[key] = parse_override(override_json)
+        snapshot = _Snapshot(
+            resource_version=(
+                configmap.metadata.resource_version if configmap else None
+            ),
+            fetched_at=time.monotonic(),
+            raw=raw,
+            overrides=overrides,
+            expiry_index=sorted(
+                (get_expire_after(override), key) for key, override in overrides.items()
+            ),
+        )
+        self._snapshot = snapshot
+        return snapshot
+
+    def _get_snapshot(self, max_age: Optional[float] = None) -> _Snapshot:
+        max_age = self.ttl if max_age is None else max_age
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.fetched_at < max_age:
+            return snapshot
+
+        requested_at = time.monotonic()
+        with self._read_lock:
+            snapshot = self._snapshot
+            # another thread fetched it while we were waiting for the lock
+            if snapshot is not None and snapshot.fetched_at >= requested_at:
+                return snapshot
+            return self._store(
+                get_namespaced_configmap(
+                    name=self.name,
+                    namespace=self.namespace,
+                    kube_client=self.kube_client,
+                )
+            )
+
+    def read(self, max_age: Optional[float] = None) -> Mapping[str, Optional[Override]]:
+        """Return all the overrides, by "$service.$instance" key (None for the ones
+        that can't be parsed). The result is shared, and must not be modified.
+
+        :param max_age: how old, in seconds, the answer can be; defaults to the
+            store's TTL. 0 always fetches the ConfigMap.
+        """
+        return self._get_snapshot(max_age).overrides
+
+    def expired(self, now: float, max_age: Optional[float] = None) -> List[str]:
+        """Keys of the overrides that expired before now, or that aren't valid."""
+        expiry_index = self._get_snapshot(max_age).expiry_index
+        return [
+            key
+            for _, key in expiry_index[: bisect.bisect_left(expiry_index, (now, ""))]
+        ]
+
+    def update(self, key: str, update: OverrideUpdate) -> Optional[Override]:
+        """Set the override of key to update(the current override of key), and
+        return it.
+
+        update may be called more than once (with fresher current overrides), and
+        exceptions it raises are raised here without affecting other updates.
+        """
+        return self.update_many({key: update})[key]
+
+    def update_many(
+        self, updates: Mapping[str, OverrideUpdate]
+    ) -> Dict[str, Optional[Override]]:
+        pending = [
+            _PendingUpdate(key, update, Future()) for key, update in updates.items()
+        ]
+        with self._pending_lock:
+            self._pending.extend(pending)
+        with self._write_lock:
+            # unless the thread we waited for already wrote our updates along with its own
+            if not all(p.result.done() for p in pending):
+                self._flush()
+        return {p.key: p.result.result() for p in pending}
+
+    def _flush(self) -> None:
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+
+        try:
+            snapshot = self._get_snapshot()
+            for attempt in range(1, MAX_WRITE_ATTEMPTS + 1):
+                if snapshot.resource_version is None:
+                    configmap, created = get_or_create_namespaced_configmap(
+                        self.name,
+                        namespace=self.namespace,
+                        kube_client=self.kube_client,
+                    )
+                    if created:
+                        log.info(f"Created the {self.name} ConfigMap")
+                    snapshot = self._store(configmap)
+
+                results: List[Tuple[_PendingUpdate, Optional[Override]]] = []
+                overrides = dict(snapshot.overrides)
+                changes: Dict[str, Optional[str]] = {}
+                for p in pending:
+                    try:
+                        new_override = p.update(overrides.get(p.key))
+                    except Exception as e:
+                        p.result.set_exception(e)
+                        continue
+                    results.append((p, new_override))
+                    if new_override is None:
+                        if p.key in overrides:
+                            del overrides[p.key]
+                            # a null removes the key
+                            changes[p.key] = None
+                    elif new_override != overrides.get(p.key):
+                        overrides[p.key] = new_override
+                        changes[p.key] = json.dumps(new_override)
+                pending = [p for p, _ in results]
+
+                if changes:
+                    try:
+                        snapshot = self._store(
+                            patch_namespaced_configmap(
+                                name=self.name,
+                                namespace=self.namespace,
+                                body={
+                                    # makes the patch fail if the ConfigMap changed
+                                    # since the version we computed the changes from
+                                    "metadata": {
+                                        "resourceVersion": snapshot.resource_version
+                                    },
+                                    "data": changes,
+                                },
+                                kube_client=self.kube_client,
+                            )
+                        )
+                    except ApiException as e:
+                        if e.status != 409 or attempt == MAX_WRITE_ATTEMPTS:
+                            raise
+                        log.info(
+                            f"{self.name} ConfigMap changed while updating it "
+                            f"(attempt {attempt}/{MAX_WRITE_ATTEMPTS}), retrying"
+                        )
+                        snapshot = self._get_snapshot(max_age=0)
+                        continue
+
+                for p, new_override in results:
+                    p.result.set_result(new_override)
+                return
+        except Exception as e:
+            for p in pending:
+                if not p.result.done():
+                    p.result.set_exception(e)
+
+    def remove_expired(self, now: float) -> List[str]:
+        """Remove the overrides that expired before now (or that aren't valid),
+        with a single patch, and return their keys."""
+
+        def remove_if_expired(override: Optional[Override]) -> Optional[Override]:
+            # it may have been set again since we found it expired
+            return None if get_expire_after(override) < now else override
+
+        expired = self.expired(now, max_age=0)
+        if not expired:
+            return []
+        removed = self.update_many({key: remove_if_expired for key in expired})
+        return [key for key, override in removed.items() if override is None]
@@ -0,0 +1,355 @@
+# Copyright 2015-2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+In-memory bounce progress of every PaaSTA instance of a cluster, for the
+paasta-api server.
+
+Looking up the bounce status of an instance takes fetching its Deployment (or
+StatefulSet) and listing its ReplicaSets (or ControllerRevisions), and
+mark-for-deployment asks for it for every instance being deployed, every few
+seconds. The tracker here lists each of these kinds of objects once, then
+watches them, and keeps a summary of the bounce of each instance up to date as
+they change: looking one up (or all the ones in progress) doesn't make any
+request to Kubernetes.
+"""
+import logging
+import threading
+from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from kubernetes.client.rest import ApiException
+from kubernetes.watch import Watch
+
+from paasta_tools.kubernetes_tools import KubeClient
+from paasta_tools.kubernetes_tools import KubernetesDeployStatus
+from paasta_tools.kubernetes_tools import get_active_versions_for_service
+from paasta_tools.kubernetes_tools import get_deploy_status_from_replicas
+from paasta_tools.utils import DeploymentVersion
+
+log = logging.getLogger(__name__)
+
+DEPLOYMENT = "Deployment"
+STATEFUL_SET = "StatefulSet"
+REPLICA_SET = "ReplicaSet"
+CONTROLLER_REVISION = "ControllerRevision"
+# AppsV1Api methods listing each kind of object in all namespaces
+LIST_FUNCTIONS = {
+    DEPLOYMENT: "list_deployment_for_all_namespaces",
+    STATEFUL_SET: "list_stateful_set_for_all_namespaces",
+    REPLICA_SET: "list_replica_set_for_all_namespaces",
+    CONTROLLER_REVISION: "list_controller_revision_for_all_namespaces",
+}
+# ReplicaSets and ControllerRevisions get these from their pod template
+LABEL_SELECTOR = "paasta.yelp.com/service,paasta.yelp.com/instance"
+WATCH_TIMEOUT_S = 300
+RETRY_DELAY_S = 5.0
+
+# (namespace, service, instance)
+BounceKey = Tuple[str, str, str]
+Version = Tuple[DeploymentVersion, str]
+
+
+class _AppState(NamedTuple):
+    desired_replicas: int
+    replicas: int
+    ready_replicas: int
+    updated_replicas: Optional[int]
+    version: Optional[Version]
+
+
+class _VersionState(NamedTuple):
+    version: Optional[Version]
+    replicas: int
+    # ReplicaSets scaled down to 0 stay around as the Deployment's history
+    running: bool
+
+
+_ObjectState = Union[_AppState, _VersionState]
+
+
+class BounceProgress(NamedTuple):
+    namespace: str
+    service: str
+    instance: str
+    desired_replicas: int
+    replicas: int
+    ready_replicas: int
+    updated_replicas: Optional[int]
+    # pods of the version the Deployment (or StatefulSet) is bouncing to, and
+    # of any other one
+    new_version_replicas: int
+    old_version_replicas: int
+    active_versions: FrozenSet[Version]
+
+    @property
+    def deploy_status(self) -> int:
+        """KubernetesDeployStatus of the app, against the number of replicas it
+        wants (rather than the number of instances configured in soa-configs)."""
+        return get_deploy_status_from_replicas(
+            ready_replicas=self.ready_replicas,
+            updated_replicas=self.updated_replicas,
+            replicas=self.replicas,
+            desired_instances=self.desired_replicas,
+        )
+
+    @property
+    def in_flight(self) -> bool:
+        return len(self.active_versions) > 1 or self.deploy_status in (
+            KubernetesDeployStatus.Waiting,
+            KubernetesDeployStatus.Deploying,
+        )
+
+
+def _get_version(obj: Any) -> Optional[Version]:
+    return next(iter(get_active_versions_for_service([obj])), None)
+
+
+def _get_state(kind: str, obj: Any) -> _ObjectState:
+    if kind in (DEPLOYMENT, STATEFUL_SET):
+        return _AppState(
+            desired_replicas=obj.spec.replicas or 0,
+            replicas=obj.status.replicas or 0,
+            ready_replicas=obj.status.ready_replicas or 0,
+            updated_replicas=obj.status.updated_replicas,
+            version=_get_version(obj),
+        )
+    elif kind == REPLICA_SET:
+        return _VersionState(
+            version=_get_version(obj),
+            replicas=obj.status.replicas or 0,
+            # see instance.kubernetes.filter_actually_running_replicasets
+            running=bool(obj.spec.replicas or obj.status.ready_replicas),
+        )
+    else:
+        # ControllerRevisions don't say how many pods they have
+        return _VersionState(version=_get_version(obj), replicas=0, running=True)
+
+
+def _get_key(obj: Any) -> Optional[BounceKey]:
+    labels = obj.metadata.labels or {}
+    service = labels.get("paasta.yelp.com/service")
+    instance = labels.get("paasta.yelp.com/instance")
+    if service is None or instance is None:
+        return None
+    return obj.metadata.namespace, service, instance
+
+
+def summarize(
+    key: BounceKey, objects: Dict[str, Dict[str, _ObjectState]]
+) -> Optional[BounceProgress]:
+    """Bounce progress of an instance, from the state of its objects by kind and
+    uid; None if it has no Deployment or StatefulSet."""
+    if objects.get(DEPLOYMENT):
+        app_kind, version_kind = DEPLOYMENT, REPLICA_SET
+    elif objects.get(STATEFUL_SET):
+        app_kind, version_kind = STATEFUL_SET, CONTROLLER_REVISION
+    else:
+        return None
+    app = next(iter(objects[app_kind].values()))
+    assert isinstance(app, _AppState)
+    versions = [
+        state
+        for state in objects.get(version_kind, {}).values()
+        if isinstance(state, _VersionState) and state.running
+    ]
+
+    if app_kind == DEPLOYMENT:
+        new_version_replicas = sum(
+            state.replicas for state in versions if state.version == app.version
+        )
+        old_version_replicas = sum(
+            state.replicas for state in versions if state.version != app.version
+        )
+    else:
+        new_version_replicas = min(app.updated_replicas or 0, app.replicas)
+        old_version_replicas = app.replicas - new_version_replicas
+
+    namespace, service, instance = key
+    return BounceProgress(
+        namespace=namespace,
+        service=service,
+        instance=instance,
+        desired_replicas=app.desired_replicas,
+        replicas=app.replicas,
+        ready_replicas=app.ready_replicas,
+        updated_replicas=app.updated_replicas,
+        new_version_replicas=new_version_replicas,
+        old_version_replicas=old_version_replicas,
+        active_versions=frozenset(
+            version
+            for version in [app.version, *(state.version for state in versions)]
+            if version is not None
+        ),
+    )
+
+
+class BounceTracker:
+    def __init__(self, kube_client: KubeClient) -> None:
+        self.kube_client = kube_client
+        self._lock = threading.Lock()
+        # key -> kind -> uid -> state
+        self._objects: Dict[BounceKey, Dict[str, Dict[str, _ObjectState]]] = {}
+        # kind -> uid -> key, to find the objects being deleted or relisted
+        self._keys: Dict[str, Dict[str, BounceKey]] = {
+            kind: {} for kind in LIST_FUNCTIONS
+        }
+        self._progress: Dict[BounceKey, BounceProgress] = {}
+        self._in_flight: Set[BounceKey] = set()
+        # kinds that were listed, and are being watched
+        self._synced: Set[str] = set()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def synced(self) -> bool:
+        """Whether all the kinds of objects are listed and being watched, i.e.
+        whether the progress here can be trusted."""
+        return len(self._synced) == len(LIST_FUNCTIONS)
+
+    def get(
+        self, namespace: str, service: str, instance: str
+    ) -> Optional[BounceProgress]:
+        """The bounce progress of an instance; None if it has no Deployment or
+        StatefulSet in namespace."""
+        return self._progress.get((namespace, service, instance))
+
+    def in_flight(self) -> List[BounceProgress]:
+        """The bounces in progress: instances running more than one version, or
+        without as many ready (and updated) replicas as they want."""
+        with self._lock:
+            return [self._progress[key] for key in sorted(self._in_flight)]
+
+    def _remove(self, kind: str, uid: str) -> Optional[BounceKey]:
+        key = self._keys[kind].pop(uid, None)
+        if key is not None:
+            objects = self._objects[key]
+            del objects[kind][uid]
+            if not objects[kind]:
+                del objects[kind]
+            if not objects:
+                del self._objects[key]
+        return key
+
+    def _add(self, kind: str, obj: Any) -> Optional[BounceKey]:
+        key = _get_key(obj)
+        if key is not None:
+            uid = obj.metadata.uid
+            self._objects.setdefault(key, {}).setdefault(kind, {})[uid] = _get_state(
+                kind, obj
+            )
+            self._keys[kind][uid] = key
+        return key
+
+    def _update(self, keys: Iterable[Optional[BounceKey]]) -> None:
+        for key in keys:
+            if key is None:
+                continue
+            progress = summarize(key, self._objects.get(key, {}))
+            if progress is None:
+                self._progress.pop(key, None)
+                self._in_flight.discard(key)
+                continue
+            self._progress[key] = progress
+            if progress.in_flight:
+                self._in_flight.add(key)
+            else:
+                self._in_flight.discard(key)
+
+    def apply(self, kind: str, event_type: str, obj: Any) -> None:
+        """Take a watch event for an object of kind into account."""
+        with self._lock:
+            changed = {self._remove(kind, obj.metadata.uid)}
+            if event_type != "DELETED":
+                changed.add(self._add(kind, obj))
+            self._update(changed)
+
+    def replace(self, kind: str, objs: Iterable[Any]) -> None:
+        """Replace all the objects of kind with objs, e.g. after listing them."""
+        with self._lock:
+            changed = {self._remove(kind, uid) for uid in list(self._keys[kind])}
+            changed.update(self._add(kind, obj) for obj in objs)
+            self._update(changed)
+
+    def _list(self, kind: str) -> str:
+        """List all the objects of kind, and return the resourceVersion to watch
+        them from."""
+        response = getattr(self.kube_client.deployments, LIST_FUNCTIONS[kind])(
+            label_selector=LABEL_SELECTOR
+        )
+        self.replace(kind, response.items)
+        with self._lock:
+            self._synced.add(kind)
+        return response.metadata.resource_version
+
+    def _watch(self, kind: str, resource_version: str) -> None:
+        """Apply the changes to the objects of kind since resource_version, until
+        the tracker is stopped or resource_version is too old to watch from."""
+        watch = Watch()
+        try:
+            while not self._stopped.is_set():
+                for event in watch.stream(
+                    getattr(self.kube_client.deployments, LIST_FUNCTIONS[kind]),
+                    label_selector=LABEL_SELECTOR,
+                    resource_version=resource_version,
+                    allow_watch_bookmarks=True,
+                    timeout_seconds=WATCH_TIMEOUT_S,
+                ):
+                    if event["type"] in ("ADDED", "MODIFIED", "DELETED"):
+                        self.apply(kind, event["type"], event["object"])
+                    if self._stopped.is_set():
+                        return
+                # the watch timed out: resume from the last change (or bookmark) seen
+                resource_version = watch.resource_version
+        except ApiException as e:
+            if e.status != 410:
+                raise
+            log.info(f"{kind} watch expired, listing them again")
+        finally:
+            watch.stop()
+
+    def _run(self, kind: str) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._watch(kind, self._list(kind))
+            except Exception:
+                log.warning(
+                    f"Error while tracking {kind}s, retrying in {RETRY_DELAY_S}s",
+                    exc_info=True,
+                )
+                with self._lock:
+                    self._synced.discard(kind)
+                self._stopped.wait(RETRY_DELAY_S)
+
+    def start(self) -> None:
+        if not self._threads:
+            for kind in LIST_FUNCTIONS:
+                thread = threading.Thread(
+                    target=self._run,
+                    args=(kind,),
+                    name=f"bounce-tracker-{kind}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stopped.set()
@@ -13,6 +13,7 @@
 # limitations under the License.
 import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from typing import List
 from typing import Optional
@@ -31,6 +32,7 @@ from kubernetes.client import V1RoleRef
 from kubernetes.client import V1ServiceAccount
 from kubernetes.client import V1TokenRequestSpec
 from kubernetes.client.exceptions import ApiException
+from kubernetes.watch import Watch
 
 from paasta_tools.adhoc_tools import load_adhoc_job_config
 from paasta_tools.eks_tools import EksDeploymentConfig
@@ -52,6 +54,7 @@ REMOTE_RUN_JOB_LABEL = "remote-run"
 POD_OWNER_LABEL = paasta_prefixed("pod_owner")
 TOOLBOX_MOCK_SERVICE = "prod-toolbox"
 DEFAULT_MAX_DURATION_LIMIT = 8 * 60 * 60  # 8 hours
+MAX_READY_WAIT = 60  # seconds an API request may block waiting for a pod
 
 
 class RemoteRunError(Exception):
@@ -198,6 +201,7 @@ def remote_run_ready(
     job_name: str,
     user: str,
     is_toolbox: bool,
+    wait: int = 0,
 ) -> RemoteRunOutcome:
     """Check if remote-run pod is ready
 
@@ -206,6 +210,7 @@ def remote_run_ready(
     :param str cluster: paasta cluster
     :param str job_name: name of the remote-run job to check
     :param bool is_toolbox: requested job is for a toolbox container
+    :param int wait: if positive, wait up to this many seconds for the pod to be ready
     :return: job status, with pod info
     """
     kube_client = KubeClient()
@@ -216,7 +221,12 @@ def remote_run_ready(
     )
     namespace = deployment_config.get_namespace()
 
-    pod = find_job_pod(kube_client, namespace, job_name)
+    if wait > 0:
+        pod = wait_for_job_pod(
+            kube_client, namespace, job_name, timeout=min(wait, MAX_READY_WAIT)
+        )
+    else:
+        pod = find_job_pod(kube_client, namespace, job_name)
     if not pod:
         return {"status": 404, "message": "No pod found"}
     if pod.status.phase == "Running":
@@ -307,12 +317,27 @@ def remote_run_token(
         raise RemoteRunError(f"Pod for {job_name} not found")
     pod_name = pod.metadata.name
     logger.info(f"Generating temporary service account token for {pod_name}")
-    service_account = create_remote_run_service_account(
-        kube_client, namespace, pod_name, user
-    )
-    role = create_pod_scoped_role(kube_client, namespace, pod_name, user)
-    bind_role_to_service_account(kube_client, namespace, service_account, role, user)
-    return create_temp_exec_token(kube_client, namespace, service_account)
+    # The service account and role are independent, and so are the binding and
+    # the token (permissions are only checked when the token is used), so create
+    # them two at a time.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        role_future = executor.submit(
+            create_pod_scoped_role, kube_client, namespace, pod_name, user
+        )
+        service_account = create_remote_run_service_account(
+            kube_client, namespace, pod_name, user
+        )
+        binding_future = executor.submit(
+            bind_role_to_service_account,
+            kube_client,
+            namespace,
+            service_account,
+            role_future.result(),
+            user,
+        )
+        token = create_temp_exec_token(kube_client, namespace, service_account)
+        binding_future.result()
+    return token
 
 
 def generate_toolbox_deployment(
@@ -359,6 +384,16 @@ def generate_toolbox_deployment(
     )
 
 
+def get_job_pod_selector(job_name: str, job_label: str = REMOTE_RUN_JOB_LABEL) -> str:
+    """Label selector matching the pod of a remote-run job
+
+    :param str job_name: remote-run job name
+    :param str job_label: job type label value
+    :return: label selector
+    """
+    return f"{paasta_prefixed(JOB_TYPE_LABEL_NAME)}={job_label},job-name={job_name}"
+
+
 def find_job_pod(
     kube_client: KubeClient,
     namespace: str,
@@ -374,14 +409,10 @@ def find_job_pod(
     :param int retries: maximum number of attemps
     :return: pod object if found
     """
-    selectors = (
-        f"{paasta_prefixed(JOB_TYPE_LABEL_NAME)}={job_label}",
-        f"job-name={job_name}",
-    )
     for _ in range(retries):
         pod_list = kube_client.core.list_namespaced_pod(
             namespace,
-            label_selector=",".join(selectors),
+            label_selector=get_job_pod_selector(job_name, job_label),
         )
         if pod_list.items:
             return pod_list.items[0]
@@ -389,6 +420,55 @@ def find_job_pod(
     return None
 
 
+def wait_for_job_pod(
+    kube_client: KubeClient,
+    namespace: str,
+    job_name: str,
+    timeout: int,
+    job_label: str = REMOTE_RUN_JOB_LABEL,
+) -> Optional[V1Pod]:
+    """Wait for the pod of a remote-run job to be running, by watching it
+    rather than polling.
+
+    :param KubeClient kube_client: Kubernetes client
+    :param str namespace: the pod namespace
+    :param str job_name: remote-run job name
+    :param int timeout: maximum number of seconds to wait
+    :return: the running pod, or its latest state if it did not start in time
+    """
+    label_selector = get_job_pod_selector(job_name, job_label)
+    pod_list = kube_client.core.list_namespaced_pod(
+        namespace, label_selector=label_selector
+    )
+    pod = pod_list.items[0] if pod_list.items else None
+    if pod and (pod.status.phase != "Pending" or pod.metadata.deletion_timestamp):
+        return pod
+
+    watch = Watch()
+    try:
+        for event in watch.stream(
+            kube_client.core.list_namespaced_pod,
+            namespace,
+            label_selector=label_selector,
+            resource_version=pod_list.metadata.resource_version,
+            timeout_seconds=timeout,
+        ):
+            if event["type"] == "DELETED":
+                # the pod was terminating, let the caller start a new one
+                return None
+            pod = event["object"]
+            if pod.status.phase != "Pending":
+                return pod
+    except ApiException as e:
+        if e.status != 410:
+            raise
+        # our resource version is too old to watch from, just check again
+        return find_job_pod(kube_client, namespace, job_name, job_label, retries=1)
+    finally:
+        watch.stop()
+    return pod
+
+
 def create_temp_exec_token(
     kube_client: KubeClient,
     namespace: str,
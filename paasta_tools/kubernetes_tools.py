@@ -20,12 +20,16 @@ import logging
 import math
 import os
 import re
+import threading
+import weakref
+from collections import OrderedDict
 from datetime import datetime
 from datetime import timezone
 from enum import Enum
 from functools import lru_cache
 from inspect import currentframe
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import Collection
 from typing import Container
@@ -45,7 +49,6 @@ from typing import cast
 
 import requests
 import service_configuration_lib
-from humanfriendly import parse_size
 from kubernetes import client as kube_client
 from kubernetes import config as kube_config
 from kubernetes.client import CoreV1Event
@@ -139,6 +142,7 @@ from paasta_tools.async_utils import async_timeout
 from paasta_tools.async_utils import run_sync
 from paasta_tools.autoscaling.utils import AutoscalingParamsDict
 from paasta_tools.autoscaling.utils import MetricsProviderDict
+from paasta_tools.lazy_imports import lazy_import
 from paasta_tools.long_running_service_tools import METRICS_PROVIDER_ACTIVE_REQUESTS
 from paasta_tools.long_running_service_tools import METRICS_PROVIDER_CPU
 from paasta_tools.long_running_service_tools import METRICS_PROVIDER_GUNICORN
@@ -185,6 +189,14 @@ from paasta_tools.utils import load_system_paasta_config
 from paasta_tools.utils import load_v2_deployments_json
 from paasta_tools.utils import time_cache
 
+# Only needed to parse resource quantities, so don't pay for it on every import.
+if TYPE_CHECKING:
+    import humanfriendly
+
+    from paasta_tools.kubernetes.async_client import AsyncKubeClient
+else:
+    humanfriendly = lazy_import("humanfriendly")
+
 log = logging.getLogger(__name__)
 
 KUBE_CONFIG_PATH = "/etc/kubernetes/admin.conf"
@@ -236,6 +248,12 @@ PROJECTED_SA_TOKEN_PATH = "token"
 AUTOSCALING_OVERRIDES_CONFIGMAP_NAME = "paasta-autoscaling-overrides"
 AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE = "paasta"
 
+# get_autoscaling_metric_spec is called for every instance on every run of
+# setup_kubernetes_job, and most instances' autoscaling config hardly ever changes
+HPA_SPEC_CACHE_MAX_SIZE = 4096
+_hpa_spec_cache: "OrderedDict[str, V2HorizontalPodAutoscaler]" = OrderedDict()
+_hpa_spec_cache_lock = threading.Lock()
+
 
 # conditions is None when creating a new HPA, but the client raises an error in that case.
 # For detail, https://github.com/kubernetes-client/python/issues/553
@@ -643,6 +661,24 @@ class KubeClient:
         self.jsonify = self.api_client.sanitize_for_serialization
 
 
+# Native async clients registered for some KubeClients (by paasta-api, see
+# paasta_tools.kubernetes.async_client), which the async helpers below use instead
+# of running the synchronous client in a thread.
+_async_kube_clients: "weakref.WeakKeyDictionary[KubeClient, AsyncKubeClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def set_async_kube_client(
+    kube_client: KubeClient, async_client: "AsyncKubeClient"
+) -> None:
+    _async_kube_clients[kube_client] = async_client
+
+
+def get_async_kube_client(kube_client: KubeClient) -> Optional["AsyncKubeClient"]:
+    return _async_kube_clients.get(kube_client)
+
+
 def allowlist_denylist_to_requirements(
     allowlist: DeployWhitelist, denylist: DeployBlacklist
 ) -> List[Tuple[str, str, List[str]]]:
@@ -923,6 +959,8 @@ class KubernetesDeploymentConfig(LongRunningServiceConfig):
     ) -> Optional[V2HorizontalPodAutoscaler]:
         # Returns None if an HPA should not be attached based on the config,
         # or the config is invalid.
+        # The returned HPA is shared with other callers asking for the same spec,
+        # and must not be modified.
 
         if self.get_desired_state() == "stop":
             return None
@@ -930,6 +968,55 @@ class KubernetesDeploymentConfig(LongRunningServiceConfig):
         if not self.is_autoscaling_enabled():
             return None
 
+        cache_key = self.get_autoscaling_metric_spec_cache_key(
+            name, namespace, min_instances_override, max_instances_override
+        )
+        with _hpa_spec_cache_lock:
+            hpa = _hpa_spec_cache.get(cache_key)
+            if hpa is not None:
+                _hpa_spec_cache.move_to_end(cache_key)
+                return hpa
+
+        hpa = self._build_autoscaling_metric_spec(
+            name, namespace, min_instances_override, max_instances_override
+        )
+        if hpa is not None:
+            with _hpa_spec_cache_lock:
+                _hpa_spec_cache[cache_key] = hpa
+                if len(_hpa_spec_cache) > HPA_SPEC_CACHE_MAX_SIZE:
+                    _hpa_spec_cache.popitem(last=False)
+        return hpa
+
+    def get_autoscaling_metric_spec_cache_key(
+        self,
+        name: str,
+        namespace: str,
+        min_instances_override: Optional[int],
+        max_instances_override: Optional[int],
+    ) -> str:
+        """Everything the HPA built by get_autoscaling_metric_spec depends on."""
+        return json.dumps(
+            [
+                self.service,
+                self.instance,
+                name,
+                namespace,
+                min_instances_override or self.get_min_instances(),
+                max_instances_override or self.get_max_instances(),
+                self.get_pool(),
+                self.config_dict.get("autoscaling"),
+            ],
+            sort_keys=True,
+            default=str,
+        )
+
+    def _build_autoscaling_metric_spec(
+        self,
+        name: str,
+        namespace: str,
+        min_instances_override: Optional[int],
+        max_instances_override: Optional[int],
+    ) -> Optional[V2HorizontalPodAutoscaler]:
         autoscaling_params = self.get_autoscaling_params()
         if autoscaling_params["metrics_providers"][0]["decision_policy"] == "bespoke":
             return None
@@ -3297,13 +3384,24 @@ async def get_tail_lines_for_kubernetes_container(
 
         try:
             if num_tail_lines > 0:
-                log = kube_client.core.read_namespaced_pod_log(
-                    name=pod.metadata.name,
-                    namespace=pod.metadata.namespace,
-                    container=container.name,
-                    tail_lines=num_tail_lines,
-                    previous=previous,
-                )
+                async_client = get_async_kube_client(kube_client)
+                if async_client is not None:
+                    log = await async_client.get_text(
+                        f"/api/v1/namespaces/{pod.metadata.namespace}/pods/{pod.metadata.name}/log",
+                        params={
+                            "container": container.name,
+                            "tailLines": num_tail_lines,
+                            "previous": str(previous).lower(),
+                        },
+                    )
+                else:
+                    log = kube_client.core.read_namespaced_pod_log(
+                        name=pod.metadata.name,
+                        namespace=pod.metadata.namespace,
+                        container=container.name,
+                        tail_lines=num_tail_lines,
+                        previous=previous,
+                    )
                 tail_lines["stdout"].extend(log.split("\n"))
         except ApiException as e:
             # there is a potential race condition in which a pod's containers
@@ -3640,11 +3738,22 @@ def list_matching_deployments_in_all_namespaces(
 async def replicasets_for_service_instance(
     service: str, instance: str, kube_client: KubeClient, namespace: str
 ) -> Sequence[V1ReplicaSet]:
-    response = await asyncio.to_thread(
-        kube_client.deployments.list_namespaced_replica_set,
-        label_selector=f"paasta.yelp.com/service={service},paasta.yelp.com/instance={instance}",
-        namespace=namespace,
+    label_selector = (
+        f"paasta.yelp.com/service={service},paasta.yelp.com/instance={instance}"
     )
+    async_client = get_async_kube_client(kube_client)
+    if async_client is not None:
+        response = await async_client.get_object(
+            f"/apis/apps/v1/namespaces/{namespace}/replicasets",
+            "V1ReplicaSetList",
+            params={"labelSelector": label_selector},
+        )
+    else:
+        response = await asyncio.to_thread(
+            kube_client.deployments.list_namespaced_replica_set,
+            label_selector=label_selector,
+            namespace=namespace,
+        )
     return response.items
 
 
@@ -3652,11 +3761,22 @@ async def replicasets_for_service_instance(
 async def controller_revisions_for_service_instance(
     service: str, instance: str, kube_client: KubeClient, namespace: str
 ) -> Sequence[V1ControllerRevision]:
-    response = await asyncio.to_thread(
-        kube_client.deployments.list_namespaced_controller_revision,
-        label_selector=f"paasta.yelp.com/service={service},paasta.yelp.com/instance={instance}",
-        namespace=namespace,
+    label_selector = (
+        f"paasta.yelp.com/service={service},paasta.yelp.com/instance={instance}"
     )
+    async_client = get_async_kube_client(kube_client)
+    if async_client is not None:
+        response = await async_client.get_object(
+            f"/apis/apps/v1/namespaces/{namespace}/controllerrevisions",
+            "V1ControllerRevisionList",
+            params={"labelSelector": label_selector},
+        )
+    else:
+        response = await asyncio.to_thread(
+            kube_client.deployments.list_namespaced_controller_revision,
+            label_selector=label_selector,
+            namespace=namespace,
+        )
     return response.items
 
 
@@ -3664,11 +3784,22 @@ async def controller_revisions_for_service_instance(
 async def pods_for_service_instance(
     service: str, instance: str, kube_client: KubeClient, namespace: str
 ) -> Sequence[V1Pod]:
-    response = await asyncio.to_thread(
-        kube_client.core.list_namespaced_pod,
-        label_selector=f"paasta.yelp.com/service={service},paasta.yelp.com/instance={instance}",
-        namespace=namespace,
+    label_selector = (
+        f"paasta.yelp.com/service={service},paasta.yelp.com/instance={instance}"
     )
+    async_client = get_async_kube_client(kube_client)
+    if async_client is not None:
+        response = await async_client.get_object(
+            f"/api/v1/namespaces/{namespace}/pods",
+            "V1PodList",
+            params={"labelSelector": label_selector},
+        )
+    else:
+        response = await asyncio.to_thread(
+            kube_client.core.list_namespaced_pod,
+            label_selector=label_selector,
+            namespace=namespace,
+        )
     return response.items
 
 
@@ -3798,13 +3929,13 @@ def parse_container_resources(resources: Mapping[str, str]) -> KubeContainerReso
     if not mem_str:
         mem_mb = None
     else:
-        mem_mb = parse_size(mem_str) / 1000000
+        mem_mb = humanfriendly.parse_size(mem_str) / 1000000
 
     disk_str = resources.get("ephemeral-storage")
     if not disk_str:
         disk_mb = None
     else:
-        disk_mb = parse_size(disk_str) / 1000000
+        disk_mb = humanfriendly.parse_size(disk_str) / 1000000
 
     return KubeContainerResources(cpus=cpus, mem=mem_mb, disk=disk_mb)
 
@@ -4021,17 +4152,31 @@ async def get_events_for_object(
     max_age_in_seconds: Optional[int] = None,
 ) -> List[CoreV1Event]:
 
+    field_selector = (
+        f"involvedObject.name={obj.metadata.name},involvedObject.kind={kind}"
+    )
     try:
-        # this is a blocking call since it does network I/O and can end up significantly blocking the
-        # asyncio event loop when doing things like getting events for all the Pods for a service with
-        # a large amount of replicas. therefore, we need to wrap the kubernetes client into something
-        # that's awaitable so that we can actually do things concurrently and not serially
-        events = await asyncio.to_thread(
-            kube_client.core.list_namespaced_event,
-            namespace=obj.metadata.namespace,
-            field_selector=f"involvedObject.name={obj.metadata.name},involvedObject.kind={kind}",
-            limit=MAX_EVENTS_TO_RETRIEVE,
-        )
+        async_client = get_async_kube_client(kube_client)
+        if async_client is not None:
+            events = await async_client.get_object(
+                f"/api/v1/namespaces/{obj.metadata.namespace}/events",
+                "CoreV1EventList",
+                params={
+                    "fieldSelector": field_selector,
+                    "limit": MAX_EVENTS_TO_RETRIEVE,
+                },
+            )
+        else:
+            # this is a blocking call since it does network I/O and can end up significantly blocking the
+            # asyncio event loop when doing things like getting events for all the Pods for a service with
+            # a large amount of replicas. therefore, we need to wrap the kubernetes client into something
+            # that's awaitable so that we can actually do things concurrently and not serially
+            events = await asyncio.to_thread(
+                kube_client.core.list_namespaced_event,
+                namespace=obj.metadata.namespace,
+                field_selector=field_selector,
+                limit=MAX_EVENTS_TO_RETRIEVE,
+            )
         events = events.items if events else []
         if max_age_in_seconds and max_age_in_seconds > 0:
             # NOTE: the k8s API returns timestamps in UTC, so we make sure to always work in UTC
@@ -4054,6 +4199,12 @@ async def get_hpa(
     namespace: str,
 ) -> V2HorizontalPodAutoscaler:
     try:
+        async_client = get_async_kube_client(kube_client)
+        if async_client is not None:
+            return await async_client.get_object(
+                f"/apis/autoscaling/v2/namespaces/{namespace}/horizontalpodautoscalers/{name}",
+                "V2HorizontalPodAutoscaler",
+            )
         return await asyncio.to_thread(
             kube_client.autoscaling.read_namespaced_horizontal_pod_autoscaler,
             name,
@@ -4066,31 +4217,53 @@ async def get_hpa(
             raise
 
 
+def get_all_hpas(
+    kube_client: KubeClient,
+    label_selector: str = "",
+) -> List[V2HorizontalPodAutoscaler]:
+    return kube_client.autoscaling.list_horizontal_pod_autoscaler_for_all_namespaces(
+        label_selector=label_selector
+    ).items
+
+
 def get_kubernetes_app_deploy_status(
     app: Union[V1Deployment, V1StatefulSet],
     desired_instances: int,
 ) -> Tuple[int, str]:
-    if app.status.ready_replicas is None:
+    deploy_status = get_deploy_status_from_replicas(
+        ready_replicas=app.status.ready_replicas,
+        updated_replicas=app.status.updated_replicas,
+        replicas=app.status.replicas,
+        desired_instances=desired_instances,
+    )
+    # Temporarily removing the message because the events query it used was overloading etcd
+    # TODO: change the implementation or remove the deploy message entirely
+    deploy_message = ""
+    return deploy_status, deploy_message
+
+
+def get_deploy_status_from_replicas(
+    ready_replicas: Optional[int],
+    updated_replicas: Optional[int],
+    replicas: Optional[int],
+    desired_instances: int,
+) -> int:
+    """The KubernetesDeployStatus of an app, from the replica counts in its status."""
+    if ready_replicas is None:
         if desired_instances == 0:
-            deploy_status = KubernetesDeployStatus.Stopped
+            return KubernetesDeployStatus.Stopped
         else:
-            deploy_status = KubernetesDeployStatus.Waiting
-    elif app.status.ready_replicas != desired_instances:
-        deploy_status = KubernetesDeployStatus.Waiting
+            return KubernetesDeployStatus.Waiting
+    elif ready_replicas != desired_instances:
+        return KubernetesDeployStatus.Waiting
     # updated_replicas can currently be None for stateful sets so we may not correctly detect status for now
     # when https://github.com/kubernetes/kubernetes/pull/62943 lands in a release this should work for both:
-    elif app.status.updated_replicas is not None and (
-        app.status.updated_replicas < desired_instances
-    ):
-        deploy_status = KubernetesDeployStatus.Deploying
-    elif app.status.replicas == 0 and desired_instances == 0:
-        deploy_status = KubernetesDeployStatus.Stopped
+    elif updated_replicas is not None and updated_replicas < desired_instances:
+        return KubernetesDeployStatus.Deploying
+    elif replicas == 0 and desired_instances == 0:
+        return KubernetesDeployStatus.Stopped
     else:
-        deploy_status = KubernetesDeployStatus.Running
-    # Temporarily removing the message because the events query it used was overloading etcd
-    # TODO: change the implementation or remove the deploy message entirely
-    deploy_message = ""
-    return deploy_status, deploy_message
+        return KubernetesDeployStatus.Running
 
 
 class KubernetesDeployStatus:
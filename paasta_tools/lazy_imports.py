@@ -0,0 +1,29 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return a module whose body only runs the first time one of its attributes
+    is accessed.
+
+    Several of our dependencies (ldap3, requests_cache, docker, networkx via
+    environment_tools) take tens to hundreds of milliseconds to import, but most
+    `paasta` invocations never touch them. Deferring them keeps the CLI (and tab
+    completion) snappy.
+
+    :param name: the fully qualified module name, e.g. "environment_tools.type_utils"
+    :returns: the module, which is registered in sys.modules like a regular import
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
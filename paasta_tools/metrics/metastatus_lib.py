@@ -13,13 +13,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import copy
+import functools
 import itertools
 import math
 import re
 from collections import Counter
+from collections import defaultdict
 from collections import namedtuple
 from typing import Any
 from typing import Callable
+from typing import Dict
+from typing import List
 from typing import Mapping
 from typing import NamedTuple
 from typing import Sequence
@@ -264,17 +268,13 @@ class ResourceParser:
 
 
 def allocated_node_resources(pods: Sequence[V1Pod]) -> Mapping[str, float]:
-    cpus = mem = disk = 0
+    cpus = mem = disk = 0.0
     for pod in pods:
-        cpus += sum(
-            ResourceParser.cpus(c.resources.requests) for c in pod.spec.containers
-        )
-        mem += sum(
-            ResourceParser.mem(c.resources.requests) for c in pod.spec.containers
-        )
-        disk += sum(
-            ResourceParser.disk(c.resources.requests) for c in pod.spec.containers
-        )
+        for container in pod.spec.containers:
+            requests = container.resources.requests
+            cpus += ResourceParser.cpus(requests)
+            mem += ResourceParser.mem(requests)
+            disk += ResourceParser.disk(requests)
     return {"cpu": cpus, "memory": mem, "ephemeral-storage": disk}
 
 
@@ -665,9 +665,14 @@ _IEC_NUMBER_SUFFIXES = {
 }
 
 
+_SUFFIXED_NUMBER_RE = re.compile(r"(?P<number>\d+)(?P<suff>\w*)")
+
+
+# quantity strings are drawn from a tiny vocabulary ("100m", "4Gi", ...) but get
+# parsed once per container across the whole fleet, so memoize the parse
+@functools.lru_cache(maxsize=4096)
 def suffixed_number_value(s: str) -> float:
-    pattern = r"(?P<number>\d+)(?P<suff>\w*)"
-    match = re.match(pattern, s)
+    match = _SUFFIXED_NUMBER_RE.match(s)
     number, suff = match.groups()
 
     if suff in _IEC_NUMBER_SUFFIXES:
@@ -691,25 +696,19 @@ def calculate_resource_utilization_for_kube_nodes(
     :returns: a dict, containing keys for "free" and "total" resources. Each of these keys
     is a ResourceInfo tuple, exposing a number for cpu, disk and mem.
     """
-    resource_total_dict: _Counter[str] = Counter()
-    resource_free_dict: _Counter[str] = Counter()
+    resource_total_dict: Dict[str, float] = defaultdict(float)
+    resource_free_dict: Dict[str, float] = defaultdict(float)
     for node in nodes:
         allocatable_resources = suffixed_number_dict_values(
             filter_kube_resources(node.status.allocatable)
         )
-        resource_total_dict.update(Counter(allocatable_resources))
+        for resource, value in allocatable_resources.items():
+            resource_total_dict[resource] += value
         allocated_resources = allocated_node_resources(pods_by_node[node.metadata.name])
-        resource_free_dict.update(
-            Counter(
-                {
-                    "cpu": allocatable_resources["cpu"] - allocated_resources["cpu"],
-                    "ephemeral-storage": allocatable_resources["ephemeral-storage"]
-                    - allocated_resources["ephemeral-storage"],
-                    "memory": allocatable_resources["memory"]
-                    - allocated_resources["memory"],
-                }
+        for resource in ("cpu", "ephemeral-storage", "memory"):
+            resource_free_dict[resource] += (
+                allocatable_resources[resource] - allocated_resources[resource]
             )
-        )
     return {
         "free": ResourceInfo(
             cpus=resource_free_dict["cpu"],
@@ -727,6 +726,26 @@ def calculate_resource_utilization_for_kube_nodes(
     }
 
 
+def group_pods_by_node(
+    nodes: Sequence[V1Node], pods: Sequence[V1Pod]
+) -> Mapping[str, Sequence[V1Pod]]:
+    """Given a list of Kubernetes nodes and a list of pods, return a dict mapping
+    each node name to the pods scheduled on it, in a single pass over the pods.
+
+    :param nodes: the nodes to group pods by. Every node gets an entry, even if
+    no pods are scheduled on it.
+    :param pods: the pods to group. Pods scheduled on nodes not in ``nodes``
+    (or not scheduled at all) are ignored.
+    :returns: a dict of node name: [pods]
+    """
+    pods_by_node: Dict[str, List[V1Pod]] = {node.metadata.name: [] for node in nodes}
+    for pod in pods:
+        node_pods = pods_by_node.get(pod.spec.node_name)
+        if node_pods is not None:
+            node_pods.append(pod)
+    return pods_by_node
+
+
 def filter_tasks_for_slaves(
     slaves: Sequence[_SlaveT], tasks: Sequence[MesosTask]
 ) -> Sequence[MesosTask]:
@@ -740,7 +759,7 @@ def filter_tasks_for_slaves(
     identical to that provided by the tasks param, but with only those where
     the task is running on one of the provided slaves included.
     """
-    slave_ids = [slave["id"] for slave in slaves]
+    slave_ids = {slave["id"] for slave in slaves}
     return [task for task in tasks if task["slave_id"] in slave_ids]
 
 
@@ -835,12 +854,8 @@ def get_resource_utilization_by_grouping_kube(
     node_groupings = group_slaves_by_key_func(grouping_func, nodes, sort_func)
 
     pods = get_all_pods_cached(kube_client, namespace)
+    pods_by_node = group_pods_by_node(nodes, pods)
 
-    pods_by_node = {}
-    for node in nodes:
-        pods_by_node[node.metadata.name] = [
-            pod for pod in pods if pod.spec.node_name == node.metadata.name
-        ]
     return {
         attribute_value: calculate_resource_utilization_for_kube_nodes(
             nodes, pods_by_node
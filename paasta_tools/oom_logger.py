@@ -34,12 +34,19 @@ log {
 };
 """
 import argparse
+import functools
 import json
+import queue
 import re
 import sys
+import threading
 from collections import namedtuple
+from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import Optional
 
+import cachetools.func
 import grpc
 from containerd.services.containers.v1 import containers_pb2
 from containerd.services.containers.v1 import containers_pb2_grpc
@@ -91,68 +98,79 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def capture_oom_events_from_stdin():
-    process_name_regex = re.compile(
-        r"^\d+\s[a-zA-Z0-9\-]+\s.*\]\s(.+)\sinvoked\soom-killer:"
-    )
-    oom_regex_docker = re.compile(
-        r"^(\d+)\s([a-zA-Z0-9\-]+)\s.*Task in /docker/(\w{12})\w+ killed as a"
-    )
-    oom_regex_kubernetes = re.compile(
-        r"""
-        ^(\d+)\s # timestamp
-        ([a-zA-Z0-9\-]+) # hostname
-        \s.*Task\sin\s/kubepods/(?:[a-zA-Z]+/)? # start of message; non capturing, optional group for the qos cgroup
-        pod[-\w]+/(\w{12})\w+\s # containerid
-        killed\sas\sa*  # eom
-        """,
-        re.VERBOSE,
-    )
-    oom_regex_kubernetes_containerd_systemd_cgroup = re.compile(
-        r"""
-        ^(\d+)\s # timestamp
-        ([a-zA-Z0-9\-]+) # hostname
-        \s.*oom-kill:.*task_memcg=/.*\.slice/.* # loosely match systemd slice and containerid
-        cri-containerd:(\w{64}).*$ # containerid
-        """,
-        re.VERBOSE,
-    )
+PROCESS_NAME_REGEX = re.compile(
+    r"^\d+\s[a-zA-Z0-9\-]+\s.*\]\s(.+)\sinvoked\soom-killer:"
+)
+OOM_REGEX_DOCKER = re.compile(
+    r"^(\d+)\s([a-zA-Z0-9\-]+)\s.*Task in /docker/(\w{12})\w+ killed as a"
+)
+OOM_REGEX_KUBERNETES = re.compile(
+    r"""
+    ^(\d+)\s # timestamp
+    ([a-zA-Z0-9\-]+) # hostname
+    \s.*Task\sin\s/kubepods/(?:[a-zA-Z]+/)? # start of message; non capturing, optional group for the qos cgroup
+    pod[-\w]+/(\w{12})\w+\s # containerid
+    killed\sas\sa*  # eom
+    """,
+    re.VERBOSE,
+)
+OOM_REGEX_KUBERNETES_CONTAINERD_SYSTEMD_CGROUP = re.compile(
+    r"""
+    ^(\d+)\s # timestamp
+    ([a-zA-Z0-9\-]+) # hostname
+    \s.*oom-kill:.*task_memcg=/.*\.slice/.* # loosely match systemd slice and containerid
+    cri-containerd:(\w{64}).*$ # containerid
+    """,
+    re.VERBOSE,
+)
+OOM_REGEX_KUBERNETES_CONTAINERD_SYSTEMD_CGROUP_STRUCTURED = re.compile(
+    r"""
+    ^(\d+)\s # timestamp
+    ([a-zA-Z0-9\-]+) # hostname
+    \s.*oom-kill:.*task_memcg=/kubepods\.slice/.* # match systemd slice and containerid
+    cri-containerd-(\w{64}).*$ # containerid
+    """,
+    re.VERBOSE,
+)
+OOM_REGEX_KUBERNETES_STRUCTURED = re.compile(
+    r"""
+    ^(\d+)\s # timestamp
+    ([a-zA-Z0-9\-]+) # hostname
+    \s.*oom-kill:.*task_memcg=/kubepods/(?:[a-zA-Z]+/)? # start of message; non-capturing, optional group for the qos cgroup
+    pod[-\w]+/(\w{12})\w+,.*$ # containerid
+    """,
+    re.VERBOSE,
+)
+OOM_REGEX_KUBERNETES_SYSTEMD_CGROUP = re.compile(
+    r"""
+    ^(\d+)\s # timestamp
+    ([a-zA-Z0-9\-]+) # hostname
+    \s.*oom-kill:.*task_memcg=/kubepods\.slice/[^,]+docker-(\w{12})\w+\.scope,.*$ # loosely match systemd slice and containerid
+    """,
+    re.VERBOSE,
+)
 
-    oom_regex_kubernetes_containerd_systemd_cgroup_structured = re.compile(
-        r"""
-        ^(\d+)\s # timestamp
-        ([a-zA-Z0-9\-]+) # hostname
-        \s.*oom-kill:.*task_memcg=/kubepods\.slice/.* # match systemd slice and containerid
-        cri-containerd-(\w{64}).*$ # containerid
-        """,
-        re.VERBOSE,
-    )
-    oom_regex_kubernetes_structured = re.compile(
-        r"""
-        ^(\d+)\s # timestamp
-        ([a-zA-Z0-9\-]+) # hostname
-        \s.*oom-kill:.*task_memcg=/kubepods/(?:[a-zA-Z]+/)? # start of message; non-capturing, optional group for the qos cgroup
-        pod[-\w]+/(\w{12})\w+,.*$ # containerid
-        """,
-        re.VERBOSE,
-    )
-    oom_regex_kubernetes_systemd_cgroup = re.compile(
-        r"""
-        ^(\d+)\s # timestamp
-        ([a-zA-Z0-9\-]+) # hostname
-        \s.*oom-kill:.*task_memcg=/kubepods\.slice/[^,]+docker-(\w{12})\w+\.scope,.*$ # loosely match systemd slice and containerid
-        """,
-        re.VERBOSE,
-    )
-    event_detail_regexes = [
-        oom_regex_docker,
-        oom_regex_kubernetes,
-        oom_regex_kubernetes_structured,
-        oom_regex_kubernetes_systemd_cgroup,
-        oom_regex_kubernetes_containerd_systemd_cgroup,
-        oom_regex_kubernetes_containerd_systemd_cgroup_structured,
-    ]
+# Every line that PROCESS_NAME_REGEX can match contains this substring
+PROCESS_NAME_MARKER = "invoked oom-killer:"
+# Every line that an event regex can match contains its marker substring, which
+# is much cheaper to look for than running the regex itself. The regexes are
+# tried in this order and the first match wins.
+EVENT_DETAIL_REGEXES = [
+    ("killed as", OOM_REGEX_DOCKER),
+    ("killed as", OOM_REGEX_KUBERNETES),
+    ("oom-kill:", OOM_REGEX_KUBERNETES_STRUCTURED),
+    ("oom-kill:", OOM_REGEX_KUBERNETES_SYSTEMD_CGROUP),
+    ("oom-kill:", OOM_REGEX_KUBERNETES_CONTAINERD_SYSTEMD_CGROUP),
+    ("oom-kill:", OOM_REGEX_KUBERNETES_CONTAINERD_SYSTEMD_CGROUP_STRUCTURED),
+]
+
+CONTAINER_ENV_CACHE_SIZE = 1024
+INSTANCE_POOL_CACHE_TTL_S = 300
+SINK_QUEUE_SIZE = 1000
+SINK_CLOSE_TIMEOUT_S = 30
 
+
+def capture_oom_events_from_stdin():
     process_name = ""
     while True:
         try:
@@ -161,10 +179,13 @@ def capture_oom_events_from_stdin():
             break
         if not syslog:
             break
-        r = process_name_regex.search(syslog)
-        if r:
-            process_name = r.group(1)
-        for expression in event_detail_regexes:
+        if PROCESS_NAME_MARKER in syslog:
+            r = PROCESS_NAME_REGEX.search(syslog)
+            if r:
+                process_name = r.group(1)
+        for marker, expression in EVENT_DETAIL_REGEXES:
+            if marker not in syslog:
+                continue
             r = expression.search(syslog)
             if r:
                 yield (int(r.group(1)), r.group(2), r.group(3), process_name)
@@ -230,16 +251,25 @@ def log_to_paasta(log_line):
     )
 
 
+@cachetools.func.ttl_cache(
+    maxsize=CONTAINER_ENV_CACHE_SIZE, ttl=INSTANCE_POOL_CACHE_TTL_S
+)
+def get_instance_pool(service: str, instance: str, cluster: str) -> str:
+    """The pool of an instance only changes on a redeploy, so there is no need to
+    re-read soa-configs for every OOM that instance has - but this runs for good,
+    so it does re-read them once in a while to pick up redeploys."""
+    return get_instance_config(
+        service=service, instance=instance, cluster=cluster
+    ).get_pool()
+
+
 def send_sfx_event(service, instance, cluster):
     if yelp_meteorite:
-        service_instance_config = get_instance_config(
-            service=service, instance=instance, cluster=cluster
-        )
         dimensions = {
             "paasta_cluster": cluster,
             "paasta_instance": instance,
             "paasta_service": service,
-            "paasta_pool": service_instance_config.get_pool(),
+            "paasta_pool": get_instance_pool(service, instance, cluster),
         }
         yelp_meteorite.events.emit_event(
             "paasta.service.oom_events",
@@ -261,6 +291,76 @@ def get_containerd_container(container_id: str) -> containers_pb2.Container:
         ).container
 
 
+def inspect_container_env(
+    container_id: str, is_cri_containerd: bool, docker_client: Any
+) -> Dict[str, str]:
+    """Returns the environment of a container, as read from containerd or docker.
+
+    :raises grpc.RpcError: if containerd can't find the container
+    :raises docker.errors.APIError: if docker can't find the container
+    """
+    if is_cri_containerd:
+        container_info = get_containerd_container(container_id)
+        container_spec_raw = container_info.spec.value.decode("utf-8")
+        container_inspect = json.loads(container_spec_raw)
+    else:
+        container_inspect = docker_client.inspect_container(resource_id=container_id)
+    return get_container_env_as_dict(is_cri_containerd, container_inspect)
+
+
+class QueuedSink:
+    """Hands events to a sink on a background thread through a bounded queue,
+    so that a slow sink can't stop us from keeping up with the kernel log.
+    Events that arrive while the queue is full are dropped and counted."""
+
+    def __init__(
+        self,
+        name: str,
+        sink: Callable[[LogLine], None],
+        maxsize: int = SINK_QUEUE_SIZE,
+    ) -> None:
+        self.name = name
+        self.dropped = 0
+        self._sink = sink
+        self._queue: "queue.Queue[Optional[LogLine]]" = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(
+            target=self._run, name=f"oom-sink-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, log_line: LogLine) -> None:
+        try:
+            self._queue.put_nowait(log_line)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: Optional[float] = SINK_CLOSE_TIMEOUT_S) -> None:
+        """Waits for the events already queued to be sent, then stops the thread."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            print(f"Timed out waiting for {self.name} to drain", file=sys.stderr)
+        else:
+            self._thread.join(timeout)
+        if self.dropped:
+            print(
+                f"Dropped {self.dropped} OOM events for {self.name}: queue was full",
+                file=sys.stderr,
+            )
+
+    def _run(self) -> None:
+        while True:
+            log_line = self._queue.get()
+            if log_line is None:
+                return
+            try:
+                self._sink(log_line)
+            except Exception as e:
+                print(
+                    f"An error occurred while sending an OOM event to {self.name}:", e
+                )
+
+
 def main():
     if clog is None:
         print("CLog logger unavailable, exiting.", file=sys.stderr)
@@ -273,29 +373,37 @@ def main():
         scribe_disable=False,
     )
     cluster = load_system_paasta_config().get_cluster()
-    client = get_docker_client()
+    client = None if args.containerd else get_docker_client()
+    # the same few containers tend to OOM over and over, so avoid asking
+    # containerd/docker about them every time
+    get_container_env = functools.lru_cache(maxsize=CONTAINER_ENV_CACHE_SIZE)(
+        inspect_container_env
+    )
+    sinks = [
+        QueuedSink("clog", log_to_clog),
+        QueuedSink("paasta", log_to_paasta),
+        QueuedSink(
+            "signalfx",
+            lambda log_line: send_sfx_event(
+                log_line.service, log_line.instance, log_line.cluster
+            ),
+        ),
+    ]
     for (
         timestamp,
         hostname,
         container_id,
         process_name,
     ) in capture_oom_events_from_stdin():
-        if args.containerd:
-            # then we're using containerd to inspect containers
-            try:
-                container_info = get_containerd_container(container_id)
-            except grpc.RpcError as e:
-                print("An error occurred while getting the container:", e)
-                continue
-            container_spec_raw = container_info.spec.value.decode("utf-8")
-            container_inspect = json.loads(container_spec_raw)
-        else:
-            # we're using docker to inspect containers
-            try:
-                container_inspect = client.inspect_container(resource_id=container_id)
-            except (APIError):
-                continue
-        env_vars = get_container_env_as_dict(args.containerd, container_inspect)
+        try:
+            env_vars = get_container_env(container_id, args.containerd, client)
+        except grpc.RpcError as e:
+            # containerd couldn't find the container
+            print("An error occurred while getting the container:", e)
+            continue
+        except APIError:
+            # docker couldn't find the container
+            continue
         service = env_vars.get("PAASTA_SERVICE", "unknown")
         instance = env_vars.get("PAASTA_INSTANCE", "unknown")
         mesos_container_id = env_vars.get("MESOS_CONTAINER_NAME", "mesos-null")
@@ -311,9 +419,11 @@ def main():
             mesos_container_id=mesos_container_id,
             mem_limit=mem_limit,
         )
-        log_to_clog(log_line)
-        log_to_paasta(log_line)
-        send_sfx_event(service, instance, cluster)
+        for sink in sinks:
+            sink.put(log_line)
+
+    for sink in sinks:
+        sink.close()
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
+import threading
 from typing import Dict
 from typing import Iterable
 from typing import List
@@ -23,6 +24,7 @@ from service_configuration_lib import read_service_configuration
 from paasta_tools import utils
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import InstanceConfig_T
+from paasta_tools.utils import NoConfigurationForServiceError
 from paasta_tools.utils import NoDeploymentsAvailable
 from paasta_tools.utils import deep_merge_dictionaries
 from paasta_tools.utils import list_clusters
@@ -75,6 +77,9 @@ class PaastaServiceConfigLoader:
         self._general_config = None
         self._deployments_json = None
         self._framework_configs = {}
+        # instance configs of different clusters can be loaded from several
+        # threads, which should still only read the files they share once
+        self._shared_files_lock = threading.Lock()
 
     @property
     def clusters(self) -> Iterable[str]:
@@ -123,6 +128,31 @@ class PaastaServiceConfigLoader:
             except NoDeploymentsAvailable:
                 pass
 
+    def instance_config(
+        self, cluster: str, instance: str, instance_type_class: Type[InstanceConfig_T]
+    ) -> InstanceConfig_T:
+        """Returns the InstanceConfig object for a single instance, reusing the
+        files (and deployments.json) already read for the service.
+
+        :param cluster: The cluster name
+        :param instance: The instance name
+        :param instance_type_class: a subclass of InstanceConfig
+        :returns: an instance of instance_type_class
+        :raises NoConfigurationForServiceError: when the instance isn't configured in cluster
+        :raises NoDeploymentsAvailable: when the instance has no deployments
+        """
+        if (cluster, instance_type_class) not in self._framework_configs:
+            self._refresh_framework_config(cluster, instance_type_class)
+        config = self._framework_configs[(cluster, instance_type_class)].get(instance)
+        if config is None:
+            raise NoConfigurationForServiceError(
+                f"{instance} not found in config file {self._soa_dir}/{self._service}/"
+                f"{self._framework_config_filename(cluster, instance_type_class)}.yaml."
+            )
+        return self._create_service_config(
+            cluster, instance, config, instance_type_class
+        )
+
     def _framework_config_filename(
         self, cluster: str, instance_type_class: Type[InstanceConfig_T]
     ):
@@ -143,9 +173,11 @@ class PaastaServiceConfigLoader:
         self, cluster: str, instance: str, config: utils.InstanceConfig
     ) -> utils.BranchDictV2:
         if self._deployments_json is None:
-            self._deployments_json = load_v2_deployments_json(
-                self._service, soa_dir=self._soa_dir
-            )
+            with self._shared_files_lock:
+                if self._deployments_json is None:
+                    self._deployments_json = load_v2_deployments_json(
+                        self._service, soa_dir=self._soa_dir
+                    )
 
         branch = config.get_branch()
         deploy_group = config.get_deploy_group()
@@ -157,9 +189,11 @@ class PaastaServiceConfigLoader:
         self, config: utils.InstanceConfigDict
     ) -> utils.InstanceConfigDict:
         if self._general_config is None:
-            self._general_config = read_service_configuration(
-                service_name=self._service, soa_dir=self._soa_dir
-            )
+            with self._shared_files_lock:
+                if self._general_config is None:
+                    self._general_config = read_service_configuration(
+                        service_name=self._service, soa_dir=self._soa_dir
+                    )
         return deep_merge_dictionaries(overrides=config, defaults=self._general_config)
 
     def _create_service_config(
@@ -66,6 +66,7 @@ class RemoteRunApi(object):
 
             Keyword Args:
                 toolbox (bool): Whether this is a toolbox job. [optional]
+                wait (int): Wait up to this many seconds (at most 60) for the pod to be ready before responding. [optional]
                 _return_http_data_only (bool): response data without head status
                     code and headers. Default is True.
                 _preload_content (bool): if False, the urllib3.HTTPResponse object
@@ -136,6 +137,7 @@ class RemoteRunApi(object):
                     'job_name',
                     'user',
                     'toolbox',
+                    'wait',
                 ],
                 'required': [
                     'service',
@@ -166,6 +168,8 @@ class RemoteRunApi(object):
                         (str,),
                     'toolbox':
                         (bool,),
+                    'wait':
+                        (int,),
                 },
                 'attribute_map': {
                     'service': 'service',
@@ -173,6 +177,7 @@ class RemoteRunApi(object):
                     'job_name': 'job_name',
                     'user': 'user',
                     'toolbox': 'toolbox',
+                    'wait': 'wait',
                 },
                 'location_map': {
                     'service': 'path',
@@ -180,6 +185,7 @@ class RemoteRunApi(object):
                     'job_name': 'query',
                     'user': 'query',
                     'toolbox': 'query',
+                    'wait': 'query',
                 },
                 'collection_format_map': {
                 }
@@ -0,0 +1,206 @@
+# coding: utf-8
+
+"""
+    Paasta API
+
+    No description provided (generated by Openapi Generator https://github.com/openapitools/openapi-generator)  # noqa: E501
+
+    The version of the OpenAPI document: 1.3.0
+    Generated by: https://openapi-generator.tech
+"""
+
+
+import re  # noqa: F401
+import sys  # noqa: F401
+
+import nulltype  # noqa: F401
+
+from paasta_tools.paastaapi.model_utils import (  # noqa: F401
+    ApiTypeError,
+    ModelComposed,
+    ModelNormal,
+    ModelSimple,
+    cached_property,
+    change_keys_js_to_python,
+    convert_js_args_to_python_args,
+    date,
+    datetime,
+    file_type,
+    none_type,
+    validate_get_composed_info,
+)
+
+
+class BounceProgress(ModelNormal):
+    """NOTE: This class is auto generated by OpenAPI Generator.
+    Ref: https://openapi-generator.tech
+
+    Do not edit the class manually.
+
+    Attributes:
+      allowed_values (dict): The key is the tuple path to the attribute
+          and the for var_name this is (var_name,). The value is a dict
+          with a capitalized key describing the allowed value and an allowed
+          value. These dicts store the allowed enum values.
+      attribute_map (dict): The key is attribute name
+          and the value is json key in definition.
+      discriminator_value_class_map (dict): A dict to go from the discriminator
+          variable value to the discriminator class name.
+      validations (dict): The key is the tuple path to the attribute
+          and the for var_name this is (var_name,). The value is a dict
+          that stores validations for max_length, min_length, max_items,
+          min_items, exclusive_maximum, inclusive_maximum, exclusive_minimum,
+          inclusive_minimum, and regex.
+      additional_properties_type (tuple): A tuple of classes accepted
+          as additional properties values.
+    """
+
+    allowed_values = {
+        ('deploy_status',): {
+            'RUNNING': "Running",
+            'DEPLOYING': "Deploying",
+            'STOPPED': "Stopped",
+            'WAITING': "Waiting",
+        },
+    }
+
+    validations = {
+    }
+
+    additional_properties_type = None
+
+    _nullable = False
+
+    @cached_property
+    def openapi_types():
+        """
+        This must be a method because a model may have properties that are
+        of type self, this must run after the class is loaded
+
+        Returns
+            openapi_types (dict): The key is attribute name
+                and the value is attribute type.
+        """
+        return {
+            'active_versions': ([[str, none_type]],),  # noqa: E501
+            'app_count': (int,),  # noqa: E501
+            'deploy_status': (str,),  # noqa: E501
+            'desired_replicas': (int,),  # noqa: E501
+            'instance': (str,),  # noqa: E501
+            'namespace': (str,),  # noqa: E501
+            'new_version_replicas': (int,),  # noqa: E501
+            'old_version_replicas': (int,),  # noqa: E501
+            'ready_replicas': (int,),  # noqa: E501
+            'service': (str,),  # noqa: E501
+            'updated_replicas': (int, none_type),  # noqa: E501
+        }
+
+    @cached_property
+    def discriminator():
+        return None
+
+
+    attribute_map = {
+        'active_versions': 'active_versions',  # noqa: E501
+        'app_count': 'app_count',  # noqa: E501
+        'deploy_status': 'deploy_status',  # noqa: E501
+        'desired_replicas': 'desired_replicas',  # noqa: E501
+        'instance': 'instance',  # noqa: E501
+        'namespace': 'namespace',  # noqa: E501
+        'new_version_replicas': 'new_version_replicas',  # noqa: E501
+        'old_version_replicas': 'old_version_replicas',  # noqa: E501
+        'ready_replicas': 'ready_replicas',  # noqa: E501
+        'service': 'service',  # noqa: E501
+        'updated_replicas': 'updated_replicas',  # noqa: E501
+    }
+
+    _composed_schemas = {}
+
+    required_properties = set([
+        '_data_store',
+        '_check_type',
+        '_spec_property_naming',
+        '_path_to_item',
+        '_configuration',
+        '_visited_composed_classes',
+    ])
+
+    @convert_js_args_to_python_args
+    def __init__(self, *args, **kwargs):  # noqa: E501
+        """BounceProgress - a model defined in OpenAPI
+
+        Keyword Args:
+            _check_type (bool): if True, values for parameters in openapi_types
+                                will be type checked and a TypeError will be
+                                raised if the wrong type is input.
+                                Defaults to True
+            _path_to_item (tuple/list): This is a list of keys or values to
+                                drill down to the model in received_data
+                                when deserializing a response
+            _spec_property_naming (bool): True if the variable names in the input data
+                                are serialized names, as specified in the OpenAPI document.
+                                False if the variable names in the input data
+                                are pythonic names, e.g. snake case (default)
+            _configuration (Configuration): the instance to use when
+                                deserializing a file_type parameter.
+                                If passed, type conversion is attempted
+                                If omitted no type conversion is done.
+            _visited_composed_classes (tuple): This stores a tuple of
+                                classes that we have traveled through so that
+                                if we see that class again we will not use its
+                                discriminator again.
+                                When traveling through a discriminator, the
+                                composed schema that is
+                                is traveled through is added to this set.
+                                For example if Animal has a discriminator
+                                petType and we pass in "Dog", and the class Dog
+                                allOf includes Animal, we move through Animal
+                                once using the discriminator, and pick Dog.
+                                Then in Dog, we will make an instance of the
+                                Animal class but this time we won't travel
+                                through its discriminator because we passed in
+                                _visited_composed_classes = (Animal,)
+            active_versions ([[str, none_type]]): List of git SHA/image_version/config SHAs running.. [optional]  # noqa: E501
+            app_count (int): The number of different running versions of the instance. [optional]  # noqa: E501
+            deploy_status (str): Deploy status of the Deployment or StatefulSet, against the number of replicas it wants. [optional]  # noqa: E501
+            desired_replicas (int): The number of replicas the Deployment or StatefulSet wants. [optional]  # noqa: E501
+            instance (str): Instance name. [optional]  # noqa: E501
+            namespace (str): Kubernetes namespace of the instance. [optional]  # noqa: E501
+            new_version_replicas (int): The number of pods of the version being bounced to. [optional]  # noqa: E501
+            old_version_replicas (int): The number of pods of other versions. [optional]  # noqa: E501
+            ready_replicas (int): The number of ready replicas. [optional]  # noqa: E501
+            service (str): Service name. [optional]  # noqa: E501
+            updated_replicas (int, none_type): The number of replicas of the version being bounced to, as reported by Kubernetes. [optional]  # noqa: E501
+        """
+
+        _check_type = kwargs.pop('_check_type', True)
+        _spec_property_naming = kwargs.pop('_spec_property_naming', False)
+        _path_to_item = kwargs.pop('_path_to_item', ())
+        _configuration = kwargs.pop('_configuration', None)
+        _visited_composed_classes = kwargs.pop('_visited_composed_classes', ())
+
+        if args:
+            raise ApiTypeError(
+                "Invalid positional arguments=%s passed to %s. Remove those invalid positional arguments." % (
+                    args,
+                    self.__class__.__name__,
+                ),
+                path_to_item=_path_to_item,
+                valid_classes=(self.__class__,),
+            )
+
+        self._data_store = {}
+        self._check_type = _check_type
+        self._spec_property_naming = _spec_property_naming
+        self._path_to_item = _path_to_item
+        self._configuration = _configuration
+        self._visited_composed_classes = _visited_composed_classes + (self.__class__,)
+
+        for var_name, var_value in kwargs.items():
+            if var_name not in self.attribute_map and \
+                        self._configuration is not None and \
+                        self._configuration.discard_unknown_keys and \
+                        self.additional_properties_type is None:
+                # discard variable.
+                continue
+            setattr(self, var_name, var_value)
@@ -76,6 +76,7 @@ class InstanceStatusCassandracluster(ModelNormal):
                 and the value is attribute type.
         """
         return {
+            'age': (int,),  # noqa: E501
             'metadata': ({str: (bool, date, datetime, dict, float, int, list, str, none_type)},),  # noqa: E501
             'status': ({str: (bool, date, datetime, dict, float, int, list, str, none_type)},),  # noqa: E501
         }
@@ -86,6 +87,7 @@ class InstanceStatusCassandracluster(ModelNormal):
 
 
     attribute_map = {
+        'age': 'age',  # noqa: E501
         'metadata': 'metadata',  # noqa: E501
         'status': 'status',  # noqa: E501
     }
@@ -136,6 +138,7 @@ class InstanceStatusCassandracluster(ModelNormal):
                                 Animal class but this time we won't travel
                                 through its discriminator because we passed in
                                 _visited_composed_classes = (Animal,)
+            age (int): Seconds since the status was read from Kubernetes, if it was served from the API's cache. [optional]  # noqa: E501
             metadata ({str: (bool, date, datetime, dict, float, int, list, str, none_type)}): Cassandra instance metadata. [optional]  # noqa: E501
             status ({str: (bool, date, datetime, dict, float, int, list, str, none_type)}): Cassandra instance status. [optional]  # noqa: E501
         """
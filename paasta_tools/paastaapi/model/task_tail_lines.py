@@ -77,6 +77,7 @@ class TaskTailLines(ModelNormal):
         """
         return {
             'error_message': (str,),  # noqa: E501
+            'partial': (bool,),  # noqa: E501
             'stderr': ([str],),  # noqa: E501
             'stdout': ([str],),  # noqa: E501
         }
@@ -88,6 +89,7 @@ class TaskTailLines(ModelNormal):
 
     attribute_map = {
         'error_message': 'error_message',  # noqa: E501
+        'partial': 'partial',  # noqa: E501
         'stderr': 'stderr',  # noqa: E501
         'stdout': 'stdout',  # noqa: E501
     }
@@ -139,6 +141,7 @@ class TaskTailLines(ModelNormal):
                                 through its discriminator because we passed in
                                 _visited_composed_classes = (Animal,)
             error_message (str): Error message when fetching tail lines fails. [optional]  # noqa: E501
+            partial (bool): Whether the tail lines could not all be fetched in time. [optional]  # noqa: E501
             stderr ([str]): The requested number of lines from the task&#39;s stderr. [optional]  # noqa: E501
             stdout ([str]): The requested number of lines from the task&#39;s stdout. [optional]  # noqa: E501
         """
@@ -1,5 +1,6 @@
 import os
 from typing import Any
+from typing import Collection
 from typing import Dict
 from typing import List
 from typing import Mapping
@@ -9,6 +10,19 @@ from mypy_extensions import TypedDict
 from service_configuration_lib import read_service_configuration
 
 
+class SecretWriteError(Exception):
+    """Raised by write_secret when the secret could not be written for some of
+    the ecosystems (it may still have been written for the others)."""
+
+    def __init__(self, secret_name: str, failures: Mapping[str, Exception]) -> None:
+        self.secret_name = secret_name
+        self.failures = dict(failures)
+        super().__init__(
+            f"Failed to write secret {secret_name} for "
+            + ", ".join(f"{eco} ({e})" for eco, e in sorted(self.failures.items()))
+        )
+
+
 class BaseSecretProvider:
     def __init__(
         self,
@@ -45,6 +59,14 @@ class BaseSecretProvider:
     def decrypt_secret_raw(self, secret_name: str) -> bytes:
         raise NotImplementedError
 
+    def decrypt_secrets_raw(self, secret_names: Collection[str]) -> Dict[str, bytes]:
+        """Decrypt several secrets at once. Providers that can batch or parallelize
+        requests should override this."""
+        return {
+            secret_name: self.decrypt_secret_raw(secret_name)
+            for secret_name in secret_names
+        }
+
     def get_secret_signature_from_data(self, data: Mapping[str, Any]) -> Optional[str]:
         raise NotImplementedError
 
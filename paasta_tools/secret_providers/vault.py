@@ -1,20 +1,45 @@
 import getpass
+import hashlib
+import json
 import logging
 import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from typing import Any
+from typing import Callable
+from typing import Collection
 from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
+from typing import Type
+
+import requests
 
 from paasta_tools.secret_providers import CryptoKey
 
 try:
     import hvac
+    from hvac.exceptions import BadGateway
+    from hvac.exceptions import InternalServerError
+    from hvac.exceptions import RateLimitExceeded
+    from hvac.exceptions import VaultDown
     from vault_tools.client.jsonsecret import get_plaintext
     from vault_tools.gpg import TempGpgKeyring
     from vault_tools.paasta_secret import encrypt_secret
     from vault_tools.paasta_secret import get_vault_client
+
+    TRANSIENT_VAULT_ERRORS: Tuple[Type[Exception], ...] = (
+        BadGateway,
+        InternalServerError,
+        RateLimitExceeded,
+        VaultDown,
+    )
 except ImportError:
 
     def get_plaintext(*args: Any, **kwargs: Any) -> bytes:
@@ -28,12 +53,124 @@ except ImportError:
     def encrypt_secret(*args: Any, **kwargs: Any) -> None:
         return None
 
+    TRANSIENT_VAULT_ERRORS = ()
+
+
+try:
+    # cryptography is a vault_tools dependency, so it's around whenever vault is
+    from cryptography.fernet import Fernet
+    from cryptography.fernet import InvalidToken
+except ImportError:
+    Fernet = None
+
 
 from paasta_tools.secret_providers import BaseSecretProvider
+from paasta_tools.secret_providers import SecretWriteError
 from paasta_tools.secret_tools import get_secret_name_from_ref
+from paasta_tools.secret_tools import write_secret_file
 
 log = logging.getLogger(__name__)
 
+WRITE_SECRET_ATTEMPTS = 3
+WRITE_SECRET_RETRY_DELAY_S = 2
+# errors worth retrying a write for: anything else (e.g. being denied access to
+# the transit key) would only fail again
+TRANSIENT_WRITE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+) + TRANSIENT_VAULT_ERRORS
+
+DEFAULT_SECRET_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "paasta",
+    "secrets",
+)
+
+
+class SecretCache:
+    """An encrypted, strictly time-limited on-disk cache of decrypted secrets.
+
+    Entries are keyed by the signature of the secret file in soa-configs (the same
+    one get_hmac_for_secret returns), so re-encrypting a secret invalidates them.
+    They are encrypted with a per-user key that lives next to them with 0600
+    permissions: this keeps plaintext off disk (and out of backups), but is no
+    protection against someone who can already read the user's files.
+    """
+
+    def __init__(self, cache_dir: str, ttl: int) -> None:
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._fernet: Optional[Fernet] = None
+
+    def _get_fernet(self) -> Fernet:
+        if self._fernet is None:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            key_path = os.path.join(self.cache_dir, "key")
+            try:
+                fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                with open(key_path, "rb") as f:
+                    key = f.read()
+            else:
+                key = Fernet.generate_key()
+                with os.fdopen(fd, "wb") as f:
+                    f.write(key)
+            self._fernet = Fernet(key)
+        return self._fernet
+
+    def _get_entry_path(self, ecosystem: str, secret_path: str, signature: str) -> str:
+        entry = hashlib.sha256(
+            f"{ecosystem}:{secret_path}:{signature}".encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, entry)
+
+    def get(self, ecosystem: str, secret_path: str, signature: str) -> Optional[bytes]:
+        entry_path = self._get_entry_path(ecosystem, secret_path, signature)
+        try:
+            with open(entry_path, "rb") as f:
+                token = f.read()
+            return self._get_fernet().decrypt(token, ttl=self.ttl)
+        except FileNotFoundError:
+            return None
+        except (OSError, InvalidToken):
+            # expired or unreadable: make sure we don't keep it around
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            return None
+
+    def set(
+        self, ecosystem: str, secret_path: str, signature: str, plaintext: bytes
+    ) -> None:
+        entry_path = self._get_entry_path(ecosystem, secret_path, signature)
+        try:
+            token = self._get_fernet().encrypt(plaintext)
+            fd = os.open(entry_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(token)
+        except OSError as e:
+            log.warning(f"Unable to cache secret {secret_path}: {e}")
+
+
+class VaultClients(Dict[str, Any]):
+    """Vault clients by ecosystem, created the first time each one is needed.
+
+    Authenticating can prompt (or send a 2FA push), so clients are created one at
+    a time even when several threads ask for them at once.
+    """
+
+    def __init__(self, factory: Callable[[str], Any]) -> None:
+        super().__init__()
+        self.factory = factory
+        self._lock = threading.Lock()
+
+    def __missing__(self, ecosystem: str) -> Any:
+        with self._lock:
+            if ecosystem not in self:
+                self[ecosystem] = self.factory(ecosystem)
+            return super().__getitem__(ecosystem)
+
 
 class SecretProvider(BaseSecretProvider):
     def __init__(
@@ -45,52 +182,57 @@ class SecretProvider(BaseSecretProvider):
         vault_auth_method: str = "ldap",
         vault_token_file: str = "/root/.vault-token",
         vault_num_uses: int = 1,
+        vault_max_workers: int = 1,
+        vault_cache_ttl: int = 0,
+        vault_cache_dir: str = DEFAULT_SECRET_CACHE_DIR,
         **kwargs: Any,
     ) -> None:
+        """
+        :param vault_max_workers: how many secrets to fetch from vault concurrently
+            (over the same client, and hence the same http session), and how many
+            ecosystems to encrypt a secret for concurrently in write_secret
+        :param vault_cache_ttl: if positive, cache decrypted secrets locally (see
+            SecretCache) for this many seconds
+        """
         super().__init__(soa_dir, service_name, cluster_names)
         self.vault_cluster_config = vault_cluster_config
         self.vault_auth_method = vault_auth_method
         self.vault_token_file = vault_token_file
+        self.max_workers = vault_max_workers
+        self.cache: Optional[SecretCache] = None
+        if vault_cache_ttl > 0 and Fernet is not None:
+            self.cache = SecretCache(vault_cache_dir, vault_cache_ttl)
+        self.vault_num_uses = vault_num_uses
         self.ecosystems = self.get_vault_ecosystems_for_clusters()
-        self.clients: Mapping[str, hvac.Client] = {}
         if vault_auth_method == "ldap":
-            username = getpass.getuser()
-            password = getpass.getpass(
+            self.username: Optional[str] = getpass.getuser()
+            self.password: Optional[str] = getpass.getpass(
                 "Please enter your LDAP password to auth with Vault\n"
             )
         else:
-            username = None
-            password = None
-        for ecosystem in self.ecosystems:
-            self.clients[ecosystem] = get_vault_client(
-                ecosystem=ecosystem,
-                num_uses=vault_num_uses,
-                vault_auth_method=self.vault_auth_method,
-                vault_token_file=self.vault_token_file,
-                username=username,
-                password=password,
-            )
+            self.username = None
+            self.password = None
+        self.clients = VaultClients(self._get_vault_client)
+
+    def _get_vault_client(self, ecosystem: str) -> "hvac.Client":
+        return get_vault_client(
+            ecosystem=ecosystem,
+            num_uses=self.vault_num_uses,
+            vault_auth_method=self.vault_auth_method,
+            vault_token_file=self.vault_token_file,
+            username=self.username,
+            password=self.password,
+        )
 
     def decrypt_environment(
         self, environment: Dict[str, str], **kwargs: Any
     ) -> Dict[str, str]:
-        client = self.clients[self.ecosystems[0]]
-        secret_environment = {}
-        for k, v in environment.items():
-            secret_name = get_secret_name_from_ref(v)
-            secret_path = os.path.join(self.secret_dir, f"{secret_name}.json")
-            secret = get_plaintext(
-                client=client,
-                env=self.ecosystems[0],
-                path=secret_path,
-                cache_enabled=False,
-                cache_dir=None,
-                cache_key=None,
-                context=self.service_name,
-                rescue_failures=False,
-            ).decode("utf-8")
-            secret_environment[k] = secret
-        return secret_environment
+        secret_names = {k: get_secret_name_from_ref(v) for k, v in environment.items()}
+        plaintexts = self.decrypt_secrets_raw(set(secret_names.values()))
+        return {
+            k: plaintexts[secret_name].decode("utf-8")
+            for k, secret_name in secret_names.items()
+        }
 
     def get_vault_ecosystems_for_clusters(self) -> List[str]:
         try:
@@ -115,27 +257,236 @@ class SecretProvider(BaseSecretProvider):
         plaintext: bytes,
         cross_environment_motivation: Optional[str] = None,
     ) -> None:
+        """Encrypt plaintext for each ecosystem and write it to the secret's json file.
+
+        Ecosystems that fail with a transient error (see TRANSIENT_WRITE_ERRORS)
+        are retried a couple of times; the ones that still fail, or that fail
+        with any other error, are reported together in a SecretWriteError after
+        the others have been written.
+        """
+        pending = list(self.ecosystems)
+        failures: Dict[str, Exception] = {}
         with TempGpgKeyring(overwrite=True):
-            for ecosystem in self.ecosystems:
-                client = self.clients[ecosystem]
-                encrypt_secret(
-                    client=client,
-                    action=action,
-                    ecosystem=ecosystem,
-                    secret_name=secret_name,
-                    soa_dir=self.soa_dir,
-                    plaintext=plaintext,
-                    service_name=self.service_name,
-                    transit_key=self.encryption_key,
-                    cross_environment_motivation=cross_environment_motivation,
+            for attempt in range(1, WRITE_SECRET_ATTEMPTS + 1):
+                if attempt > 1:
+                    print(
+                        f"Retrying {', '.join(pending)} "
+                        f"(attempt {attempt}/{WRITE_SECRET_ATTEMPTS})"
+                    )
+                    time.sleep(WRITE_SECRET_RETRY_DELAY_S)
+                if self.max_workers > 1 and len(pending) > 1:
+                    write = self._write_secret_concurrently
+                else:
+                    write = self._write_secret_serially
+                failures = {eco: e for eco, e in failures.items() if eco not in pending}
+                failures.update(
+                    write(
+                        pending,
+                        action,
+                        secret_name,
+                        plaintext,
+                        cross_environment_motivation,
+                    )
+                )
+                pending = [
+                    eco
+                    for eco in pending
+                    if isinstance(failures.get(eco), TRANSIENT_WRITE_ERRORS)
+                ]
+                if not pending:
+                    break
+        if failures:
+            raise SecretWriteError(secret_name, failures)
+
+    def _encrypt_secret(
+        self,
+        ecosystem: str,
+        soa_dir: Optional[str],
+        action: str,
+        secret_name: str,
+        plaintext: bytes,
+        cross_environment_motivation: Optional[str],
+    ) -> None:
+        encrypt_secret(
+            client=self.clients[ecosystem],
+            action=action,
+            ecosystem=ecosystem,
+            secret_name=secret_name,
+            soa_dir=soa_dir,
+            plaintext=plaintext,
+            service_name=self.service_name,
+            transit_key=self.encryption_key,
+            cross_environment_motivation=cross_environment_motivation,
+        )
+
+    def _write_secret_serially(
+        self,
+        ecosystems: List[str],
+        action: str,
+        secret_name: str,
+        plaintext: bytes,
+        cross_environment_motivation: Optional[str],
+    ) -> Dict[str, Exception]:
+        failures: Dict[str, Exception] = {}
+        for done, ecosystem in enumerate(ecosystems, start=1):
+            try:
+                self._encrypt_secret(
+                    ecosystem,
+                    self.soa_dir,
+                    action,
+                    secret_name,
+                    plaintext,
+                    cross_environment_motivation,
+                )
+            except Exception as e:
+                failures[ecosystem] = e
+                print(f"{ecosystem}: failed to encrypt {secret_name}: {e}")
+            else:
+                print(
+                    f"{ecosystem}: encrypted {secret_name} ({done}/{len(ecosystems)})"
+                )
+        return failures
+
+    def _write_secret_concurrently(
+        self,
+        ecosystems: List[str],
+        action: str,
+        secret_name: str,
+        plaintext: bytes,
+        cross_environment_motivation: Optional[str],
+    ) -> Dict[str, Exception]:
+        """Like _write_secret_serially, but encrypts for up to max_workers
+        ecosystems at a time.
+
+        encrypt_secret rewrites the whole secret file, so concurrent calls would
+        clobber each other's environments. Instead, each ecosystem writes to its
+        own scratch copy of the file, and we merge the results back at the end.
+        """
+        secret_path = self._get_secret_path(secret_name)
+        staged: Dict[str, Dict[str, Any]] = {}
+        failures: Dict[str, Exception] = {}
+        with tempfile.TemporaryDirectory(prefix="paasta-secret-") as staging_dir:
+
+            def write_staged(ecosystem: str) -> Dict[str, Any]:
+                staging_soa_dir = os.path.join(staging_dir, ecosystem)
+                staging_secret_dir = os.path.join(
+                    staging_soa_dir, self.service_name, "secrets"
+                )
+                os.makedirs(staging_secret_dir)
+                if os.path.exists(secret_path):
+                    shutil.copy(secret_path, staging_secret_dir)
+                self._encrypt_secret(
+                    ecosystem,
+                    staging_soa_dir,
+                    action,
+                    secret_name,
+                    plaintext,
+                    cross_environment_motivation,
                 )
+                with open(os.path.join(staging_secret_dir, f"{secret_name}.json")) as f:
+                    return json.load(f)
+
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(ecosystems))
+            ) as executor:
+                futures = {
+                    executor.submit(write_staged, ecosystem): ecosystem
+                    for ecosystem in ecosystems
+                }
+                for future in as_completed(futures):
+                    ecosystem = futures[future]
+                    try:
+                        staged[ecosystem] = future.result()
+                    except Exception as e:
+                        failures[ecosystem] = e
+                        print(f"{ecosystem}: failed to encrypt {secret_name}: {e}")
+                    else:
+                        print(
+                            f"{ecosystem}: encrypted {secret_name} "
+                            f"({len(staged)}/{len(ecosystems)})"
+                        )
+
+        if staged:
+            self._merge_staged_secrets(secret_path, staged)
+        return failures
+
+    def _merge_staged_secrets(
+        self, secret_path: str, staged: Mapping[str, Mapping[str, Any]]
+    ) -> None:
+        try:
+            with open(secret_path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        for ecosystem, staged_data in staged.items():
+            for key, value in staged_data.items():
+                if key != "environments":
+                    data[key] = value
+            data.setdefault("environments", {})[ecosystem] = staged_data[
+                "environments"
+            ][ecosystem]
+        os.makedirs(os.path.dirname(secret_path), exist_ok=True)
+        write_secret_file(secret_path, data)
 
     def decrypt_secret(self, secret_name: str) -> str:
         return self.decrypt_secret_raw(secret_name).decode("utf-8")
 
     def decrypt_secret_raw(self, secret_name: str) -> bytes:
+        return self.decrypt_secrets_raw([secret_name])[secret_name]
+
+    def decrypt_secrets_raw(self, secret_names: Collection[str]) -> Dict[str, bytes]:
+        plaintexts: Dict[str, bytes] = {}
+        signatures: Dict[str, Optional[str]] = {}
+        if self.cache is not None:
+            for secret_name in secret_names:
+                signature = self._get_secret_signature(secret_name)
+                signatures[secret_name] = signature
+                if signature is not None:
+                    cached = self.cache.get(
+                        self.ecosystems[0],
+                        self._get_secret_path(secret_name),
+                        signature,
+                    )
+                    if cached is not None:
+                        plaintexts[secret_name] = cached
+
+        to_fetch = [name for name in secret_names if name not in plaintexts]
+        if self.max_workers > 1 and len(to_fetch) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(to_fetch))
+            ) as executor:
+                fetched = dict(
+                    zip(to_fetch, executor.map(self._fetch_secret, to_fetch))
+                )
+        else:
+            fetched = {name: self._fetch_secret(name) for name in to_fetch}
+        plaintexts.update(fetched)
+
+        if self.cache is not None:
+            for secret_name, plaintext in fetched.items():
+                signature = signatures.get(secret_name)
+                if signature is not None:
+                    self.cache.set(
+                        self.ecosystems[0],
+                        self._get_secret_path(secret_name),
+                        signature,
+                        plaintext,
+                    )
+        return plaintexts
+
+    def _get_secret_path(self, secret_name: str) -> str:
+        return os.path.join(self.secret_dir, f"{secret_name}.json")
+
+    def _get_secret_signature(self, secret_name: str) -> Optional[str]:
+        try:
+            with open(self._get_secret_path(secret_name)) as f:
+                return self.get_secret_signature_from_data(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _fetch_secret(self, secret_name: str) -> bytes:
         client = self.clients[self.ecosystems[0]]
-        secret_path = os.path.join(self.secret_dir, f"{secret_name}.json")
+        secret_path = self._get_secret_path(secret_name)
         return get_plaintext(
             client=client,
             path=secret_path,
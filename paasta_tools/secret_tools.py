@@ -23,6 +23,7 @@ from typing import Union
 
 from paasta_tools.secret_providers import SecretProvider
 from paasta_tools.utils import SecretVolume
+from paasta_tools.utils import atomic_file_write
 
 SECRET_REGEX = r"^(SHARED_)?SECRET\([A-Za-z0-9_-]*\)$"
 SHARED_SECRET_SERVICE = "_shared"
@@ -50,6 +51,14 @@ def is_shared_secret_from_secret_name(soa_dir: str, secret_name: str) -> bool:
     return os.path.isfile(secret_path)
 
 
+def write_secret_file(secret_path: str, data: Dict[str, Any]) -> None:
+    """Write the json file of a secret formatted the way vault_tools' encrypt_secret
+    writes it, so that rewriting a file outside of it doesn't reformat the file."""
+    with atomic_file_write(secret_path) as f:
+        json.dump(data, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+
 def get_hmac_for_secret(
     env_var_val: str, service: str, soa_dir: str, secret_environment: str
 ) -> Optional[str]:
@@ -194,7 +203,7 @@ def decrypt_secret_volumes(
     cluster_name: str,
     secret_provider_kwargs: Dict[str, Any],
 ) -> Dict[str, Union[str, bytes]]:
-    secret_volumes = {}
+    secret_volumes: Dict[str, Union[str, bytes]] = {}
     # The config might look one of two ways:
     # Implicit full path consisting of the container path and the secret name:
     #   secret_volumes:
@@ -218,38 +227,39 @@ def decrypt_secret_volumes(
     #
     # This ^ should result in 2 files (/nail/foo/bar.yaml, /nail/foo/baz.yaml)
     # We need to support both cases
+    secret_names_by_path: Dict[str, str] = {}
     for secret_volume in secret_volumes_config:
         if not secret_volume.get("items"):
-            secret_contents = decrypt_secret(
-                secret_provider_name=secret_provider_name,
-                soa_dir=soa_dir,
-                service_name=service_name,
-                cluster_name=cluster_name,
-                secret_provider_kwargs=secret_provider_kwargs,
-                secret_name=secret_volume["secret_name"],
-                decode=False,
-            )
-            # Index by container path => the actual secret contents, to be used downstream to create local files and mount into the container
-            secret_volumes[
+            secret_names_by_path[
                 os.path.join(
                     secret_volume["container_path"], secret_volume["secret_name"]
                 )
-            ] = secret_contents
+            ] = secret_volume["secret_name"]
         else:
             for item in secret_volume["items"]:
-                secret_contents = decrypt_secret(
-                    secret_provider_name=secret_provider_name,
-                    soa_dir=soa_dir,
-                    service_name=service_name,
-                    cluster_name=cluster_name,
-                    secret_provider_kwargs=secret_provider_kwargs,
-                    secret_name=item["key"],
-                    decode=False,
-                )
-                # Index by container path => the actual secret contents, to be used downstream to create local files and mount into the container
-                secret_volumes[
+                secret_names_by_path[
                     os.path.join(secret_volume["container_path"], item["path"])
-                ] = secret_contents
+                ] = item["key"]
+    if not secret_names_by_path:
+        return {}
+
+    # Decrypt everything with a single provider (and vault client) rather than
+    # authenticating once per file
+    secret_names = set(secret_names_by_path.values())
+    secret_provider = get_secret_provider(
+        secret_provider_name=secret_provider_name,
+        soa_dir=soa_dir,
+        service_name=service_name,
+        cluster_names=[cluster_name],
+        secret_provider_kwargs={
+            **secret_provider_kwargs,
+            "vault_num_uses": len(secret_names),
+        },
+    )
+    secret_contents = secret_provider.decrypt_secrets_raw(secret_names)
+    # Index by container path => the actual secret contents, to be used downstream to create local files and mount into the container
+    for container_path, secret_name in secret_names_by_path.items():
+        secret_volumes[container_path] = secret_contents[secret_name]
 
     return secret_volumes
 
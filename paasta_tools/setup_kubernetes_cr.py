@@ -23,15 +23,20 @@ Command line options:
 import argparse
 import logging
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
+from typing import Dict
 from typing import Mapping
 from typing import Optional
 from typing import Sequence
+from typing import Tuple
 
+import service_configuration_lib
 from kubernetes.client.exceptions import ApiException
 
 from paasta_tools import yaml_tools as yaml
-from paasta_tools.cli.utils import LONG_RUNNING_INSTANCE_TYPE_HANDLERS
 from paasta_tools.flink_tools import get_flink_ingress_url_root
 from paasta_tools.kubernetes_tools import CustomResourceDefinition
 from paasta_tools.kubernetes_tools import KubeClient
@@ -44,21 +49,35 @@ from paasta_tools.kubernetes_tools import load_custom_resource_definitions
 from paasta_tools.kubernetes_tools import paasta_prefixed
 from paasta_tools.kubernetes_tools import sanitise_kubernetes_name
 from paasta_tools.kubernetes_tools import update_custom_resource
+from paasta_tools.metrics import metrics_lib
 from paasta_tools.utils import DEFAULT_SOA_DIR
+from paasta_tools.utils import InstanceConfig
 from paasta_tools.utils import NoDeploymentsAvailable
+from paasta_tools.utils import deep_merge_dictionaries
 from paasta_tools.utils import get_config_hash
 from paasta_tools.utils import get_git_sha_from_dockerurl
 from paasta_tools.utils import load_all_configs
 from paasta_tools.utils import load_system_paasta_config
+from paasta_tools.utils import load_v2_deployments_json
 
 log = logging.getLogger(__name__)
 
+# Services are reconciled concurrently, with at most this many at a time
+MAX_CONCURRENT_RECONCILES = 10
+
+# (service, instance, kind)
+CustomResourceKey = Tuple[str, str, str]
+
 
 class StdoutKubeClient:
     """Replace all destructive operations in Kubernetes APIs with
     writing out YAML to stdout."""
 
     class StdoutWrapper:
+        # custom resources are reconciled from several threads, so make sure
+        # their YAML documents don't get interleaved
+        lock = threading.Lock()
+
         def __init__(self, target) -> None:
             self.target = target
 
@@ -76,7 +95,8 @@ class StdoutKubeClient:
                 if "metadata" not in body:
                     body["metadata"] = {}
                 body["metadata"]["namespace"] = ns
-            yaml.safe_dump(body, sys.stdout, indent=4, explicit_start=True)
+            with self.lock:
+                yaml.safe_dump(body, sys.stdout, indent=4, explicit_start=True)
 
     def __init__(self, kube_client) -> None:
         self.deployments = StdoutKubeClient.StdoutWrapper(kube_client.deployments)
@@ -141,6 +161,7 @@ def main() -> None:
         custom_resource_definitions=custom_resource_definitions,
         service=args.service,
         instance=args.instance,
+        metrics_interface=metrics_lib.get_metrics_interface("paasta"),
     )
     sys.exit(0 if setup_kube_succeeded else 1)
 
@@ -152,6 +173,7 @@ def setup_all_custom_resources(
     custom_resource_definitions: Sequence[CustomResourceDefinition],
     service: str = None,
     instance: str = None,
+    metrics_interface: metrics_lib.BaseMetrics = metrics_lib.NoMetrics("paasta"),
 ) -> bool:
 
     got_results = False
@@ -193,18 +215,28 @@ def setup_all_custom_resources(
             ensure_namespace(
                 kube_client=kube_client, namespace=f"paasta-{crd.kube_kind.plural}"
             )
-            results.append(
-                setup_custom_resources(
-                    kube_client=kube_client,
-                    kind=crd.kube_kind,
-                    crd=crd,
-                    config_dicts=config_dicts,
-                    version=crd.version,
-                    group=crd.group,
-                    cluster=cluster,
-                    service=service,
-                    instance=instance,
+            timer = metrics_interface.create_timer(
+                "setup_kubernetes_cr.reconcile_duration",
+                default_dimensions=dict(cluster=cluster, kind=crd.kube_kind.singular),
+            )
+            start = time.time()
+            with timer:
+                results.append(
+                    setup_custom_resources(
+                        kube_client=kube_client,
+                        kind=crd.kube_kind,
+                        crd=crd,
+                        config_dicts=config_dicts,
+                        version=crd.version,
+                        group=crd.group,
+                        cluster=cluster,
+                        service=service,
+                        instance=instance,
+                    )
                 )
+            log.info(
+                f"Reconciled {crd.kube_kind.singular} custom resources in "
+                f"{time.time() - start:.2f}s"
             )
         if results:
             got_results = True
@@ -226,31 +258,47 @@ def setup_custom_resources(
     cluster: str,
     service: str = None,
     instance: str = None,
+    max_workers: int = MAX_CONCURRENT_RECONCILES,
 ) -> bool:
     succeded = True
     if config_dicts:
-        crs = list_custom_resources(
-            kube_client=kube_client, kind=kind, version=version, group=group
+        crs = index_custom_resources(
+            list_custom_resources(
+                kube_client=kube_client, kind=kind, version=version, group=group
+            )
         )
-    for svc, config in config_dicts.items():
-        if service is not None and service != svc:
-            continue
-        if not reconcile_kubernetes_resource(
-            kube_client=kube_client,
-            service=svc,
-            instance=instance,
-            instance_configs=config,
-            kind=kind,
-            custom_resources=crs,
-            version=version,
-            group=group,
-            cluster=cluster,
-            crd=crd,
-        ):
-            succeded = False
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                reconcile_kubernetes_resource,
+                kube_client=kube_client,
+                service=svc,
+                instance=instance,
+                instance_configs=config,
+                kind=kind,
+                custom_resources=crs,
+                version=version,
+                group=group,
+                cluster=cluster,
+                crd=crd,
+            )
+            for svc, config in config_dicts.items()
+            if service is None or service == svc
+        ]
+        for future in futures:
+            if not future.result():
+                succeded = False
     return succeded
 
 
+def index_custom_resources(
+    custom_resources: Sequence[KubeCustomResource],
+) -> Dict[CustomResourceKey, KubeCustomResource]:
+    """Indexes custom resources by (service, instance, kind), so that looking up
+    the existing resource for an instance doesn't require a scan of them all."""
+    return {(cr.service, cr.instance, cr.kind): cr for cr in custom_resources}
+
+
 def get_dashboard_base_url(kind: str, cluster: str, is_eks: bool) -> Optional[str]:
     system_paasta_config = load_system_paasta_config()
     dashboard_links = system_paasta_config.get_dashboard_links()
@@ -325,7 +373,7 @@ def reconcile_kubernetes_resource(
     kube_client: KubeClient,
     service: str,
     instance_configs: Mapping[str, Any],
-    custom_resources: Sequence[KubeCustomResource],
+    custom_resources: Mapping[CustomResourceKey, KubeCustomResource],
     kind: KubeKind,
     version: str,
     group: str,
@@ -334,23 +382,51 @@ def reconcile_kubernetes_resource(
     instance: str = None,
 ) -> bool:
     succeeded = True
-    config_handler = LONG_RUNNING_INSTANCE_TYPE_HANDLERS[crd.file_prefix]
 
     is_eks = False
     if crd.file_prefix.endswith("eks"):
         is_eks = True
 
+    instance_configs = {
+        inst: config
+        for inst, config in instance_configs.items()
+        if instance is None or instance == inst
+    }
+    if not instance_configs:
+        return succeeded
+    # service.yaml and deployments.json are the same for every instance of the
+    # service, so read them once here and build each instance's config from the
+    # instance_configs we were given rather than reloading it from disk
+    try:
+        general_config = service_configuration_lib.read_service_configuration(
+            service, soa_dir=DEFAULT_SOA_DIR
+        )
+        deployments_json = load_v2_deployments_json(service, soa_dir=DEFAULT_SOA_DIR)
+    except NoDeploymentsAvailable:
+        for inst in instance_configs:
+            log.warning(
+                f"No deployments available for {service}.{inst} in {cluster}, skipping"
+            )
+        return succeeded
+    except Exception as e:
+        log.error(f"Unable to load configs for {service} in {cluster}: {e}")
+        return False
+
     for inst, config in instance_configs.items():
-        if instance is not None and instance != inst:
-            continue
         try:
+            soa_config = InstanceConfig(
+                service=service,
+                cluster=cluster,
+                instance=inst,
+                config_dict=deep_merge_dictionaries(
+                    overrides=config, defaults=general_config
+                ),
+                branch_dict=None,
+                soa_dir=DEFAULT_SOA_DIR,
+            )
             try:
-                soa_config = config_handler.loader(
-                    service=service,
-                    instance=inst,
-                    cluster=cluster,
-                    load_deployments=True,
-                    soa_dir=DEFAULT_SOA_DIR,
+                soa_config.branch_dict = deployments_json.get_branch_dict(
+                    service, soa_config.get_branch(), soa_config.get_deploy_group()
                 )
             except NoDeploymentsAvailable:
                 log.warning(
@@ -383,9 +459,8 @@ def reconcile_kubernetes_resource(
                 name=formatted_resource["metadata"]["name"],
                 namespace=f"paasta-{kind.plural}",
             )
-            if not (service, inst, kind.singular) in [
-                (c.service, c.instance, c.kind) for c in custom_resources
-            ]:
+            existing_resource = custom_resources.get((service, inst, kind.singular))
+            if existing_resource is None:
                 log.info(f"{desired_resource} does not exist so creating")
                 create_custom_resource(
                     kube_client=kube_client,
@@ -394,7 +469,7 @@ def reconcile_kubernetes_resource(
                     formatted_resource=formatted_resource,
                     group=group,
                 )
-            elif desired_resource not in custom_resources:
+            elif existing_resource != desired_resource:
                 sanitised_service = sanitise_kubernetes_name(service)
                 sanitised_instance = sanitise_kubernetes_name(inst)
                 log.info(f"{desired_resource} exists but config_sha doesn't match")
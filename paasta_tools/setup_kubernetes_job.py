@@ -21,35 +21,36 @@ Command line options:
 - -v, --verbose: Verbose output
 """
 import argparse
-import json
 import logging
+import os
 import sys
 import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Sequence
 from typing import Tuple
+from typing import Type
 from typing import Union
 
 from paasta_tools.eks_tools import EksDeploymentConfig
-from paasta_tools.eks_tools import load_eks_service_config_no_cache
 from paasta_tools.kubernetes.application.controller_wrappers import Application
 from paasta_tools.kubernetes.application.controller_wrappers import (
     get_application_wrapper,
 )
+from paasta_tools.kubernetes.autoscaling_overrides import AutoscalingOverridesStore
 from paasta_tools.kubernetes_tools import AUTOSCALING_OVERRIDES_CONFIGMAP_NAME
-from paasta_tools.kubernetes_tools import AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE
 from paasta_tools.kubernetes_tools import HpaOverride
 from paasta_tools.kubernetes_tools import InvalidKubernetesConfig
 from paasta_tools.kubernetes_tools import KubeClient
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
 from paasta_tools.kubernetes_tools import ensure_namespace
-from paasta_tools.kubernetes_tools import get_namespaced_configmap
 from paasta_tools.kubernetes_tools import list_all_paasta_deployments
-from paasta_tools.kubernetes_tools import load_kubernetes_service_config_no_cache
 from paasta_tools.metrics import metrics_lib
+from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import SPACER
 from paasta_tools.utils import DeploymentVersion
@@ -61,6 +62,11 @@ from paasta_tools.utils import load_system_paasta_config
 
 log = logging.getLogger(__name__)
 
+# Loading configs in worker processes only pays off for full-cluster runs:
+# below this many service instances, starting the workers costs more than it saves.
+CONFIG_LOAD_PROCESS_POOL_THRESHOLD = 200
+CONFIG_LOAD_PROCESSES = min(8, os.cpu_count() or 1)
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Creates Kubernetes jobs.")
@@ -207,49 +213,103 @@ def validate_job_name(service_instance: str) -> bool:
     return True
 
 
-def get_kubernetes_deployment_config(
-    service_instances_with_valid_names: list,
+def load_service_deployment_configs(
+    service: str,
+    instances: Sequence[str],
     cluster: str,
     soa_dir: str = DEFAULT_SOA_DIR,
     eks: bool = False,
-) -> List[Tuple[bool, Union[KubernetesDeploymentConfig, EksDeploymentConfig]]]:
-    service_instance_configs_list = []
-    for service_instance in service_instances_with_valid_names:
+) -> List[
+    Tuple[bool, Optional[Union[KubernetesDeploymentConfig, EksDeploymentConfig]]]
+]:
+    """Load the configs of several instances of the same service, reading
+    service.yaml, the cluster's instance (and autotune) files and deployments.json
+    only once.
+
+    :returns: a (no error?, config or None) pair per instance, in the same order
+    """
+    config_class: Union[Type[KubernetesDeploymentConfig], Type[EksDeploymentConfig]] = (
+        EksDeploymentConfig if eks else KubernetesDeploymentConfig
+    )
+    loader = PaastaServiceConfigLoader(service=service, soa_dir=soa_dir)
+    service_instance_configs_list: List[
+        Tuple[bool, Optional[Union[KubernetesDeploymentConfig, EksDeploymentConfig]]]
+    ] = []
+    for instance in instances:
         try:
-            service_instance_config: Union[
-                KubernetesDeploymentConfig, EksDeploymentConfig
-            ]
-            if eks:
-                service_instance_config = load_eks_service_config_no_cache(
-                    service=service_instance[0],
-                    instance=service_instance[1],
-                    cluster=cluster,
-                    soa_dir=soa_dir,
-                )
-            else:
-                service_instance_config = load_kubernetes_service_config_no_cache(
-                    service=service_instance[0],
-                    instance=service_instance[1],
-                    cluster=cluster,
-                    soa_dir=soa_dir,
-                )
+            service_instance_config = loader.instance_config(
+                cluster, instance, config_class
+            )
             service_instance_configs_list.append((True, service_instance_config))
         except NoDeploymentsAvailable:
             log.debug(
                 "No deployments found for %s.%s in cluster %s. Skipping."
-                % (service_instance[0], service_instance[1], cluster)
+                % (service, instance, cluster)
             )
             service_instance_configs_list.append((True, None))
         except NoConfigurationForServiceError:
             error_msg = (
                 "Could not read kubernetes configuration file for %s.%s in cluster %s"
-                % (service_instance[0], service_instance[1], cluster)
+                % (service, instance, cluster)
             )
             log.error(error_msg)
             service_instance_configs_list.append((False, None))
     return service_instance_configs_list
 
 
+def get_kubernetes_deployment_config(
+    service_instances_with_valid_names: list,
+    cluster: str,
+    soa_dir: str = DEFAULT_SOA_DIR,
+    eks: bool = False,
+    processes: int = CONFIG_LOAD_PROCESSES,
+) -> List[Tuple[bool, Union[KubernetesDeploymentConfig, EksDeploymentConfig]]]:
+    """Load the configs of the given service instances, grouped by service so
+    that each service's files are read once. Large batches are spread over
+    `processes` worker processes.
+
+    :returns: a (no error?, config or None) pair per service instance, in the same order
+    """
+    indexed_instances_by_service: Dict[str, List[Tuple[int, str]]] = {}
+    for index, service_instance in enumerate(service_instances_with_valid_names):
+        indexed_instances_by_service.setdefault(service_instance[0], []).append(
+            (index, service_instance[1])
+        )
+    services = sorted(indexed_instances_by_service)
+    instances_by_service = [
+        [instance for _, instance in indexed_instances_by_service[service]]
+        for service in services
+    ]
+    load_args = (
+        services,
+        instances_by_service,
+        repeat(cluster),
+        repeat(soa_dir),
+        repeat(eks),
+    )
+
+    service_instance_configs_list: List = [None] * len(
+        service_instances_with_valid_names
+    )
+    if (
+        processes > 1
+        and len(services) > 1
+        and len(service_instances_with_valid_names)
+        >= CONFIG_LOAD_PROCESS_POOL_THRESHOLD
+    ):
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            configs_by_service = list(
+                executor.map(load_service_deployment_configs, *load_args, chunksize=4)
+            )
+    else:
+        configs_by_service = list(map(load_service_deployment_configs, *load_args))
+
+    for service, configs in zip(services, configs_by_service):
+        for (index, _), config in zip(indexed_instances_by_service[service], configs):
+            service_instance_configs_list[index] = config
+    return service_instance_configs_list
+
+
 def get_hpa_overrides(kube_client: KubeClient) -> Dict[str, Dict[str, HpaOverride]]:
     """
     Load autoscaling overrides from the ConfigMap once.
@@ -288,19 +348,18 @@ def get_hpa_overrides(kube_client: KubeClient) -> Dict[str, Dict[str, HpaOverrid
     """
     overrides: Dict[str, Dict[str, HpaOverride]] = {}
     try:
-        configmap = get_namespaced_configmap(
-            name=AUTOSCALING_OVERRIDES_CONFIGMAP_NAME,
-            namespace=AUTOSCALING_OVERRIDES_CONFIGMAP_NAMESPACE,
-            kube_client=kube_client,
-        )
+        stored_overrides = AutoscalingOverridesStore(kube_client).read()
 
-        if configmap and configmap.data:
+        if stored_overrides:
             current_time = time.time()
 
-            for service_instance, override_json in configmap.data.items():
+            for service_instance, override_metadata in stored_overrides.items():
                 try:
                     service, instance = service_instance.split(".")
-                    override_metadata = json.loads(override_json)
+                    if override_metadata is None:
+                        raise ValueError(
+                            f"Unable to parse the override for {service_instance}"
+                        )
                     expire_after = override_metadata.get("expire_after")
                     min_instances = override_metadata.get("min_instances")
                     max_instances = override_metadata.get("max_instances")
@@ -15,12 +15,21 @@
 Small utility to update the Prometheus adapter's config to match soaconfigs.
 """
 import argparse
+import functools
+import json
 import logging
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
+from string import Template
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Set
+from typing import Tuple
 from typing import cast
 
 import ruamel.yaml as yaml
@@ -30,6 +39,7 @@ from kubernetes.client import V1ObjectMeta
 from kubernetes.client.rest import ApiException
 from mypy_extensions import TypedDict
 
+import paasta_tools
 from paasta_tools.autoscaling.utils import MetricsProviderDict
 from paasta_tools.eks_tools import EksDeploymentConfig
 from paasta_tools.kubernetes_tools import KubeClient
@@ -67,6 +77,8 @@ from paasta_tools.long_running_service_tools import METRICS_PROVIDER_UWSGI_V2
 from paasta_tools.long_running_service_tools import METRICS_PROVIDER_WORKER_LOAD
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
 from paasta_tools.utils import DEFAULT_SOA_DIR
+from paasta_tools.utils import compose_job_id
+from paasta_tools.utils import get_config_hash
 from paasta_tools.utils import get_services_for_cluster
 
 log = logging.getLogger(__name__)
@@ -173,6 +185,24 @@ def parse_args() -> argparse.Namespace:
         default=False,
         help="Enable verbose logging.",
     )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        dest="workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes to load soaconfigs with. Default is %(default)s.",
+    )
+    parser.add_argument(
+        "--rule-cache",
+        dest="rule_cache",
+        type=Path,
+        default=None,
+        help=(
+            "File to cache generated rules in between runs, so that only the rules "
+            "of instances whose autoscaling config changed are regenerated."
+        ),
+    )
     parser.add_argument(
         "--dry-run",
         dest="dry_run",
@@ -282,39 +312,38 @@ def create_instance_scaling_rule(
     )
 
 
-def create_instance_active_requests_scaling_rule(
-    service: str,
-    instance_config: KubernetesDeploymentConfig,
-    metrics_provider_config: MetricsProviderDict,
-    paasta_cluster: str,
-    metric_name: str,
-) -> PrometheusAdapterRule:
+def _promql_placeholders(*names: str) -> Tuple[str, ...]:
+    """Placeholders for the per-instance values of a PromQL template."""
+    return tuple(f"${{{name}}}" for name in names)
+
+
+def _compile_promql(query: str) -> Template:
+    return Template(_minify_promql(query))
+
+
+@functools.lru_cache(maxsize=None)
+def _active_requests_queries() -> Tuple[Template, Template]:
     """
-    Creates a Prometheus adapter rule config for a given service instance.
+    The (minified) metricsQuery and seriesQuery of active_requests rules, compiled once
+    with placeholders for the values of each instance.
     """
-    instance = instance_config.instance
-    namespace = instance_config.get_namespace()
-    desired_active_requests_per_replica = metrics_provider_config.get(
+    (
+        worker_filter_terms,
+        replica_filter_terms,
+        envoy_filter_terms,
+        deployment_name,
+        namespace,
+        desired_active_requests_per_replica,
+        moving_average_window,
+    ) = _promql_placeholders(
+        "worker_filter_terms",
+        "replica_filter_terms",
+        "envoy_filter_terms",
+        "deployment_name",
+        "namespace",
         "desired_active_requests_per_replica",
-        DEFAULT_DESIRED_ACTIVE_REQUESTS_PER_REPLICA,
+        "moving_average_window",
     )
-    moving_average_window = metrics_provider_config.get(
-        "moving_average_window_seconds",
-        DEFAULT_ACTIVE_REQUESTS_AUTOSCALING_MOVING_AVERAGE_WINDOW,
-    )
-    deployment_name = get_kubernetes_app_name(service=service, instance=instance)
-
-    # In order for autoscaling to work safely while a service migrates from one namespace to another, the HPA needs to
-    # make sure that the deployment in the new namespace is scaled up enough to handle _all_ the load.
-    # This is because once the new deployment is 100% healthy, cleanup_kubernetes_job will delete the deployment out of
-    # the old namespace all at once, suddenly putting all the load onto the deployment in the new namespace.
-    # To ensure this, we must:
-    #  - DO NOT filter on namespace in worker_filter_terms (which is used when calculating desired_instances).
-    #  - DO filter on namespace in replica_filter_terms (which is used to calculate current_replicas).
-    # This makes sure that desired_instances includes load from all namespaces, but that the scaling ratio calculated
-    # by (desired_instances / current_replicas) is meaningful for each namespace.
-    worker_filter_terms = f"paasta_cluster='{paasta_cluster}',paasta_service='{service}',paasta_instance='{instance}'"
-    replica_filter_terms = f"paasta_cluster='{paasta_cluster}',deployment='{deployment_name}',namespace='{namespace}'"
 
     current_replicas = f"""
         sum(
@@ -331,17 +360,6 @@ def create_instance_active_requests_scaling_rule(
         ) by (kube_deployment)
     """
 
-    # Envoy tracks metrics at the smartstack namespace level. In most cases the paasta instance name matches the smartstack namespace.
-    # In rare cases, there are custom registration added to instance configs.
-    # If there is no custom registration the envoy and instance names match and no need to update the worker_filter_terms.
-    # If there is a single custom registration for an instance, we will process the registration value and extract the value to be used.
-    # The registrations usually follow the format of {service_name}.{smartstack_name}. Hence we split the string by dot and extract the last token.
-    # More than one custom registrations are not supported and config validation takes care of rejecting such configs.
-    registrations = instance_config.get_registrations()
-
-    mesh_instance = registrations[0].split(".")[-1] if len(registrations) == 1 else None
-    envoy_filter_terms = f"paasta_cluster='{paasta_cluster}',paasta_service='{service}',paasta_instance='{mesh_instance or instance}'"
-
     # envoy-based metrics have no labels corresponding to the k8s resources that they
     # front, but we can trivially add one in since our deployment names are of the form
     # {service_name}-{instance_name} - which are both things in `worker_filter_terms` so
@@ -383,16 +401,10 @@ def create_instance_active_requests_scaling_rule(
     series_query = f"""
         k8s:deployment:pods_status_ready{{{worker_filter_terms}}}
     """
-
-    return {
-        "name": {"as": metric_name},
-        "seriesQuery": _minify_promql(series_query),
-        "resources": {"template": "kube_<<.Resource>>"},
-        "metricsQuery": _minify_promql(metrics_query),
-    }
+    return _compile_promql(metrics_query), _compile_promql(series_query)
 
 
-def create_instance_uwsgi_scaling_rule(
+def create_instance_active_requests_scaling_rule(
     service: str,
     instance_config: KubernetesDeploymentConfig,
     metrics_provider_config: MetricsProviderDict,
@@ -404,9 +416,13 @@ def create_instance_uwsgi_scaling_rule(
     """
     instance = instance_config.instance
     namespace = instance_config.get_namespace()
-    setpoint = metrics_provider_config["setpoint"]
+    desired_active_requests_per_replica = metrics_provider_config.get(
+        "desired_active_requests_per_replica",
+        DEFAULT_DESIRED_ACTIVE_REQUESTS_PER_REPLICA,
+    )
     moving_average_window = metrics_provider_config.get(
-        "moving_average_window_seconds", DEFAULT_UWSGI_AUTOSCALING_MOVING_AVERAGE_WINDOW
+        "moving_average_window_seconds",
+        DEFAULT_ACTIVE_REQUESTS_AUTOSCALING_MOVING_AVERAGE_WINDOW,
     )
     deployment_name = get_kubernetes_app_name(service=service, instance=instance)
 
@@ -420,7 +436,54 @@ def create_instance_uwsgi_scaling_rule(
     # This makes sure that desired_instances includes load from all namespaces, but that the scaling ratio calculated
     # by (desired_instances / current_replicas) is meaningful for each namespace.
     worker_filter_terms = f"paasta_cluster='{paasta_cluster}',paasta_service='{service}',paasta_instance='{instance}'"
-    replica_filter_terms = f"paasta_cluster='{paasta_cluster}',kube_deployment='{deployment_name}',namespace='{namespace}'"
+    replica_filter_terms = f"paasta_cluster='{paasta_cluster}',deployment='{deployment_name}',namespace='{namespace}'"
+
+    # Envoy tracks metrics at the smartstack namespace level. In most cases the paasta instance name matches the smartstack namespace.
+    # In rare cases, there are custom registration added to instance configs.
+    # If there is no custom registration the envoy and instance names match and no need to update the worker_filter_terms.
+    # If there is a single custom registration for an instance, we will process the registration value and extract the value to be used.
+    # The registrations usually follow the format of {service_name}.{smartstack_name}. Hence we split the string by dot and extract the last token.
+    # More than one custom registrations are not supported and config validation takes care of rejecting such configs.
+    registrations = instance_config.get_registrations()
+
+    mesh_instance = registrations[0].split(".")[-1] if len(registrations) == 1 else None
+    envoy_filter_terms = f"paasta_cluster='{paasta_cluster}',paasta_service='{service}',paasta_instance='{mesh_instance or instance}'"
+
+    metrics_query, series_query = _active_requests_queries()
+    values = dict(
+        worker_filter_terms=worker_filter_terms,
+        replica_filter_terms=replica_filter_terms,
+        envoy_filter_terms=envoy_filter_terms,
+        deployment_name=deployment_name,
+        namespace=namespace,
+        desired_active_requests_per_replica=desired_active_requests_per_replica,
+        moving_average_window=moving_average_window,
+    )
+    return {
+        "name": {"as": metric_name},
+        "seriesQuery": series_query.substitute(values),
+        "resources": {"template": "kube_<<.Resource>>"},
+        "metricsQuery": metrics_query.substitute(values),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _uwsgi_metrics_query() -> Template:
+    """
+    The (minified) metricsQuery of uwsgi rules, compiled once with placeholders for the
+    values of each instance.
+    """
+    (
+        worker_filter_terms,
+        replica_filter_terms,
+        setpoint,
+        moving_average_window,
+    ) = _promql_placeholders(
+        "worker_filter_terms",
+        "replica_filter_terms",
+        "setpoint",
+        "moving_average_window",
+    )
 
     # k8s:deployment:pods_status_ready is a metric created by summing kube_pod_status_ready
     # over paasta service/instance/cluster. it counts the number of ready pods in a paasta
@@ -485,16 +548,10 @@ def create_instance_uwsgi_scaling_rule(
     metrics_query = f"""
         {desired_instances} / {ready_pods_namespaced}
     """
-
-    return {
-        "name": {"as": metric_name},
-        "seriesQuery": f"uwsgi_worker_busy{{{worker_filter_terms}}}",
-        "resources": {"template": "kube_<<.Resource>>"},
-        "metricsQuery": _minify_promql(metrics_query),
-    }
+    return _compile_promql(metrics_query)
 
 
-def create_instance_uwsgi_v2_scaling_rule(
+def create_instance_uwsgi_scaling_rule(
     service: str,
     instance_config: KubernetesDeploymentConfig,
     metrics_provider_config: MetricsProviderDict,
@@ -505,17 +562,47 @@ def create_instance_uwsgi_v2_scaling_rule(
     Creates a Prometheus adapter rule config for a given service instance.
     """
     instance = instance_config.instance
+    namespace = instance_config.get_namespace()
+    setpoint = metrics_provider_config["setpoint"]
     moving_average_window = metrics_provider_config.get(
         "moving_average_window_seconds", DEFAULT_UWSGI_AUTOSCALING_MOVING_AVERAGE_WINDOW
     )
+    deployment_name = get_kubernetes_app_name(service=service, instance=instance)
 
     # In order for autoscaling to work safely while a service migrates from one namespace to another, the HPA needs to
     # make sure that the deployment in the new namespace is scaled up enough to handle _all_ the load.
     # This is because once the new deployment is 100% healthy, cleanup_kubernetes_job will delete the deployment out of
     # the old namespace all at once, suddenly putting all the load onto the deployment in the new namespace.
-    # To ensure this, we must NOT filter on namespace in worker_filter_terms (which is used when calculating total_load.
-    # This makes sure that desired_instances includes load from all namespaces.
+    # To ensure this, we must:
+    #  - DO NOT filter on namespace in worker_filter_terms (which is used when calculating desired_instances).
+    #  - DO filter on namespace in replica_filter_terms (which is used to calculate current_replicas).
+    # This makes sure that desired_instances includes load from all namespaces, but that the scaling ratio calculated
+    # by (desired_instances / current_replicas) is meaningful for each namespace.
     worker_filter_terms = f"paasta_cluster='{paasta_cluster}',paasta_service='{service}',paasta_instance='{instance}'"
+    replica_filter_terms = f"paasta_cluster='{paasta_cluster}',kube_deployment='{deployment_name}',namespace='{namespace}'"
+
+    return {
+        "name": {"as": metric_name},
+        "seriesQuery": f"uwsgi_worker_busy{{{worker_filter_terms}}}",
+        "resources": {"template": "kube_<<.Resource>>"},
+        "metricsQuery": _uwsgi_metrics_query().substitute(
+            worker_filter_terms=worker_filter_terms,
+            replica_filter_terms=replica_filter_terms,
+            setpoint=setpoint,
+            moving_average_window=moving_average_window,
+        ),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_busy_total_load_query(worker_busy_metric: str) -> Template:
+    """
+    The (minified) metricsQuery of uwsgi_v2 and worker_load rules, which only differ in
+    the metric they read, compiled once with placeholders for the values of each instance.
+    """
+    worker_filter_terms, moving_average_window = _promql_placeholders(
+        "worker_filter_terms", "moving_average_window"
+    )
 
     # k8s:deployment:pods_status_ready is a metric created by summing kube_pod_status_ready
     # over paasta service/instance/cluster. it counts the number of ready pods in a paasta
@@ -531,7 +618,7 @@ def create_instance_uwsgi_v2_scaling_rule(
     """
     load_per_instance = f"""
         avg(
-            uwsgi_worker_busy{{{worker_filter_terms}}}
+            {worker_busy_metric}{{{worker_filter_terms}}}
         ) by (kube_pod, kube_deployment)
     """
     missing_instances = f"""
@@ -556,16 +643,10 @@ def create_instance_uwsgi_v2_scaling_rule(
             )[{moving_average_window}s:]
         )
     """
+    return _compile_promql(total_load_smoothed)
 
-    return {
-        "name": {"as": metric_name},
-        "seriesQuery": f"uwsgi_worker_busy{{{worker_filter_terms}}}",
-        "resources": {"template": "kube_<<.Resource>>"},
-        "metricsQuery": _minify_promql(total_load_smoothed),
-    }
 
-
-def create_instance_worker_load_scaling_rule(
+def create_instance_uwsgi_v2_scaling_rule(
     service: str,
     instance_config: KubernetesDeploymentConfig,
     metrics_provider_config: MetricsProviderDict,
@@ -573,12 +654,11 @@ def create_instance_worker_load_scaling_rule(
     metric_name: str,
 ) -> PrometheusAdapterRule:
     """
-    Creates a Prometheus adapter rule config for a given service instance using generic worker_busy metric.
+    Creates a Prometheus adapter rule config for a given service instance.
     """
     instance = instance_config.instance
     moving_average_window = metrics_provider_config.get(
-        "moving_average_window_seconds",
-        DEFAULT_WORKER_LOAD_AUTOSCALING_MOVING_AVERAGE_WINDOW,
+        "moving_average_window_seconds", DEFAULT_UWSGI_AUTOSCALING_MOVING_AVERAGE_WINDOW
     )
 
     # In order for autoscaling to work safely while a service migrates from one namespace to another, the HPA needs to
@@ -589,55 +669,18 @@ def create_instance_worker_load_scaling_rule(
     # This makes sure that desired_instances includes load from all namespaces.
     worker_filter_terms = f"paasta_cluster='{paasta_cluster}',paasta_service='{service}',paasta_instance='{instance}'"
 
-    # k8s:deployment:pods_status_ready is a metric created by summing kube_pod_status_ready
-    # over paasta service/instance/cluster. it counts the number of ready pods in a paasta
-    # deployment.
-    ready_pods = f"""
-        (sum(
-            k8s:deployment:pods_status_ready{{{worker_filter_terms}}} >= 0
-            or
-            max_over_time(
-                k8s:deployment:pods_status_ready{{{worker_filter_terms}}}[{DEFAULT_EXTRAPOLATION_TIME}s]
-            )
-        ) by (kube_deployment))
-    """
-    load_per_instance = f"""
-        avg(
-            worker_busy{{{worker_filter_terms}}}
-        ) by (kube_pod, kube_deployment)
-    """
-    missing_instances = f"""
-        clamp_min(
-            {ready_pods} - count({load_per_instance}) by (kube_deployment),
-            0
-        )
-    """
-    total_load = f"""
-    (
-        sum(
-            {load_per_instance}
-        ) by (kube_deployment)
-        +
-        {missing_instances}
-    )
-    """
-    total_load_smoothed = f"""
-        avg_over_time(
-            (
-                {total_load}
-            )[{moving_average_window}s:]
-        )
-    """
-
     return {
         "name": {"as": metric_name},
-        "seriesQuery": f"worker_busy{{{worker_filter_terms}}}",
+        "seriesQuery": f"uwsgi_worker_busy{{{worker_filter_terms}}}",
         "resources": {"template": "kube_<<.Resource>>"},
-        "metricsQuery": _minify_promql(total_load_smoothed),
+        "metricsQuery": _worker_busy_total_load_query("uwsgi_worker_busy").substitute(
+            worker_filter_terms=worker_filter_terms,
+            moving_average_window=moving_average_window,
+        ),
     }
 
 
-def create_instance_piscina_scaling_rule(
+def create_instance_worker_load_scaling_rule(
     service: str,
     instance_config: KubernetesDeploymentConfig,
     metrics_provider_config: MetricsProviderDict,
@@ -645,28 +688,54 @@ def create_instance_piscina_scaling_rule(
     metric_name: str,
 ) -> PrometheusAdapterRule:
     """
-    Creates a Prometheus adapter rule config for a given service instance.
+    Creates a Prometheus adapter rule config for a given service instance using generic worker_busy metric.
     """
     instance = instance_config.instance
-    namespace = instance_config.get_namespace()
-    setpoint = metrics_provider_config["setpoint"]
     moving_average_window = metrics_provider_config.get(
         "moving_average_window_seconds",
-        DEFAULT_PISCINA_AUTOSCALING_MOVING_AVERAGE_WINDOW,
+        DEFAULT_WORKER_LOAD_AUTOSCALING_MOVING_AVERAGE_WINDOW,
     )
-    deployment_name = get_kubernetes_app_name(service=service, instance=instance)
 
     # In order for autoscaling to work safely while a service migrates from one namespace to another, the HPA needs to
     # make sure that the deployment in the new namespace is scaled up enough to handle _all_ the load.
     # This is because once the new deployment is 100% healthy, cleanup_kubernetes_job will delete the deployment out of
     # the old namespace all at once, suddenly putting all the load onto the deployment in the new namespace.
-    # To ensure this, we must:
-    #  - DO NOT filter on namespace in worker_filter_terms (which is used when calculating desired_instances).
-    #  - DO filter on namespace in replica_filter_terms (which is used to calculate current_replicas).
-    # This makes sure that desired_instances includes load from all namespaces, but that the scaling ratio calculated
-    # by (desired_instances / current_replicas) is meaningful for each namespace.
+    # To ensure this, we must NOT filter on namespace in worker_filter_terms (which is used when calculating total_load.
+    # This makes sure that desired_instances includes load from all namespaces.
     worker_filter_terms = f"paasta_cluster='{paasta_cluster}',paasta_service='{service}',paasta_instance='{instance}'"
-    replica_filter_terms = f"paasta_cluster='{paasta_cluster}',deployment='{deployment_name}',namespace='{namespace}'"
+
+    return {
+        "name": {"as": metric_name},
+        "seriesQuery": f"worker_busy{{{worker_filter_terms}}}",
+        "resources": {"template": "kube_<<.Resource>>"},
+        "metricsQuery": _worker_busy_total_load_query("worker_busy").substitute(
+            worker_filter_terms=worker_filter_terms,
+            moving_average_window=moving_average_window,
+        ),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _desired_replicas_ratio_query(load_per_instance_template: str) -> Template:
+    """
+    The (minified) metricsQuery of piscina and gunicorn rules, which only differ in how
+    they compute the load of each instance, compiled once with placeholders for the
+    values of each instance.
+
+    :param load_per_instance_template: PromQL for the load of each instance, with a
+        ${worker_filter_terms} placeholder
+    """
+    (
+        worker_filter_terms,
+        replica_filter_terms,
+        setpoint,
+        moving_average_window,
+    ) = _promql_placeholders(
+        "worker_filter_terms",
+        "replica_filter_terms",
+        "setpoint",
+        "moving_average_window",
+    )
 
     current_replicas = f"""
         sum(
@@ -694,9 +763,7 @@ def create_instance_piscina_scaling_rule(
             )
         ) by (kube_deployment))
     """
-    load_per_instance = f"""
-        (piscina_pool_utilization{{{worker_filter_terms}}})
-    """
+    load_per_instance = load_per_instance_template
     missing_instances = f"""
         clamp_min(
             {ready_pods} - count({load_per_instance}) by (kube_deployment),
@@ -725,12 +792,63 @@ def create_instance_piscina_scaling_rule(
     metrics_query = f"""
         {desired_instances} / {current_replicas}
     """
+    return _compile_promql(metrics_query)
+
+
+PISCINA_LOAD_PER_INSTANCE = """
+        (piscina_pool_utilization{${worker_filter_terms}})
+    """
+
+GUNICORN_LOAD_PER_INSTANCE = """
+        avg(
+            gunicorn_worker_busy{${worker_filter_terms}}
+        ) by (kube_pod, kube_deployment)
+    """
+
+
+def create_instance_piscina_scaling_rule(
+    service: str,
+    instance_config: KubernetesDeploymentConfig,
+    metrics_provider_config: MetricsProviderDict,
+    paasta_cluster: str,
+    metric_name: str,
+) -> PrometheusAdapterRule:
+    """
+    Creates a Prometheus adapter rule config for a given service instance.
+    """
+    instance = instance_config.instance
+    namespace = instance_config.get_namespace()
+    setpoint = metrics_provider_config["setpoint"]
+    moving_average_window = metrics_provider_config.get(
+        "moving_average_window_seconds",
+        DEFAULT_PISCINA_AUTOSCALING_MOVING_AVERAGE_WINDOW,
+    )
+    deployment_name = get_kubernetes_app_name(service=service, instance=instance)
+
+    # In order for autoscaling to work safely while a service migrates from one namespace to another, the HPA needs to
+    # make sure that the deployment in the new namespace is scaled up enough to handle _all_ the load.
+    # This is because once the new deployment is 100% healthy, cleanup_kubernetes_job will delete the deployment out of
+    # the old namespace all at once, suddenly putting all the load onto the deployment in the new namespace.
+    # To ensure this, we must:
+    #  - DO NOT filter on namespace in worker_filter_terms (which is used when calculating desired_instances).
+    #  - DO filter on namespace in replica_filter_terms (which is used to calculate current_replicas).
+    # This makes sure that desired_instances includes load from all namespaces, but that the scaling ratio calculated
+    # by (desired_instances / current_replicas) is meaningful for each namespace.
+    worker_filter_terms = f"paasta_cluster='{paasta_cluster}',paasta_service='{service}',paasta_instance='{instance}'"
+    replica_filter_terms = f"paasta_cluster='{paasta_cluster}',deployment='{deployment_name}',namespace='{namespace}'"
 
     return {
         "name": {"as": metric_name},
         "seriesQuery": f"piscina_pool_utilization{{{worker_filter_terms}}}",
         "resources": {"template": "kube_<<.Resource>>"},
-        "metricsQuery": _minify_promql(metrics_query),
+        "metricsQuery": _desired_replicas_ratio_query(
+            PISCINA_LOAD_PER_INSTANCE
+        ).substitute(
+            worker_filter_terms=worker_filter_terms,
+            replica_filter_terms=replica_filter_terms,
+            setpoint=setpoint,
+            moving_average_window=moving_average_window,
+        ),
     }
 
 
@@ -766,71 +884,18 @@ def create_instance_gunicorn_scaling_rule(
     worker_filter_terms = f"paasta_cluster='{paasta_cluster}',paasta_service='{service}',paasta_instance='{instance}'"
     replica_filter_terms = f"paasta_cluster='{paasta_cluster}',deployment='{deployment_name}',namespace='{namespace}'"
 
-    current_replicas = f"""
-        sum(
-            label_join(
-                (
-                    kube_deployment_spec_replicas{{{replica_filter_terms}}} >= 0
-                    or
-                    max_over_time(
-                        kube_deployment_spec_replicas{{{replica_filter_terms}}}[{DEFAULT_EXTRAPOLATION_TIME}s]
-                    )
-                ),
-                "kube_deployment", "", "deployment"
-            )
-        ) by (kube_deployment)
-    """
-    # k8s:deployment:pods_status_ready is a metric created by summing kube_pod_status_ready
-    # over paasta service/instance/cluster. it counts the number of ready pods in a paasta
-    # deployment.
-    ready_pods = f"""
-        (sum(
-            k8s:deployment:pods_status_ready{{{worker_filter_terms}}} >= 0
-            or
-            max_over_time(
-                k8s:deployment:pods_status_ready{{{worker_filter_terms}}}[{DEFAULT_EXTRAPOLATION_TIME}s]
-            )
-        ) by (kube_deployment))
-    """
-    load_per_instance = f"""
-        avg(
-            gunicorn_worker_busy{{{worker_filter_terms}}}
-        ) by (kube_pod, kube_deployment)
-    """
-    missing_instances = f"""
-        clamp_min(
-            {ready_pods} - count({load_per_instance}) by (kube_deployment),
-            0
-        )
-    """
-    total_load = f"""
-    (
-        sum(
-            {load_per_instance}
-        ) by (kube_deployment)
-        +
-        {missing_instances}
-    )
-    """
-    desired_instances_at_each_point_in_time = f"""
-        {total_load} / {setpoint}
-    """
-    desired_instances = f"""
-        avg_over_time(
-            (
-                {desired_instances_at_each_point_in_time}
-            )[{moving_average_window}s:]
-        )
-    """
-    metrics_query = f"""
-        {desired_instances} / {current_replicas}
-    """
-
     return {
         "name": {"as": metric_name},
         "seriesQuery": f"gunicorn_worker_busy{{{worker_filter_terms}}}",
         "resources": {"template": "kube_<<.Resource>>"},
-        "metricsQuery": _minify_promql(metrics_query),
+        "metricsQuery": _desired_replicas_ratio_query(
+            GUNICORN_LOAD_PER_INSTANCE
+        ).substitute(
+            worker_filter_terms=worker_filter_terms,
+            replica_filter_terms=replica_filter_terms,
+            setpoint=setpoint,
+            moving_average_window=moving_average_window,
+        ),
     }
 
 
@@ -934,14 +999,132 @@ def get_rules_for_service_instance(
     return rules
 
 
+def get_rule_params_digest(
+    service_name: str,
+    instance_config: KubernetesDeploymentConfig,
+    paasta_cluster: str,
+) -> str:
+    """
+    Returns a digest of everything that get_rules_for_service_instance() reads from
+    an instance config - if two digests match, so do the rules generated for them.
+    """
+    return get_config_hash(
+        {
+            # rules generated by a different version of this code may well differ
+            "paasta_tools_version": paasta_tools.__version__,
+            "service": service_name,
+            "instance": instance_config.instance,
+            "cluster": paasta_cluster,
+            "namespace": instance_config.get_namespace(),
+            "registrations": instance_config.get_registrations(),
+            "deployment_name": instance_config.get_sanitised_deployment_name(),
+            "metrics_providers": [
+                instance_config.get_autoscaling_metrics_provider(metrics_provider_type)
+                for metrics_provider_type in ALL_METRICS_PROVIDERS
+            ],
+        }
+    )
+
+
+class PrometheusAdapterRuleCache:
+    """
+    Caches the rules generated for each service instance alongside the digest of the
+    params they were generated from (see get_rule_params_digest()), so that only
+    instances whose params changed need their rules generated again.
+
+    The cache can be saved to and loaded from a file to carry it between runs.
+    """
+
+    def __init__(
+        self, entries: Dict[str, Tuple[str, List[PrometheusAdapterRule]]] = None
+    ) -> None:
+        self.entries = entries or {}
+        self.hits = 0
+        self.misses = 0
+        self._used_keys: Set[str] = set()
+
+    @classmethod
+    def load(cls, path: Path) -> "PrometheusAdapterRuleCache":
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            entries = {}
+        except ValueError:
+            log.warning(f"Ignoring unreadable rule cache at {path}")
+            entries = {}
+        return cls({key: (digest, rules) for key, (digest, rules) in entries.items()})
+
+    def save(self, path: Path) -> None:
+        # only keep the instances we've seen this run so that removed instances
+        # don't linger in the cache forever
+        entries = {key: self.entries[key] for key in sorted(self._used_keys)}
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+
+    def get_rules_for_service_instance(
+        self,
+        service_name: str,
+        instance_config: KubernetesDeploymentConfig,
+        paasta_cluster: str,
+    ) -> List[PrometheusAdapterRule]:
+        key = compose_job_id(service_name, instance_config.instance)
+        digest = get_rule_params_digest(service_name, instance_config, paasta_cluster)
+        self._used_keys.add(key)
+
+        cached = self.entries.get(key)
+        if cached is not None and cached[0] == digest:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        rules = get_rules_for_service_instance(
+            service_name=service_name,
+            instance_config=instance_config,
+            paasta_cluster=paasta_cluster,
+        )
+        self.entries[key] = (digest, rules)
+        return rules
+
+
+def load_service_instance_configs_for_adapter(
+    service_name: str, paasta_cluster: str, soa_dir: Path
+) -> List[KubernetesDeploymentConfig]:
+    """
+    Loads all the instance configs of a service that we may need adapter rules for.
+
+    NOTE: this is run in worker processes by create_prometheus_adapter_config(), so
+    it needs to stay a picklable, module-level function.
+    """
+    config_loader = PaastaServiceConfigLoader(
+        service=service_name, soa_dir=str(soa_dir)
+    )
+    return [
+        instance_config
+        for instance_type_class in K8S_INSTANCE_TYPE_CLASSES
+        for instance_config in config_loader.instance_configs(
+            cluster=paasta_cluster,
+            instance_type_class=instance_type_class,
+        )
+    ]
+
+
 def create_prometheus_adapter_config(
-    paasta_cluster: str, soa_dir: Path
+    paasta_cluster: str,
+    soa_dir: Path,
+    workers: int = 1,
+    rule_cache: Optional[PrometheusAdapterRuleCache] = None,
 ) -> PrometheusAdapterConfig:
     """
     Given a paasta cluster and a soaconfigs directory, create the necessary Prometheus adapter
     config to autoscale services.
     Currently supports the following metrics providers:
         * uwsgi
+
+    :param workers: if greater than 1, soaconfigs are loaded in a pool of this many processes
+    :param rule_cache: if provided, used to skip generating rules for unchanged instances
     """
     rules: List[PrometheusAdapterRule] = []
     # get_services_for_cluster() returns a list of (service, instance) tuples, but this
@@ -963,22 +1146,43 @@ def create_prometheus_adapter_config(
             )
         }
     )
-    for service_name in services:
-        config_loader = PaastaServiceConfigLoader(
-            service=service_name, soa_dir=str(soa_dir)
-        )
-        for instance_type_class in K8S_INSTANCE_TYPE_CLASSES:
-            for instance_config in config_loader.instance_configs(
-                cluster=paasta_cluster,
-                instance_type_class=instance_type_class,
-            ):
-                rules.extend(
-                    get_rules_for_service_instance(
+    service_names = sorted(services)
+
+    def generate_rules(
+        instance_configs_by_service: Iterable[List[KubernetesDeploymentConfig]],
+    ) -> None:
+        for service_name, instance_configs in zip(
+            service_names, instance_configs_by_service
+        ):
+            for instance_config in instance_configs:
+                if rule_cache is not None:
+                    instance_rules = rule_cache.get_rules_for_service_instance(
+                        service_name=service_name,
+                        instance_config=instance_config,
+                        paasta_cluster=paasta_cluster,
+                    )
+                else:
+                    instance_rules = get_rules_for_service_instance(
                         service_name=service_name,
                         instance_config=instance_config,
                         paasta_cluster=paasta_cluster,
                     )
+                rules.extend(instance_rules)
+
+    args = (service_names, repeat(paasta_cluster), repeat(soa_dir))
+    if workers > 1 and len(service_names) > 1:
+        # loading soaconfigs is the expensive (and CPU-bound) part of this, so that's
+        # what we spread over processes - rules are generated here as results come in
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            generate_rules(
+                executor.map(
+                    load_service_instance_configs_for_adapter,
+                    *args,
+                    chunksize=max(1, len(service_names) // (workers * 4)),
                 )
+            )
+    else:
+        generate_rules(map(load_service_instance_configs_for_adapter, *args))
 
     return {
         # we sort our rules so that we can easily compare between two different configmaps
@@ -989,6 +1193,29 @@ def create_prometheus_adapter_config(
     }
 
 
+def diff_prometheus_adapter_configs(
+    existing_config: PrometheusAdapterConfig, desired_config: PrometheusAdapterConfig
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Returns the names of the rules that were added, removed and changed (in that
+    order) going from existing_config to desired_config.
+    """
+    existing_rules = {
+        rule["name"]["as"]: rule for rule in existing_config.get("rules") or []
+    }
+    desired_rules = {
+        rule["name"]["as"]: rule for rule in desired_config.get("rules") or []
+    }
+    added = sorted(desired_rules.keys() - existing_rules.keys())
+    removed = sorted(existing_rules.keys() - desired_rules.keys())
+    changed = sorted(
+        name
+        for name in desired_rules.keys() & existing_rules.keys()
+        if desired_rules[name] != existing_rules[name]
+    )
+    return added, removed, changed
+
+
 def update_prometheus_adapter_configmap(
     kube_client: KubeClient, config: PrometheusAdapterConfig
 ) -> None:
@@ -1091,11 +1318,22 @@ def main() -> int:
         logging.basicConfig(level=logging.INFO)
 
     log.info("Generating adapter config from soaconfigs.")
+    rule_cache = (
+        PrometheusAdapterRuleCache.load(args.rule_cache) if args.rule_cache else None
+    )
     config = create_prometheus_adapter_config(
         paasta_cluster=args.cluster,
         soa_dir=args.soa_dir,
+        workers=args.workers,
+        rule_cache=rule_cache,
     )
     log.info("Generated adapter config from soaconfigs.")
+    if rule_cache is not None:
+        log.info(
+            f"Reused cached rules for {rule_cache.hits} instances, "
+            f"regenerated {rule_cache.misses}."
+        )
+        rule_cache.save(args.rule_cache)
     if args.dry_run:
         log.info(
             "Generated the following config:\n%s",
@@ -1104,7 +1342,8 @@ def main() -> int:
             ),
         )
         return 0  # everything after this point requires creds/updates state
-    else:
+    elif log.isEnabledFor(logging.DEBUG):
+        # dumping the whole config is expensive, so avoid it unless it'll be logged
         log.debug(
             "Generated the following config:\n%s",
             yaml.dump(
@@ -1122,7 +1361,20 @@ def main() -> int:
 
     existing_config = get_prometheus_adapter_configmap(kube_client=kube_client)
     if existing_config and existing_config != config:
-        log.info("Existing config differs from soaconfigs - updating.")
+        added, removed, changed = diff_prometheus_adapter_configs(
+            existing_config, config
+        )
+        log.info(
+            f"Existing config differs from soaconfigs ({len(added)} rules added, "
+            f"{len(removed)} removed, {len(changed)} changed) - updating."
+        )
+        for action, rule_names in (
+            ("Adding", added),
+            ("Removing", removed),
+            ("Updating", changed),
+        ):
+            for rule_name in rule_names:
+                log.info(f"{action} rule {rule_name}")
         log.debug("Existing data: %s", existing_config)
         log.debug("Desired data: %s", config)
         update_prometheus_adapter_configmap(kube_client=kube_client, config=config)
@@ -14,6 +14,7 @@
 import abc
 import collections
 import csv
+import functools
 import logging
 import random
 from typing import Any
@@ -31,6 +32,7 @@ from typing import TypeVar
 from typing import Union
 from typing import cast
 
+import cachetools.func
 import requests
 from kubernetes.client import V1Node
 from kubernetes.client import V1Pod
@@ -63,6 +65,22 @@ class HaproxyBackend(TypedDict, total=False):
 log = logging.getLogger(__name__)
 
 
+# How long (seconds) one check cycle reuses a single haproxy CSV fetch.
+HAPROXY_SNAPSHOT_TTL = 5
+
+
+@functools.lru_cache(maxsize=1)
+def _get_haproxy_session() -> requests.Session:
+    """Returns a requests.Session shared by every haproxy query in this process,
+    so that connections to each synapse host are pooled and reused."""
+    # retry 3 times
+    haproxy_request = requests.Session()
+    haproxy_request.headers.update({"User-Agent": get_user_agent()})
+    haproxy_request.mount("http://", requests.adapters.HTTPAdapter(max_retries=3))
+    haproxy_request.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
+    return haproxy_request
+
+
 def retrieve_haproxy_csv(
     synapse_host: str, synapse_port: int, synapse_haproxy_url_format: str, scope: str
 ) -> Iterable[Dict[str, str]]:
@@ -78,17 +96,71 @@ def retrieve_haproxy_csv(
         host=synapse_host, port=synapse_port, scope=scope
     )
 
-    # timeout after 1 second and retry 3 times
-    haproxy_request = requests.Session()
-    haproxy_request.headers.update({"User-Agent": get_user_agent()})
-    haproxy_request.mount("http://", requests.adapters.HTTPAdapter(max_retries=3))
-    haproxy_request.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
-    haproxy_response = haproxy_request.get(synapse_uri, timeout=1)
+    # timeout after 1 second
+    haproxy_response = _get_haproxy_session().get(synapse_uri, timeout=1)
     haproxy_data = haproxy_response.text
     reader = csv.DictReader(haproxy_data.splitlines())
     return reader
 
 
+class HaproxyBackendsSnapshot:
+    """The backends listed in a single fetch of the haproxy CSV, indexed by
+    service so that any number of per-service lookups can be answered without
+    going back to haproxy."""
+
+    def __init__(self, reader: Iterable[Dict[str, str]]) -> None:
+        self._backends: List[HaproxyBackend] = []
+        self._backends_by_service: DefaultDict[
+            str, List[HaproxyBackend]
+        ] = collections.defaultdict(list)
+
+        for line in reader:
+            # Ignore the fictional FRONTEND/BACKEND hosts before doing any
+            # other work on the line
+            if line["svname"] in ("FRONTEND", "BACKEND"):
+                continue
+            # clean up two irregularities of the CSV output, relative to
+            # DictReader's behavior there's a leading "# " for no good reason:
+            line["pxname"] = line.pop("# pxname")
+            # and there's a trailing comma on every line:
+            line.pop("")
+
+            backend = cast(HaproxyBackend, line)
+            self._backends.append(backend)
+            self._backends_by_service[backend["pxname"]].append(backend)
+
+    def get_backends(self, services: Optional[Collection[str]]) -> List[HaproxyBackend]:
+        """Returns the backends of the given services, regardless of their state.
+
+        :param services: If None, return backends for all services, otherwise only return backends for these particular
+                         services.
+        """
+        if services is None:
+            return list(self._backends)
+        if len(services) == 1:
+            (service,) = services
+            return list(self._backends_by_service.get(service, []))
+        # preserve the CSV ordering when several services are requested
+        wanted = set(services)
+        return [b for b in self._backends if b["pxname"] in wanted]
+
+
+@cachetools.func.ttl_cache(maxsize=256, ttl=HAPROXY_SNAPSHOT_TTL)
+def get_haproxy_backends_snapshot(
+    synapse_host: str, synapse_port: int, synapse_haproxy_url_format: str, scope: str
+) -> HaproxyBackendsSnapshot:
+    """Fetches and indexes the haproxy CSV, reusing the result of any identical
+    fetch made in the last HAPROXY_SNAPSHOT_TTL seconds."""
+    return HaproxyBackendsSnapshot(
+        retrieve_haproxy_csv(
+            synapse_host,
+            synapse_port,
+            synapse_haproxy_url_format=synapse_haproxy_url_format,
+            scope=scope,
+        )
+    )
+
+
 def get_backends(
     service: str, synapse_host: str, synapse_port: int, synapse_haproxy_url_format: str
 ) -> List[HaproxyBackend]:
@@ -140,32 +212,13 @@ def get_multiple_backends(
         # For now let's just hope this is rare and fetch all data.
         scope = ""
 
-    reader = retrieve_haproxy_csv(
+    snapshot = get_haproxy_backends_snapshot(
         synapse_host,
         synapse_port,
         synapse_haproxy_url_format=synapse_haproxy_url_format,
         scope=scope,
     )
-    backends = []
-
-    for line in reader:
-        # clean up two irregularities of the CSV output, relative to
-        # DictReader's behavior there's a leading "# " for no good reason:
-        line["pxname"] = line.pop("# pxname")
-        # and there's a trailing comma on every line:
-        line.pop("")
-
-        # Look for the service in question and ignore the fictional
-        # FRONTEND/BACKEND hosts, use starts_with so that hosts that are UP
-        # with 1/X healthchecks to go before going down get counted as UP:
-        ha_slave, ha_service = line["svname"], line["pxname"]
-        if (services is None or ha_service in services) and ha_slave not in (
-            "FRONTEND",
-            "BACKEND",
-        ):
-            backends.append(cast(HaproxyBackend, line))
-
-    return backends
+    return snapshot.get_backends(services)
 
 
 def load_smartstack_info_for_service(
@@ -516,10 +569,10 @@ class BaseReplicationChecker(ReplicationChecker):
         :returns: a dict {'service_discovery_provider': {'location_type': {'service.instance': int}}}
         """
         replication_infos = {}
+        attribute_host_dict = self.get_allowed_locations_and_hosts(instance_config)
+        instance_pool = instance_config.get_pool()
         for provider in self._service_discovery_providers:
             replication_info = {}
-            attribute_host_dict = self.get_allowed_locations_and_hosts(instance_config)
-            instance_pool = instance_config.get_pool()
             for location, hosts in attribute_host_dict.items():
                 # Try to get information from all available hosts in the pool before giving up
                 hostnames = self.get_hostnames_in_pool(hosts, instance_pool)
@@ -588,6 +641,12 @@ class KubeSmartstackEnvoyReplicationChecker(BaseReplicationChecker):
         self, nodes: Sequence[V1Node], system_paasta_config: SystemPaastaConfig
     ) -> None:
         self.nodes = nodes
+        # instances only ever discover at a handful of attributes (habitat,
+        # region, ...), so group the nodes once per attribute rather than once
+        # per instance
+        self._hosts_by_discover_location_type: Dict[
+            str, Dict[str, Sequence[DiscoveredHost]]
+        ] = {}
         super().__init__(
             system_paasta_config=system_paasta_config,
             service_discovery_providers=get_service_discovery_providers(
@@ -604,18 +663,21 @@ class KubeSmartstackEnvoyReplicationChecker(BaseReplicationChecker):
             soa_dir=instance_config.soa_dir,
         ).get_discover()
 
-        attribute_to_nodes = kubernetes_tools.get_nodes_grouped_by_attribute(
-            nodes=self.nodes, attribute=discover_location_type
-        )
-        ret: Dict[str, Sequence[DiscoveredHost]] = {}
-        for attr, nodes in attribute_to_nodes.items():
-            ret[attr] = [
-                DiscoveredHost(
-                    hostname=node.metadata.labels["yelp.com/hostname"],
-                    pool=node.metadata.labels["yelp.com/pool"],
-                )
-                for node in nodes
-            ]
+        ret = self._hosts_by_discover_location_type.get(discover_location_type)
+        if ret is None:
+            attribute_to_nodes = kubernetes_tools.get_nodes_grouped_by_attribute(
+                nodes=self.nodes, attribute=discover_location_type
+            )
+            ret = {}
+            for attr, nodes in attribute_to_nodes.items():
+                ret[attr] = [
+                    DiscoveredHost(
+                        hostname=node.metadata.labels["yelp.com/hostname"],
+                        pool=node.metadata.labels["yelp.com/pool"],
+                    )
+                    for node in nodes
+                ]
+            self._hosts_by_discover_location_type[discover_location_type] = ret
         return ret
 
 
@@ -23,6 +23,7 @@ import hashlib
 import io
 import json
 import logging
+import marshal
 import math
 import os
 import pwd
@@ -47,6 +48,7 @@ from subprocess import STDOUT
 from subprocess import Popen
 from types import FrameType
 from typing import IO
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 from typing import Collection
@@ -72,12 +74,7 @@ from typing import cast
 
 import choice
 import dateutil.tz
-import ldap3
-import requests_cache
 import service_configuration_lib
-from docker import APIClient
-from docker.utils import kwargs_from_env
-from environment_tools.type_utils import convert_location_type
 from kazoo.client import KazooClient
 from mypy_extensions import TypedDict
 from service_configuration_lib import read_extra_service_information
@@ -85,6 +82,20 @@ from service_configuration_lib import read_service_configuration
 
 import paasta_tools.cli.fsm
 from paasta_tools import yaml_tools as yaml
+from paasta_tools.lazy_imports import lazy_import
+
+# These are slow to import and only needed by a handful of code paths, so we
+# defer loading them until first use to keep `paasta` startup fast.
+if TYPE_CHECKING:
+    import docker
+    import ldap3
+    import requests_cache
+    from environment_tools import type_utils
+else:
+    docker = lazy_import("docker")
+    ldap3 = lazy_import("ldap3")
+    requests_cache = lazy_import("requests_cache")
+    type_utils = lazy_import("environment_tools.type_utils")
 
 # DO NOT CHANGE SPACER, UNLESS YOU'RE PREPARED TO CHANGE ALL INSTANCES
 # OF IT IN OTHER LIBRARIES (i.e. service_configuration_lib).
@@ -1868,6 +1879,8 @@ PoolToResourcePoolSettingsDict = Dict[str, ResourcePoolSettings]
 class LocalRunConfig(TypedDict, total=False):
     default_cluster: str
     decrypt_secrets_by_default: bool
+    vault_max_workers: int
+    vault_cache_ttl: int
 
 
 class SparkRunConfig(TypedDict, total=False):
@@ -1915,6 +1928,10 @@ class SystemPaastaConfigDict(TypedDict, total=False):
     api_client_timeout: int
     api_endpoints: Dict[str, str]
     api_profiling_config: Dict
+    api_status_poll_interval: float
+    api_bounce_tracker_enabled: bool
+    api_kube_async_pool_size: int
+    api_kube_async_timeout: float
     api_auth_sso_oidc_client_id: str
     auth_certificate_ttl: str
     auto_config_instance_types_enabled: Dict[str, bool]
@@ -2108,6 +2125,16 @@ def validate_pool(
     return True
 
 
+def convert_location_type(
+    location: str, source_type: str, desired_type: str
+) -> List[str]:
+    """Wrapper around environment_tools' convert_location_type, which is only
+    imported (along with networkx) when we actually need to look up a location."""
+    return type_utils.convert_location_type(
+        location=location, source_type=source_type, desired_type=desired_type
+    )
+
+
 class SystemPaastaConfig:
     def __init__(self, config: SystemPaastaConfigDict, directory: str) -> None:
         self.directory = directory
@@ -2679,6 +2706,28 @@ class SystemPaastaConfig:
             {"cprofile_sampling_enabled": False},
         )
 
+    def get_api_status_poll_interval(self) -> float:
+        """How often paasta-api refreshes Flink and Cassandra statuses in the
+        background, in seconds. 0 (the default) disables this, and statuses are
+        then looked up on every request."""
+        return self.config_dict.get("api_status_poll_interval", 0)
+
+    def get_api_bounce_tracker_enabled(self) -> bool:
+        """Whether paasta-api watches the Deployments, StatefulSets, ReplicaSets
+        and ControllerRevisions of the cluster to answer bounce status requests
+        from memory (and to list the bounces in progress)."""
+        return self.config_dict.get("api_bounce_tracker_enabled", False)
+
+    def get_api_kube_async_pool_size(self) -> int:
+        """How many connections to the Kubernetes API paasta-api's async client
+        keeps open per worker. 0 disables the async client, and paasta-api then
+        runs the synchronous one in threads."""
+        return self.config_dict.get("api_kube_async_pool_size", 100)
+
+    def get_api_kube_async_timeout(self) -> float:
+        """Timeout, in seconds, of the requests of paasta-api's async Kubernetes client."""
+        return self.config_dict.get("api_kube_async_timeout", 10)
+
     def get_skip_cpu_override_validation_services(self) -> List[str]:
         return self.config_dict.get("skip_cpu_override_validation", [])
 
@@ -3103,6 +3152,179 @@ def get_hostname() -> str:
     return socket.getfqdn()
 
 
+SOA_SNAPSHOT_FORMAT_VERSION = 1
+# filename -> (mtime_ns, instance names if it's a <instance_type>-<cluster>.yaml file)
+SoaSnapshotFiles = Dict[str, Tuple[int, Optional[Tuple[str, ...]]]]
+
+
+def get_soa_snapshot_path(soa_dir: str = DEFAULT_SOA_DIR) -> str:
+    """The snapshot lives next to (not inside) the soa_dir, so that it doesn't
+    show up as a service in list_services."""
+    return soa_dir.rstrip("/") + ".paasta-snapshot"
+
+
+def parse_deploy_file_name(file_name: str) -> Optional[Tuple[str, str]]:
+    """Return (instance_type, cluster) for a file named like kubernetes-norcal-devc.yaml"""
+    if not file_name.endswith(".yaml"):
+        return None
+    instance_type, _, cluster = file_name[: -len(".yaml")].partition("-")
+    if instance_type not in INSTANCE_TYPES or not cluster:
+        return None
+    return instance_type, cluster
+
+
+class SoaSnapshot:
+    """A precomputed map of service -> yaml files -> instance names for a soa_dir.
+
+    `list_clusters`, `get_service_instance_list` and friends are called in loops by
+    the cli and by cron jobs, and answering them from disk means globbing the
+    soa_dir and parsing YAML over and over. When a snapshot has been generated next
+    to the soa_dir (see generate_soa_snapshot.py) we answer from it instead.
+
+    The snapshot is kept up to date using directory mtimes: a service directory
+    whose mtime changed is rescanned, re-reading only the files whose own mtime
+    changed. soa-configs are synced by writing and renaming files, which bumps the
+    directory mtime; a file edited in place won't be noticed until its directory
+    changes or the snapshot is regenerated.
+    """
+
+    def __init__(
+        self,
+        soa_dir: str,
+        services: Dict[str, Tuple[int, SoaSnapshotFiles]],
+    ) -> None:
+        self.soa_dir = soa_dir
+        self.services = services
+
+    @classmethod
+    def build(cls, soa_dir: str = DEFAULT_SOA_DIR) -> "SoaSnapshot":
+        snapshot = cls(soa_dir, {})
+        snapshot.refresh()
+        return snapshot
+
+    @classmethod
+    def loads(cls, soa_dir: str, data: bytes) -> "SoaSnapshot":
+        format_version, services = marshal.loads(data)
+        if format_version != SOA_SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {format_version}")
+        return cls(soa_dir, services)
+
+    def dumps(self) -> bytes:
+        return marshal.dumps((SOA_SNAPSHOT_FORMAT_VERSION, self.services))
+
+    def save(self, path: str) -> None:
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path) or ".",
+            prefix=f".{os.path.basename(path)}-",
+            delete=False,
+        ) as f:
+            f.write(self.dumps())
+        os.chmod(f.name, 0o0644)
+        os.rename(f.name, path)
+
+    def refresh(self) -> bool:
+        """Rescan the service directories whose mtime changed.
+
+        :returns: whether anything changed
+        """
+        changed = False
+        service_dirs = {
+            entry.name: entry.stat().st_mtime_ns
+            for entry in os.scandir(self.soa_dir)
+            if entry.is_dir()
+        }
+        for service in set(self.services) - set(service_dirs):
+            del self.services[service]
+            changed = True
+        for service, mtime in service_dirs.items():
+            cached = self.services.get(service)
+            if cached is None or cached[0] != mtime:
+                cached_files = cached[1] if cached is not None else {}
+                self.services[service] = (
+                    mtime,
+                    self._scan_service(service, cached_files),
+                )
+                changed = True
+        return changed
+
+    def _scan_service(
+        self, service: str, cached_files: SoaSnapshotFiles
+    ) -> SoaSnapshotFiles:
+        files: SoaSnapshotFiles = {}
+        for entry in os.scandir(os.path.join(self.soa_dir, service)):
+            if not entry.name.endswith(".yaml") or not entry.is_file():
+                continue
+            mtime = entry.stat().st_mtime_ns
+            cached = cached_files.get(entry.name)
+            if cached is not None and cached[0] == mtime:
+                files[entry.name] = cached
+                continue
+            instances = None
+            deploy_file = parse_deploy_file_name(entry.name)
+            if deploy_file is not None:
+                instance_type, cluster = deploy_file
+                instances = tuple(
+                    instance
+                    for _, instance in read_service_instance_names_from_disk(
+                        service, instance_type, cluster, self.soa_dir
+                    )
+                )
+            files[entry.name] = (mtime, instances)
+        return files
+
+    def get_deploy_files(
+        self, service: Optional[str], instance_types: Collection[str]
+    ) -> Iterator[Tuple[str, str]]:
+        """Yield (cluster, path) for each deploy file of the given instance types."""
+        services = [service] if service is not None else self.services
+        for srv in services:
+            _, files = self.services.get(srv, (0, {}))
+            for file_name in files:
+                deploy_file = parse_deploy_file_name(file_name)
+                if deploy_file is not None and deploy_file[0] in instance_types:
+                    yield deploy_file[1], os.path.join(self.soa_dir, srv, file_name)
+
+    def get_files_of_type(self, file_type: str, service: str) -> List[str]:
+        _, files = self.services.get(service, (0, {}))
+        return [
+            os.path.join(self.soa_dir, service, file_name)
+            for file_name in files
+            if file_name.startswith(f"{file_type}-")
+        ]
+
+    def get_instance_names(
+        self, service: str, instance_type: str, cluster: str
+    ) -> Tuple[str, ...]:
+        _, files = self.services.get(service, (0, {}))
+        _, instances = files.get(f"{instance_type}-{cluster}.yaml", (0, None))
+        return instances or ()
+
+
+@time_cache(ttl=5)
+def load_soa_snapshot(soa_dir: str = DEFAULT_SOA_DIR) -> Optional[SoaSnapshot]:
+    """Load and refresh the snapshot for soa_dir, if one has been generated.
+
+    A refreshed snapshot is written back if we're allowed to; otherwise we keep
+    using the (refreshed) copy in memory.
+    """
+    path = get_soa_snapshot_path(soa_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            snapshot = SoaSnapshot.loads(soa_dir, f.read())
+        changed = snapshot.refresh()
+    except (OSError, ValueError, TypeError, EOFError) as e:
+        log.warning(f"Ignoring unusable soa-configs snapshot {path}: {e}")
+        return None
+    if changed and os.access(os.path.dirname(path) or ".", os.W_OK):
+        try:
+            snapshot.save(path)
+        except OSError as e:
+            log.warning(f"Unable to update soa-configs snapshot {path}: {e}")
+    return snapshot
+
+
 def get_files_of_type_in_dir(
     file_type: str,
     service: str = None,
@@ -3116,8 +3338,12 @@ def get_files_of_type_in_dir(
     :return: a list
     """
     # TODO: Only use INSTANCE_TYPES as input by making file_type Literal
-    service = "**" if service is None else service
     soa_dir = DEFAULT_SOA_DIR if soa_dir is None else soa_dir
+    if service is not None:
+        snapshot = load_soa_snapshot(soa_dir)
+        if snapshot is not None:
+            return snapshot.get_files_of_type(file_type, service)
+    service = "**" if service is None else service
     file_type += "-*.yaml"
     return [
         file_path
@@ -3131,6 +3357,17 @@ def get_files_of_type_in_dir(
 def get_soa_cluster_deploy_files(
     service: str = None, soa_dir: str = DEFAULT_SOA_DIR, instance_type: str = None
 ) -> Iterator[Tuple[str, str]]:
+    snapshot = load_soa_snapshot(soa_dir)
+    if snapshot is not None:
+        clusters = set(load_system_paasta_config().get_clusters())
+        for cluster, yaml_file in snapshot.get_deploy_files(
+            service,
+            (instance_type,) if instance_type in INSTANCE_TYPES else INSTANCE_TYPES,
+        ):
+            if cluster in clusters:
+                yield (cluster, yaml_file)
+        return
+
     if service is None:
         service = "*"
     service_path = os.path.join(soa_dir, service)
@@ -3208,6 +3445,20 @@ def filter_templates_from_config(config: Dict) -> Dict[str, Any]:
 def read_service_instance_names(
     service: str, instance_type: str, cluster: str, soa_dir: str
 ) -> Collection[Tuple[str, str]]:
+    snapshot = load_soa_snapshot(soa_dir)
+    if snapshot is not None:
+        return [
+            (service, instance)
+            for instance in snapshot.get_instance_names(service, instance_type, cluster)
+        ]
+    return read_service_instance_names_from_disk(
+        service, instance_type, cluster, soa_dir
+    )
+
+
+def read_service_instance_names_from_disk(
+    service: str, instance_type: str, cluster: str, soa_dir: str
+) -> List[Tuple[str, str]]:
     instance_list = []
     conf_file = f"{instance_type}-{cluster}"
     config = service_configuration_lib.read_extra_service_information(
@@ -3444,12 +3695,12 @@ def get_docker_host() -> str:
     return os.environ.get("DOCKER_HOST", "unix://var/run/docker.sock")
 
 
-def get_docker_client() -> APIClient:
-    client_opts = kwargs_from_env()
+def get_docker_client() -> "docker.APIClient":
+    client_opts = docker.utils.kwargs_from_env()
     if "base_url" in client_opts:
-        return APIClient(**client_opts)
+        return docker.APIClient(**client_opts)
     else:
-        return APIClient(base_url=get_docker_host(), **client_opts)
+        return docker.APIClient(base_url=get_docker_host(), **client_opts)
 
 
 def get_running_mesos_docker_containers() -> List[Dict]:
@@ -62,6 +62,7 @@ setup(
         "paasta_tools/generate_deployments_for_service.py",
         "paasta_tools/generate_services_file.py",
         "paasta_tools/generate_services_yaml.py",
+        "paasta_tools/generate_soa_snapshot.py",
         "paasta_tools/generate_authenticating_services.py",
         "paasta_tools/kubernetes/bin/kubernetes_remove_evicted_pods.py",
         "paasta_tools/kubernetes/bin/paasta_cleanup_remote_run_resources.py",
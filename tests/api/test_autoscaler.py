@@ -96,3 +96,42 @@ def test_update_autoscaler_count_warning(mock_get_instance_config, instance_type
     response = autoscaler.update_autoscaler_count(request)
     assert response.json_body["desired_instances"] == 100
     assert "WARNING" in response.json_body["status"]
+
+
+@mock.patch(
+    "paasta_tools.api.views.autoscaler.get_autoscaling_overrides_store", autospec=True
+)
+@mock.patch("paasta_tools.api.views.autoscaler.get_instance_config", autospec=True)
+def test_set_autoscaling_override_merges_existing_override(
+    mock_get_instance_config, mock_get_autoscaling_overrides_store
+):
+    request = testing.DummyRequest()
+    request.swagger_data = {
+        "service": "fake_service",
+        "instance": "fake_instance",
+        "json_body": {"max_instances": 20, "expire_after": 1234},
+    }
+    mock_get_instance_config.return_value = mock.MagicMock(
+        get_min_instances=mock.MagicMock(return_value=1),
+        get_max_instances=mock.MagicMock(return_value=10),
+        spec=KubernetesDeploymentConfig,
+    )
+    mock_store = mock_get_autoscaling_overrides_store.return_value
+    mock_store.update.side_effect = lambda key, update: update(
+        {"min_instances": 5, "expire_after": 1000}
+    )
+
+    response = autoscaler.set_autoscaling_override(request)
+
+    assert response.status_code == 202
+    assert mock_store.update.call_args.args[0] == "fake_service.fake_instance"
+    merge_overrides = mock_store.update.call_args.args[1]
+    assert merge_overrides({"min_instances": 5, "expire_after": 1000}) == {
+        "min_instances": 5,
+        "max_instances": 20,
+        "created_at": mock.ANY,
+        "expire_after": 1234,
+    }
+    # the existing min_instances override is higher than the new max_instances
+    with pytest.raises(autoscaler.ApiFailure):
+        merge_overrides({"min_instances": 30, "expire_after": 1000})
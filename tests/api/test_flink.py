@@ -200,3 +200,21 @@ class TestGetFlinkJobCheckpoints:
         mock_curl_flink_endpoint.side_effect = ValueError("BOOM")
         with pytest.raises(ApiFailure):
             _ = flink.get_flink_cluster_job_checkpoints(mock_request)
+
+
+@mock.patch("paasta_tools.api.views.flink.settings", autospec=True)
+@mock.patch("paasta_tools.api.views.flink.curl_flink_endpoint", autospec=True)
+def test_get_flink_endpoint_from_status_poller(mock_curl_flink_endpoint, mock_settings):
+    request = testing.DummyRequest()
+    request.swagger_data = {"service": "test_service", "instance": "test_instance"}
+    mock_settings.status_poller.get.return_value = ({"jobs-running": 1}, 7.5)
+
+    assert flink.get_flink_cluster_overview(request) == {"jobs-running": 1}
+    assert request.response.headers["Age"] == "7"
+    key, fetch = mock_settings.status_poller.get.call_args[0]
+    assert key == ("flink", "test_service", "test_instance", "overview")
+
+    fetch()
+    mock_curl_flink_endpoint.assert_called_once_with(
+        flink.cr_id("test_service", "test_instance"), "overview"
+    )
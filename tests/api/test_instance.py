@@ -26,6 +26,8 @@ from paasta_tools.api import settings
 from paasta_tools.api.views import instance
 from paasta_tools.api.views.exception import ApiFailure
 from paasta_tools.instance.kubernetes import ServiceMesh
+from paasta_tools.kubernetes.bounce_tracker import BounceProgress
+from paasta_tools.kubernetes.bounce_tracker import BounceTracker
 from paasta_tools.long_running_service_tools import ServiceNamespaceConfig
 from paasta_tools.smartstack_tools import DiscoveredHost
 from paasta_tools.smartstack_tools import HaproxyBackend
@@ -487,6 +489,77 @@ class TestBounceStatus:
             == "Temporary issue fetching bounce status. Please try again."
         )
 
+    def test_bounce_tracker(
+        self,
+        mock_pik_bounce_status,
+        mock_validate_service_instance,
+        mock_request,
+    ):
+        mock_validate_service_instance.return_value = "kubernetes"
+        instance.bounce_status(mock_request)
+        assert (
+            mock_pik_bounce_status.call_args.kwargs["bounce_tracker"]
+            is instance.settings.bounce_tracker
+        )
+
+
+class TestListBounces:
+    def test_list_bounces(self):
+        progress = BounceProgress(
+            namespace="paastasvc-test--service",
+            service="test_service",
+            instance="test_instance",
+            desired_replicas=3,
+            replicas=4,
+            ready_replicas=3,
+            updated_replicas=1,
+            new_version_replicas=1,
+            old_version_replicas=3,
+            active_versions=frozenset(
+                {
+                    (DeploymentVersion("aaa", None), "config_aaa"),
+                    (DeploymentVersion("bbb", "extrastuff"), "config_bbb"),
+                }
+            ),
+        )
+        mock_bounce_tracker = mock.Mock(spec=BounceTracker, synced=True)
+        mock_bounce_tracker.in_flight.return_value = [progress]
+        with mock.patch.object(settings, "bounce_tracker", mock_bounce_tracker):
+            response = instance.list_bounces(testing.DummyRequest())
+        assert response == {
+            "bounces": [
+                {
+                    "namespace": "paastasvc-test--service",
+                    "service": "test_service",
+                    "instance": "test_instance",
+                    "desired_replicas": 3,
+                    "ready_replicas": 3,
+                    "updated_replicas": 1,
+                    "new_version_replicas": 1,
+                    "old_version_replicas": 3,
+                    "deploy_status": "Deploying",
+                    "app_count": 2,
+                    "active_versions": [
+                        ("aaa", None, "config_aaa"),
+                        ("bbb", "extrastuff", "config_bbb"),
+                    ],
+                }
+            ]
+        }
+
+    @pytest.mark.parametrize(
+        "bounce_tracker,expected_err",
+        [
+            (None, 501),
+            (mock.Mock(spec=BounceTracker, synced=False), 503),
+        ],
+    )
+    def test_list_bounces_unavailable(self, bounce_tracker, expected_err):
+        with mock.patch.object(settings, "bounce_tracker", bounce_tracker):
+            with pytest.raises(ApiFailure) as excinfo:
+                instance.list_bounces(testing.DummyRequest())
+        assert excinfo.value.err == expected_err
+
 
 @mock.patch("paasta_tools.api.views.instance.validate_service_instance", autospec=True)
 @mock.patch(
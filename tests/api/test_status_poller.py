@@ -0,0 +1,69 @@
+from unittest import mock
+
+import pytest
+
+from paasta_tools.api.status_poller import StatusPoller
+
+
+@pytest.fixture
+def poller():
+    poller = StatusPoller(interval=10, max_workers=2, idle_timeout=60)
+    yield poller
+    poller.stop()
+
+
+@mock.patch("paasta_tools.api.status_poller.time", autospec=True)
+def test_get_serves_from_cache(mock_time, poller):
+    fetch = mock.Mock(side_effect=["first", "second"])
+    mock_time.time.return_value = 100
+    assert poller.get("key", fetch) == ("first", 0)
+
+    mock_time.time.return_value = 105
+    assert poller.get("key", fetch) == ("first", 5)
+    assert fetch.call_count == 1
+
+    # too stale to serve: fetch synchronously
+    mock_time.time.return_value = 125
+    assert poller.get("key", fetch) == ("second", 0)
+    assert fetch.call_count == 2
+
+
+@mock.patch("paasta_tools.api.status_poller.random", autospec=True)
+@mock.patch("paasta_tools.api.status_poller.time", autospec=True)
+def test_refresh_due(mock_time, mock_random, poller):
+    mock_random.uniform.return_value = 1.0
+    mock_time.time.return_value = 100
+    fetch_a = mock.Mock(side_effect=["a1", "a2"])
+    fetch_b = mock.Mock(return_value="b")
+    poller.get("a", fetch_a)
+    mock_time.time.return_value = 105
+    poller.get("b", fetch_b)
+
+    # nothing is due yet
+    assert poller.refresh_due() == 0
+
+    # "a" is due, but not "b"
+    mock_time.time.return_value = 111
+    with mock.patch.object(poller, "_executor", autospec=True) as mock_executor:
+        mock_executor.submit.side_effect = lambda fn, *args: fn(*args)
+        assert poller.refresh_due() == 1
+    assert poller.get("a", fetch_a) == ("a2", 0)
+
+    # nobody asked for "b" in a while, but "a" is due again
+    mock_time.time.return_value = 170
+    with mock.patch.object(poller, "_executor", autospec=True) as mock_executor:
+        assert poller.refresh_due() == 1
+    mock_executor.submit.assert_called_once_with(poller._refresh, "a", fetch_a)
+    assert "b" not in poller._statuses
+    assert "a" in poller._statuses
+
+
+@mock.patch("paasta_tools.api.status_poller.time", autospec=True)
+def test_refresh_failure_keeps_previous_status(mock_time, poller):
+    mock_time.time.return_value = 100
+    fetch = mock.Mock(side_effect=["first", Exception("boom")])
+    poller.get("key", fetch)
+    poller._refresh("key", fetch)
+    assert poller.get("key", fetch) == ("first", 0)
+    assert poller._next_refresh["key"] == 110
+    assert not poller._in_flight
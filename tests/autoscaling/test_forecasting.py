@@ -1,3 +1,5 @@
+import pytest
+
 from paasta_tools.autoscaling import forecasting
 
 
@@ -70,3 +72,112 @@ def test_linreg_forecast_policy():
     assert 350 == forecasting.linreg_forecast_policy(
         historical_load_2, linreg_window_seconds=7, linreg_extrapolation_seconds=0
     )
+
+
+def test_historical_load():
+    historical_load = forecasting.HistoricalLoad(
+        capacity=4, datapoints=[(1, 100), (2, 120), (3, 140)]
+    )
+    assert list(historical_load) == [(1, 100), (2, 120), (3, 140)]
+
+    # appending past the capacity forgets the oldest datapoints
+    historical_load.append(4, 160)
+    historical_load.append(5, 180)
+    historical_load.append(5, 190)
+    assert len(historical_load) == 4
+    assert list(historical_load) == [(3, 140), (4, 160), (5, 180), (5, 190)]
+    assert historical_load[0] == (3, 140)
+    assert historical_load[-1] == (5, 190)
+
+    times, values = historical_load.window(4, 5)
+    assert list(times) == [4, 5, 5]
+    assert list(values) == [160, 180, 190]
+    assert forecasting.window_historical_load(historical_load, 3.5, 4.5) == [(4, 160)]
+    assert forecasting.window_historical_load(historical_load, 6, 7) == []
+
+    with pytest.raises(ValueError):
+        historical_load.append(4, 200)
+
+
+@pytest.mark.parametrize(
+    "policy,kwargs",
+    [
+        ("current", {}),
+        ("moving_average", {"moving_average_window_seconds": 100}),
+        (
+            "linreg",
+            {"linreg_window_seconds": 100, "linreg_extrapolation_seconds": [0, 30]},
+        ),
+        ("ewma", {"ewma_half_life_seconds": 50}),
+        (
+            "holt_winters",
+            {
+                "holt_winters_window_seconds": 600,
+                "holt_winters_extrapolation_seconds": 60,
+                "holt_winters_season_length": 12,
+            },
+        ),
+    ],
+)
+def test_policies_accept_historical_load(policy, kwargs):
+    datapoints = [(t * 10.0, 100 + (t * 37) % 23 + t / 2) for t in range(500)]
+    historical_load = forecasting.HistoricalLoad(capacity=200)
+    for timestamp, value in datapoints:
+        historical_load.append(timestamp, value)
+
+    forecast_policy = forecasting.get_forecast_policy(policy)
+    assert forecast_policy(historical_load, **kwargs) == pytest.approx(
+        forecast_policy(datapoints, **kwargs)
+    )
+
+
+def test_ewma_forecast_policy():
+    historical_load = [(1, 100), (2, 100), (3, 100)]
+    assert 100 == forecasting.ewma_forecast_policy(
+        historical_load, ewma_half_life_seconds=1
+    )
+
+    # the last datapoint is one half-life after the previous ones
+    historical_load.append((4, 200))
+    assert 150 == forecasting.ewma_forecast_policy(
+        historical_load, ewma_half_life_seconds=1
+    )
+    assert 200 == forecasting.ewma_forecast_policy(
+        historical_load, ewma_half_life_seconds=0
+    )
+
+
+def test_holt_winters_forecast_policy():
+    linear = [(t, 100 + 20 * t) for t in range(10)]
+    assert 480 == pytest.approx(
+        forecasting.holt_winters_forecast_policy(
+            linear,
+            holt_winters_window_seconds=10,
+            holt_winters_extrapolation_seconds=[0, 10],
+        )
+    )
+
+    seasonal = [(t, [10, 20, 30][t % 3]) for t in range(12)]
+    # the next datapoint starts a new season
+    assert 10 == pytest.approx(
+        forecasting.holt_winters_forecast_policy(
+            seasonal,
+            holt_winters_window_seconds=12,
+            holt_winters_extrapolation_seconds=1,
+            holt_winters_season_length=3,
+        )
+    )
+    assert 30 == pytest.approx(
+        forecasting.holt_winters_forecast_policy(
+            seasonal,
+            holt_winters_window_seconds=12,
+            holt_winters_extrapolation_seconds=[1, 2, 3],
+            holt_winters_season_length=3,
+        )
+    )
+
+    assert 220 == forecasting.holt_winters_forecast_policy(
+        [(1, 200), (2, 220)],
+        holt_winters_window_seconds=0,
+        holt_winters_extrapolation_seconds=10,
+    )
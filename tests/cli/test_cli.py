@@ -0,0 +1,124 @@
+import json
+import os
+from unittest import mock
+
+from paasta_tools.cli import cli
+
+
+def test_list_external_commands_is_cached():
+    cli.list_external_commands.cache_clear()
+    with mock.patch(
+        "paasta_tools.cli.cli.subprocess.check_output",
+        autospec=True,
+        return_value=b"paasta-foo\npaasta-bar\n",
+    ) as mock_check_output:
+        assert cli.list_external_commands() == {"foo", "bar"}
+        assert cli.list_external_commands() == {"foo", "bar"}
+    assert mock_check_output.call_count == 1
+    cli.list_external_commands.cache_clear()
+
+
+def test_completion_spec_round_trip(tmp_path):
+    commands = {"status": [{"option_strings": ["-v"], "dest": "v"}]}
+    with mock.patch(
+        "paasta_tools.cli.cli.COMPLETION_SPEC_DIR", str(tmp_path), autospec=None
+    ), mock.patch("paasta_tools.__version__", "1.2.3", autospec=None):
+        (tmp_path / "completion-spec-1.2.2.json").write_text("{}")
+        cli.save_completion_spec(commands)
+        assert cli.load_completion_spec() == commands
+        assert os.listdir(tmp_path) == ["completion-spec-1.2.3.json"]
+
+
+def test_load_completion_spec_ignores_other_versions(tmp_path):
+    with mock.patch(
+        "paasta_tools.cli.cli.COMPLETION_SPEC_DIR", str(tmp_path), autospec=None
+    ), mock.patch("paasta_tools.__version__", "1.2.3", autospec=None):
+        (tmp_path / "completion-spec-1.2.3.json").write_text(
+            json.dumps({"version": "1.2.2", "commands": {"status": []}})
+        )
+        assert cli.load_completion_spec() == {}
+
+        (tmp_path / "completion-spec-1.2.3.json").write_text("not json")
+        assert cli.load_completion_spec() == {}
+
+
+def test_argparser_from_spec_matches_real_parser():
+    with mock.patch(
+        "paasta_tools.cli.cli.list_external_commands", autospec=True, return_value=[]
+    ):
+        parser = cli.get_argparser(commands=["status"])
+    arguments = json.loads(
+        json.dumps(cli.describe_subcommand_arguments(parser, "status"))
+    )
+
+    spec_parser = cli.get_argparser_from_spec("status", arguments)
+
+    args = spec_parser.parse_args(["status", "-s", "foo", "-c", "a,b", "-v", "-v"])
+    assert args.service == "foo"
+    assert args.clusters == "a,b"
+    assert args.verbose
+
+
+def test_is_completing_option_name():
+    assert cli.is_completing_option_name("paasta status --cl", 18)
+    assert cli.is_completing_option_name("paasta status -", 15)
+    assert not cli.is_completing_option_name("paasta status -s ", 17)
+    assert not cli.is_completing_option_name("paasta status --clusters=", 25)
+    assert not cli.is_completing_option_name("paasta status -s fo", 19)
+
+
+@mock.patch("paasta_tools.cli.cli.save_completion_spec", autospec=True)
+@mock.patch("paasta_tools.cli.cli.load_completion_spec", autospec=True)
+@mock.patch("paasta_tools.cli.cli.get_argparser", autospec=True)
+def test_get_completion_argparser_uses_cached_spec(
+    mock_get_argparser, mock_load_completion_spec, mock_save_completion_spec
+):
+    mock_load_completion_spec.return_value = {
+        "status": [
+            {
+                "option_strings": ["-s", "--service"],
+                "dest": "service",
+                "nargs": None,
+                "help": "",
+            }
+        ]
+    }
+
+    parser = cli.get_completion_argparser("status", "paasta status --se", 18)
+
+    assert not mock_get_argparser.called
+    assert not mock_save_completion_spec.called
+    assert parser.parse_args(["status", "--service", "foo"]).service == "foo"
+
+
+@mock.patch("paasta_tools.cli.cli.save_completion_spec", autospec=True)
+@mock.patch("paasta_tools.cli.cli.load_completion_spec", autospec=True)
+@mock.patch("paasta_tools.cli.cli.describe_subcommand_arguments", autospec=True)
+@mock.patch("paasta_tools.cli.cli.get_argparser", autospec=True)
+def test_get_completion_argparser_populates_spec(
+    mock_get_argparser,
+    mock_describe_subcommand_arguments,
+    mock_load_completion_spec,
+    mock_save_completion_spec,
+):
+    mock_load_completion_spec.return_value = {}
+
+    parser = cli.get_completion_argparser("status", "paasta status --se", 18)
+
+    assert parser == mock_get_argparser.return_value
+    mock_get_argparser.assert_called_once_with(commands=["status"])
+    mock_save_completion_spec.assert_called_once_with(
+        {"status": mock_describe_subcommand_arguments.return_value}
+    )
+
+
+@mock.patch("paasta_tools.cli.cli.load_completion_spec", autospec=True)
+@mock.patch("paasta_tools.cli.cli.get_argparser", autospec=True)
+def test_get_completion_argparser_needs_real_completers_for_values(
+    mock_get_argparser, mock_load_completion_spec
+):
+    parser = cli.get_completion_argparser("status", "paasta status -s ", 17)
+
+    assert parser == mock_get_argparser.return_value
+    mock_get_argparser.assert_called_once_with(commands=["status"])
+    assert not mock_load_completion_spec.called
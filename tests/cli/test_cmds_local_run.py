@@ -23,6 +23,7 @@ from pytest import raises
 
 from paasta_tools.adhoc_tools import AdhocJobConfig
 from paasta_tools.cli.cli import main
+from paasta_tools.cli.cmds.local_run import DEFAULT_VAULT_MAX_WORKERS
 from paasta_tools.cli.cmds.local_run import LostContainerException
 from paasta_tools.cli.cmds.local_run import assume_aws_role
 from paasta_tools.cli.cmds.local_run import configure_and_run_docker_container
@@ -408,6 +409,8 @@ def test_configure_and_run_command_uses_cmd_from_config(
         "vault_cluster_config": {},
         "vault_auth_method": "ldap",
         "vault_token_file": "/blah/token",
+        "vault_max_workers": DEFAULT_VAULT_MAX_WORKERS,
+        "vault_cache_ttl": 0,
     }
 
     return_code = configure_and_run_docker_container(
@@ -501,6 +504,8 @@ def test_configure_and_run_uses_bash_by_default_when_interactive(
         "vault_cluster_config": {},
         "vault_auth_method": "ldap",
         "vault_token_file": "/blah/token",
+        "vault_max_workers": DEFAULT_VAULT_MAX_WORKERS,
+        "vault_cache_ttl": 0,
     }
     mock_run_docker_container.assert_called_once_with(
         docker_client=mock_docker_client,
@@ -591,6 +596,8 @@ def test_configure_and_run_pulls_image_when_asked(
         "vault_cluster_config": {},
         "vault_auth_method": "ldap",
         "vault_token_file": "/blah/token",
+        "vault_max_workers": DEFAULT_VAULT_MAX_WORKERS,
+        "vault_cache_ttl": 0,
     }
     mock_run_docker_container.assert_called_once_with(
         docker_client=mock_docker_client,
@@ -675,6 +682,8 @@ def test_configure_and_run_docker_container_defaults_to_interactive_instance(
             "vault_cluster_config": {},
             "vault_auth_method": "ldap",
             "vault_token_file": "/blah/token",
+            "vault_max_workers": DEFAULT_VAULT_MAX_WORKERS,
+            "vault_cache_ttl": 0,
         }
         mock_run_docker_container.assert_called_once_with(
             docker_client=mock_docker_client,
@@ -373,6 +373,135 @@ def test_paasta_log_line_passes_filter_false_when_invalid_time():
     )
 
 
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        "2016-06-08T06:31:52.706609135Z",
+        "2016-06-08T06:31:52.7Z",
+        "2016-06-08T06:31:52Z",
+        "2016-06-07T23:46:03+00:00",
+        "2015-03-12T21:20:04.602002",
+        "2015-03-12T21:20:04",
+        "2016-06-07T23:46:03-07:00",
+        "20160607T234603Z",
+    ],
+)
+def test_parse_log_timestamp_matches_isodate(timestamp):
+    actual = logs.parse_log_timestamp(timestamp)
+    expected = isodate.parse_datetime(timestamp)
+    assert actual == expected
+    assert actual.utcoffset() == expected.utcoffset()
+
+
+def test_parse_log_timestamp_invalid():
+    with raises(ValueError):
+        logs.parse_log_timestamp("2016-06-08T06:31:52.garbage")
+
+
+def test_log_line_filter_parse_returns_record():
+    line = json.dumps(
+        {
+            "cluster": "fake_cluster1",
+            "component": "stdout",
+            "instance": "main",
+            "pod_name": "fake_pod1",
+            "message": "testing",
+            "timestamp": "2016-06-08T06:31:52.706609135Z",
+        }
+    )
+    line_filter = logs.LogLineFilter(
+        levels=[],
+        components=["stdout"],
+        clusters=["fake_cluster1"],
+        instances=["main"],
+        pods=["fake_pod1"],
+        app_output=True,
+    )
+
+    for raw_line in (line, line.encode("utf-8")):
+        parsed = line_filter.parse(raw_line)
+        assert parsed.raw_line == raw_line
+        assert parsed.line == line
+        assert parsed.record == json.loads(line)
+        assert parsed.sort_key == pytz.utc.localize(
+            datetime.datetime(2016, 6, 8, 6, 31, 52, 706609)
+        )
+
+
+@pytest.mark.parametrize(
+    "clusters,instances,pods,expected",
+    [
+        (["fake_cluster1"], ["main"], ["fake_pod1"], True),
+        (["fake_cluster2"], ["main"], ["fake_pod1"], False),
+        (["fake_cluster1"], ["canary"], ["fake_pod1"], False),
+        (["fake_cluster1"], ["main"], ["fake_pod2"], False),
+        (["fake_cluster1"], None, None, True),
+        # the cluster name only appears in the message, so it gets past the
+        # substring prefilter and must be rejected after decoding
+        (["in_message"], None, None, False),
+        # non-ascii values can't be prefiltered, but must still be filtered
+        (["fake_cluster1"], ["mäin"], None, False),
+    ],
+)
+def test_log_line_filter_app_output(clusters, instances, pods, expected):
+    line = json.dumps(
+        {
+            "cluster": "fake_cluster1",
+            "component": "stderr",
+            "instance": "main",
+            "pod_name": "fake_pod1",
+            "message": "in_message",
+            "timestamp": "2016-06-08T06:31:52.706609135Z",
+        }
+    )
+    line_filter = logs.LogLineFilter(
+        levels=["debug"],
+        components=["stdout", "stderr"],
+        clusters=clusters,
+        instances=instances,
+        pods=pods,
+        app_output=True,
+    )
+    assert line_filter(line) is expected
+    assert line_filter(line.encode("utf-8")) is expected
+
+
+def test_log_line_filter_prefilter_skips_decoding():
+    line_filter = logs.LogLineFilter(
+        levels=["debug"],
+        components=["stdout"],
+        clusters=["fake_cluster1"],
+        instances=["main"],
+        app_output=True,
+    )
+    with mock.patch(
+        "paasta_tools.cli.cmds.logs.json.loads", autospec=True
+    ) as mock_loads:
+        assert line_filter.parse('{"cluster": "fake_cluster2"}') is None
+    assert mock_loads.call_count == 0
+
+
+def test_log_line_filter_app_output_missing_timestamp():
+    line = json.dumps(
+        {"cluster": "fake_cluster1", "component": "stdout", "instance": "main"}
+    )
+    line_filter = logs.LogLineFilter(
+        levels=[],
+        components=["stdout"],
+        clusters=["fake_cluster1"],
+        instances=["main"],
+        app_output=True,
+    )
+    assert line_filter.parse(line) is None
+
+
+def test_scribe_component_stream_info_app_output():
+    stream_info = logs.ScribeLogReader.COMPONENT_STREAM_INFO
+    assert stream_info["stdout"].app_output is True
+    assert stream_info["stderr"].app_output is True
+    assert stream_info["default"].app_output is False
+
+
 def test_extract_utc_timestamp_from_log_line_ok():
     fake_timestamp = "2015-07-22T10:38:46-07:00"
     fake_utc_timestamp = isodate.parse_datetime("2015-07-22T17:38:46.000000")
@@ -484,6 +613,19 @@ def test_prettify_log_line_valid_json_strip_headers():
     assert parsed_line["message"] in actual
 
 
+def test_prettify_log_line_uses_parsed_line():
+    parsed_line = {
+        "message": "fake_message",
+        "component": "build",
+        "timestamp": "2015-03-12T21:20:04.602002",
+    }
+    actual = logs.prettify_log_line(
+        "not decoded again", [], strip_headers=False, parsed_line=parsed_line
+    )
+    assert logs.prettify_timestamp(parsed_line["timestamp"]) in actual
+    assert parsed_line["message"] in actual
+
+
 def test_scribereader_run_code_over_scribe_envs():
     clusters = ["fake_cluster1", "fake_cluster2"]
     components = ["build", "deploy", "monitoring", "stdout", "stderr"]
@@ -933,20 +1075,21 @@ def test_vector_logs_print_logs_by_time():
         return_value=True,
         autospec=True,
     ):
-        fake_iter = mock.MagicMock()
-        fake_iter.__iter__.return_value = [
-            b"""{"cluster":"fake_cluster1","component":"stderr","instance":"main",
+        mock_s3_logs.return_value.get_log_object_keys.return_value = ["key1"]
+        reader_mock = mock_s3_logs.return_value.get_log_object_reader
+        reader_mock.return_value = iter(
+            [
+                b"""{"cluster":"fake_cluster1","component":"stderr","instance":"main",
                                            "level":"debug","message":"testing 1",
                                            "timestamp":"2016-06-08T06:31:52.706609135Z"}""",
-            b"""{"cluster":"fake_cluster1","component":"stderr","instance":"main",
+                b"""{"cluster":"fake_cluster1","component":"stderr","instance":"main",
                                            "level":"debug","message":"testing 2",
                                            "timestamp":"2016-06-08T06:41:52.706609135Z"}""",
-            b"""{"cluster":"fake_cluster2","component":"stderr","instance":"main",
+                b"""{"cluster":"fake_cluster2","component":"stderr","instance":"main",
                                            "level":"debug","message":"testing 3",
                                            "timestamp":"2016-06-08T06:51:52.706609135Z"}""",
-        ]
-        reader_mock = mock_s3_logs.return_value.get_log_reader
-        reader_mock.return_value = fake_iter
+            ]
+        )
 
         start_time = pytz.utc.localize(isodate.parse_datetime("2016-06-08T06:00"))
         end_time = pytz.utc.localize(isodate.parse_datetime("2016-06-08T07:00"))
@@ -964,8 +1107,116 @@ def test_vector_logs_print_logs_by_time():
             strip_headers=False,
         )
 
-        assert reader_mock.call_count == 1
+        mock_s3_logs.return_value.get_log_object_keys.assert_called_once_with(
+            log_name="stream_paasta_app_output_fake_service",
+            start_datetime=start_time,
+            end_datetime=end_time,
+        )
+        reader_mock.assert_called_once_with("key1")
         assert print_log_patch.call_count == 2
+        assert [
+            call[1]["parsed_line"]["message"] for call in print_log_patch.call_args_list
+        ] == ["testing 1", "testing 2"]
+
+
+LOG_LINE_TEMPLATE = (
+    '{"cluster":"fake_cluster1","component":"stdout","instance":"main",'
+    '"message":"%s","timestamp":"2016-06-08T06:%s:00Z"}'
+)
+
+
+def print_vector_logs(objects, prefetch_objects=4, on_print=None):
+    """Prints the logs of objects, a {key: [(message, minute), ...]} dict in key
+    order, through VectorLogsReader.print_logs_by_time, and returns the messages
+    printed along with the keys of the objects read."""
+    read_keys = []
+
+    def get_log_object_reader(key):
+        read_keys.append(key)
+        return iter(LOG_LINE_TEMPLATE % line for line in objects[key])
+
+    with mock.patch(
+        "paasta_tools.cli.cmds.logs.S3LogsReader", autospec=None
+    ) as mock_s3_logs, mock.patch(
+        "paasta_tools.cli.cmds.logs.print_log", autospec=True
+    ) as print_log_patch, mock.patch(
+        "paasta_tools.cli.cmds.logs.s3reader_available",
+        return_value=True,
+        autospec=True,
+    ):
+        mock_s3_logs.return_value.get_log_object_keys.return_value = list(objects)
+        mock_s3_logs.return_value.get_log_object_reader.side_effect = (
+            get_log_object_reader
+        )
+        if on_print is not None:
+            print_log_patch.side_effect = lambda *args, **kwargs: on_print(read_keys)
+        reader = logs.VectorLogsReader(cluster_map={}, nats_endpoint_map={})
+        reader.PREFETCH_OBJECTS = prefetch_objects
+        reader.print_logs_by_time(
+            "fake_service",
+            pytz.utc.localize(isodate.parse_datetime("2016-06-08T06:00")),
+            pytz.utc.localize(isodate.parse_datetime("2016-06-08T07:00")),
+            ["debug"],
+            ["stdout"],
+            ["fake_cluster1"],
+            ["main"],
+            pods=None,
+            raw_mode=False,
+            strip_headers=False,
+        )
+
+    printed = [
+        call[1]["parsed_line"]["message"] for call in print_log_patch.call_args_list
+    ]
+    return printed, read_keys
+
+
+def test_vector_logs_print_logs_by_time_merges_objects_in_order():
+    # Objects overlap in time, and the same line may be held by more than one
+    printed, read_keys = print_vector_logs(
+        {
+            "a": [("1", "05"), ("4", "20"), ("6", "30")],
+            "b": [("2", "10"), ("2", "10"), ("5", "25")],
+            "c": [("3", "15"), ("4", "20"), ("7", "35")],
+        }
+    )
+    assert printed == ["1", "2", "3", "4", "5", "6", "7"]
+    assert sorted(read_keys) == ["a", "b", "c"]
+
+
+def test_vector_logs_print_logs_by_time_bounds_objects_in_memory():
+    objects = {
+        f"{minute:02d}": [(str(minute), f"{minute:02d}")] for minute in range(1, 31)
+    }
+    read_when_printed = []
+    printed, read_keys = print_vector_logs(
+        objects,
+        prefetch_objects=2,
+        on_print=lambda read_keys: read_when_printed.append(len(read_keys)),
+    )
+
+    assert printed == [str(minute) for minute in range(1, 31)]
+    assert read_keys == list(objects)
+    # when a line gets printed, the only objects read are those up to the one
+    # after it (which could hold an earlier line) plus the prefetched ones
+    for index, read in enumerate(read_when_printed):
+        assert read <= (index + 1) + 1 + 2
+
+
+def test_dedupe_log_lines_only_remembers_the_current_timestamp():
+    def parsed(message, minute):
+        line = LOG_LINE_TEMPLATE % (message, minute)
+        record = json.loads(line)
+        return logs.ParsedLogLine(
+            line, record, isodate.parse_datetime(record["timestamp"])
+        )
+
+    assert [
+        p.record["message"]
+        for p in logs.dedupe_log_lines(
+            [parsed("a", "00"), parsed("a", "00"), parsed("b", "01"), parsed("a", "02")]
+        )
+    ] == ["a", "b", "a"]
 
 
 def test_prefix():
@@ -85,6 +85,8 @@ def test_paasta_remote_run_start(
                 job_name="foobar",
                 user="pippo",
                 toolbox=False,
+                wait=30,
+                _request_timeout=90,
             )
         ]
         * 3
@@ -536,3 +536,36 @@ def test_paasta_secret_dispatches_set_namespaces():
         mock_args = mock.Mock(action="set-namespaces", shared=False, service="mysvc")
         secret.paasta_secret(mock_args)
         mock_handler.assert_called_once_with(mock_args)
+
+
+def test_paasta_secret_add_partial_failure():
+    with mock.patch(
+        "paasta_tools.cli.cmds.secret._get_secret_provider_for_service", autospec=True
+    ) as mock_get_secret_provider_for_service, mock.patch(
+        "paasta_tools.cli.cmds.secret.get_plaintext_input", autospec=True
+    ), mock.patch(
+        "paasta_tools.cli.cmds.secret._log_audit", autospec=True
+    ) as mock_log_audit:
+        mock_secret_provider = mock.Mock(secret_dir="/nail/blah")
+        mock_secret_provider.write_secret.side_effect = secret.SecretWriteError(
+            "theonering", {"mordor": Exception("too hot")}
+        )
+        mock_get_secret_provider_for_service.return_value = mock_secret_provider
+        mock_args = mock.Mock(
+            action="add",
+            secret_name="theonering",
+            service="middleearth",
+            clusters="mesosstage",
+            shared=False,
+            parallelism=2,
+        )
+        with raises(SystemExit):
+            secret.paasta_secret(mock_args)
+
+    assert (
+        mock_get_secret_provider_for_service.call_args[1][
+            "secret_provider_extra_kwargs"
+        ]["vault_max_workers"]
+        == 2
+    )
+    assert mock_log_audit.call_count == 0
@@ -336,6 +336,84 @@ def test_wait_for_deployment_raise_no_such_cluster(
         )
 
 
+@patch(
+    "paasta_tools.cli.cmds.mark_for_deployment.load_system_paasta_config", autospec=True
+)
+@patch(
+    "paasta_tools.cli.cmds.mark_for_deployment.PaastaServiceConfigLoader", autospec=True
+)
+def test_get_instance_configs_for_service_in_deploy_group_all_clusters(
+    mock_paasta_service_config_loader,
+    mock_load_system_paasta_config,
+    system_paasta_config,
+):
+    mock_load_system_paasta_config.return_value = system_paasta_config
+    mock_paasta_service_config_loader.return_value.clusters = [
+        f"cluster{i}" for i in range(10)
+    ]
+
+    def instance_configs(cluster, instance_type_class):
+        if instance_type_class is not KubernetesDeploymentConfig:
+            return []
+        return [
+            mock_kubernetes_deployment_config(f"{cluster}-main"),
+            KubernetesDeploymentConfig(
+                service="fake_service",
+                cluster=cluster,
+                instance="other",
+                config_dict={"deploy_group": "other_deploy_group"},
+                branch_dict=None,
+            ),
+        ]
+
+    mock_paasta_service_config_loader.return_value.instance_configs.side_effect = (
+        instance_configs
+    )
+    with patch.object(
+        system_paasta_config,
+        "get_api_endpoints",
+        autospec=True,
+        return_value={f"cluster{i}": f"some_url_{i}" for i in range(10)},
+    ):
+        instance_configs_per_cluster = mark_for_deployment.get_instance_configs_for_service_in_deploy_group_all_clusters(
+            "fake_service", "fake_deploy_group", "/nail/soa"
+        )
+
+    # all the clusters are loaded through the same loader, and come back in order
+    assert mock_paasta_service_config_loader.call_count == 1
+    assert list(instance_configs_per_cluster) == [f"cluster{i}" for i in range(10)]
+    assert {
+        cluster: [ic.get_instance() for ic in instance_configs]
+        for cluster, instance_configs in instance_configs_per_cluster.items()
+    } == {f"cluster{i}": [f"cluster{i}-main"] for i in range(10)}
+
+
+@patch(
+    "paasta_tools.cli.cmds.mark_for_deployment.get_instance_configs_for_service_in_deploy_group_all_clusters",
+    autospec=True,
+)
+@patch("paasta_tools.cli.cmds.mark_for_deployment._log", autospec=True)
+def test_wait_for_deployment_reuses_instance_configs(
+    mock__log,
+    mock_get_instance_configs_for_service_in_deploy_group_all_clusters,
+):
+    # e.g. a MarkForDeploymentProcess for a deploy group without any instance
+    assert (
+        asyncio.run(
+            mark_for_deployment.wait_for_deployment(
+                "service",
+                "fake_deploy_group",
+                "somesha",
+                "/nail/soa",
+                0,
+                instance_configs_per_cluster={},
+            )
+        )
+        is None
+    )
+    assert not mock_get_instance_configs_for_service_in_deploy_group_all_clusters.called
+
+
 @patch("paasta_tools.cli.cmds.wait_for_deployment.validate_service_name", autospec=True)
 @patch("paasta_tools.cli.cmds.mark_for_deployment.wait_for_deployment", autospec=True)
 def test_paasta_wait_for_deployment_return_1_when_no_such_service(
@@ -0,0 +1,25 @@
+from paasta_tools.contrib.benchmark_suite import find_regressions
+
+
+def test_find_regressions():
+    baseline = {
+        "slower": {"best": 1.0},
+        "a_bit_slower": {"best": 1.0},
+        "faster": {"best": 1.0},
+        "tiny": {"best": 0.001},
+        "failed": {"error": "oops"},
+    }
+    results = {
+        "slower": {"best": 1.5},
+        "a_bit_slower": {"best": 1.2},
+        "faster": {"best": 0.5},
+        # 3x slower, but only by 2ms
+        "tiny": {"best": 0.003},
+        "failed": {"best": 2.0},
+        "new": {"best": 2.0},
+    }
+    assert find_regressions(results, baseline, threshold=0.25) == ["slower"]
+    assert find_regressions(results, baseline, threshold=0.1) == [
+        "slower",
+        "a_bit_slower",
+    ]
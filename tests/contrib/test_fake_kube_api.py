@@ -0,0 +1,85 @@
+import pytest
+
+from paasta_tools.contrib.fake_kube_api import FakeKubernetesAPI
+from paasta_tools.contrib.fake_kube_api import match_label_selector
+from paasta_tools.contrib.fake_kube_api import parse_path
+
+DEPLOYMENTS = "/apis/apps/v1/namespaces/paastasvc-foo/deployments"
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    (
+        ("/api/v1/namespaces", (("api/v1", "namespaces"), None, None)),
+        ("/api/v1/namespaces/foo", (("api/v1", "namespaces"), None, "foo")),
+        (
+            "/api/v1/namespaces/foo/secrets/bar",
+            (("api/v1", "secrets"), "foo", "bar"),
+        ),
+        ("/apis/apps/v1/deployments", (("apis/apps/v1", "deployments"), None, None)),
+        (
+            "/apis/apps/v1/namespaces/foo/deployments/bar/status",
+            (("apis/apps/v1", "deployments"), "foo", "bar"),
+        ),
+    ),
+)
+def test_parse_path(path, expected):
+    assert parse_path(path) == expected
+
+
+def test_parse_path_not_a_resource():
+    with pytest.raises(ValueError):
+        parse_path("/version")
+
+
+@pytest.mark.parametrize(
+    "selector, expected",
+    (
+        ("", True),
+        ("paasta.yelp.com/service=foo", True),
+        ("paasta.yelp.com/service==bar", False),
+        ("paasta.yelp.com/service!=foo", False),
+        ("paasta.yelp.com/service,paasta.yelp.com/instance", True),
+        ("paasta.yelp.com/pool", False),
+        ("!paasta.yelp.com/pool", True),
+        ("paasta.yelp.com/instance in (main,canary),paasta.yelp.com/service", True),
+        ("paasta.yelp.com/instance notin (main,canary)", False),
+    ),
+)
+def test_match_label_selector(selector, expected):
+    labels = {"paasta.yelp.com/service": "foo", "paasta.yelp.com/instance": "main"}
+    assert match_label_selector(selector, labels) is expected
+
+
+def test_object_lifecycle():
+    api = FakeKubernetesAPI()
+    body = {"metadata": {"name": "foo-main", "labels": {"app": "foo"}}, "spec": {}}
+
+    code, created = api.handle("POST", DEPLOYMENTS, {}, body)
+    assert code == 201
+    assert created["metadata"]["namespace"] == "paastasvc-foo"
+    assert api.handle("POST", DEPLOYMENTS, {}, body)[0] == 409
+
+    code, patched = api.handle(
+        "PATCH",
+        f"{DEPLOYMENTS}/foo-main",
+        {},
+        {
+            "metadata": {"labels": {"app": None, "version": "2"}},
+            "spec": {"replicas": 3},
+        },
+    )
+    assert code == 200
+    assert patched["metadata"]["labels"] == {"version": "2"}
+    assert patched["metadata"]["uid"] == created["metadata"]["uid"]
+    assert patched["spec"] == {"replicas": 3}
+
+    _, listed = api.handle(
+        "GET", "/apis/apps/v1/deployments", {"labelSelector": ["version=2"]}
+    )
+    assert listed["items"] == [patched]
+    assert api.handle("GET", DEPLOYMENTS, {"labelSelector": ["app"]})[1]["items"] == []
+
+    assert api.handle("DELETE", f"{DEPLOYMENTS}/foo-main", {})[0] == 200
+    assert api.handle("GET", f"{DEPLOYMENTS}/foo-main", {})[0] == 404
+    assert api.requests == {"post": 2, "patch": 1, "list": 2, "delete": 1, "get": 1}
@@ -18,21 +18,32 @@ from unittest.mock import AsyncMock
 
 import pytest
 import requests.exceptions
+from kubernetes.client.rest import ApiException
 
 import paasta_tools.instance.kubernetes as pik
 from paasta_tools import utils
 from paasta_tools.async_utils import run_sync
+from paasta_tools.kubernetes.bounce_tracker import BounceProgress
+from paasta_tools.kubernetes.bounce_tracker import BounceTracker
 from paasta_tools.utils import DeploymentVersion
 from tests.conftest import Struct
 from tests.conftest import wrap_value_in_task
 
 
+@pytest.fixture(autouse=True)
+def clear_log_tail_cache():
+    pik._log_tail_cache.clear()
+    yield
+    pik._log_tail_cache.clear()
+
+
 @pytest.fixture
 def mock_pod():
     return Struct(
         metadata=Struct(
             owner_references=[Struct(kind="ReplicaSet", name="replicaset_1")],
             name="pod_1",
+            uid="6d3c9ab4-pod-1",
             namespace="paasta",
             creation_timestamp=datetime.datetime(2021, 3, 6),
             deletion_timestamp=None,
@@ -119,7 +130,7 @@ def instance_status_kwargs():
         instance_type="",
         verbose=0,
         include_envoy=False,
-        settings=mock.Mock(),
+        settings=mock.Mock(status_poller=None),
         use_new=False,
         all_namespaces=False,
     )
@@ -166,6 +177,23 @@ def test_instance_status_cr_and_kubernetes(mock_kubernetes_status, mock_cr_statu
     assert len(mock_kubernetes_status.mock_calls) == 1
 
 
+@mock.patch("paasta_tools.instance.kubernetes.cr_status", autospec=True)
+@mock.patch("paasta_tools.instance.kubernetes.kubernetes_status", autospec=True)
+def test_instance_status_cr_from_status_poller(mock_kubernetes_status, mock_cr_status):
+    kwargs = instance_status_kwargs()
+    kwargs.update(
+        service="foo", instance="bar", instance_type="flink", settings=mock.Mock()
+    )
+    kwargs["settings"].status_poller.get.return_value = ({"status": "ok"}, 3.2)
+
+    assert pik.instance_status(**kwargs) == {"flink": {"status": "ok", "age": 3}}
+    key, fetch = kwargs["settings"].status_poller.get.call_args[0]
+    assert key == ("cr", "flink", "foo", "bar")
+    assert mock_cr_status.call_count == 0
+    fetch()
+    assert mock_cr_status.call_count == 1
+
+
 def test_kubernetes_status():
     with mock.patch(
         "paasta_tools.instance.kubernetes.job_status",
@@ -1034,6 +1062,72 @@ def test_bounce_status():
         }
 
 
+def test_bounce_status_from_bounce_tracker():
+    progress = BounceProgress(
+        namespace="paastasvc-fake--service",
+        service="fake_service",
+        instance="fake_instance",
+        desired_replicas=3,
+        replicas=4,
+        ready_replicas=3,
+        updated_replicas=1,
+        new_version_replicas=1,
+        old_version_replicas=3,
+        active_versions=frozenset({(DeploymentVersion("aaa", None), "config_aaa")}),
+    )
+    mock_bounce_tracker = mock.Mock(spec=BounceTracker, synced=True)
+    mock_bounce_tracker.get.return_value = progress
+    with mock.patch(
+        "paasta_tools.instance.kubernetes.kubernetes_tools.load_kubernetes_service_config",
+        autospec=True,
+    ) as mock_load_kubernetes_service_config, mock.patch(
+        "paasta_tools.instance.kubernetes.kubernetes_tools.get_kubernetes_app_by_name",
+        autospec=True,
+    ) as mock_get_kubernetes_app_by_name:
+        mock_config = mock_load_kubernetes_service_config.return_value
+        mock_config.get_instances.return_value = 3
+        mock_config.get_desired_state.return_value = "start"
+        mock_config.service = "fake_service"
+        mock_config.instance = "fake_instance"
+        mock_config.get_kubernetes_namespace.return_value = "paastasvc-fake--service"
+        status = pik.bounce_status(
+            "fake_service",
+            "fake_instance",
+            mock.Mock(),
+            bounce_tracker=mock_bounce_tracker,
+        )
+
+    assert not mock_get_kubernetes_app_by_name.called
+    mock_bounce_tracker.get.assert_called_once_with(
+        namespace="paastasvc-fake--service",
+        service="fake_service",
+        instance="fake_instance",
+    )
+    assert status == {
+        "expected_instance_count": 3,
+        "desired_state": "start",
+        "running_instance_count": 3,
+        "deploy_status": "Deploying",
+        "active_shas": [("aaa", "config_aaa")],
+        "active_versions": [("aaa", None, "config_aaa")],
+        "app_count": 1,
+    }
+
+    # the app is gone
+    mock_bounce_tracker.get.return_value = None
+    with mock.patch(
+        "paasta_tools.instance.kubernetes.kubernetes_tools.load_kubernetes_service_config",
+        autospec=True,
+    ), pytest.raises(ApiException) as excinfo:
+        pik.bounce_status(
+            "fake_service",
+            "fake_instance",
+            mock.Mock(),
+            bounce_tracker=mock_bounce_tracker,
+        )
+    assert excinfo.value.status == 404
+
+
 @pytest.mark.asyncio
 async def test_get_pod_containers(mock_pod):
     mock_client = mock.Mock()
@@ -1576,3 +1670,63 @@ def test_restart_replica_by_name_force_parameter(
         kube_client=mock_settings.kubernetes_client,
         grace_period_seconds=expected_grace_period,
     )
+
+
+@pytest.mark.asyncio
+async def test_pod_details_fetcher_caches_tail_lines(mock_pod):
+    container = mock_pod.status.container_statuses[0]
+    with mock.patch(
+        "paasta_tools.instance.kubernetes.get_tail_lines_for_kubernetes_container",
+        new_callable=AsyncMock,
+        autospec=None,
+        side_effect=[{"stdout": ["a"]}, {"stdout": ["b"]}, {"stdout": ["c"]}],
+    ) as mock_get_tail_lines:
+        fetcher = pik.PodDetailsFetcher(mock.Mock(), 10)
+        assert await fetcher.tail_lines(mock_pod, container) == {"stdout": ["a"]}
+        assert await fetcher.tail_lines(mock_pod, container) == {"stdout": ["a"]}
+        # previous logs, and the logs of a restarted container, are separate entries
+        assert await fetcher.tail_lines(mock_pod, container, previous=True) == {
+            "stdout": ["b"]
+        }
+        container.restart_count += 1
+        assert await fetcher.tail_lines(mock_pod, container) == {"stdout": ["c"]}
+    assert mock_get_tail_lines.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_pod_details_fetcher_concurrency_and_budget(mock_pod):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_tail_lines(client, pod, container, num_tail_lines, previous):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05 if container.name != "stuck" else 10)
+        in_flight -= 1
+        return {"stdout": [container.name]}
+
+    containers = [
+        Struct(name=name, restart_count=0) for name in ("a", "b", "c", "d", "stuck")
+    ]
+    with mock.patch(
+        "paasta_tools.instance.kubernetes.get_tail_lines_for_kubernetes_container",
+        autospec=True,
+        side_effect=slow_tail_lines,
+    ):
+        fetcher = pik.PodDetailsFetcher(mock.Mock(), 10, concurrency=2, budget=0.5)
+        tail_lines = await asyncio.gather(
+            *[fetcher.tail_lines(mock_pod, container) for container in containers]
+        )
+        # the budget has run out: no more reads
+        late_tail_lines = await fetcher.tail_lines(
+            mock_pod, Struct(name="e", restart_count=0)
+        )
+
+    assert max_in_flight == 2
+    assert tail_lines[:4] == [{"stdout": [name]} for name in "abcd"]
+    assert tail_lines[4] == {
+        "error_message": "Could not fetch logs for stuck",
+        "partial": True,
+    }
+    assert late_tail_lines["partial"] is True
@@ -24,7 +24,7 @@ from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
 from paasta_tools.utils import DEFAULT_SOA_DIR
 
 
-@pytest.fixture(scope="session", autouse=True)
+@pytest.fixture(scope="module", autouse=True)
 def mock_time_sleep():
     with mock.patch(
         "paasta_tools.kubernetes.bin.paasta_secrets_sync.time.sleep",
@@ -0,0 +1,121 @@
+import contextlib
+import json
+from unittest import mock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from kubernetes.client import ApiClient
+from kubernetes.client import Configuration
+from kubernetes.client import V1PodList
+from kubernetes.client.rest import ApiException
+
+from paasta_tools.kubernetes.async_client import AsyncKubeClient
+
+POD_LIST = {
+    "kind": "PodList",
+    "apiVersion": "v1",
+    "metadata": {"resourceVersion": "42"},
+    "items": [
+        {
+            "metadata": {
+                "name": "kurupt-fm-abc",
+                "namespace": "paasta",
+                "creationTimestamp": "2021-01-01T00:00:00Z",
+            },
+            "status": {"phase": "Running"},
+        }
+    ],
+}
+
+
+@contextlib.asynccontextmanager
+async def kube_api():
+    requests = []
+
+    async def list_pods(request):
+        requests.append(request)
+        return web.json_response(POD_LIST)
+
+    async def read_log(request):
+        requests.append(request)
+        return web.Response(text="line 1\nline 2")
+
+    async def missing_hpa(request):
+        requests.append(request)
+        return web.json_response({"message": "not found"}, status=404)
+
+    app = web.Application()
+    app.router.add_get("/api/v1/namespaces/paasta/pods", list_pods)
+    app.router.add_get("/api/v1/namespaces/paasta/pods/kurupt-fm-abc/log", read_log)
+    app.router.add_get(
+        "/apis/autoscaling/v2/namespaces/paasta/horizontalpodautoscalers/kurupt-fm",
+        missing_hpa,
+    )
+    server = TestServer(app)
+    await server.start_server()
+    configuration = Configuration(host=str(server.make_url("")))
+    configuration.api_key = {"authorization": "some-token"}
+    configuration.api_key_prefix = {"authorization": "Bearer"}
+    kube_client = mock.Mock(api_client=ApiClient(configuration))
+    async_client = AsyncKubeClient(kube_client, pool_size=4)
+    try:
+        yield async_client, requests
+    finally:
+        await async_client.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_get_json():
+    async with kube_api() as (async_client, requests):
+        response = await async_client.get_json(
+            "/api/v1/namespaces/paasta/pods", params={"labelSelector": "app=kurupt"}
+        )
+        assert response == POD_LIST
+        assert requests[0].query["labelSelector"] == "app=kurupt"
+        assert requests[0].headers["authorization"] == "Bearer some-token"
+
+
+@pytest.mark.asyncio
+async def test_get_object():
+    async with kube_api() as (async_client, _):
+        response = await async_client.get_object(
+            "/api/v1/namespaces/paasta/pods", "V1PodList"
+        )
+        assert isinstance(response, V1PodList)
+        assert response.items[0].metadata.name == "kurupt-fm-abc"
+        assert response.items[0].metadata.creation_timestamp.year == 2021
+        assert response.items[0].status.phase == "Running"
+
+
+@pytest.mark.asyncio
+async def test_get_text():
+    async with kube_api() as (async_client, requests):
+        response = await async_client.get_text(
+            "/api/v1/namespaces/paasta/pods/kurupt-fm-abc/log", params={"tailLines": 2}
+        )
+        assert response == "line 1\nline 2"
+        assert requests[0].query["tailLines"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_get_raises_api_exception():
+    async with kube_api() as (async_client, _):
+        with pytest.raises(ApiException) as excinfo:
+            await async_client.get_object(
+                "/apis/autoscaling/v2/namespaces/paasta/horizontalpodautoscalers/kurupt-fm",
+                "V2HorizontalPodAutoscaler",
+            )
+        assert excinfo.value.status == 404
+        assert json.loads(excinfo.value.body) == {"message": "not found"}
+
+
+@pytest.mark.asyncio
+async def test_session_shared_across_requests():
+    async with kube_api() as (async_client, _):
+        await async_client.get_json("/api/v1/namespaces/paasta/pods")
+        session = async_client._session()
+        await async_client.get_json("/api/v1/namespaces/paasta/pods")
+        assert async_client._session() is session
+        assert session.connector.limit == 4
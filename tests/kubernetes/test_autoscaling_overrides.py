@@ -0,0 +1,232 @@
+import copy
+import json
+import threading
+from unittest import mock
+
+import pytest
+from kubernetes.client import V1ConfigMap
+from kubernetes.client import V1ObjectMeta
+from kubernetes.client.rest import ApiException
+
+from paasta_tools.kubernetes import autoscaling_overrides
+from paasta_tools.kubernetes.autoscaling_overrides import AutoscalingOverridesStore
+
+
+class FakeCoreApi:
+    """Just enough of the ConfigMap API, including resourceVersion checks on patches."""
+
+    def __init__(self, data=None):
+        self.configmap = None
+        if data is not None:
+            self.configmap = V1ConfigMap(
+                metadata=V1ObjectMeta(
+                    name="paasta-autoscaling-overrides",
+                    namespace="paasta",
+                    resource_version="1",
+                ),
+                data={key: json.dumps(value) for key, value in data.items()},
+            )
+        self.reads = 0
+        self.patches = []
+
+    def change(self, key, value):
+        """Somebody else changing the ConfigMap."""
+        self.configmap.data[key] = json.dumps(value)
+        self.configmap.metadata.resource_version = str(
+            int(self.configmap.metadata.resource_version) + 1
+        )
+
+    def read_namespaced_config_map(self, name, namespace):
+        self.reads += 1
+        if self.configmap is None:
+            raise ApiException(status=404)
+        return copy.deepcopy(self.configmap)
+
+    def create_namespaced_config_map(self, namespace, body):
+        self.configmap = copy.deepcopy(body)
+        self.configmap.metadata.resource_version = "1"
+        return copy.deepcopy(self.configmap)
+
+    def patch_namespaced_config_map(self, name, namespace, body):
+        self.patches.append(body)
+        if (
+            body["metadata"]["resourceVersion"]
+            != self.configmap.metadata.resource_version
+        ):
+            raise ApiException(status=409)
+        for key, value in body["data"].items():
+            if value is None:
+                self.configmap.data.pop(key, None)
+            else:
+                self.configmap.data[key] = value
+        self.configmap.metadata.resource_version = str(
+            int(self.configmap.metadata.resource_version) + 1
+        )
+        return copy.deepcopy(self.configmap)
+
+
+def make_store(data=None, ttl=60):
+    core = FakeCoreApi(data)
+    return AutoscalingOverridesStore(mock.Mock(core=core), ttl=ttl), core
+
+
+def test_read_is_cached():
+    store, core = make_store(
+        {
+            "a.main": {"min_instances": 2, "expire_after": 100},
+            "b.main": {"max_instances": 5, "expire_after": 200},
+        }
+    )
+    assert store.read() == {
+        "a.main": {"min_instances": 2, "expire_after": 100},
+        "b.main": {"max_instances": 5, "expire_after": 200},
+    }
+    store.read()
+    assert core.reads == 1
+
+    core.change("b.main", {"max_instances": 6, "expire_after": 200})
+    with mock.patch(
+        "paasta_tools.kubernetes.autoscaling_overrides.parse_override",
+        autospec=True,
+        side_effect=autoscaling_overrides.parse_override,
+    ) as mock_parse_override:
+        assert store.read(max_age=0)["b.main"] == {
+            "max_instances": 6,
+            "expire_after": 200,
+        }
+    assert core.reads == 2
+    # a.main did not change, so it's not parsed again
+    assert mock_parse_override.call_count == 1
+
+
+def test_read_missing_configmap():
+    store, _ = make_store()
+    assert store.read() == {}
+    assert store.expired(now=1000) == []
+
+
+def test_read_single_flight():
+    store, core = make_store({"a.main": {"min_instances": 2, "expire_after": 100}})
+    # hold the lock like a thread that is fetching the ConfigMap would
+    with store._read_lock:
+        threads = [threading.Thread(target=store.read) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        store._store(core.read_namespaced_config_map("", ""))
+    for thread in threads:
+        thread.join()
+    assert core.reads == 1
+
+
+def test_update_creates_configmap():
+    store, core = make_store()
+    assert store.update("a.main", lambda current: {"min_instances": 2}) == {
+        "min_instances": 2
+    }
+    assert json.loads(core.configmap.data["a.main"]) == {"min_instances": 2}
+
+
+def test_update_coalesces_concurrent_updates():
+    store, core = make_store({"a.main": {"min_instances": 2, "expire_after": 100}})
+    store.read()
+    results = {}
+
+    def set_max_instances(key):
+        results[key] = store.update(
+            key, lambda current: {**(current or {}), "max_instances": 10}
+        )
+
+    # hold the lock like a thread that is writing other updates would
+    with store._write_lock:
+        threads = [
+            threading.Thread(target=set_max_instances, args=(key,))
+            for key in ["a.main", "b.main", "c.main"]
+        ]
+        for thread in threads:
+            thread.start()
+        while len(store._pending) < 3:
+            threading.Event().wait(0.001)
+    for thread in threads:
+        thread.join()
+
+    assert len(core.patches) == 1
+    assert set(core.patches[0]["data"]) == {"a.main", "b.main", "c.main"}
+    assert results["a.main"] == {
+        "min_instances": 2,
+        "expire_after": 100,
+        "max_instances": 10,
+    }
+    assert results["b.main"] == {"max_instances": 10}
+
+
+def test_update_retries_on_conflict():
+    store, core = make_store({"a.main": {"min_instances": 2, "expire_after": 100}})
+    store.read()
+    # the cached version is now stale
+    core.change("a.main", {"min_instances": 3, "expire_after": 100})
+
+    update = mock.Mock(
+        side_effect=lambda current: {**current, "max_instances": 10},
+    )
+    assert store.update("a.main", update) == {
+        "min_instances": 3,
+        "expire_after": 100,
+        "max_instances": 10,
+    }
+    assert update.call_args_list == [
+        mock.call({"min_instances": 2, "expire_after": 100}),
+        mock.call({"min_instances": 3, "expire_after": 100}),
+    ]
+    assert len(core.patches) == 2
+
+
+def test_update_errors_are_isolated():
+    store, core = make_store({})
+
+    def fail(current):
+        raise ValueError("nope")
+
+    with pytest.raises(ValueError):
+        store.update("a.main", fail)
+    assert store.update_many(
+        {"b.main": lambda current: {"min_instances": 1}, "c.main": lambda c: None}
+    ) == {"b.main": {"min_instances": 1}, "c.main": None}
+    # nothing to change for c.main
+    assert core.patches[-1]["data"] == {"b.main": json.dumps({"min_instances": 1})}
+
+
+def test_remove_expired():
+    store, core = make_store(
+        {
+            "a.main": {"min_instances": 2, "expire_after": 100},
+            "b.main": {"min_instances": 2, "expire_after": 300},
+            "c.main": {"min_instances": 2},
+            "d.main": {"min_instances": 2, "expire_after": 200},
+        }
+    )
+    core.configmap.data["e.main"] = "not json"
+
+    assert store.expired(now=250) == ["c.main", "e.main", "a.main", "d.main"]
+    assert sorted(store.remove_expired(now=250)) == [
+        "a.main",
+        "c.main",
+        "d.main",
+        "e.main",
+    ]
+    assert core.patches == [
+        {
+            "metadata": {"resourceVersion": "1"},
+            "data": {"a.main": None, "c.main": None, "d.main": None, "e.main": None},
+        }
+    ]
+    assert list(core.configmap.data) == ["b.main"]
+
+
+def test_remove_expired_keeps_overrides_set_again():
+    store, core = make_store({"a.main": {"min_instances": 2, "expire_after": 100}})
+    store.expired(now=250)
+    core.change("a.main", {"min_instances": 2, "expire_after": 1000})
+
+    with mock.patch.object(store, "expired", autospec=True, return_value=["a.main"]):
+        assert store.remove_expired(now=250) == []
+    assert "a.main" in core.configmap.data
@@ -0,0 +1,195 @@
+from unittest import mock
+
+import pytest
+from kubernetes.client import V1ControllerRevision
+from kubernetes.client import V1Deployment
+from kubernetes.client import V1DeploymentSpec
+from kubernetes.client import V1DeploymentStatus
+from kubernetes.client import V1LabelSelector
+from kubernetes.client import V1ListMeta
+from kubernetes.client import V1ObjectMeta
+from kubernetes.client import V1PodTemplateSpec
+from kubernetes.client import V1ReplicaSet
+from kubernetes.client import V1ReplicaSetList
+from kubernetes.client import V1ReplicaSetSpec
+from kubernetes.client import V1ReplicaSetStatus
+from kubernetes.client import V1StatefulSet
+from kubernetes.client import V1StatefulSetSpec
+from kubernetes.client import V1StatefulSetStatus
+from kubernetes.client.rest import ApiException
+
+from paasta_tools.kubernetes import bounce_tracker
+from paasta_tools.kubernetes.bounce_tracker import BounceTracker
+from paasta_tools.kubernetes_tools import KubernetesDeployStatus
+from paasta_tools.utils import DeploymentVersion
+
+NAMESPACE = "paastasvc-service"
+KEY = (NAMESPACE, "service", "main")
+
+
+def make_metadata(uid, git_sha="aaa", config_sha="config111", instance="main"):
+    return V1ObjectMeta(
+        uid=uid,
+        namespace=NAMESPACE,
+        labels={
+            "paasta.yelp.com/service": "service",
+            "paasta.yelp.com/instance": instance,
+            "paasta.yelp.com/git_sha": f"git{git_sha}",
+            "paasta.yelp.com/config_sha": config_sha,
+        },
+    )
+
+
+def make_deployment(
+    uid="deployment", desired=3, ready=3, updated=3, replicas=3, **kwargs
+):
+    return V1Deployment(
+        metadata=make_metadata(uid, **kwargs),
+        spec=V1DeploymentSpec(
+            replicas=desired, selector=V1LabelSelector(), template=V1PodTemplateSpec()
+        ),
+        status=V1DeploymentStatus(
+            replicas=replicas, ready_replicas=ready, updated_replicas=updated
+        ),
+    )
+
+
+def make_replicaset(uid, desired, replicas, ready=None, **kwargs):
+    return V1ReplicaSet(
+        metadata=make_metadata(uid, **kwargs),
+        spec=V1ReplicaSetSpec(replicas=desired, selector=V1LabelSelector()),
+        status=V1ReplicaSetStatus(
+            replicas=replicas,
+            ready_replicas=replicas if ready is None else ready,
+        ),
+    )
+
+
+@pytest.fixture
+def tracker():
+    return BounceTracker(mock.Mock())
+
+
+def test_bounce_progress(tracker):
+    assert tracker.get(*KEY) is None
+
+    tracker.replace(bounce_tracker.DEPLOYMENT, [make_deployment(git_sha="bbb")])
+    tracker.replace(
+        bounce_tracker.REPLICA_SET,
+        [
+            make_replicaset("old", desired=2, replicas=2, git_sha="aaa"),
+            make_replicaset("new", desired=1, replicas=1, git_sha="bbb"),
+            # scaled down long ago
+            make_replicaset("older", desired=0, replicas=0, git_sha="999"),
+        ],
+    )
+
+    progress = tracker.get(*KEY)
+    assert progress.new_version_replicas == 1
+    assert progress.old_version_replicas == 2
+    assert progress.active_versions == {
+        (DeploymentVersion("aaa", None), "111"),
+        (DeploymentVersion("bbb", None), "111"),
+    }
+    assert progress.in_flight
+    assert tracker.in_flight() == [progress]
+
+    # the old ReplicaSet is scaled down
+    tracker.apply(
+        bounce_tracker.REPLICA_SET,
+        "MODIFIED",
+        make_replicaset("old", desired=0, replicas=0, git_sha="aaa"),
+    )
+    tracker.apply(
+        bounce_tracker.REPLICA_SET,
+        "MODIFIED",
+        make_replicaset("new", desired=3, replicas=3, git_sha="bbb"),
+    )
+    progress = tracker.get(*KEY)
+    assert (progress.new_version_replicas, progress.old_version_replicas) == (3, 0)
+    assert progress.deploy_status == KubernetesDeployStatus.Running
+    assert tracker.in_flight() == []
+
+    tracker.apply(bounce_tracker.DEPLOYMENT, "DELETED", make_deployment())
+    assert tracker.get(*KEY) is None
+
+
+def test_bounce_progress_waiting_for_replicas(tracker):
+    tracker.replace(bounce_tracker.DEPLOYMENT, [make_deployment(desired=3, ready=2)])
+    assert tracker.get(*KEY).deploy_status == KubernetesDeployStatus.Waiting
+    assert tracker.in_flight() == [tracker.get(*KEY)]
+
+
+def test_bounce_progress_stateful_set(tracker):
+    tracker.replace(
+        bounce_tracker.STATEFUL_SET,
+        [
+            V1StatefulSet(
+                metadata=make_metadata("statefulset", git_sha="bbb"),
+                spec=V1StatefulSetSpec(
+                    replicas=3,
+                    selector=V1LabelSelector(),
+                    service_name="",
+                    template=V1PodTemplateSpec(),
+                ),
+                status=V1StatefulSetStatus(
+                    replicas=3, ready_replicas=3, updated_replicas=1
+                ),
+            )
+        ],
+    )
+    tracker.replace(
+        bounce_tracker.CONTROLLER_REVISION,
+        [
+            V1ControllerRevision(
+                metadata=make_metadata(f"revision-{sha}", git_sha=sha), revision=1
+            )
+            for sha in ("aaa", "bbb")
+        ],
+    )
+    progress = tracker.get(*KEY)
+    assert (progress.new_version_replicas, progress.old_version_replicas) == (1, 2)
+    assert len(progress.active_versions) == 2
+    assert progress.deploy_status == KubernetesDeployStatus.Deploying
+
+
+def test_replace_forgets_objects_not_listed_anymore(tracker):
+    tracker.replace(
+        bounce_tracker.DEPLOYMENT,
+        [make_deployment("main"), make_deployment("canary", instance="canary")],
+    )
+    tracker.replace(bounce_tracker.DEPLOYMENT, [make_deployment("main")])
+    assert tracker.get(*KEY) is not None
+    assert tracker.get(NAMESPACE, "service", "canary") is None
+    assert tracker._objects.keys() == {KEY}
+
+
+def test_list_and_watch(tracker):
+    tracker.kube_client.deployments.list_replica_set_for_all_namespaces.return_value = (
+        V1ReplicaSetList(
+            metadata=V1ListMeta(resource_version="10"),
+            items=[make_replicaset("old", desired=3, replicas=3)],
+        )
+    )
+    tracker.replace(bounce_tracker.DEPLOYMENT, [make_deployment(git_sha="bbb")])
+
+    def stream(func, **kwargs):
+        assert kwargs["resource_version"] == "10"
+        yield {
+            "type": "ADDED",
+            "object": make_replicaset("new", desired=1, replicas=1, git_sha="bbb"),
+        }
+        raise ApiException(status=410)
+
+    with mock.patch(
+        "paasta_tools.kubernetes.bounce_tracker.Watch", autospec=True
+    ) as mock_watch:
+        mock_watch.return_value.stream.side_effect = stream
+        tracker._watch(
+            bounce_tracker.REPLICA_SET, tracker._list(bounce_tracker.REPLICA_SET)
+        )
+
+    assert bounce_tracker.REPLICA_SET in tracker._synced
+    assert not tracker.synced
+    progress = tracker.get(*KEY)
+    assert (progress.new_version_replicas, progress.old_version_replicas) == (1, 3)
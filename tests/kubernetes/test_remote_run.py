@@ -41,6 +41,7 @@ from paasta_tools.kubernetes.remote_run import remote_run_ready
 from paasta_tools.kubernetes.remote_run import remote_run_start
 from paasta_tools.kubernetes.remote_run import remote_run_stop
 from paasta_tools.kubernetes.remote_run import remote_run_token
+from paasta_tools.kubernetes.remote_run import wait_for_job_pod
 
 
 @patch("paasta_tools.kubernetes.remote_run.ensure_namespace", autospec=True)
@@ -253,6 +254,101 @@ def test_remote_run_ready(
     }
 
 
+@patch("paasta_tools.kubernetes.remote_run.wait_for_job_pod", autospec=True)
+@patch("paasta_tools.kubernetes.remote_run.find_job_pod", autospec=True)
+@patch("paasta_tools.kubernetes.remote_run.load_eks_service_config", autospec=True)
+@patch("paasta_tools.kubernetes.remote_run.KubeClient", autospec=True)
+def test_remote_run_ready_wait(
+    mock_client, mock_load_config, mock_find_job_pod, mock_wait_for_job_pod
+):
+    mock_load_config.return_value.get_namespace.return_value = "namespace"
+    mock_wait_for_job_pod.return_value.metadata.name = "somepod"
+    mock_wait_for_job_pod.return_value.metadata.deletion_timestamp = None
+    mock_wait_for_job_pod.return_value.status.phase = "Running"
+    assert remote_run_ready(
+        "foo", "bar", "dev", "somejob", "someuser", is_toolbox=False, wait=600
+    ) == {
+        "status": 200,
+        "message": "Pod ready",
+        "pod_name": "somepod",
+        "namespace": "namespace",
+    }
+    mock_wait_for_job_pod.assert_called_once_with(
+        mock_client.return_value, "namespace", "somejob", timeout=60
+    )
+    assert mock_find_job_pod.call_count == 0
+
+
+def _create_mock_pod(phase, deletion_timestamp=None):
+    mock_pod = MagicMock()
+    mock_pod.status.phase = phase
+    mock_pod.metadata.deletion_timestamp = deletion_timestamp
+    return mock_pod
+
+
+@patch("paasta_tools.kubernetes.remote_run.Watch", autospec=True)
+def test_wait_for_job_pod_already_running(mock_watch):
+    mock_client = MagicMock()
+    running_pod = _create_mock_pod("Running")
+    mock_client.core.list_namespaced_pod.return_value.items = [running_pod]
+    assert wait_for_job_pod(mock_client, "namespace", "somejob", 30) is running_pod
+    assert mock_watch.call_count == 0
+
+
+@patch("paasta_tools.kubernetes.remote_run.Watch", autospec=True)
+def test_wait_for_job_pod_watches(mock_watch):
+    mock_client = MagicMock()
+    mock_client.core.list_namespaced_pod.return_value.items = []
+    mock_client.core.list_namespaced_pod.return_value.metadata.resource_version = "42"
+    running_pod = _create_mock_pod("Running")
+    mock_watch.return_value.stream.return_value = iter(
+        [
+            {"type": "ADDED", "object": _create_mock_pod("Pending")},
+            {"type": "MODIFIED", "object": running_pod},
+            {"type": "MODIFIED", "object": _create_mock_pod("Succeeded")},
+        ]
+    )
+    assert wait_for_job_pod(mock_client, "namespace", "somejob", 30) is running_pod
+    mock_watch.return_value.stream.assert_called_once_with(
+        mock_client.core.list_namespaced_pod,
+        "namespace",
+        label_selector="paasta.yelp.com/job_type=remote-run,job-name=somejob",
+        resource_version="42",
+        timeout_seconds=30,
+    )
+    mock_watch.return_value.stop.assert_called_once_with()
+
+
+@patch("paasta_tools.kubernetes.remote_run.Watch", autospec=True)
+def test_wait_for_job_pod_timeout_and_deletion(mock_watch):
+    mock_client = MagicMock()
+    pending_pod = _create_mock_pod("Pending")
+    mock_client.core.list_namespaced_pod.return_value.items = [pending_pod]
+    # nothing happened before the timeout
+    mock_watch.return_value.stream.return_value = iter([])
+    assert wait_for_job_pod(mock_client, "namespace", "somejob", 30) is pending_pod
+    # the pod went away
+    mock_watch.return_value.stream.return_value = iter(
+        [{"type": "DELETED", "object": pending_pod}]
+    )
+    assert wait_for_job_pod(mock_client, "namespace", "somejob", 30) is None
+
+
+@patch("paasta_tools.kubernetes.remote_run.find_job_pod", autospec=True)
+@patch("paasta_tools.kubernetes.remote_run.Watch", autospec=True)
+def test_wait_for_job_pod_expired_resource_version(mock_watch, mock_find_job_pod):
+    mock_client = MagicMock()
+    mock_client.core.list_namespaced_pod.return_value.items = []
+    mock_watch.return_value.stream.side_effect = ApiException(status=410)
+    assert (
+        wait_for_job_pod(mock_client, "namespace", "somejob", 30)
+        is mock_find_job_pod.return_value
+    )
+    mock_find_job_pod.assert_called_once_with(
+        mock_client, "namespace", "somejob", "remote-run", retries=1
+    )
+
+
 @patch("paasta_tools.kubernetes.remote_run.get_application_wrapper", autospec=True)
 @patch("paasta_tools.kubernetes.remote_run.load_eks_service_config", autospec=True)
 @patch("paasta_tools.kubernetes.remote_run.KubeClient", autospec=True)
@@ -525,6 +525,30 @@ def test_calculate_resource_utilization_for_kube_nodes():
     assert free.disk == 180
 
 
+def test_group_pods_by_node():
+    fake_nodes = [
+        V1Node(metadata=V1ObjectMeta(name="fake_node1")),
+        V1Node(metadata=V1ObjectMeta(name="fake_node2")),
+    ]
+    fake_pods = [
+        V1Pod(
+            metadata=V1ObjectMeta(name=name),
+            spec=V1PodSpec(containers=[], node_name=node_name),
+        )
+        for name, node_name in [
+            ("pod1", "fake_node1"),
+            ("pod2", "fake_node1"),
+            ("pod3", "other_node"),
+            ("pod4", None),
+        ]
+    ]
+    pods_by_node = metastatus_lib.group_pods_by_node(fake_nodes, fake_pods)
+
+    assert {
+        node: [pod.metadata.name for pod in pods] for node, pods in pods_by_node.items()
+    } == {"fake_node1": ["pod1", "pod2"], "fake_node2": []}
+
+
 def test_healthcheck_result_for_resource_utilization_ok():
     expected_message = "cpus: 5.00/10.00(50.00%) used. Threshold (90.00%)"
     expected = metastatus_lib.HealthCheckResult(message=expected_message, healthy=True)
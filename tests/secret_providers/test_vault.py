@@ -1,31 +1,68 @@
+import json
+import time
 from unittest import mock
 
+import pytest
+import requests
 from pytest import fixture
 from pytest import raises
 
+from paasta_tools.secret_providers import SecretWriteError
+from paasta_tools.secret_providers.vault import SecretCache
 from paasta_tools.secret_providers.vault import SecretProvider
 
 
 @fixture
 def mock_secret_provider():
+    # clients are created lazily, so keep get_vault_client patched for the test
+    with mock.patch(
+        "paasta_tools.secret_providers.vault.get_vault_client", autospec=True
+    ):
+        with mock.patch(
+            "paasta_tools.secret_providers.vault.SecretProvider.get_vault_ecosystems_for_clusters",
+            autospec=True,
+            return_value=["devc"],
+        ):
+            provider = SecretProvider(
+                soa_dir="/nail/blah",
+                service_name="universe",
+                cluster_names=["mesosstage"],
+                vault_auth_method="token",
+            )
+        yield provider
+
+
+def test_secret_provider(mock_secret_provider):
+    assert mock_secret_provider.ecosystems == ["devc"]
+    assert mock_secret_provider.clients["devc"]
+
+
+def test_secret_provider_creates_clients_lazily():
     with mock.patch(
         "paasta_tools.secret_providers.vault.SecretProvider.get_vault_ecosystems_for_clusters",
         autospec=True,
-        return_value=["devc"],
+        return_value=["devc", "prod"],
     ), mock.patch(
         "paasta_tools.secret_providers.vault.get_vault_client", autospec=True
-    ):
-        return SecretProvider(
+    ) as mock_get_vault_client:
+        provider = SecretProvider(
             soa_dir="/nail/blah",
             service_name="universe",
             cluster_names=["mesosstage"],
             vault_auth_method="token",
         )
+        assert mock_get_vault_client.call_count == 0
 
-
-def test_secret_provider(mock_secret_provider):
-    assert mock_secret_provider.ecosystems == ["devc"]
-    assert mock_secret_provider.clients["devc"]
+        assert provider.clients["devc"] is mock_get_vault_client.return_value
+        assert provider.clients["devc"] is mock_get_vault_client.return_value
+    mock_get_vault_client.assert_called_once_with(
+        ecosystem="devc",
+        num_uses=1,
+        vault_auth_method="token",
+        vault_token_file="/root/.vault-token",
+        username=None,
+        password=None,
+    )
 
 
 def test_decrypt_environment(mock_secret_provider):
@@ -173,3 +210,255 @@ def test_get_secret_signature_from_data_missing(mock_secret_provider):
         assert not mock_secret_provider.get_secret_signature_from_data(
             {"environments": {"westeros": {}}}
         )
+
+
+def test_decrypt_secrets_raw_concurrently(mock_secret_provider):
+    mock_secret_provider.max_workers = 4
+    with mock.patch(
+        "paasta_tools.secret_providers.vault.get_plaintext", autospec=False
+    ) as mock_get_plaintext:
+        mock_get_plaintext.side_effect = lambda path, **kwargs: path.encode("utf-8")
+        ret = mock_secret_provider.decrypt_secrets_raw(["a", "b", "c"])
+
+    assert ret == {
+        "a": b"/nail/blah/universe/secrets/a.json",
+        "b": b"/nail/blah/universe/secrets/b.json",
+        "c": b"/nail/blah/universe/secrets/c.json",
+    }
+    assert mock_get_plaintext.call_count == 3
+
+
+def test_decrypt_environment_fetches_each_secret_once(mock_secret_provider):
+    with mock.patch(
+        "paasta_tools.secret_providers.vault.get_plaintext", autospec=False
+    ) as mock_get_plaintext:
+        mock_get_plaintext.return_value = b"SECRETSQUIRREL"
+        ret = mock_secret_provider.decrypt_environment(
+            {"A": "SECRET(same)", "B": "SECRET(same)"}
+        )
+    assert ret == {"A": "SECRETSQUIRREL", "B": "SECRETSQUIRREL"}
+    assert mock_get_plaintext.call_count == 1
+
+
+def test_decrypt_secrets_raw_uses_cache(mock_secret_provider):
+    mock_secret_provider.cache = mock.Mock(spec=SecretCache)
+    mock_secret_provider.cache.get.side_effect = lambda ecosystem, path, signature: (
+        b"cached" if path.endswith("/hit.json") else None
+    )
+    with mock.patch(
+        "paasta_tools.secret_providers.vault.get_plaintext",
+        autospec=False,
+        return_value=b"fetched",
+    ) as mock_get_plaintext, mock.patch.object(
+        mock_secret_provider,
+        "_get_secret_signature",
+        autospec=True,
+        side_effect=lambda name: None if name == "unsigned" else f"sig-{name}",
+    ):
+        ret = mock_secret_provider.decrypt_secrets_raw(["hit", "miss", "unsigned"])
+
+    assert ret == {"hit": b"cached", "miss": b"fetched", "unsigned": b"fetched"}
+    assert mock_get_plaintext.call_count == 2
+    mock_secret_provider.cache.set.assert_called_once_with(
+        "devc", "/nail/blah/universe/secrets/miss.json", "sig-miss", b"fetched"
+    )
+
+
+def test_get_secret_signature(mock_secret_provider, tmp_path):
+    mock_secret_provider.secret_dir = str(tmp_path)
+    (tmp_path / "mysecret.json").write_text(
+        '{"environments": {"devc": {"signature": "abc"}}}'
+    )
+    assert mock_secret_provider._get_secret_signature("mysecret") == "abc"
+    assert mock_secret_provider._get_secret_signature("missing") is None
+
+
+def test_secret_cache(tmp_path):
+    pytest.importorskip("cryptography")
+    cache = SecretCache(str(tmp_path / "cache"), ttl=60)
+    assert cache.get("devc", "/path.json", "sig") is None
+
+    cache.set("devc", "/path.json", "sig", b"SECRETSQUIRREL")
+    assert cache.get("devc", "/path.json", "sig") == b"SECRETSQUIRREL"
+    assert cache.get("devc", "/path.json", "other-sig") is None
+    assert b"SECRETSQUIRREL" not in b"".join(
+        path.read_bytes() for path in (tmp_path / "cache").iterdir()
+    )
+
+    with mock.patch("time.time", autospec=True, return_value=time.time() + 120):
+        assert cache.get("devc", "/path.json", "sig") is None
+
+
+def fake_encrypt_secret(
+    client, ecosystem, secret_name, soa_dir, service_name, **kwargs
+):
+    secret_path = f"{soa_dir}/{service_name}/secrets/{secret_name}.json"
+    try:
+        with open(secret_path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {"environments": {}}
+    data["environments"][ecosystem] = {"signature": f"sig-{ecosystem}"}
+    data["version"] = 2
+    # formatted the way vault_tools writes secret files
+    with open(secret_path, "w") as f:
+        json.dump(data, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+
+def test_write_secret_concurrently(mock_secret_provider, tmp_path):
+    (tmp_path / "universe" / "secrets").mkdir(parents=True)
+    secret_path = tmp_path / "universe" / "secrets" / "mysecret.json"
+    secret_path.write_text(
+        json.dumps({"environments": {"prod": {"signature": "old"}}, "version": 1})
+    )
+    mock_secret_provider.soa_dir = str(tmp_path)
+    mock_secret_provider.secret_dir = str(tmp_path / "universe" / "secrets")
+    mock_secret_provider.ecosystems = ["devc", "prod", "stagef"]
+    mock_secret_provider.max_workers = 3
+    with mock.patch(
+        "paasta_tools.secret_providers.vault.TempGpgKeyring", autospec=False
+    ), mock.patch(
+        "paasta_tools.secret_providers.vault.encrypt_secret",
+        autospec=True,
+        side_effect=fake_encrypt_secret,
+    ) as mock_encrypt_secret:
+        mock_secret_provider.write_secret(
+            action="update", secret_name="mysecret", plaintext=b"SECRETSQUIRREL"
+        )
+
+    assert mock_encrypt_secret.call_count == 3
+    # each ecosystem writes to its own copy, so none of them clobbers the others
+    assert {c[1]["soa_dir"] for c in mock_encrypt_secret.call_args_list}.isdisjoint(
+        {str(tmp_path)}
+    )
+    assert json.loads(secret_path.read_text()) == {
+        "environments": {
+            "devc": {"signature": "sig-devc"},
+            "prod": {"signature": "sig-prod"},
+            "stagef": {"signature": "sig-stagef"},
+        },
+        "version": 2,
+    }
+
+
+def test_write_secret_concurrently_formats_like_serially(
+    mock_secret_provider, tmp_path
+):
+    contents = {}
+    for max_workers in (1, 3):
+        soa_dir = tmp_path / str(max_workers)
+        (soa_dir / "universe" / "secrets").mkdir(parents=True)
+        fake_encrypt_secret(
+            client=None,
+            ecosystem="prod",
+            secret_name="mysecret",
+            soa_dir=str(soa_dir),
+            service_name="universe",
+        )
+        mock_secret_provider.soa_dir = str(soa_dir)
+        mock_secret_provider.secret_dir = str(soa_dir / "universe" / "secrets")
+        mock_secret_provider.ecosystems = ["devc", "prod", "stagef"]
+        mock_secret_provider.max_workers = max_workers
+        with mock.patch(
+            "paasta_tools.secret_providers.vault.TempGpgKeyring", autospec=False
+        ), mock.patch(
+            "paasta_tools.secret_providers.vault.encrypt_secret",
+            autospec=True,
+            side_effect=fake_encrypt_secret,
+        ):
+            mock_secret_provider.write_secret(
+                action="update", secret_name="mysecret", plaintext=b"SECRETSQUIRREL"
+            )
+        contents[max_workers] = (
+            soa_dir / "universe" / "secrets" / "mysecret.json"
+        ).read_bytes()
+
+    assert contents[3] == contents[1]
+
+
+def test_write_secret_retries_failed_ecosystems(mock_secret_provider, tmp_path):
+    mock_secret_provider.soa_dir = str(tmp_path)
+    mock_secret_provider.secret_dir = str(tmp_path / "universe" / "secrets")
+    mock_secret_provider.ecosystems = ["devc", "prod"]
+    mock_secret_provider.max_workers = 2
+    attempts = {"prod": 0}
+
+    def flaky_encrypt_secret(ecosystem, **kwargs):
+        if ecosystem == "prod":
+            attempts["prod"] += 1
+            if attempts["prod"] == 1:
+                raise requests.exceptions.ConnectionError("vault is sad")
+        fake_encrypt_secret(ecosystem=ecosystem, **kwargs)
+
+    with mock.patch(
+        "paasta_tools.secret_providers.vault.TempGpgKeyring", autospec=False
+    ), mock.patch(
+        "paasta_tools.secret_providers.vault.encrypt_secret",
+        autospec=True,
+        side_effect=flaky_encrypt_secret,
+    ) as mock_encrypt_secret, mock.patch(
+        "paasta_tools.secret_providers.vault.time.sleep",
+        autospec=True,
+    ):
+        mock_secret_provider.write_secret(
+            action="add", secret_name="mysecret", plaintext=b"SECRETSQUIRREL"
+        )
+
+    assert [c[1]["ecosystem"] for c in mock_encrypt_secret.call_args_list].count(
+        "devc"
+    ) == 1
+    assert attempts["prod"] == 2
+    with open(tmp_path / "universe" / "secrets" / "mysecret.json") as f:
+        assert sorted(json.load(f)["environments"]) == ["devc", "prod"]
+
+
+def test_write_secret_aggregates_failures(mock_secret_provider):
+    mock_secret_provider.ecosystems = ["devc", "prod"]
+
+    def failing_encrypt_secret(ecosystem, **kwargs):
+        if ecosystem == "prod":
+            raise requests.exceptions.Timeout("vault is sad")
+
+    with mock.patch(
+        "paasta_tools.secret_providers.vault.TempGpgKeyring", autospec=False
+    ), mock.patch(
+        "paasta_tools.secret_providers.vault.encrypt_secret",
+        autospec=True,
+        side_effect=failing_encrypt_secret,
+    ) as mock_encrypt_secret, mock.patch(
+        "paasta_tools.secret_providers.vault.time.sleep", autospec=True
+    ):
+        with raises(SecretWriteError) as excinfo:
+            mock_secret_provider.write_secret(
+                action="add", secret_name="mysecret", plaintext=b"SECRETSQUIRREL"
+            )
+
+    assert list(excinfo.value.failures) == ["prod"]
+    assert mock_encrypt_secret.call_count == 4
+
+
+def test_write_secret_does_not_retry_permanent_failures(mock_secret_provider):
+    mock_secret_provider.ecosystems = ["devc", "prod"]
+
+    def failing_encrypt_secret(ecosystem, **kwargs):
+        if ecosystem == "prod":
+            raise Exception("permission denied")
+
+    with mock.patch(
+        "paasta_tools.secret_providers.vault.TempGpgKeyring", autospec=False
+    ), mock.patch(
+        "paasta_tools.secret_providers.vault.encrypt_secret",
+        autospec=True,
+        side_effect=failing_encrypt_secret,
+    ) as mock_encrypt_secret, mock.patch(
+        "paasta_tools.secret_providers.vault.time.sleep", autospec=True
+    ) as mock_sleep:
+        with raises(SecretWriteError) as excinfo:
+            mock_secret_provider.write_secret(
+                action="add", secret_name="mysecret", plaintext=b"SECRETSQUIRREL"
+            )
+
+    assert list(excinfo.value.failures) == ["prod"]
+    assert mock_encrypt_secret.call_count == 2
+    assert not mock_sleep.called
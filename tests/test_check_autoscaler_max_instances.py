@@ -0,0 +1,214 @@
+from unittest import mock
+
+import pysensu_yelp
+import pytest
+
+from paasta_tools import check_autoscaler_max_instances
+from paasta_tools.check_autoscaler_max_instances import MaxInstancesEvent
+from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
+from paasta_tools.utils import SystemPaastaConfig
+
+
+def make_job_config(instance, max_instances=3, docker_image="some_image"):
+    return KubernetesDeploymentConfig(
+        service="fake_service",
+        cluster="fake_cluster",
+        instance=instance,
+        config_dict={
+            "min_instances": 1,
+            "max_instances": max_instances,
+            "autoscaling": {
+                "metrics_providers": [
+                    {"type": "cpu", "setpoint": 0.8},
+                ]
+            },
+        },
+        branch_dict={
+            "docker_image": docker_image,
+            "git_sha": "abc",
+            "image_version": None,
+            "desired_state": "start",
+            "force_bounce": None,
+        },
+    )
+
+
+def make_hpa(name, desired_replicas, current_value):
+    hpa = mock.Mock()
+    hpa.metadata.name = name
+    hpa.metadata.namespace = "paastasvc-fake--service"
+    return hpa, {
+        "min_instances": 1,
+        "max_instances": 3,
+        "metrics": [
+            {"name": "cpu", "current_value": current_value, "target_value": "80"}
+        ],
+        "desired_replicas": desired_replicas,
+        "last_scale_time": "N/A",
+    }
+
+
+@pytest.mark.parametrize(
+    "desired_replicas,current_value,expected_status",
+    [
+        (2, "90", pysensu_yelp.Status.OK),
+        (3, "70", pysensu_yelp.Status.OK),
+        (3, "90", pysensu_yelp.Status.CRITICAL),
+    ],
+)
+def test_check_instance(desired_replicas, current_value, expected_status):
+    _, autoscaling_status = make_hpa(
+        "fake--service-main", desired_replicas, current_value
+    )
+    status, output = check_autoscaler_max_instances.check_instance(
+        make_job_config("main"), autoscaling_status
+    )
+    assert status == expected_status
+    assert output.startswith("fake_service.main")
+
+
+def test_check_service_uses_hpa_snapshot():
+    main_hpa, main_status = make_hpa("fake--service-main", 3, "90")
+    job_configs = [
+        make_job_config("main"),
+        # no HPA for this one
+        make_job_config("other"),
+        # never marked for deployment
+        make_job_config("undeployed", docker_image=""),
+    ]
+    hpas = {("paastasvc-fake--service", "fake--service-main"): main_hpa}
+    with mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.PaastaServiceConfigLoader",
+        autospec=True,
+    ) as mock_loader, mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.pik.autoscaling_status_from_hpa",
+        autospec=True,
+        side_effect=lambda hpa: main_status
+        if hpa is main_hpa
+        else {"min_instances": -1},
+    ) as mock_autoscaling_status_from_hpa:
+        mock_loader.return_value.instance_configs.return_value = job_configs
+        events = check_autoscaler_max_instances.check_service(
+            "fake_service",
+            "/fake/soa/dir",
+            "fake_cluster",
+            KubernetesDeploymentConfig,
+            mock.Mock(),
+            hpas,
+        )
+
+    assert mock_autoscaling_status_from_hpa.call_args_list == [
+        mock.call(main_hpa),
+        mock.call(None),
+    ]
+    assert len(events) == 1
+    assert events[0].instance == "main"
+    assert events[0].status == pysensu_yelp.Status.CRITICAL
+    assert events[0].overrides["runbook"] == "y/check-autoscaler-max-instances"
+
+
+def test_send_events_in_batches():
+    events = [
+        MaxInstancesEvent(
+            service="fake_service",
+            instance=f"instance{i}",
+            overrides={},
+            status=pysensu_yelp.Status.OK,
+            output="ok",
+        )
+        for i in range(7)
+    ]
+    with mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.send_event", autospec=True
+    ) as mock_send_event, mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.SENSU_EVENT_BATCH_SIZE", 3
+    ):
+        check_autoscaler_max_instances.send_events(
+            events,
+            soa_dir="/fake/soa/dir",
+            cluster="fake_cluster",
+            system_paasta_config=SystemPaastaConfig({}, "/fake/config"),
+        )
+
+    assert sorted(
+        call.kwargs["check_name"] for call in mock_send_event.call_args_list
+    ) == sorted(
+        f"check_autoscaler_max_instances.fake_service.instance{i}" for i in range(7)
+    )
+
+
+@pytest.mark.asyncio
+async def test_check_max_instances_lists_hpas_once():
+    with mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.KubeClient", autospec=True
+    ), mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.get_hpas_by_namespace_and_name",
+        autospec=True,
+    ) as mock_get_hpas, mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.list_services",
+        autospec=True,
+        return_value=["a", "b"],
+    ), mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.check_service",
+        autospec=True,
+        side_effect=lambda service, *args: [service],
+    ) as mock_check_service, mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.send_events", autospec=True
+    ) as mock_send_events:
+        await check_autoscaler_max_instances.check_max_instances(
+            soa_dir="/fake/soa/dir",
+            cluster="fake_cluster",
+            instance_type_class=KubernetesDeploymentConfig,
+            system_paasta_config=mock.Mock(),
+        )
+
+    assert mock_get_hpas.call_count == 1
+    assert mock_check_service.call_count == 2
+    for call in mock_check_service.call_args_list:
+        assert call.args[-1] is mock_get_hpas.return_value
+    assert sorted(mock_send_events.call_args.args[0]) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_check_max_instances_sends_checked_events_when_a_service_fails():
+    def fake_check_service(service, *args):
+        if service == "broken":
+            raise Exception("oh no")
+        return [f"{service}-{i}" for i in range(2)]
+
+    with mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.KubeClient", autospec=True
+    ), mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.get_hpas_by_namespace_and_name",
+        autospec=True,
+    ), mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.list_services",
+        autospec=True,
+        return_value=["a", "b", "c", "broken"],
+    ), mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.check_service",
+        autospec=True,
+        side_effect=fake_check_service,
+    ), mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.send_events", autospec=True
+    ) as mock_send_events, mock.patch(
+        "paasta_tools.check_autoscaler_max_instances.SENSU_EVENT_BATCH_SIZE", 3
+    ), mock.patch(
+        # check services one at a time so they finish in a known order
+        "paasta_tools.check_autoscaler_max_instances.MAX_CONCURRENT_SERVICES",
+        1,
+    ):
+        with pytest.raises(Exception, match="oh no"):
+            await check_autoscaler_max_instances.check_max_instances(
+                soa_dir="/fake/soa/dir",
+                cluster="fake_cluster",
+                instance_type_class=KubernetesDeploymentConfig,
+                system_paasta_config=mock.Mock(),
+            )
+
+    # a full batch is sent as soon as it fills, and the partial batch checked
+    # before the failure is still sent
+    assert [call.args[0] for call in mock_send_events.call_args_list] == [
+        ["a-0", "a-1", "b-0", "b-1"],
+        ["c-0", "c-1"],
+    ]
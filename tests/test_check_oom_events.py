@@ -1,13 +1,18 @@
+import json
 import time
 from unittest import mock
 
 import pytest
 from pysensu_yelp import Status
 
+from paasta_tools.check_oom_events import OOMEventsWindow
 from paasta_tools.check_oom_events import compose_sensu_status
 from paasta_tools.check_oom_events import latest_oom_events
+from paasta_tools.check_oom_events import load_oom_events_window
 from paasta_tools.check_oom_events import main
+from paasta_tools.check_oom_events import read_new_oom_events
 from paasta_tools.check_oom_events import read_oom_events_from_scribe
+from paasta_tools.check_oom_events import save_oom_events_window
 
 
 @pytest.fixture(autouse=True)
@@ -192,3 +197,100 @@ def test_main(
         superregion="some_superregion",
         interval=180,
     )
+
+
+def test_oom_events_window_does_not_double_count(scribereader_output):
+    events = [json.loads(line) for line in scribereader_output[:-1]]
+    window = OOMEventsWindow()
+    # the first two events are two processes killed in the same container
+    assert read_new_oom_events(window, iter(events)) == 3
+    # a second run over the same stream has nothing new to add
+    assert read_new_oom_events(window, iter(events)) == 0
+
+    start_timestamp = int(time.time()) - 60
+    assert window.victims(start_timestamp) == {
+        ("fake_service1", "fake_instance1"): {"baaab5a3a9fa"},
+        ("fake_service2", "fake_instance2"): {"8dc8b9aeebbe", "7dc8b9ffffff"},
+    }
+    assert window.last_timestamp == events[-1]["timestamp"]
+
+
+def test_read_new_oom_events_out_of_order(scribereader_output):
+    events = [json.loads(line) for line in scribereader_output[:-1]]
+    window = OOMEventsWindow()
+    read_new_oom_events(window, iter(events[3:]))
+    # written to the stream after the newest event we've seen, but older
+    assert read_new_oom_events(window, iter(events[:3])) == 2
+
+    start_timestamp = int(time.time()) - 60
+    assert window.victims(start_timestamp) == {
+        ("fake_service1", "fake_instance1"): {"baaab5a3a9fa"},
+        ("fake_service2", "fake_instance2"): {"8dc8b9aeebbe", "7dc8b9ffffff"},
+    }
+    assert window.last_timestamp == events[3]["timestamp"]
+
+
+def test_read_new_oom_events_skips_expired_events(scribereader_output):
+    events = [json.loads(line) for line in scribereader_output[:-1]]
+    window = OOMEventsWindow()
+    assert read_new_oom_events(window, iter(events), events[2]["timestamp"]) == 1
+    assert list(window.containers) == [("fake_service2", "fake_instance2")]
+
+
+def test_oom_events_window_expire(scribereader_output):
+    window = OOMEventsWindow()
+    for line in scribereader_output[:-1]:
+        window.add(json.loads(line))
+
+    # only the last event happened less than 15 seconds ago
+    window.expire(int(time.time()) - 15)
+    assert window.containers == {
+        ("fake_service2", "fake_instance2"): {
+            "7dc8b9ffffff": json.loads(scribereader_output[3])["timestamp"]
+        },
+    }
+
+
+def test_oom_events_window_checkpoint_roundtrip(tmp_path, scribereader_output):
+    path = str(tmp_path / "checkpoint.json")
+    assert load_oom_events_window(path).containers == {}
+
+    window = OOMEventsWindow()
+    for line in scribereader_output[:-1]:
+        window.add(json.loads(line))
+    save_oom_events_window(path, window)
+
+    loaded = load_oom_events_window(path)
+    assert loaded.containers == window.containers
+    assert loaded.last_timestamp == window.last_timestamp
+
+
+@mock.patch("paasta_tools.check_oom_events.get_services_for_cluster", autospec=True)
+@mock.patch("paasta_tools.check_oom_events.send_sensu_event", autospec=True)
+@mock.patch("paasta_tools.check_oom_events.get_instance_config", autospec=True)
+def test_main_with_checkpoint(
+    mock_get_instance_config,
+    mock_send_sensu_event,
+    mock_get_services_for_cluster,
+    mock_scribereader,
+    scribereader_output,
+    tmp_path,
+):
+    mock_scribereader.get_tail_host_and_port.return_value = "localhost", 12345
+    mock_get_services_for_cluster.return_value = [
+        ("fake_service1", "fake_instance1"),
+    ]
+    checkpoint = str(tmp_path / "checkpoint.json")
+    argv = ["", "-s", "some_superregion", "--checkpoint", checkpoint]
+
+    mock_scribereader.get_stream_tailer.return_value = scribereader_output
+    main(argv)
+    # the event has scrolled out of the stream by the next run, but is still
+    # within the check interval
+    mock_scribereader.get_stream_tailer.return_value = ()
+    main(argv)
+
+    assert [call[0][1] for call in mock_send_sensu_event.call_args_list] == [
+        {"baaab5a3a9fa"},
+        {"baaab5a3a9fa"},
+    ]
@@ -110,3 +110,39 @@ def test_check_services_replication():
         )
         assert count_under_replicated == 0
         assert total == 1
+
+
+def test_check_services_replication_only_loads_requested_services():
+    instance_config = mock.Mock(instance="main")
+    instance_config.get_docker_image.return_value = True
+    with mock.patch(
+        "paasta_tools.check_services_replication_tools.list_services",
+        autospec=True,
+    ) as mock_list_services, mock.patch(
+        "paasta_tools.check_services_replication_tools.PaastaServiceConfigLoader",
+        autospec=True,
+    ) as mock_paasta_service_config_loader:
+        mock_paasta_service_config_loader.return_value.instance_configs.return_value = [
+            instance_config
+        ]
+        mock_check_service_replication = mock.Mock(return_value=False)
+
+        (
+            count_under_replicated,
+            total,
+        ) = check_services_replication_tools.check_services_replication(
+            soa_dir="anw",
+            cluster="westeros-prod",
+            service_instances=["a.main"],
+            instance_type_class=None,
+            check_service_replication=mock_check_service_replication,
+            replication_checker=mock.Mock(),
+            pods_by_service_instance={},
+            dry_run=True,
+        )
+        assert not mock_list_services.called
+        mock_paasta_service_config_loader.assert_called_once_with(
+            service="a", soa_dir="anw"
+        )
+        assert count_under_replicated == 1
+        assert total == 1
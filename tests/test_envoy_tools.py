@@ -18,6 +18,7 @@ from unittest import mock
 import pytest
 import requests
 
+from paasta_tools import envoy_tools
 from paasta_tools.envoy_tools import are_namespaces_up_in_eds
 from paasta_tools.envoy_tools import are_services_up_in_pod
 from paasta_tools.envoy_tools import get_backends
@@ -26,6 +27,13 @@ from paasta_tools.envoy_tools import get_casper_endpoints
 from paasta_tools.envoy_tools import match_backends_and_pods
 
 
+@pytest.fixture(autouse=True)
+def clear_envoy_clusters_snapshot_cache():
+    envoy_tools.get_envoy_clusters_snapshot.cache_clear()
+    yield
+    envoy_tools.get_envoy_clusters_snapshot.cache_clear()
+
+
 def test_get_backends():
     testdir = os.path.dirname(os.path.realpath(__file__))
     testdata = os.path.join(testdir, "envoy_admin_clusters_snapshot.txt")
@@ -75,6 +83,35 @@ def test_get_backends():
             assert expected == get_backends("service1.main", "host", 123, "something")
 
 
+def test_get_backends_reuses_clusters_snapshot():
+    testdir = os.path.dirname(os.path.realpath(__file__))
+    testdata = os.path.join(testdir, "envoy_admin_clusters_snapshot.txt")
+    with open(testdata, "r") as fd:
+        mock_envoy_admin_clusters_data = json.load(fd)
+
+    mock_response = mock.Mock()
+    mock_response.json.return_value = mock_envoy_admin_clusters_data
+    mock_get = mock.Mock(return_value=(mock_response))
+
+    with mock.patch.object(requests.Session, "get", mock_get):
+        first = envoy_tools.get_multiple_backends(
+            ["service1.main"], "host", 123, "something", resolve_hostnames=False
+        )
+        first["service1.main"][0][0]["has_associated_task"] = True
+        second = envoy_tools.get_multiple_backends(
+            ["service1.main"], "host", 123, "something", resolve_hostnames=False
+        )
+        all_backends = envoy_tools.get_multiple_backends(
+            None, "host", 123, "something", resolve_hostnames=False
+        )
+
+    assert mock_get.call_count == 1
+    assert "has_associated_task" not in second["service1.main"][0][0]
+    assert [b for b, _ in second["service1.main"]] == [
+        b for b, _ in all_backends["service1.main"]
+    ]
+
+
 def test_get_casper_endpoints():
     testdir = os.path.dirname(os.path.realpath(__file__))
     testdata = os.path.join(testdir, "envoy_admin_clusters_snapshot.txt")
@@ -308,6 +308,12 @@ class TestKubernetesDeploymentConfig:
         ) as m:
             yield m
 
+    @pytest.fixture(autouse=True)
+    def clear_hpa_spec_cache(self):
+        kubernetes_tools._hpa_spec_cache.clear()
+        yield
+        kubernetes_tools._hpa_spec_cache.clear()
+
     def setup_method(self, method):
         mock_config_dict = KubernetesDeploymentConfigDict(
             bounce_method="crossover",
@@ -3315,6 +3321,81 @@ class TestKubernetesDeploymentConfig:
         expected_res = None
         assert expected_res == return_value
 
+    def test_get_autoscaling_metric_spec_cached(self):
+        def make_config(setpoint):
+            return KubernetesDeploymentConfig(
+                service="service",
+                cluster="cluster",
+                instance="instance",
+                config_dict=KubernetesDeploymentConfigDict(
+                    {
+                        "min_instances": 1,
+                        "max_instances": 3,
+                        "autoscaling": {
+                            "metrics_providers": [
+                                {"type": METRICS_PROVIDER_CPU, "setpoint": setpoint}
+                            ]
+                        },
+                    }
+                ),
+                branch_dict=None,
+            )
+
+        def get_spec(config, **kwargs):
+            return config.get_autoscaling_metric_spec(
+                "fake_name", "cluster", KubeClient(), "paasta", **kwargs
+            )
+
+        with mock.patch.object(
+            KubernetesDeploymentConfig,
+            "_build_autoscaling_metric_spec",
+            autospec=True,
+            side_effect=KubernetesDeploymentConfig._build_autoscaling_metric_spec,
+        ) as mock_build:
+            hpa = get_spec(make_config(0.5))
+            # a different config object for the same instance and config
+            assert get_spec(make_config(0.5)) is hpa
+            assert mock_build.call_count == 1
+
+            # anything the HPA depends on changing builds a new one
+            assert (
+                get_spec(make_config(0.6)).spec.metrics[0].resource.target
+                != hpa.spec.metrics[0].resource.target
+            )
+            assert get_spec(make_config(0.5), max_instances_override=5) is not hpa
+            assert mock_build.call_count == 3
+
+    def test_get_autoscaling_metric_spec_cache_bounded(self):
+        with mock.patch(
+            "paasta_tools.kubernetes_tools.HPA_SPEC_CACHE_MAX_SIZE", 2
+        ), mock.patch.object(
+            KubernetesDeploymentConfig,
+            "_build_autoscaling_metric_spec",
+            autospec=True,
+        ) as mock_build:
+            config = KubernetesDeploymentConfig(
+                service="service",
+                cluster="cluster",
+                instance="instance",
+                config_dict=KubernetesDeploymentConfigDict(
+                    {"min_instances": 1, "max_instances": 3}
+                ),
+                branch_dict=None,
+            )
+            for name in ["a", "b", "a", "c", "a", "b"]:
+                config.get_autoscaling_metric_spec(
+                    name, "cluster", KubeClient(), "paasta"
+                )
+
+        # "a" is used the most recently, so it's "b" that makes room for "c"
+        assert [call.args[1] for call in mock_build.call_args_list] == [
+            "a",
+            "b",
+            "c",
+            "b",
+        ]
+        assert len(kubernetes_tools._hpa_spec_cache) == 2
+
     @pytest.mark.parametrize(
         "target_type,expected_target_type,expected_target_field",
         [
@@ -4137,6 +4218,40 @@ def test_get_tail_lines_for_kubernetes_container(
     ]
 
 
+def test_get_tail_lines_for_kubernetes_container_async_client(event_loop):
+    kube_client = mock.MagicMock()
+    mock_async_client = mock.Mock(get_text=mock.AsyncMock(return_value="a\nb"))
+    container = mock.MagicMock()
+    container.name = "my--container"
+    container.state.waiting = None
+    container.state.terminated = None
+    pod = mock.MagicMock()
+    pod.metadata.name = "my--pod"
+    pod.metadata.namespace = "my_namespace"
+
+    with mock.patch(
+        "paasta_tools.kubernetes_tools.get_async_kube_client",
+        autospec=True,
+        return_value=mock_async_client,
+    ):
+        tail_lines = event_loop.run_until_complete(
+            kubernetes_tools.get_tail_lines_for_kubernetes_container(
+                kube_client=kube_client,
+                pod=pod,
+                container=container,
+                num_tail_lines=10,
+                previous=True,
+            ),
+        )
+
+    assert tail_lines == {"stdout": ["a", "b"], "stderr": [], "error_message": ""}
+    mock_async_client.get_text.assert_called_once_with(
+        "/api/v1/namespaces/my_namespace/pods/my--pod/log",
+        params={"container": "my--container", "tailLines": 10, "previous": "true"},
+    )
+    assert not kube_client.core.read_namespaced_pod_log.called
+
+
 @pytest.mark.parametrize("messages_num", [3, 0])
 def test_get_pod_event_messages(messages_num, event_loop):
     pod = mock.MagicMock()
@@ -4567,6 +4682,40 @@ async def test_pods_for_service_instance():
     )
 
 
+@pytest.mark.asyncio
+async def test_pods_for_service_instance_async_client():
+    mock_client = mock.Mock()
+    mock_async_client = mock.Mock(get_object=mock.AsyncMock())
+    with mock.patch(
+        "paasta_tools.kubernetes_tools.get_async_kube_client",
+        autospec=True,
+        return_value=mock_async_client,
+    ):
+        assert (
+            await pods_for_service_instance(
+                "kurupt", "fm", mock_client, namespace="paasta"
+            )
+            == mock_async_client.get_object.return_value.items
+        )
+    mock_async_client.get_object.assert_called_once_with(
+        "/api/v1/namespaces/paasta/pods",
+        "V1PodList",
+        params={
+            "labelSelector": "paasta.yelp.com/service=kurupt,paasta.yelp.com/instance=fm"
+        },
+    )
+    assert not mock_client.core.list_namespaced_pod.called
+
+
+def test_get_async_kube_client():
+    kube_client = mock.Mock()
+    assert kubernetes_tools.get_async_kube_client(kube_client) is None
+    async_client = mock.Mock()
+    kubernetes_tools.set_async_kube_client(kube_client, async_client)
+    assert kubernetes_tools.get_async_kube_client(kube_client) is async_client
+    assert kubernetes_tools.get_async_kube_client(mock.Mock()) is None
+
+
 def test_get_active_versions_for_service():
     mock_pod_list = [
         mock.Mock(
@@ -0,0 +1,33 @@
+import sys
+
+import pytest
+
+from paasta_tools.lazy_imports import lazy_import
+
+
+def test_lazy_import_defers_module_body(tmp_path, monkeypatch):
+    (tmp_path / "paasta_lazy_fixture.py").write_text(
+        "import builtins\nbuiltins.paasta_lazy_fixture_loaded = True\nVALUE = 42\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "paasta_lazy_fixture", raising=False)
+    import builtins
+
+    module = lazy_import("paasta_lazy_fixture")
+    try:
+        assert not hasattr(builtins, "paasta_lazy_fixture_loaded")
+        assert module.VALUE == 42
+        assert builtins.paasta_lazy_fixture_loaded
+    finally:
+        sys.modules.pop("paasta_lazy_fixture", None)
+        if hasattr(builtins, "paasta_lazy_fixture_loaded"):
+            del builtins.paasta_lazy_fixture_loaded
+
+
+def test_lazy_import_reuses_imported_module():
+    assert lazy_import("json") is sys.modules["json"]
+
+
+def test_lazy_import_missing_module():
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("paasta_tools_this_module_does_not_exist")
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import json
+import threading
 from unittest.mock import MagicMock
 from unittest.mock import Mock
 from unittest.mock import patch
@@ -19,7 +20,9 @@ from unittest.mock import patch
 import pytest
 
 from paasta_tools.oom_logger import LogLine
+from paasta_tools.oom_logger import QueuedSink
 from paasta_tools.oom_logger import capture_oom_events_from_stdin
+from paasta_tools.oom_logger import get_instance_pool
 from paasta_tools.oom_logger import log_to_clog
 from paasta_tools.oom_logger import main
 from paasta_tools.oom_logger import send_sfx_event
@@ -410,6 +413,7 @@ def test_log_to_clog(mock_clog, log_line):
 
 @patch("paasta_tools.oom_logger.get_instance_config", autospec=True)
 def test_send_sfx_event(mock_get_instance_config):
+    get_instance_pool.cache_clear()
     service = "foo"
     instance = "bar"
     cluster = "baz"
@@ -529,3 +533,60 @@ def test_main_containerd(
     mock_send_sfx_event.assert_called_once_with(
         "fake_service", "fake_instance", "fake_cluster"
     )
+
+
+@patch("paasta_tools.oom_logger.sys.stdin", autospec=True)
+@patch(
+    "paasta_tools.oom_logger.clog"
+)  # we don't autospec here since there's some funky stuff going on with attribute access
+@patch("paasta_tools.oom_logger.send_sfx_event", autospec=True)
+@patch("paasta_tools.oom_logger.load_system_paasta_config", autospec=True)
+@patch("paasta_tools.oom_logger.log_to_clog", autospec=True)
+@patch("paasta_tools.oom_logger.log_to_paasta", autospec=True)
+@patch("paasta_tools.oom_logger.get_docker_client", autospec=True)
+@patch("paasta_tools.oom_logger.parse_args", autospec=True)
+def test_main_caches_container_lookups(
+    mock_parse_args,
+    mock_get_docker_client,
+    mock_log_to_paasta,
+    mock_log_to_clog,
+    mock_load_system_paasta_config,
+    mock_send_sfx_event,
+    mock_clog,
+    mock_sys_stdin,
+    sys_stdin,
+    docker_inspect,
+):
+    mock_sys_stdin.readline.side_effect = sys_stdin[:-1] + sys_stdin[-1:] * 3 + [""]
+    mock_parse_args.return_value.containerd = False
+    docker_client = Mock(inspect_container=Mock(return_value=docker_inspect))
+    mock_get_docker_client.return_value = docker_client
+
+    main()
+    assert docker_client.inspect_container.call_count == 1
+    assert mock_log_to_clog.call_count == 3
+    assert mock_log_to_paasta.call_count == 3
+    assert mock_send_sfx_event.call_count == 3
+
+
+def test_queued_sink_drops_when_full(log_line):
+    started = threading.Event()
+    unblock = threading.Event()
+    sent = []
+
+    def slow_sink(line):
+        started.set()
+        unblock.wait()
+        sent.append(line)
+
+    sink = QueuedSink("test", slow_sink, maxsize=2)
+    sink.put(log_line)
+    # wait for the sink to be busy with the first event, then fill up the queue
+    assert started.wait(timeout=5)
+    for _ in range(3):
+        sink.put(log_line)
+    unblock.set()
+    sink.close()
+
+    assert sink.dropped == 1
+    assert sent == [log_line] * 3
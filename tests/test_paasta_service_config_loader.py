@@ -13,11 +13,15 @@
 # limitations under the License.
 from unittest.mock import patch
 
+from pytest import raises
+
 from paasta_tools.adhoc_tools import AdhocJobConfig
 from paasta_tools.adhoc_tools import load_adhoc_job_config
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
 from paasta_tools.utils import DeploymentsJsonV2
+from paasta_tools.utils import NoConfigurationForServiceError
+from paasta_tools.utils import NoDeploymentsAvailable
 
 TEST_SERVICE_NAME = "example_happyhour"
 TEST_SOA_DIR = "fake_soa_dir"
@@ -333,3 +337,32 @@ def test_old_and_new_ways_load_the_same_adhoc_configs(
         ),
     ]
     assert list(s.instance_configs(TEST_CLUSTER_NAME, AdhocJobConfig)) == expected
+
+
+@patch(
+    "paasta_tools.paasta_service_config_loader.load_v2_deployments_json", autospec=True
+)
+@patch(
+    "paasta_tools.paasta_service_config_loader.load_service_instance_configs",
+    autospec=True,
+)
+def test_kubernetes_instance_config(
+    mock_load_service_instance_configs, mock_load_deployments_json
+):
+    mock_load_service_instance_configs.return_value = kubernetes_cluster_config()
+    mock_load_deployments_json.return_value = deployment_json()
+    s = create_test_service()
+
+    main = s.instance_config(TEST_CLUSTER_NAME, "main", KubernetesDeploymentConfig)
+    canary = s.instance_config(TEST_CLUSTER_NAME, "canary", KubernetesDeploymentConfig)
+    assert main.get_instance() == "main"
+    assert canary.get_deploy_group() == f"{TEST_CLUSTER_NAME}.canary"
+    assert canary.get_docker_image() == "some_image"
+    with raises(NoDeploymentsAvailable):
+        s.instance_config(TEST_CLUSTER_NAME, "not_deployed", KubernetesDeploymentConfig)
+    with raises(NoConfigurationForServiceError):
+        s.instance_config(TEST_CLUSTER_NAME, "missing", KubernetesDeploymentConfig)
+
+    # the service's files were only read once
+    assert mock_load_service_instance_configs.call_count == 1
+    assert mock_load_deployments_json.call_count == 1
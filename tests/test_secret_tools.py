@@ -258,10 +258,10 @@ def test_decrypt_secret_volumes_multiple_files(mock_get_secret_provider):
             ],
         )
     ]
-    mock_secret_provider.decrypt_secret_raw.side_effect = [
-        "the_secret_contents1",
-        "the_secret_contents2",
-    ]
+    mock_secret_provider.decrypt_secrets_raw.return_value = {
+        "the_secret_name1": "the_secret_contents1",
+        "the_secret_name2": "the_secret_contents2",
+    }
     ret = decrypt_secret_volumes(
         secret_provider_name="vault",
         secret_volumes_config=mock_secret_volumes_config,
@@ -274,6 +274,16 @@ def test_decrypt_secret_volumes_multiple_files(mock_get_secret_provider):
         "/the/container/path/the_secret_filename1": "the_secret_contents1",
         "/the/container/path/the_secret_filename2": "the_secret_contents2",
     }
+    mock_get_secret_provider.assert_called_once_with(
+        secret_provider_name="vault",
+        soa_dir="/nail/blah",
+        service_name="universe",
+        cluster_names=["mesosstage"],
+        secret_provider_kwargs={"some": "config", "vault_num_uses": 2},
+    )
+    mock_secret_provider.decrypt_secrets_raw.assert_called_once_with(
+        {"the_secret_name1", "the_secret_name2"}
+    )
 
 
 @mock.patch("paasta_tools.secret_tools.get_secret_provider", autospec=True)
@@ -287,7 +297,9 @@ def test_decrypt_secret_volumes_single_file(mock_get_secret_provider):
             secret_name="the_secret_name",
         )
     ]
-    mock_secret_provider.decrypt_secret_raw.side_effect = ["the_secret_contents"]
+    mock_secret_provider.decrypt_secrets_raw.return_value = {
+        "the_secret_name": "the_secret_contents"
+    }
     ret = decrypt_secret_volumes(
         secret_provider_name="vault",
         secret_volumes_config=mock_secret_volumes_config,
@@ -301,6 +313,22 @@ def test_decrypt_secret_volumes_single_file(mock_get_secret_provider):
     }
 
 
+@mock.patch("paasta_tools.secret_tools.get_secret_provider", autospec=True)
+def test_decrypt_secret_volumes_none(mock_get_secret_provider):
+    assert (
+        decrypt_secret_volumes(
+            secret_provider_name="vault",
+            secret_volumes_config=[],
+            soa_dir="/nail/blah",
+            service_name="universe",
+            cluster_name="mesosstage",
+            secret_provider_kwargs={"some": "config"},
+        )
+        == {}
+    )
+    assert mock_get_secret_provider.call_count == 0
+
+
 @mock.patch("paasta_tools.secret_tools.get_secret_provider", autospec=True)
 def test_decrypt_secret_decode_true(mock_get_secret_provider):
     mock_secret_provider = mock.Mock()
@@ -17,6 +17,7 @@ import pytest
 
 from paasta_tools import setup_kubernetes_cr
 from paasta_tools.kubernetes_tools import KubeCustomResource
+from paasta_tools.utils import NoDeploymentsAvailable
 from paasta_tools.utils import SystemPaastaConfig
 
 
@@ -231,6 +232,7 @@ def test_setup_custom_resources():
         mock_client = mock.Mock()
         mock_kind = mock.Mock()
         mock_crd = mock.Mock()
+        mock_list_cr.return_value = []
         assert setup_kubernetes_cr.setup_custom_resources(
             kube_client=mock_client,
             kind=mock_kind,
@@ -271,7 +273,7 @@ def test_setup_custom_resources():
                     cluster="mycluster",
                     instance=None,
                     kind=mock_kind,
-                    custom_resources=mock_list_cr.return_value,
+                    custom_resources={},
                     version="v1",
                     group="yelp.com",
                     crd=mock_crd,
@@ -283,15 +285,36 @@ def test_setup_custom_resources():
                     cluster="mycluster",
                     instance=None,
                     kind=mock_kind,
-                    custom_resources=mock_list_cr.return_value,
+                    custom_resources={},
                     version="v1",
                     group="yelp.com",
                     crd=mock_crd,
                 ),
-            ]
+            ],
+            # services are reconciled concurrently
+            any_order=True,
         )
 
 
+def test_index_custom_resources():
+    custom_resources = [
+        KubeCustomResource(
+            service="kurupt",
+            instance=instance,
+            config_sha="conf123",
+            git_sha="git123",
+            kind="flink",
+            name=f"kurupt-{instance}",
+            namespace="paasta-flinks",
+        )
+        for instance in ("fm", "am")
+    ]
+    assert setup_kubernetes_cr.index_custom_resources(custom_resources) == {
+        ("kurupt", "fm", "flink"): custom_resources[0],
+        ("kurupt", "am", "flink"): custom_resources[1],
+    }
+
+
 def test_format_custom_resource():
     with mock.patch(
         "paasta_tools.setup_kubernetes_cr.get_config_hash", autospec=True
@@ -366,29 +389,37 @@ def test_paasta_config_flink_dashboard_base_url():
 
 
 @mock.patch(
-    "paasta_tools.setup_kubernetes_cr.LONG_RUNNING_INSTANCE_TYPE_HANDLERS",
+    "paasta_tools.setup_kubernetes_cr.service_configuration_lib.read_service_configuration",
     autospec=True,
+    return_value={"docker_registry": "registry.example.com"},
 )
-def test_reconcile_kubernetes_resource(mock_LONG_RUNNING_INSTANCE_TYPE_HANDLERS):
+def test_reconcile_kubernetes_resource(mock_read_service_configuration):
     with mock.patch(
         "paasta_tools.setup_kubernetes_cr.format_custom_resource", autospec=True
     ) as mock_format_custom_resource, mock.patch(
         "paasta_tools.setup_kubernetes_cr.create_custom_resource", autospec=True
     ) as mock_create_custom_resource, mock.patch(
         "paasta_tools.setup_kubernetes_cr.update_custom_resource", autospec=True
-    ) as mock_update_custom_resource:
+    ) as mock_update_custom_resource, mock.patch(
+        "paasta_tools.setup_kubernetes_cr.load_v2_deployments_json", autospec=True
+    ) as mock_load_v2_deployments_json:
+        mock_load_v2_deployments_json.return_value.get_branch_dict.return_value = {
+            "docker_image": "services-mc:paasta-abc123"
+        }
         mock_kind = mock.Mock(singular="flink", plural="flinks")
-        mock_custom_resources = [
-            KubeCustomResource(
-                service="kurupt",
-                instance="fm",
-                config_sha="conf123",
-                git_sha="git123",
-                kind="flink",
-                name="foo",
-                namespace="paasta-flinks",
-            )
-        ]
+        mock_custom_resources = setup_kubernetes_cr.index_custom_resources(
+            [
+                KubeCustomResource(
+                    service="kurupt",
+                    instance="fm",
+                    config_sha="conf123",
+                    git_sha="git123",
+                    kind="flink",
+                    name="foo",
+                    namespace="paasta-flinks",
+                )
+            ]
+        )
         mock_client = mock.Mock()
         # no instances, do nothing
         assert setup_kubernetes_cr.reconcile_kubernetes_resource(
@@ -500,3 +531,80 @@ def test_reconcile_kubernetes_resource(mock_LONG_RUNNING_INSTANCE_TYPE_HANDLERS)
             formatted_resource=mock_format_custom_resource.return_value,
             group="yelp.com",
         )
+
+        # deployments.json is read once per service, not once per instance
+        mock_load_v2_deployments_json.reset_mock()
+        mock_create_custom_resource.reset_mock()
+        mock_create_custom_resource.side_effect = None
+        assert setup_kubernetes_cr.reconcile_kubernetes_resource(
+            kube_client=mock_client,
+            service="mc",
+            instance_configs={"grindah": {"some": "conf"}, "ren": {"some": "conf"}},
+            cluster="mycluster",
+            custom_resources=mock_custom_resources,
+            kind=mock_kind,
+            version="v1",
+            group="yelp.com",
+            crd=mock.Mock(),
+        )
+        assert mock_load_v2_deployments_json.call_count == 1
+        assert mock_create_custom_resource.call_count == 2
+        assert mock_format_custom_resource.call_args[1]["git_sha"] == "abc123"
+
+        # no deployments for the service, skip all of its instances
+        mock_create_custom_resource.reset_mock()
+        mock_load_v2_deployments_json.side_effect = NoDeploymentsAvailable
+        assert setup_kubernetes_cr.reconcile_kubernetes_resource(
+            kube_client=mock_client,
+            service="mc",
+            instance_configs={"grindah": {"some": "conf"}, "ren": {"some": "conf"}},
+            cluster="mycluster",
+            custom_resources=mock_custom_resources,
+            kind=mock_kind,
+            version="v1",
+            group="yelp.com",
+            crd=mock.Mock(),
+        )
+        assert not mock_create_custom_resource.called
+
+        # one of the instances isn't deployed yet, skip it but set up the others
+        mock_create_custom_resource.reset_mock()
+        mock_format_custom_resource.reset_mock()
+        mock_load_v2_deployments_json.side_effect = None
+        mock_load_v2_deployments_json.return_value.get_branch_dict.side_effect = [
+            NoDeploymentsAvailable,
+            {"docker_image": "services-mc:paasta-abc123"},
+        ]
+        assert setup_kubernetes_cr.reconcile_kubernetes_resource(
+            kube_client=mock_client,
+            service="mc",
+            instance_configs={"grindah": {"some": "conf"}, "ren": {"some": "conf"}},
+            cluster="mycluster",
+            custom_resources=mock_custom_resources,
+            kind=mock_kind,
+            version="v1",
+            group="yelp.com",
+            crd=mock.Mock(),
+        )
+        assert [
+            call[1]["instance"] for call in mock_format_custom_resource.call_args_list
+        ] == ["ren"]
+        assert mock_create_custom_resource.call_count == 1
+
+        # deployments.json can't be read, fail the service without setting anything up
+        mock_create_custom_resource.reset_mock()
+        mock_update_custom_resource.reset_mock()
+        mock_load_v2_deployments_json.side_effect = IOError("deployments.json")
+        assert not setup_kubernetes_cr.reconcile_kubernetes_resource(
+            kube_client=mock_client,
+            service="mc",
+            instance_configs={"grindah": {"some": "conf"}, "ren": {"some": "conf"}},
+            cluster="mycluster",
+            custom_resources=mock_custom_resources,
+            kind=mock_kind,
+            version="v1",
+            group="yelp.com",
+            crd=mock.Mock(),
+        )
+        assert not mock_create_custom_resource.called
+        assert not mock_update_custom_resource.called
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -188,18 +189,16 @@ def test_main_invalid_job_name():
 
 def test_get_kubernetes_deployment_config():
     with mock.patch(
-        "paasta_tools.setup_kubernetes_job.load_kubernetes_service_config_no_cache",
+        "paasta_tools.setup_kubernetes_job.PaastaServiceConfigLoader.instance_config",
         autospec=True,
-    ) as mock_load_kubernetes_service_config_no_cache:
+    ) as mock_instance_config:
 
         mock_get_service_instances_with_valid_names = [
             ("kurupt", "instance", None, None)
         ]
 
         # Testing NoDeploymentsAvailable exception
-        mock_load_kubernetes_service_config_no_cache.side_effect = (
-            NoDeploymentsAvailable
-        )
+        mock_instance_config.side_effect = NoDeploymentsAvailable
         ret = get_kubernetes_deployment_config(
             service_instances_with_valid_names=mock_get_service_instances_with_valid_names,
             cluster="fake_cluster",
@@ -208,9 +207,7 @@ def test_get_kubernetes_deployment_config():
         assert ret == [(True, None)]
 
         # Testing NoConfigurationForServiceError exception
-        mock_load_kubernetes_service_config_no_cache.side_effect = (
-            NoConfigurationForServiceError
-        )
+        mock_instance_config.side_effect = NoConfigurationForServiceError
 
         ret = get_kubernetes_deployment_config(
             service_instances_with_valid_names=mock_get_service_instances_with_valid_names,
@@ -228,8 +225,8 @@ def test_get_kubernetes_deployment_config():
             config_dict=KubernetesDeploymentConfigDict(),
             branch_dict=None,
         )
-        mock_load_kubernetes_service_config_no_cache.side_effect = None
-        mock_load_kubernetes_service_config_no_cache.return_value = mock_kube_deploy
+        mock_instance_config.side_effect = None
+        mock_instance_config.return_value = mock_kube_deploy
         ret = get_kubernetes_deployment_config(
             service_instances_with_valid_names=mock_get_service_instances_with_valid_names,
             cluster="fake_cluster",
@@ -251,18 +248,88 @@ def test_get_kubernetes_deployment_config():
         ]
 
 
+@mock.patch(
+    "paasta_tools.setup_kubernetes_job.PaastaServiceConfigLoader", autospec=True
+)
+def test_get_kubernetes_deployment_config_groups_by_service(mock_loader):
+    def instance_config(cluster, instance, config_class):
+        if instance == "missing":
+            raise NoConfigurationForServiceError
+        return (cluster, instance, config_class)
+
+    mock_loader.return_value.instance_config.side_effect = instance_config
+    ret = get_kubernetes_deployment_config(
+        service_instances_with_valid_names=[
+            ("b", "main", None, None),
+            ("a", "main", None, None),
+            ("b", "canary", None, None),
+            ("a", "missing", None, None),
+        ],
+        cluster="fake_cluster",
+        soa_dir="nail/blah",
+    )
+    assert ret == [
+        (True, ("fake_cluster", "main", KubernetesDeploymentConfig)),
+        (True, ("fake_cluster", "main", KubernetesDeploymentConfig)),
+        (True, ("fake_cluster", "canary", KubernetesDeploymentConfig)),
+        (False, None),
+    ]
+    # one loader, and hence one read of each file, per service
+    assert mock_loader.call_args_list == [
+        mock.call(service="a", soa_dir="nail/blah"),
+        mock.call(service="b", soa_dir="nail/blah"),
+    ]
+
+
+@mock.patch(
+    "paasta_tools.setup_kubernetes_job.ProcessPoolExecutor",
+    autospec=True,
+    side_effect=ThreadPoolExecutor,
+)
+@mock.patch(
+    "paasta_tools.setup_kubernetes_job.load_service_deployment_configs",
+    autospec=True,
+)
+def test_get_kubernetes_deployment_config_process_pool(
+    mock_load_service_deployment_configs, mock_process_pool_executor
+):
+    mock_load_service_deployment_configs.side_effect = (
+        lambda service, instances, *args: [(True, f"{service}.{i}") for i in instances]
+    )
+    service_instances = [
+        (f"service{i % 10}", f"instance{i}", None, None) for i in range(200)
+    ]
+    ret = get_kubernetes_deployment_config(
+        service_instances_with_valid_names=service_instances,
+        cluster="fake_cluster",
+        processes=4,
+    )
+    assert ret == [(True, f"{s}.{i}") for s, i, _, __ in service_instances]
+    mock_process_pool_executor.assert_called_once_with(max_workers=4)
+    assert mock_load_service_deployment_configs.call_count == 10
+
+    # small batches are loaded in-process
+    mock_process_pool_executor.reset_mock()
+    get_kubernetes_deployment_config(
+        service_instances_with_valid_names=service_instances[:10],
+        cluster="fake_cluster",
+        processes=4,
+    )
+    assert mock_process_pool_executor.call_count == 0
+
+
 def test_get_eks_deployment_config():
     with mock.patch(
-        "paasta_tools.setup_kubernetes_job.load_eks_service_config_no_cache",
+        "paasta_tools.setup_kubernetes_job.PaastaServiceConfigLoader.instance_config",
         autospec=True,
-    ) as mock_load_eks_service_config_no_cache:
+    ) as mock_instance_config:
 
         mock_get_service_instances_with_valid_names = [
             ("kurupt", "instance", None, None)
         ]
 
         # Testing NoDeploymentsAvailable exception
-        mock_load_eks_service_config_no_cache.side_effect = NoDeploymentsAvailable
+        mock_instance_config.side_effect = NoDeploymentsAvailable
         ret = get_kubernetes_deployment_config(
             service_instances_with_valid_names=mock_get_service_instances_with_valid_names,
             cluster="fake_cluster",
@@ -272,9 +339,7 @@ def test_get_eks_deployment_config():
         assert ret == [(True, None)]
 
         # Testing NoConfigurationForServiceError exception
-        mock_load_eks_service_config_no_cache.side_effect = (
-            NoConfigurationForServiceError
-        )
+        mock_instance_config.side_effect = NoConfigurationForServiceError
 
         ret = get_kubernetes_deployment_config(
             service_instances_with_valid_names=mock_get_service_instances_with_valid_names,
@@ -293,8 +358,8 @@ def test_get_eks_deployment_config():
             config_dict=KubernetesDeploymentConfigDict(),
             branch_dict=None,
         )
-        mock_load_eks_service_config_no_cache.side_effect = None
-        mock_load_eks_service_config_no_cache.return_value = mock_kube_deploy
+        mock_instance_config.side_effect = None
+        mock_instance_config.return_value = mock_kube_deploy
         ret = get_kubernetes_deployment_config(
             service_instances_with_valid_names=mock_get_service_instances_with_valid_names,
             cluster="fake_cluster",
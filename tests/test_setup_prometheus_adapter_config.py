@@ -1,3 +1,4 @@
+from pathlib import Path
 from unittest import mock
 
 import pytest
@@ -11,6 +12,9 @@ from paasta_tools.long_running_service_tools import METRICS_PROVIDER_MEMORY
 from paasta_tools.long_running_service_tools import METRICS_PROVIDER_UWSGI
 from paasta_tools.long_running_service_tools import METRICS_PROVIDER_UWSGI_V2
 from paasta_tools.long_running_service_tools import METRICS_PROVIDER_WORKER_LOAD
+from paasta_tools.setup_prometheus_adapter_config import PrometheusAdapterConfig
+from paasta_tools.setup_prometheus_adapter_config import PrometheusAdapterRule
+from paasta_tools.setup_prometheus_adapter_config import PrometheusAdapterRuleCache
 from paasta_tools.setup_prometheus_adapter_config import _minify_promql
 from paasta_tools.setup_prometheus_adapter_config import (
     create_instance_active_requests_scaling_rule,
@@ -30,6 +34,10 @@ from paasta_tools.setup_prometheus_adapter_config import (
 from paasta_tools.setup_prometheus_adapter_config import (
     create_instance_worker_load_scaling_rule,
 )
+from paasta_tools.setup_prometheus_adapter_config import (
+    create_prometheus_adapter_config,
+)
+from paasta_tools.setup_prometheus_adapter_config import diff_prometheus_adapter_configs
 from paasta_tools.setup_prometheus_adapter_config import get_rules_for_service_instance
 from paasta_tools.utils import SystemPaastaConfig
 
@@ -491,3 +499,112 @@ def test_create_instance_arbitrary_promql_scaling_rule_with_custom_resources():
         "metricsQuery": "foo",
         "seriesQuery": "bar",
     }
+
+
+def _make_instance_config(setpoint: float) -> KubernetesDeploymentConfig:
+    return KubernetesDeploymentConfig(
+        service="service",
+        cluster="cluster",
+        instance="instance",
+        config_dict={
+            "autoscaling": {
+                "metrics_providers": [
+                    {"type": METRICS_PROVIDER_UWSGI, "setpoint": setpoint}
+                ]
+            },
+        },
+        branch_dict=None,
+        soa_dir="/fake/soa",
+    )
+
+
+def test_prometheus_adapter_rule_cache(tmp_path: Path) -> None:
+    cache = PrometheusAdapterRuleCache()
+    with mock.patch(
+        "paasta_tools.setup_prometheus_adapter_config.get_rules_for_service_instance",
+        autospec=True,
+        side_effect=get_rules_for_service_instance,
+    ) as mock_get_rules:
+        rules = cache.get_rules_for_service_instance(
+            "service", _make_instance_config(0.5), "cluster"
+        )
+        assert len(rules) == 1
+        assert (
+            cache.get_rules_for_service_instance(
+                "service", _make_instance_config(0.5), "cluster"
+            )
+            == rules
+        )
+        assert mock_get_rules.call_count == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # a change to the autoscaling params invalidates the cached rules
+        new_rules = cache.get_rules_for_service_instance(
+            "service", _make_instance_config(0.7), "cluster"
+        )
+        assert new_rules != rules
+        assert mock_get_rules.call_count == 2
+
+        cache.entries["service.removed"] = ("digest", [])
+        cache.save(tmp_path / "rule_cache.json")
+        loaded_cache = PrometheusAdapterRuleCache.load(tmp_path / "rule_cache.json")
+        assert list(loaded_cache.entries) == ["service.instance"]
+        assert (
+            loaded_cache.get_rules_for_service_instance(
+                "service", _make_instance_config(0.7), "cluster"
+            )
+            == new_rules
+        )
+        assert mock_get_rules.call_count == 2
+
+
+def test_prometheus_adapter_rule_cache_load_missing_or_invalid(
+    tmp_path: Path,
+) -> None:
+    assert PrometheusAdapterRuleCache.load(tmp_path / "missing.json").entries == {}
+    (tmp_path / "invalid.json").write_text("{not json")
+    assert PrometheusAdapterRuleCache.load(tmp_path / "invalid.json").entries == {}
+
+
+def test_create_prometheus_adapter_config() -> None:
+    with mock.patch(
+        "paasta_tools.setup_prometheus_adapter_config.get_services_for_cluster",
+        autospec=True,
+        side_effect=[[("service", "instance")], [("service", "instance")]],
+    ), mock.patch(
+        "paasta_tools.setup_prometheus_adapter_config.load_service_instance_configs_for_adapter",
+        autospec=True,
+        return_value=[_make_instance_config(0.5)],
+    ) as mock_load_configs:
+        cache = PrometheusAdapterRuleCache()
+        config = create_prometheus_adapter_config(
+            paasta_cluster="cluster", soa_dir=Path("/fake/soa"), rule_cache=cache
+        )
+
+    mock_load_configs.assert_called_once_with("service", "cluster", Path("/fake/soa"))
+    assert [rule["name"]["as"] for rule in config["rules"]] == [
+        "service-instance-uwsgi-prom"
+    ]
+    assert cache.misses == 1
+
+
+def test_diff_prometheus_adapter_configs() -> None:
+    def rule(name: str, query: str) -> PrometheusAdapterRule:
+        return {
+            "name": {"as": name},
+            "seriesQuery": "series",
+            "resources": {"template": "kube_<<.Resource>>"},
+            "metricsQuery": query,
+        }
+
+    existing_config: PrometheusAdapterConfig = {
+        "rules": [rule("a", "q"), rule("b", "q"), rule("c", "q")]
+    }
+    desired_config: PrometheusAdapterConfig = {
+        "rules": [rule("a", "q"), rule("c", "changed"), rule("d", "q")]
+    }
+    assert diff_prometheus_adapter_configs(existing_config, desired_config) == (
+        ["d"],
+        ["b"],
+        ["c"],
+    )
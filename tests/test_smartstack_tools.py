@@ -26,6 +26,13 @@ from paasta_tools.smartstack_tools import match_backends_and_pods
 from paasta_tools.utils import DEFAULT_SYNAPSE_HAPROXY_URL_FORMAT
 
 
+@pytest.fixture(autouse=True)
+def clear_haproxy_backends_snapshot_cache():
+    smartstack_tools.get_haproxy_backends_snapshot.cache_clear()
+    yield
+    smartstack_tools.get_haproxy_backends_snapshot.cache_clear()
+
+
 def test_load_smartstack_info_for_service(system_paasta_config):
     with mock.patch(
         "paasta_tools.smartstack_tools.long_running_service_tools.load_service_namespace_config",
@@ -104,6 +111,34 @@ def test_get_replication_for_service():
         assert expected == replication_result
 
 
+def test_get_multiple_backends_reuses_haproxy_snapshot():
+    testdir = os.path.dirname(os.path.realpath(__file__))
+    testdata = os.path.join(testdir, "haproxy_snapshot.txt")
+    with open(testdata, "r") as fd:
+        mock_haproxy_data = fd.read()
+
+    mock_response = mock.Mock()
+    mock_response.text = mock_haproxy_data
+    mock_get = mock.Mock(return_value=(mock_response))
+
+    with mock.patch.object(requests.Session, "get", mock_get):
+        all_backends = smartstack_tools.get_multiple_backends(
+            None, "fake_host", 6666, DEFAULT_SYNAPSE_HAPROXY_URL_FORMAT
+        )
+        some_backends = smartstack_tools.get_multiple_backends(
+            ["service4", "service2"],
+            "fake_host",
+            6666,
+            DEFAULT_SYNAPSE_HAPROXY_URL_FORMAT,
+        )
+
+    assert mock_get.call_count == 1
+    assert all(b["svname"] not in ("FRONTEND", "BACKEND") for b in all_backends)
+    assert some_backends == [
+        b for b in all_backends if b["pxname"] in ("service4", "service2")
+    ]
+
+
 def test_backend_is_up():
     assert True is backend_is_up({"status": "UP"})
     assert True is backend_is_up({"status": "UP 1/2"})
@@ -354,6 +389,36 @@ def test_kube_get_allowed_locations_and_hosts(mock_kube_replication_checker):
         }
 
 
+def test_kube_get_allowed_locations_and_hosts_groups_nodes_once(
+    mock_kube_replication_checker,
+):
+    with mock.patch(
+        "paasta_tools.kubernetes_tools.load_service_namespace_config", autospec=True
+    ) as mock_load_service_namespace_config, mock.patch(
+        "paasta_tools.kubernetes_tools.get_nodes_grouped_by_attribute", autospec=True
+    ) as mock_get_nodes_grouped_by_attribute:
+        mock_load_service_namespace_config.return_value = mock.Mock(
+            get_discover=mock.Mock(return_value="region")
+        )
+        mock_get_nodes_grouped_by_attribute.return_value = {
+            "us-west-1": [
+                mock.MagicMock(
+                    metadata=mock.MagicMock(
+                        labels={"yelp.com/hostname": "foo1", "yelp.com/pool": "default"}
+                    )
+                )
+            ]
+        }
+        for instance in ("foo", "bar"):
+            ret = mock_kube_replication_checker.get_allowed_locations_and_hosts(
+                mock.Mock(service="blah", instance=instance, soa_dir="/nail/thing")
+            )
+            assert ret == {
+                "us-west-1": [DiscoveredHost(hostname="foo1", pool="default")]
+            }
+        assert mock_get_nodes_grouped_by_attribute.call_count == 1
+
+
 def test_get_allowed_locations_and_hosts(mock_replication_checker):
     mock_replication_checker.get_allowed_locations_and_hosts(
         instance_config=mock.Mock()
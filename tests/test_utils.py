@@ -1019,6 +1019,95 @@ def test_read_service_instance_names_tron():
         assert sorted(expected) == sorted(actual)
 
 
+@pytest.fixture
+def soa_dir_with_snapshot(tmp_path):
+    soa_dir = tmp_path / "soa"
+    service_dir = soa_dir / "fake_service"
+    service_dir.mkdir(parents=True)
+    (service_dir / "kubernetes-cluster1.yaml").write_text(
+        "main: {}\ncanary: {}\n_template: {}\n"
+    )
+    (service_dir / "tron-cluster2.yaml").write_text(
+        "job1:\n  actions:\n    actionA: {}\n"
+    )
+    (service_dir / "kubernetes-bogus.yaml").write_text("main: {}\n")
+    (service_dir / "slo-cluster1.yaml").write_text("{}\n")
+    (service_dir / "service.yaml").write_text("{}\n")
+    (soa_dir / "other_service").mkdir()
+    utils.SoaSnapshot.build(str(soa_dir)).save(
+        utils.get_soa_snapshot_path(str(soa_dir))
+    )
+    with mock.patch(
+        "paasta_tools.utils.load_system_paasta_config",
+        autospec=True,
+        return_value=SystemPaastaConfig(
+            {"clusters": ["cluster1", "cluster2"]}, str(soa_dir)
+        ),
+    ):
+        yield str(soa_dir)
+
+
+def test_soa_snapshot_answers_without_reading_yaml(soa_dir_with_snapshot):
+    with mock.patch(
+        "paasta_tools.utils.read_service_instance_names_from_disk", autospec=True
+    ) as mock_read_from_disk, mock.patch("glob.glob", autospec=True) as mock_glob:
+        assert utils.list_clusters(soa_dir=soa_dir_with_snapshot) == [
+            "cluster1",
+            "cluster2",
+        ]
+        assert utils.list_clusters(
+            "fake_service", soa_dir=soa_dir_with_snapshot, instance_type="tron"
+        ) == ["cluster2"]
+        assert utils.list_clusters("other_service", soa_dir_with_snapshot) == []
+        assert sorted(
+            utils.get_service_instance_list_no_cache(
+                "fake_service", "cluster1", soa_dir=soa_dir_with_snapshot
+            )
+        ) == [("fake_service", "canary"), ("fake_service", "main")]
+        assert utils.get_service_instance_list_no_cache(
+            "fake_service", "cluster2", "tron", soa_dir=soa_dir_with_snapshot
+        ) == [("fake_service", "job1.actionA")]
+        assert utils.get_files_of_type_in_dir(
+            "slo", "fake_service", soa_dir_with_snapshot
+        ) == [os.path.join(soa_dir_with_snapshot, "fake_service", "slo-cluster1.yaml")]
+    assert mock_read_from_disk.call_count == 0
+    assert mock_glob.call_count == 0
+
+
+def test_soa_snapshot_refresh_only_rereads_changed_files(soa_dir_with_snapshot):
+    with open(utils.get_soa_snapshot_path(soa_dir_with_snapshot), "rb") as f:
+        snapshot = utils.SoaSnapshot.loads(soa_dir_with_snapshot, f.read())
+    assert not snapshot.refresh()
+
+    service_dir = os.path.join(soa_dir_with_snapshot, "fake_service")
+    with open(os.path.join(service_dir, "kubernetes-cluster2.yaml"), "w") as f:
+        f.write("new_instance: {}\n")
+    os.rmdir(os.path.join(soa_dir_with_snapshot, "other_service"))
+
+    with mock.patch(
+        "paasta_tools.utils.read_service_instance_names_from_disk",
+        autospec=True,
+        side_effect=utils.read_service_instance_names_from_disk,
+    ) as mock_read_from_disk:
+        assert snapshot.refresh()
+    mock_read_from_disk.assert_called_once_with(
+        "fake_service", "kubernetes", "cluster2", soa_dir_with_snapshot
+    )
+    assert snapshot.get_instance_names("fake_service", "kubernetes", "cluster2") == (
+        "new_instance",
+    )
+    assert "other_service" not in snapshot.services
+
+
+def test_soa_snapshot_rejects_other_formats():
+    with pytest.raises(ValueError):
+        utils.SoaSnapshot.loads("/fake/soa", utils.marshal.dumps((0, {})))
+
+
+def test_load_soa_snapshot_missing(tmp_path):
+    assert utils.load_soa_snapshot(str(tmp_path / "soa")) is None
+
+
 @mock.patch(
     "paasta_tools.utils.load_service_instance_auto_configs",
     autospec=True,